@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from typing import List
 from app.core.database import get_db
+from app.core.json_rows import fetch_json_list, fetch_json_one, json_response
 from pydantic import BaseModel
 
 
@@ -36,22 +37,15 @@ def get_all_attacks(
         
         query += f" LIMIT {limit} OFFSET {skip}"
         
-        result = db.execute(query, params).fetchall()
-        columns = [desc[0] for desc in db.description]
-        attacks = [dict(zip(columns, row)) for row in result]
-        
-        return attacks
+        return json_response(fetch_json_list(db, AttackResponse, query, params))
 
 
 @router.get("/{attack_id}", response_model=AttackResponse)
 def get_attack(attack_id: str):
      with get_db() as db:
-        result = db.execute("SELECT * FROM attacks WHERE id = ?", [attack_id]).fetchone()
+        result = fetch_json_one(db, AttackResponse, "SELECT * FROM attacks WHERE id = ?", [attack_id])
         
         if not result:
             raise HTTPException(status_code=404, detail="Attack not found")
         
-        columns = [desc[0] for desc in db.description]
-        attack = dict(zip(columns, result))
-        
-        return attack
+        return json_response(result)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from typing import List
 from app.core.database import get_db
+from app.core.json_rows import fetch_json_list, fetch_json_one, json_response
 from pydantic import BaseModel
 
 
@@ -25,38 +26,28 @@ def get_all_attitudes(skip: int = 0, limit: int = 100):
     """Get all attitudes"""
     with get_db() as db:
         query = f"SELECT * FROM attitudes LIMIT {limit} OFFSET {skip}"
-        result = db.execute(query).fetchall()
-        columns = [desc[0] for desc in db.description]
-        attitudes = [dict(zip(columns, row)) for row in result]
-        
-        return attitudes
+        return json_response(fetch_json_list(db, AttitudeResponse, query))
 
 
 @router.get("/{attitude_id}", response_model=AttitudeResponse)
 def get_attitude(attitude_id: int):
     """Get a specific attitude by ID"""
     with get_db() as db:
-        result = db.execute("SELECT * FROM attitudes WHERE id = ?", [attitude_id]).fetchone()
+        result = fetch_json_one(db, AttitudeResponse, "SELECT * FROM attitudes WHERE id = ?", [attitude_id])
         
         if not result:
             raise HTTPException(status_code=404, detail="Attitude not found")
         
-        columns = [desc[0] for desc in db.description]
-        attitude = dict(zip(columns, result))
-        
-        return attitude
+        return json_response(result)
 
 
 @router.get("/name/{attitude_name}", response_model=AttitudeResponse)
 def get_attitude_by_name(attitude_name: str):
     """Get a specific attitude by name"""
     with get_db() as db:
-        result = db.execute("SELECT * FROM attitudes WHERE name = ?", [attitude_name]).fetchone()
+        result = fetch_json_one(db, AttitudeResponse, "SELECT * FROM attitudes WHERE name = ?", [attitude_name])
         
         if not result:
             raise HTTPException(status_code=404, detail="Attitude not found")
         
-        columns = [desc[0] for desc in db.description]
-        attitude = dict(zip(columns, result))
-        
-        return attitude
+        return json_response(result)
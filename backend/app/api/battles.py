@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from typing import List
 from app.core.database import get_db
+from app.sockets import battle_socket
 from pydantic import BaseModel
 from datetime import datetime
 import json
@@ -75,20 +76,46 @@ def get_battle(battle_id: int):
 
 @router.get("/{battle_id}/log")
 def get_battle_log(battle_id: int):
+    live = battle_socket.active_battles.get(str(battle_id))
+    engine = live.get('engine') if live else None
+    if engine is not None:
+        # Running on this worker, recorded or not: what was spilled plus the tail still in memory
+        return {
+            "battle_id": battle_id,
+            "log": engine.log.full_log(),
+            "duration": None,
+            "turns": engine.turn
+        }
+    
+    # Spill files are owned by the socket layer's store
+    battle_log_store = battle_socket.battle_log_store
     with get_db() as db:
         result = db.execute(
             "SELECT id, battle_log, duration, turns FROM battles WHERE id = ?",
             [battle_id]
         ).fetchone()
         
-        if not result:
+    if not result:
+        # Live on another worker, or ended without being recorded: the spilled log is all there is
+        if not battle_log_store.exists(battle_id):
             raise HTTPException(status_code=404, detail="Battle not found")
         
-        battle_log = json.loads(result[1]) if result[1] else []
-        
+        battle_log = battle_log_store.read(battle_id)
         return {
-            "battle_id": result[0],
+            "battle_id": battle_id,
             "log": battle_log,
-            "duration": result[2],
-            "turns": result[3]
+            "duration": None,
+            "turns": battle_log[-1]['turn'] if battle_log else 0
         }
+    
+    if result[1]:
+        battle_log = json.loads(result[1])
+    else:
+        battle_log = battle_log_store.read(battle_id)
+    
+    return {
+        "battle_id": result[0],
+        "log": battle_log,
+        "duration": result[2],
+        "turns": result[3]
+    }
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, HTTPException
+from typing import List, Dict
+from app.services.catalog import get_catalog
+from app.services.threat_matrix import MOVE_TYPES, build_threat_matrix
+from pydantic import BaseModel
+
+
+router = APIRouter()
+
+
+class ThreatMatrixRequest(BaseModel):
+    yokai_id: str
+    move_type: str = "attack"  # "attack", "technique" or "soultimate"
+    move_id: str
+    ivs: Dict[str, int] = {"hp": 0, "str": 0, "spr": 0, "def": 0, "spd": 0}
+    gym_points: Dict[str, int] = {"str": 0, "spr": 0, "def": 0, "spd": 0}
+    attitude_boosts: Dict[str, int] = {"hp": 0, "str": 0, "spr": 0, "def": 0, "spd": 0}
+    is_defending: bool = False
+    is_crit: bool = False
+    is_moxie: bool = False
+
+
+class ThreatMatrixEntry(BaseModel):
+    yokai_id: str
+    name: str | None = None
+    hp: int
+    min_damage: int
+    max_damage: int
+    hits_to_ko_min: int | None = None
+    hits_to_ko_max: int | None = None
+
+
+class ThreatMatrixResponse(BaseModel):
+    attacker_id: str
+    move_type: str
+    move_id: str
+    move_name: str | None = None
+    results: List[ThreatMatrixEntry]
+
+
+@router.post("/threat-matrix", response_model=ThreatMatrixResponse)
+def get_threat_matrix(request: ThreatMatrixRequest):
+    """Damage range and hits to KO of one move against every yokai"""
+    if request.move_type not in MOVE_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid move type, expected one of {', '.join(MOVE_TYPES)}")
+
+    attacker = {'id': request.yokai_id}
+    for stat, value in request.ivs.items():
+        attacker[f'{stat}_iv'] = value
+    for stat, value in request.gym_points.items():
+        attacker[f'{stat}_gym'] = value
+    for stat, value in request.attitude_boosts.items():
+        attacker[f'attitude_{stat}_boost'] = value
+
+    try:
+        return build_threat_matrix(
+            get_catalog(),
+            attacker,
+            request.move_type,
+            request.move_id,
+            is_defending=request.is_defending,
+            is_crit=request.is_crit,
+            is_moxie=request.is_moxie
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
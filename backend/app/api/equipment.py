@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from typing import List
 from app.core.database import get_db
+from app.core.json_rows import fetch_json_list, fetch_json_one, json_response
 from pydantic import BaseModel
 
 
@@ -26,38 +27,28 @@ def get_all_equipment(skip: int = 0, limit: int = 100):
     """Get all equipment items"""
     with get_db() as db:
         query = f"SELECT * FROM equipment LIMIT {limit} OFFSET {skip}"
-        result = db.execute(query).fetchall()
-        columns = [desc[0] for desc in db.description]
-        equipment = [dict(zip(columns, row)) for row in result]
-        
-        return equipment
+        return json_response(fetch_json_list(db, EquipmentResponse, query))
 
 
 @router.get("/{equipment_id}", response_model=EquipmentResponse)
 def get_equipment(equipment_id: int):
     """Get a specific equipment item by ID"""
     with get_db() as db:
-        result = db.execute("SELECT * FROM equipment WHERE id = ?", [equipment_id]).fetchone()
+        result = fetch_json_one(db, EquipmentResponse, "SELECT * FROM equipment WHERE id = ?", [equipment_id])
         
         if not result:
             raise HTTPException(status_code=404, detail="Equipment not found")
         
-        columns = [desc[0] for desc in db.description]
-        equipment = dict(zip(columns, result))
-        
-        return equipment
+        return json_response(result)
 
 
 @router.get("/name/{equipment_name}", response_model=EquipmentResponse)
 def get_equipment_by_name(equipment_name: str):
     """Get a specific equipment item by name"""
     with get_db() as db:
-        result = db.execute("SELECT * FROM equipment WHERE name = ?", [equipment_name]).fetchone()
+        result = fetch_json_one(db, EquipmentResponse, "SELECT * FROM equipment WHERE name = ?", [equipment_name])
         
         if not result:
             raise HTTPException(status_code=404, detail="Equipment not found")
         
-        columns = [desc[0] for desc in db.description]
-        equipment = dict(zip(columns, result))
-        
-        return equipment
+        return json_response(result)
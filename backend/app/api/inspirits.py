@@ -1,8 +1,8 @@
 from fastapi import APIRouter, HTTPException
 from typing import List, Dict, Any, Union
 from app.core.database import get_db
+from app.core.json_rows import fetch_json_list, fetch_json_one, json_response
 from pydantic import BaseModel
-import json
 
 
 router = APIRouter()
@@ -22,44 +22,16 @@ class InspiritResponse(BaseModel):
 def get_all_inspirits(skip: int = 0, limit: int = 100):
     with get_db() as db:
         query = f"SELECT * FROM inspirit LIMIT {limit} OFFSET {skip}"
-        result = db.execute(query).fetchall()
-        columns = [desc[0] for desc in db.description]
-        inspirits = []
-        for row in result:
-            inspirit = dict(zip(columns, row))
-            # Parse JSON effects if it's a string
-            if inspirit.get('effects'):
-                if isinstance(inspirit['effects'], str):
-                    try:
-                        inspirit['effects'] = json.loads(inspirit['effects'])
-                    except (json.JSONDecodeError, TypeError):
-                        # If parsing fails, keep as None or leave as is
-                        inspirit['effects'] = None
-            inspirits.append(inspirit)
-        
-        return inspirits
+        # effects is a JSON column, DuckDB embeds it as JSON rather than a string
+        return json_response(fetch_json_list(db, InspiritResponse, query))
 
 
 @router.get("/{inspirit_id}", response_model=InspiritResponse)
 def get_inspirit(inspirit_id: str):
     with get_db() as db:
-        result = db.execute("SELECT * FROM inspirit WHERE id = ?", [inspirit_id]).fetchone()
+        result = fetch_json_one(db, InspiritResponse, "SELECT * FROM inspirit WHERE id = ?", [inspirit_id])
         
         if not result:
             raise HTTPException(status_code=404, detail="Inspirit not found")
         
-        columns = [desc[0] for desc in db.description]
-        inspirit = dict(zip(columns, result))
-        
-        # Parse JSON effects if it's a string
-        if inspirit.get('effects'):
-            if isinstance(inspirit['effects'], str):
-                try:
-                    inspirit['effects'] = json.loads(inspirit['effects'])
-                except (json.JSONDecodeError, TypeError):
-                    # If parsing fails, keep as None
-                    inspirit['effects'] = None
-        
-        return inspirit
-        
-        return inspirit
+        return json_response(result)
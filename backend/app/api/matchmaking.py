@@ -1,14 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from typing import List
-import redis
-import json
+import asyncio
 from app.core.config import settings
+from app.core.redis import get_redis
+from app.services.matchmaking_queue import MatchmakingQueue, MemoryMatchmakingQueue, RedisMatchmakingQueue
+from app.sockets import battle_socket
 
 
 router = APIRouter()
 
-redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+_queue: MatchmakingQueue | None = None
+
+
+async def get_matchmaking_queue() -> MatchmakingQueue:
+    """
+    The queue of the configured ``MATCHMAKING_BACKEND``.
+    
+    Redis queues sit on the shared async pool and are rebuilt along with
+    it; the in-memory queue lives as long as the process and counts active
+    battles from whichever battle store the socket layer is using.
+    """
+    global _queue
+    if settings.MATCHMAKING_BACKEND == "memory":
+        if not isinstance(_queue, MemoryMatchmakingQueue):
+            _queue = MemoryMatchmakingQueue(
+                ttl=settings.MATCHMAKING_QUEUE_TTL,
+                battle_count=lambda: battle_socket.battle_router.store.count()
+            )
+        return _queue
+    
+    client = get_redis()
+    if not isinstance(_queue, RedisMatchmakingQueue) or _queue.client is not client:
+        _queue = RedisMatchmakingQueue(client, ttl=settings.MATCHMAKING_QUEUE_TTL)
+    return _queue
 
 
 class MatchmakingRequest(BaseModel):
@@ -16,6 +41,7 @@ class MatchmakingRequest(BaseModel):
     username: str
     team_id: int
     tier: str = "OU"
+    rating: int = 1000
 
 
 class MatchmakingStatus(BaseModel):
@@ -26,77 +52,52 @@ class MatchmakingStatus(BaseModel):
 
 
 @router.post("/join")
-async def join_matchmaking(request: MatchmakingRequest):
-    queue_key = f"matchmaking:{request.tier}"
-    
-    queue_data = redis_client.lrange(queue_key, 0, -1)
-    for item in queue_data:
-        data = json.loads(item)
-        if data['user_id'] == request.user_id:
-            raise HTTPException(status_code=400, detail="Already in matchmaking queue")
+async def join_matchmaking(request: MatchmakingRequest, queue: MatchmakingQueue = Depends(get_matchmaking_queue)):
+    position = await queue.join(request.tier, request.user_id, request.model_dump())
+    if position is None:
+        raise HTTPException(status_code=400, detail="Already in matchmaking queue")
     
-    player_data = request.model_dump_json()
-    redis_client.rpush(queue_key, player_data)
-    
-    redis_client.expire(queue_key, 1800)
-    
-    return {"message": "Joined matchmaking queue", "tier": request.tier}
+    return {"message": "Joined matchmaking queue", "tier": request.tier, "position": position}
 
 
 @router.post("/leave")
-async def leave_matchmaking(user_id: int, tier: str = "OU"):
-    queue_key = f"matchmaking:{tier}"
+async def leave_matchmaking(user_id: int, tier: str = "OU", queue: MatchmakingQueue = Depends(get_matchmaking_queue)):
+    if not await queue.leave(tier, user_id):
+        raise HTTPException(status_code=404, detail="Not in matchmaking queue")
     
-    queue_data = redis_client.lrange(queue_key, 0, -1)
-    for item in queue_data:
-        data = json.loads(item)
-        if data['user_id'] == user_id:
-            redis_client.lrem(queue_key, 1, item)
-            return {"message": "Left matchmaking queue"}
-    
-    raise HTTPException(status_code=404, detail="Not in matchmaking queue")
+    return {"message": "Left matchmaking queue"}
 
 
 @router.get("/status", response_model=MatchmakingStatus)
-async def get_matchmaking_status(user_id: int, tier: str = "OU"):
-    queue_key = f"matchmaking:{tier}"
-    
-    queue_data = redis_client.lrange(queue_key, 0, -1)
-    total_in_queue = len(queue_data)
-    
-    position = None
-    in_queue = False
-    
-    for idx, item in enumerate(queue_data):
-        data = json.loads(item)
-        if data['user_id'] == user_id:
-            in_queue = True
-            position = idx + 1
-            break
-    
-    active_battles = redis_client.get("active_battles") or 0
+async def get_matchmaking_status(user_id: int, tier: str = "OU", queue: MatchmakingQueue = Depends(get_matchmaking_queue)):
+    # Both reads run concurrently (on separate pooled connections with Redis)
+    (position, total_in_queue), active_battles = await asyncio.gather(
+        queue.status(tier, user_id), queue.active_battles()
+    )
     
     return MatchmakingStatus(
-        in_queue=in_queue,
+        in_queue=position is not None,
         position=position,
         total_in_queue=total_in_queue,
-        active_battles=int(active_battles)
+        active_battles=active_battles
     )
 
 
 @router.get("/stats")
-async def get_matchmaking_stats():
-    stats = {}
-    
-    for tier in ["OU", "UU", "RU", "NU"]:
-        queue_key = f"matchmaking:{tier}"
-        count = redis_client.llen(queue_key)
-        stats[tier] = count
-    
-    active_battles = redis_client.get("active_battles") or 0
+async def get_matchmaking_stats(queue: MatchmakingQueue = Depends(get_matchmaking_queue)):
+    stats, active_battles = await asyncio.gather(queue.sizes(), queue.active_battles())
     
     return {
         "queues": stats,
-        "active_battles": int(active_battles),
+        "active_battles": active_battles,
         "total_online": sum(stats.values())
     }
+
+
+@router.get("/matcher")
+async def get_matcher_stats(request: Request):
+    """Matches made by this process's background matcher and their wait-time percentiles"""
+    matchmaker = getattr(request.app.state, 'matchmaker', None)
+    if matchmaker is None:
+        raise HTTPException(status_code=404, detail="Matchmaker not running in this process")
+    return matchmaker.stats()
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from typing import List
 from app.core.database import get_db
+from app.core.json_rows import fetch_json_list, fetch_json_one, json_response
 from pydantic import BaseModel
 
 
@@ -22,36 +23,26 @@ def get_all_soul_gems(skip: int = 0, limit: int = 100):
     """Get all soul gems"""
     with get_db() as db:
         query = f"SELECT * FROM soul_gems LIMIT {limit} OFFSET {skip}"
-        result = db.execute(query).fetchall()
-        columns = [desc[0] for desc in db.description]
-        soul_gems = [dict(zip(columns, row)) for row in result]
-        
-        return soul_gems
+        return json_response(fetch_json_list(db, SoulGemResponse, query))
 
 
 @router.get("/{soul_gem_id}", response_model=SoulGemResponse)
 def get_soul_gem(soul_gem_id: int):
     with get_db() as db:
-        result = db.execute("SELECT * FROM soul_gems WHERE id = ?", [soul_gem_id]).fetchone()
+        result = fetch_json_one(db, SoulGemResponse, "SELECT * FROM soul_gems WHERE id = ?", [soul_gem_id])
         
         if not result:
             raise HTTPException(status_code=404, detail="Soul gem not found")
         
-        columns = [desc[0] for desc in db.description]
-        soul_gem = dict(zip(columns, result))
-        
-        return soul_gem
+        return json_response(result)
 
 
 @router.get("/name/{soul_gem_name}", response_model=SoulGemResponse)
 def get_soul_gem_by_name(soul_gem_name: str):
     with get_db() as db:
-        result = db.execute("SELECT * FROM soul_gems WHERE name = ?", [soul_gem_name]).fetchone()
+        result = fetch_json_one(db, SoulGemResponse, "SELECT * FROM soul_gems WHERE name = ?", [soul_gem_name])
         
         if not result:
             raise HTTPException(status_code=404, detail="Soul gem not found")
         
-        columns = [desc[0] for desc in db.description]
-        soul_gem = dict(zip(columns, result))
-        
-        return soul_gem
+        return json_response(result)
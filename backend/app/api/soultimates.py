@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from typing import List
 from app.core.database import get_db
+from app.core.json_rows import fetch_json_list, fetch_json_one, json_response
 from pydantic import BaseModel
 
 
@@ -38,23 +39,16 @@ def get_all_soultimates(
         
         query += f" LIMIT {limit} OFFSET {skip}"
         
-        result = db.execute(query, params).fetchall()
-        columns = [desc[0] for desc in db.description]
-        soultimates = [dict(zip(columns, row)) for row in result]
-        
-        return soultimates
+        return json_response(fetch_json_list(db, SoultimateResponse, query, params))
 
 
 @router.get("/{soultimate_id}", response_model=SoultimateResponse)
 def get_soultimate(soultimate_id: str):
     """Get a specific soultimate by ID"""
     with get_db() as db:
-        result = db.execute("SELECT * FROM soultimate WHERE id = ?", [soultimate_id]).fetchone()
+        result = fetch_json_one(db, SoultimateResponse, "SELECT * FROM soultimate WHERE id = ?", [soultimate_id])
         
         if not result:
             raise HTTPException(status_code=404, detail="Soultimate not found")
         
-        columns = [desc[0] for desc in db.description]
-        soultimate = dict(zip(columns, result))
-        
-        return soultimate
+        return json_response(result)
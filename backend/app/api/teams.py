@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from typing import List, Optional, Dict, Any
-from app.core.database import get_db
+from app.core.database import get_db, get_write_db
 from pydantic import BaseModel
 from datetime import datetime
 import json
@@ -133,7 +133,7 @@ def create_team(
     if len(team.yokai) > 6:
         raise HTTPException(status_code=400, detail="Team cannot have more than 6 Yo-kai")
     
-    with get_db() as db:
+    with get_write_db() as db:
         max_id = db.execute("SELECT MAX(id) FROM teams").fetchone()[0]
         new_id = (max_id or 0) + 1
         
@@ -172,7 +172,7 @@ def delete_team(
     team_id: int,
     user_id: int = 1
 ):
-    with get_db() as db:
+    with get_write_db() as db:
         result = db.execute(
             "SELECT * FROM teams WHERE id = ?",
             [team_id]
@@ -198,7 +198,7 @@ def update_team(
     team_update: TeamUpdate,
     user_id: int = 1
 ):
-    with get_db() as db:
+    with get_write_db() as db:
         result = db.execute(
             "SELECT * FROM teams WHERE id = ?",
             [team_id]
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from typing import List
 from app.core.database import get_db
+from app.core.json_rows import fetch_json_list, fetch_json_one, json_response
 from pydantic import BaseModel
 
 
@@ -37,23 +38,16 @@ def get_all_techniques(
         
         query += f" LIMIT {limit} OFFSET {skip}"
         
-        result = db.execute(query, params).fetchall()
-        columns = [desc[0] for desc in db.description]
-        techniques = [dict(zip(columns, row)) for row in result]
-        
-        return techniques
+        return json_response(fetch_json_list(db, TechniqueResponse, query, params))
 
 
 @router.get("/{technique_id}", response_model=TechniqueResponse)
 def get_technique(technique_id: str):
     """Get a specific technique by ID"""
     with get_db() as db:
-        result = db.execute("SELECT * FROM techniques WHERE id = ?", [technique_id]).fetchone()
+        result = fetch_json_one(db, TechniqueResponse, "SELECT * FROM techniques WHERE id = ?", [technique_id])
         
         if not result:
             raise HTTPException(status_code=404, detail="Technique not found")
         
-        columns = [desc[0] for desc in db.description]
-        technique = dict(zip(columns, result))
-        
-        return technique
+        return json_response(result)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from app.core.database import get_db
+from app.core.database import get_db, get_write_db
 from pydantic import BaseModel, EmailStr
 from passlib.context import CryptContext
 
@@ -29,7 +29,7 @@ class UserResponse(BaseModel):
 
 @router.post("/register", response_model=UserResponse)
 def register_user(user: UserCreate):
-    with get_db() as db:
+    with get_write_db() as db:
         existing = db.execute(
             "SELECT id FROM users WHERE username = ?",
             [user.username]
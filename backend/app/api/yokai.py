@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from typing import List
 from app.core.database import get_db
+from app.core.json_rows import fetch_json_list, fetch_json_one, json_response
 from pydantic import BaseModel
 
 
@@ -74,36 +75,26 @@ def get_all_yokai(
         query += " ORDER BY id"
         query += f" LIMIT {limit} OFFSET {skip}"
         
-        result = db.execute(query, params).fetchall()
-        columns = [desc[0] for desc in db.description]
-        yokai_list = [dict(zip(columns, row)) for row in result]
-        
-        return yokai_list
+        return json_response(fetch_json_list(db, YokaiResponse, query, params))
 
 
 @router.get("/{yokai_id}", response_model=YokaiResponse)
 def get_yokai(yokai_id: str):
     with get_db() as db:
-        result = db.execute("SELECT * FROM yokai WHERE id = ?", [yokai_id]).fetchone()
+        result = fetch_json_one(db, YokaiResponse, "SELECT * FROM yokai WHERE id = ?", [yokai_id])
         
         if not result:
             raise HTTPException(status_code=404, detail="Yokai not found")
         
-        columns = [desc[0] for desc in db.description]
-        yokai = dict(zip(columns, result))
-        
-        return yokai
+        return json_response(result)
 
 
 @router.get("/name/{yokai_name}", response_model=YokaiResponse)
 def get_yokai_by_name(yokai_name: str):
     with get_db() as db:
-        result = db.execute("SELECT * FROM yokai WHERE name = ?", [yokai_name]).fetchone()
+        result = fetch_json_one(db, YokaiResponse, "SELECT * FROM yokai WHERE name = ?", [yokai_name])
         
         if not result:
             raise HTTPException(status_code=404, detail="Yokai not found")
         
-        columns = [desc[0] for desc in db.description]
-        yokai = dict(zip(columns, result))
-        
-        return yokai
+        return json_response(result)
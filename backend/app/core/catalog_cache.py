@@ -0,0 +1,212 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+import gzip
+import hashlib
+import threading
+import time
+
+import anyio
+
+from app.core.config import settings
+from app.core.database import get_db
+
+
+# API prefix -> catalog table whose contents the responses depend on
+CATALOG_ROUTES = {
+    '/api/yokai': 'yokai',
+    '/api/attacks': 'attacks',
+    '/api/techniques': 'techniques',
+    '/api/soultimates': 'soultimate',
+    '/api/inspirits': 'inspirit',
+    '/api/skills': 'skills',
+    '/api/attitudes': 'attitudes',
+    '/api/equipment': 'equipment',
+    '/api/soul-gems': 'soul_gems',
+}
+
+# Bodies smaller than this aren't worth gzipping
+GZIP_MIN_SIZE = 1024
+
+
+class CachedResponse:
+    """One encoded catalog response, plain and gzipped, tagged with its table version"""
+
+    __slots__ = ('version', 'etag', 'body', 'gzipped', 'content_type')
+
+    def __init__(self, version: str, body: bytes, content_type: bytes):
+        self.version = version
+        self.body = body
+        self.content_type = content_type
+        self.etag = f'W/"{version[:12]}-{hashlib.blake2b(body, digest_size=8).hexdigest()}"'.encode()
+        self.gzipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_SIZE else None
+
+
+class CatalogCache:
+    """
+    Pre-encoded responses of the read-only catalog endpoints.
+
+    Entries are keyed by path and normalized query string and carry the
+    version of their table: a fingerprint of the table contents computed by
+    DuckDB, re-checked at most every ``version_ttl`` seconds. Reseeding a
+    table changes its fingerprint, so stale entries are never served once
+    the check has run; ``clear()`` drops everything right away.
+    """
+
+    def __init__(self, max_entries: int = 512, version_ttl: float = 5.0):
+        self.max_entries = max_entries
+        self.version_ttl = version_ttl
+        self._entries: 'OrderedDict[Tuple[str, str], CachedResponse]' = OrderedDict()
+        self._versions: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def table_for(path: str) -> Optional[str]:
+        for prefix, table in CATALOG_ROUTES.items():
+            if path == prefix or path.startswith(prefix + '/'):
+                return table
+        return None
+
+    @staticmethod
+    def key_for(path: str, query_string: bytes) -> Tuple[str, str]:
+        params = sorted(parse_qsl(query_string.decode('latin-1'), keep_blank_values=True))
+        return path, urlencode(params)
+
+    @staticmethod
+    def fingerprint(table: str) -> str:
+        """Hash of the table contents, independent of row order"""
+        with get_db() as db:
+            count, total = db.execute(
+                f"SELECT count(*), sum(hash(t)::HUGEINT) FROM {table} AS t"
+            ).fetchone()
+        return hashlib.blake2b(f"{table}:{count}:{total}".encode(), digest_size=16).hexdigest()
+
+    def table_version(self, table: str) -> Optional[str]:
+        """Last known version if still fresh, otherwise None (call refresh_version)"""
+        known = self._versions.get(table)
+        if known is not None and time.monotonic() - known[1] < self.version_ttl:
+            return known[0]
+        return None
+
+    def refresh_version(self, table: str) -> str:
+        version = self.fingerprint(table)
+        self._versions[table] = (version, time.monotonic())
+        return version
+
+    def get(self, key: Tuple[str, str], version: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Tuple[str, str], entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+catalog_cache = CatalogCache(
+    max_entries=settings.CATALOG_CACHE_MAX_ENTRIES,
+    version_ttl=settings.CATALOG_CACHE_VERSION_TTL
+)
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> bytes:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return b''
+
+
+class CatalogCacheMiddleware:
+    """
+    ASGI middleware serving catalog GETs from ``catalog_cache``.
+
+    Misses run the endpoint as usual and store its 200 JSON response. Hits
+    are answered without touching the endpoint: ``304 Not Modified`` when the
+    client's ``If-None-Match`` matches, otherwise the stored bytes, gzipped
+    when the client accepts it.
+    """
+
+    def __init__(self, app, cache: Optional[CatalogCache] = None):
+        self.app = app
+        self.cache = cache if cache is not None else catalog_cache
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] not in ('GET', 'HEAD'):
+            await self.app(scope, receive, send)
+            return
+        table = self.cache.table_for(scope['path'])
+        if table is None:
+            await self.app(scope, receive, send)
+            return
+
+        version = self.cache.table_version(table)
+        if version is None:
+            version = await anyio.to_thread.run_sync(self.cache.refresh_version, table)
+
+        key = self.cache.key_for(scope['path'], scope['query_string'])
+        entry = self.cache.get(key, version)
+        if entry is None:
+            entry = await self._fill(scope, receive, send, key, version)
+            if entry is None:
+                return  # Not cacheable, already sent
+
+        await self._send_entry(scope, send, entry)
+
+    async def _fill(self, scope, receive, send, key, version) -> Optional[CachedResponse]:
+        """Run the endpoint; cache a 200 JSON response or pass anything else through"""
+        messages: List[Dict[str, Any]] = []
+
+        async def capture(message):
+            messages.append(message)
+
+        await self.app(scope, receive, capture)
+
+        start = messages[0] if messages else None
+        content_type = _header(start['headers'], b'content-type') if start else b''
+        if start is None or start['status'] != 200 or not content_type.startswith(b'application/json'):
+            for message in messages:
+                await send(message)
+            return None
+
+        body = b''.join(m.get('body', b'') for m in messages if m['type'] == 'http.response.body')
+        entry = CachedResponse(version, body, content_type)
+        self.cache.put(key, entry)
+        return entry
+
+    async def _send_entry(self, scope, send, entry: CachedResponse) -> None:
+        request_headers = scope['headers']
+        headers = [
+            (b'etag', entry.etag),
+            (b'cache-control', b'no-cache'),
+            (b'vary', b'Accept-Encoding'),
+        ]
+
+        if_none_match = _header(request_headers, b'if-none-match')
+        if if_none_match and entry.etag in [tag.strip() for tag in if_none_match.split(b',')]:
+            await send({'type': 'http.response.start', 'status': 304, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        body = entry.body
+        if entry.gzipped is not None and b'gzip' in _header(request_headers, b'accept-encoding'):
+            body = entry.gzipped
+            headers.append((b'content-encoding', b'gzip'))
+        headers.append((b'content-type', entry.content_type))
+        headers.append((b'content-length', str(len(body)).encode()))
+
+        await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else body})
@@ -1,9 +1,33 @@
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
     DUCKDB_PATH: str = "./data/somen_spirits.duckdb"
+    DUCKDB_READ_ONLY: bool = False  # battle workers beside the writer process, on a seed_database.py --replica copy; writes return 503
+    BATTLE_LOG_DIR: str = "./data/battle_logs"
+    PRACTICE_AI_THINK_TIME: float = 1.0  # seconds the practice AI searches per turn
+    CATALOG_CACHE_MAX_ENTRIES: int = 512  # encoded catalog responses kept in memory
+    CATALOG_CACHE_VERSION_TTL: float = 5.0  # seconds between catalog table version checks
+    CATALOG_SNAPSHOT_PATH: str = ""  # battle catalog from seed_database.py --snapshot (must match the database's seed); empty reads the database
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_MAX_CONNECTIONS: int = 64  # pool size shared by the API, sockets and matcher
+    BATTLE_BACKEND: Literal["memory", "redis"] = "memory"  # redis shares live battles between the writer and read-only battle workers
+    BATTLE_STORE_TTL: int = 21600  # seconds a live battle record outlives its last update
+    TURN_TIMEOUT: float = 60.0  # seconds a player has to choose before their default action is played
+    TURN_TIMEOUT_FORFEIT_AFTER: int = 2  # turns in a row played for an idle player before they forfeit
+    BATTLE_IDLE_TIMEOUT: float = 300.0  # seconds a battle waits for its second player
+    TURN_TIMER_TICK: float = 1.0  # resolution of the turn timer wheel, in seconds
+    SPECTATOR_UPDATE_INTERVAL: float = 0.5  # seconds between coalesced updates of one battle's spectators
+    SPECTATOR_MAX_PENDING: int = 8  # unacknowledged updates before a spectator is switched to a snapshot
+    MATCHMAKING_BACKEND: Literal["redis", "memory"] = "redis"  # memory keeps queues in-process: one worker only
+    MATCHMAKING_QUEUE_TTL: int = 1800  # seconds a queue entry stays valid
+    MATCHMAKER_ENABLED: Optional[bool] = None  # run the background matcher here; unset: unless DUCKDB_READ_ONLY
+    MATCHMAKER_INTERVAL: float = 0.5  # seconds between idle matching passes
+    MATCHMAKER_BATCH_SIZE: int = 1000  # oldest entries per tier considered each pass
+    MATCHMAKING_RATING_WINDOW: int = 100  # accepted rating gap right after joining
+    MATCHMAKING_RATING_WINDOW_GROWTH: float = 10.0  # extra gap per second waited
+    MATCHMAKING_RATING_WINDOW_MAX: int = 1000
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
     SECRET_KEY: str = "some super secure key not sure how to do this yet."
@@ -8,37 +8,108 @@ import threading
 duckdb_conn = None
 db_lock = threading.Lock()
 
+
+class ReadOnlyDatabaseError(RuntimeError):
+    """A write was attempted on a database opened with ``DUCKDB_READ_ONLY``"""
+
+
 #disgusting logic for handling duckdb conn
 def get_duckdb():
+    """
+    The process-wide connection, opened on first use.
+    
+    DuckDB locks the file per process: either one process opens it
+    read-write, or any number open it read-only, never both. Several
+    workers therefore run as one writer process on the database (matcher,
+    users, teams, battle records) plus battle workers with
+    ``DUCKDB_READ_ONLY`` on a ``seed_database.py --replica`` copy, all on
+    ``BATTLE_BACKEND=redis``. A second read-write opener gets a
+    RuntimeError saying so instead of DuckDB's bare lock error.
+    """
     global duckdb_conn
     if duckdb_conn is None:
         with db_lock:
             if duckdb_conn is None:  # Double-check locking
                 os.makedirs(os.path.dirname(settings.DUCKDB_PATH), exist_ok=True)
-                # Connect in read-write mode
-                duckdb_conn = duckdb.connect(settings.DUCKDB_PATH, read_only=False)
+                try:
+                    duckdb_conn = duckdb.connect(settings.DUCKDB_PATH, read_only=settings.DUCKDB_READ_ONLY)
+                except duckdb.IOException as e:
+                    if 'lock' not in str(e).lower():
+                        raise
+                    raise RuntimeError(
+                        f"{settings.DUCKDB_PATH} is locked by another process ({e}). DuckDB allows one "
+                        "read-write process per file: run one writer process on it and start other "
+                        "workers with DUCKDB_READ_ONLY=true on a seed_database.py --replica copy"
+                    ) from e
     return duckdb_conn
 
 
+# One cursor per thread: a DuckDB connection must not be shared between threads,
+# cursors of the same database run their queries in parallel
+_thread_local = threading.local()
+
+# Writers go one at a time, each inside its own transaction
+write_lock = threading.Lock()
+
+
+def get_cursor() -> duckdb.DuckDBPyConnection:
+    """This thread's cursor on the shared database, created on first use"""
+    cursor = getattr(_thread_local, 'cursor', None)
+    if cursor is None:
+        cursor = get_duckdb().cursor()
+        _thread_local.cursor = cursor
+    return cursor
+
+
 @contextmanager
 def get_db() -> Generator[duckdb.DuckDBPyConnection, None, None]:
-    # Use the shared connection with thread safety
-    db = get_duckdb()
-    try:
-        yield db
-    except Exception as e:
-        raise e
+    """
+    Read path: this thread's own cursor.
+    
+    FastAPI runs sync endpoints in a threadpool, so each worker thread gets
+    its own cursor (and its own ``description``) instead of queueing on a
+    single connection.
+    """
+    yield get_cursor()
+
+
+@contextmanager
+def get_write_db() -> Generator[duckdb.DuckDBPyConnection, None, None]:
+    """
+    Write path: this thread's cursor inside a transaction, one writer at a time.
+    
+    Commits when the block finishes and rolls back if it raises, so
+    read-then-write sequences like ``SELECT MAX(id)`` + ``INSERT`` can't
+    interleave with another writer. Raises ReadOnlyDatabaseError under
+    ``DUCKDB_READ_ONLY``.
+    """
+    if settings.DUCKDB_READ_ONLY:
+        raise ReadOnlyDatabaseError(f"{settings.DUCKDB_PATH} is opened read-only (DUCKDB_READ_ONLY)")
+    with write_lock:
+        db = get_cursor()
+        db.execute("BEGIN TRANSACTION")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
 
 
 def init_db(drop_existing: bool = False):
     """
     Initialize the database schema.
     
+    Only opens the connection under ``DUCKDB_READ_ONLY``: the schema then
+    belongs to whoever seeded the file.
+    
     Args:
         drop_existing: If True, drop all existing tables before creating new ones.
                       Default is False to preserve data on application restart.
     """
     db = get_duckdb()
+    if settings.DUCKDB_READ_ONLY:
+        return
     
     if drop_existing:
         db.execute("DROP TABLE IF EXISTS yokai")
@@ -50,6 +121,7 @@ def init_db(drop_existing: bool = False):
         db.execute("DROP TABLE IF EXISTS attitudes")
         db.execute("DROP TABLE IF EXISTS equipment")
         db.execute("DROP TABLE IF EXISTS soul_gems")
+        db.execute("DROP TABLE IF EXISTS seed_metadata")
 
     db.execute("""
         CREATE TABLE IF NOT EXISTS yokai (
@@ -180,6 +252,17 @@ def init_db(drop_existing: bool = False):
         )
     """)
     
+    # Hash of the seed file each catalog table was last loaded from
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS seed_metadata (
+            table_name VARCHAR PRIMARY KEY,
+            file_name VARCHAR NOT NULL,
+            content_hash VARCHAR NOT NULL,
+            row_count INTEGER NOT NULL,
+            seeded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
     db.execute("""
         CREATE TABLE IF NOT EXISTS users (
             id INTEGER PRIMARY KEY,
@@ -0,0 +1,91 @@
+from functools import lru_cache
+from types import NoneType, UnionType
+from typing import Any, Optional, Sequence, Type, Union, get_args, get_origin
+
+import duckdb
+from fastapi import Response
+from pydantic import BaseModel
+
+
+# Python annotation -> DuckDB type the column is cast to, mirroring pydantic's coercion
+_SQL_TYPES = {
+    str: 'VARCHAR',
+    int: 'BIGINT',
+    float: 'DOUBLE',
+    bool: 'BOOLEAN',
+}
+
+
+def _unwrap_optional(annotation: Any) -> tuple[Any, bool]:
+    """(inner type, nullable) for ``X | None`` / ``Optional[X]``"""
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        nullable = len(args) < len(get_args(annotation))
+        return (args[0] if len(args) == 1 else annotation), nullable
+    return annotation, False
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+@lru_cache(maxsize=None)
+def model_projection(model: Type[BaseModel]) -> str:
+    """
+    ``struct_pack(...)`` building one response object per row, from the model's fields.
+
+    Each field is cast to its declared type; a NULL in a field the model
+    doesn't allow to be None aborts the query, like pydantic validation would.
+    """
+    fields = []
+    for name, field in model.model_fields.items():
+        column = _quote(name)
+        annotation, nullable = _unwrap_optional(field.annotation)
+        sql_type = _SQL_TYPES.get(annotation)
+        value = f"CAST({column} AS {sql_type})" if sql_type else column
+        if not nullable and field.is_required():
+            message = f"{model.__name__}.{name} is NULL".replace("'", "''")
+            value = f"CASE WHEN {column} IS NULL THEN error('{message}') ELSE {value} END"
+        fields.append(f"{column} := {value}")
+    return f"struct_pack({', '.join(fields)})"
+
+
+def fetch_json_list(
+    db: duckdb.DuckDBPyConnection,
+    model: Type[BaseModel],
+    query: str,
+    params: Optional[Sequence[Any]] = None
+) -> bytes:
+    """
+    Run ``query`` and return its rows as a JSON array of ``model`` objects.
+
+    DuckDB builds the whole document itself, so no Python object is
+    created per row or per value. Row order of ``query`` is kept.
+    """
+    result = db.execute(
+        f"""
+        SELECT to_json(coalesce(list({model_projection(model)} ORDER BY __row), []))
+        FROM (SELECT *, row_number() OVER () AS __row FROM ({query}) AS q) AS rows
+        """,
+        params or []
+    ).fetchone()
+    return result[0].encode()
+
+
+def fetch_json_one(
+    db: duckdb.DuckDBPyConnection,
+    model: Type[BaseModel],
+    query: str,
+    params: Optional[Sequence[Any]] = None
+) -> Optional[bytes]:
+    """The first row of ``query`` as one JSON ``model`` object, or None if there is none"""
+    result = db.execute(
+        f"SELECT to_json({model_projection(model)}) FROM ({query}) AS q LIMIT 1",
+        params or []
+    ).fetchone()
+    return result[0].encode() if result else None
+
+
+def json_response(content: bytes) -> Response:
+    """Send already serialized JSON without FastAPI re-validating it"""
+    return Response(content=content, media_type='application/json')
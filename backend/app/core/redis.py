@@ -0,0 +1,43 @@
+import asyncio
+from typing import Optional
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+
+# Shared by every module of this process, created on first use
+_client: Optional[aioredis.Redis] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_redis() -> aioredis.Redis:
+    """
+    The process-wide async Redis client, created on first use.
+
+    All callers share one connection pool, so concurrent handlers each
+    borrow a connection instead of queueing on one socket. Connections
+    belong to the event loop that opened them: call this from a coroutine,
+    and a new loop (e.g. another test client) gets a new pool.
+    """
+    global _client, _loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _loop is not loop:
+        # Blocking pool: past max_connections callers wait for a free
+        # connection instead of failing with "Too many connections"
+        pool = aioredis.BlockingConnectionPool.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            max_connections=settings.REDIS_MAX_CONNECTIONS
+        )
+        _client = aioredis.Redis(connection_pool=pool)
+        _loop = loop
+    return _client
+
+
+async def close_redis() -> None:
+    """Close the shared pool on shutdown; the next ``get_redis`` opens a new one"""
+    global _client, _loop
+    client, _client, _loop = _client, None, None
+    if client is not None:
+        await client.aclose()
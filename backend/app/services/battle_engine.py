@@ -1,32 +1,71 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import random
 import math
-from app.core.database import get_db
+import secrets
+from app.services.battle_log import BattleLog, BattleLogStore
+from app.services.battle_yokai import BattleYokai, STAGE_STATS, build_battle_yokai
+from app.services.catalog import MoveCatalog, get_catalog
+from app.services.team_hydration import hydrate_team
 from damage_calc import (
     get_attack_damage,
+    get_damage,
     get_random_multiplier,
+    RESISTANCE_KEYS,
     calculate_stats,
-    calculate_hits_to_ko
+    calculate_hits_to_ko,
+    CRIT_CHANCE
 )
 
 
+def inspirit_has_effect(inspirit: Optional[Dict[str, Any]]) -> bool:
+    """
+    Whether the engine can execute an inspirit row: it needs the parsed
+    ``effect_type`` and ``tags``, which the seeded ``inspirit`` table
+    (``effects`` JSON only) doesn't have.
+    """
+    return inspirit is not None and 'effect_type' in inspirit and 'tags' in inspirit
+
+
 class BattleEngine:
     """
     Handles all battle logic, turn processing, damage calculations, etc.
     Based on the original battleCLIENT.js logic but server-side
     """
     
-    def __init__(self, team1: List[Dict], team2: List[Dict]):
+    def __init__(
+        self,
+        team1: List[Dict],
+        team2: List[Dict],
+        catalog: Optional[MoveCatalog] = None,
+        seed: Optional[int] = None,
+        battle_id: Optional[Any] = None,
+        log_store: Optional[BattleLogStore] = None,
+        lean: bool = False
+    ):
+        # Pin one catalog snapshot for the whole battle so a reload can't change moves mid-fight
+        self.catalog = catalog if catalog is not None else get_catalog()
+        
+        # Every roll in the battle comes from this generator, so seed + actions replays it exactly
+        self.seed = seed if seed is not None else secrets.randbits(64)
+        self.rng = random.Random(self.seed)
+        self.action_history: List[Tuple[int, Dict]] = []
+        
+        # Lean engines (AI search, simulations) skip logging, history and damage breakdowns
+        self.lean = lean
+        
         self.team1 = team1
         self.team2 = team2
         self.turn = 0
         self.current_phase = "action_select"  # action_select, resolution, end
         
+        # Only recent entries stay in memory, older ones go to log_store (or are dropped without one)
+        self.log = BattleLog(store=log_store, battle_id=battle_id)
+        
         self.state = {
             'team1': self._initialize_team(team1),
             'team2': self._initialize_team(team2),
             'turn': 0,
-            'log': [],
+            'log': self.log.entries,
             'weather': None,
             'field_effects': []
         }
@@ -36,165 +75,91 @@ class BattleEngine:
             'player2': None
         }
     
+    @classmethod
+    def replay(
+        cls,
+        team1: List[Dict],
+        team2: List[Dict],
+        seed: int,
+        actions: List[Tuple[int, Dict]],
+        catalog: Optional[MoveCatalog] = None
+    ) -> 'BattleEngine':
+        """Rebuild a battle from its seed and the (player_num, action) stream it received"""
+        engine = cls(team1, team2, catalog=catalog, seed=seed)
+        for player_num, action in actions:
+            engine.process_action(player_num, action)
+        return engine
+    
+    def clone(self, rng: Optional[random.Random] = None, lean: bool = True) -> 'BattleEngine':
+        """
+        Cheap copy of the battle for look-ahead (e.g. the practice AI).
+        
+        Fighters are copied with BattleYokai.clone(), which shares the catalog
+        rows; nothing is deep-copied. The clone has its own rng (a copy of
+        this one's state unless ``rng`` is given), an empty action history
+        and a log that is never persisted, so playing it out never touches
+        the original battle.
+        """
+        engine = object.__new__(type(self))
+        engine.catalog = self.catalog
+        engine.seed = self.seed
+        if rng is None:
+            rng = random.Random()
+            rng.setstate(self.rng.getstate())
+        engine.rng = rng
+        engine.action_history = []
+        engine.lean = lean
+        engine.team1 = self.team1
+        engine.team2 = self.team2
+        engine.turn = self.turn
+        engine.current_phase = self.current_phase
+        engine.log = BattleLog()
+        engine.state = {
+            'team1': [yokai.clone() for yokai in self.state['team1']],
+            'team2': [yokai.clone() for yokai in self.state['team2']],
+            'turn': self.state['turn'],
+            'log': engine.log.entries,
+            'weather': self.state['weather'],
+            'field_effects': list(self.state['field_effects'])
+        }
+        engine.pending_actions = dict(self.pending_actions)
+        return engine
+    
     def _get_attack_data(self, attack_id: int) -> Optional[Dict[str, Any]]:
-        with get_db() as db:
-            result = db.execute(
-                "SELECT * FROM attacks WHERE id = ?",
-                [attack_id]
-            ).fetchone()
-            
-            if result:
-                columns = [desc[0] for desc in db.description]
-                return dict(zip(columns, result))
-            return None
+        return self.catalog.attacks.get(attack_id)
     
     def _get_technique_data(self, technique_id: int) -> Optional[Dict[str, Any]]:
-        with get_db() as db:
-            result = db.execute(
-                "SELECT * FROM techniques WHERE id = ?",
-                [technique_id]
-            ).fetchone()
-            
-            if result:
-                columns = [desc[0] for desc in db.description]
-                return dict(zip(columns, result))
-            return None
+        return self.catalog.techniques.get(technique_id)
     
     def _get_inspirit_data(self, inspirit_id: int) -> Optional[Dict[str, Any]]:
-        with get_db() as db:
-            result = db.execute(
-                "SELECT * FROM inspirit WHERE id = ?",
-                [inspirit_id]
-            ).fetchone()
-            
-            if result:
-                columns = [desc[0] for desc in db.description]
-                return dict(zip(columns, result))
-            return None
+        return self.catalog.inspirits.get(inspirit_id)
     
     def _get_soultimate_data(self, soultimate_id: int) -> Optional[Dict[str, Any]]:
-        with get_db() as db:
-            result = db.execute(
-                "SELECT * FROM soultimate WHERE id = ?",
-                [soultimate_id]
-            ).fetchone()
-            
-            if result:
-                columns = [desc[0] for desc in db.description]
-                return dict(zip(columns, result))
-            return None
+        return self.catalog.soultimates.get(soultimate_id)
     
     def _get_yokai_data(self, yokai_id: int) -> Optional[Dict[str, Any]]:
-        with get_db() as db:
-            # Try to fetch by id first, then by code if id doesn't work, artifact from mixed schemas that needs to be fixed
-            # TODO: revisit
-            result = db.execute(
-                "SELECT * FROM yokai WHERE id = ?",
-                [yokai_id]
-            ).fetchone()
-            
-            if result:
-                columns = [desc[0] for desc in db.description]
-                return dict(zip(columns, result))
-            return None
+        return self.catalog.yokai.get(yokai_id)
     
     def _calculate_elemental_modifier(self, attacker_attribute: str, target: Dict) -> float:
         if not attacker_attribute or attacker_attribute == 'none':
             return 1.0
         
-        resistance_map = {
-            'fire': 'fire_res',
-            'water': 'water_res',
-            'lightning': 'lightning_res',
-            'earth': 'earth_res',
-            'wind': 'wind_res',
-            'ice': 'ice_res'
-        }
-        
-        res_key = resistance_map.get(attacker_attribute.lower())
+        res_key = RESISTANCE_KEYS.get(attacker_attribute.lower())
         if res_key and res_key in target:
             return target[res_key]
         
         return 1.0
     
-    def _initialize_team(self, team: List[Dict]) -> List[Dict]:
-        battle_team = []
-        for yokai in team:
-            if 'id' in yokai or len(yokai) < 5:
-                full_yokai_data = self._get_yokai_data(yokai['id'])
-                if full_yokai_data:
-                    yokai = full_yokai_data
-            
-            # Get IVs, gym stats (EVs), and attitude boosts from yokai data or defaults
-            hp_iv = yokai.get('hp_iv', 0)
-            str_iv = yokai.get('str_iv', 0)
-            spr_iv = yokai.get('spr_iv', 0)
-            def_iv = yokai.get('def_iv', 0)
-            spd_iv = yokai.get('spd_iv', 0)
-            
-            hp_gym = yokai.get('hp_gym', 0)
-            str_gym = yokai.get('str_gym', 0)
-            spr_gym = yokai.get('spr_gym', 0)
-            def_gym = yokai.get('def_gym', 0)
-            spd_gym = yokai.get('spd_gym', 0)
-            
-            hp_boost = yokai.get('attitude_hp_boost', 0)
-            str_boost = yokai.get('attitude_str_boost', 0)
-            spr_boost = yokai.get('attitude_spr_boost', 0)
-            def_boost = yokai.get('attitude_def_boost', 0)
-            spd_boost = yokai.get('attitude_spd_boost', 0)
-            
-            level = yokai.get('level', 50)  # Default level 50
-            
-            # Calculate final stats using damage_calc module
-            # Note: This requires yokai_data to have base stats
-            # For now, use the stats directly if they exist, otherwise calculate
-            if 'bs_b_hp' in yokai:  # Using Battle Stats B (max level stats)
-                final_hp = yokai['bs_b_hp'] + hp_iv + hp_gym + hp_boost
-                final_str = yokai['bs_b_str'] + str_iv + str_gym + str_boost
-                final_spr = yokai['bs_b_spr'] + spr_iv + spr_gym + spr_boost
-                final_def = yokai['bs_b_def'] + def_iv + def_gym + def_boost
-                final_spd = yokai['bs_b_spd'] + spd_iv + spd_gym + spd_boost
-            else:
-                # Fallback to default stats
-                final_hp = yokai.get('hp', 100)
-                final_str = yokai.get('str', 50)
-                final_spr = yokai.get('spr', 50)
-                final_def = yokai.get('def', 50)
-                final_spd = yokai.get('spd', 50)
-            
-            battle_yokai = {
-                **yokai,
-                'max_hp': final_hp,
-                'current_hp': final_hp,
-                'str_stat': final_str,
-                'spr_stat': final_spr,
-                'def_stat': final_def,
-                'spd_stat': final_spd,
-                'current_soul': 0,
-                'status_effects': [],
-                'stat_modifiers': {
-                    'str': 0,
-                    'spr': 0,
-                    'def': 0,
-                    'spd': 0
-                },
-                'is_fainted': False,
-                'attitude_str_boost': str_boost,
-                'attitude_spr_boost': spr_boost,
-                'attitude_def_boost': def_boost,
-                'attitude_spd_boost': spd_boost
-            }
-            battle_team.append(battle_yokai)
-        return battle_team
+    def _initialize_team(self, team: List[Dict]) -> List[BattleYokai]:
+        return [build_battle_yokai(row, build) for row, build in hydrate_team(team, self.catalog)]
     
     def get_state(self) -> Dict[str, Any]:
         return {
-            'team1': self.state['team1'],
-            'team2': self.state['team2'],
+            'team1': [yokai.to_dict() for yokai in self.state['team1']],
+            'team2': [yokai.to_dict() for yokai in self.state['team2']],
             'turn': self.state['turn'],
             'phase': self.current_phase,
-            'log': self.state['log'][-10:]
+            'log': self.log.recent(10)
         }
     
     def process_action(self, player_num: int, action: Dict) -> Dict[str, Any]:
@@ -209,6 +174,8 @@ class BattleEngine:
         """
         player_key = f'player{player_num}'
         self.pending_actions[player_key] = action
+        if not self.lean:
+            self.action_history.append((player_num, dict(action)))
         
         if self.pending_actions['player1'] and self.pending_actions['player2']:
             return self._resolve_turn()
@@ -240,13 +207,16 @@ class BattleEngine:
         results = []
         
         for player_num, action, yokai in actions:
-            if yokai['is_fainted']:
+            if yokai.is_fainted:
                 continue
             
             result = self._execute_action(player_num, action, yokai)
             results.append(result)
             
-            self.state['log'].append({
+            if self.lean:
+                continue
+            
+            self.log.append({
                 'turn': self.turn,
                 'player': player_num,
                 'action': action,
@@ -257,6 +227,9 @@ class BattleEngine:
         
         self.pending_actions = {'player1': None, 'player2': None}
         
+        if self.lean:
+            return {'status': 'resolved', 'turn': self.turn, 'results': results}
+        
         return {
             'status': 'resolved',
             'turn': self.turn,
@@ -264,7 +237,7 @@ class BattleEngine:
             'state': self.get_state()
         }
     
-    def _execute_action(self, player_num: int, action: Dict, attacker: Dict) -> Dict[str, Any]:
+    def _execute_action(self, player_num: int, action: Dict, attacker: BattleYokai) -> Dict[str, Any]:
         action_type = action['type']
         target_team = self.state['team2'] if player_num == 1 else self.state['team1']
         target = target_team[action['target_index']]
@@ -280,7 +253,7 @@ class BattleEngine:
         
         return {'success': False, 'message': 'Unknown action type'}
     
-    def _execute_attack(self, attacker: Dict, target: Dict, attack_id: int) -> Dict[str, Any]:
+    def _execute_attack(self, attacker: BattleYokai, target: BattleYokai, attack_id: int) -> Dict[str, Any]:
         attack_data = self._get_attack_data(attack_id)
         
         if not attack_data:
@@ -295,18 +268,22 @@ class BattleEngine:
         
         # Get defender stats
         defender_def = self._calculate_stat(target, 'def')
-        defender_hp = target['current_hp']
+        defender_hp = target.current_hp
         
         # Check if defending
-        is_defending = 'guarding' in target.get('status_effects', [])
+        is_defending = target.has_status('guarding')
         
         # Check for critical hit (5% chance)
-        is_crit = random.random() < 0.05
+        is_crit = self.rng.random() < CRIT_CHANCE
         
         # Get attitude bonuses (default to 0 if not present)
-        attitude_str_boost = attacker.get('attitude_str_boost', 0)
-        attitude_spr_boost = attacker.get('attitude_spr_boost', 0)
-        attitude_def_boost = target.get('attitude_def_boost', 0)
+        attitude_str_boost = attacker.attitude_str_boost
+        attitude_spr_boost = attacker.attitude_spr_boost
+        attitude_def_boost = target.attitude_def_boost
+        
+        if self.lean:
+            return self._lean_damage(attacker, target, attack_data, 1, attacker_str, attacker_spr,
+                                     defender_def, is_defending, is_crit)
         
         # Calculate damage using damage_calc module
         damage_result = get_attack_damage(
@@ -322,17 +299,18 @@ class BattleEngine:
             is_moxie=False,
             attitude_str_boost=attitude_str_boost,
             attitude_spr_boost=attitude_spr_boost,
-            attitude_def_boost=attitude_def_boost
+            attitude_def_boost=attitude_def_boost,
+            rng=self.rng
         )
         
         total_damage = damage_result['damage']
         hits = damage_result['stats_used']['hit_amount']
         
         # Apply damage to target
-        target['current_hp'] = max(0, target['current_hp'] - total_damage)
+        target.current_hp = max(0, target.current_hp - total_damage)
         
-        if target['current_hp'] == 0:
-            target['is_fainted'] = True
+        if target.current_hp == 0:
+            target.is_fainted = True
         
         return {
             'success': True,
@@ -342,11 +320,40 @@ class BattleEngine:
             'hits': hits,
             'is_crit': is_crit,
             'damage_breakdown': damage_result,
-            'target_remaining_hp': target['current_hp'],
-            'target_fainted': target['is_fainted']
+            'target_remaining_hp': target.current_hp,
+            'target_fainted': target.is_fainted
         }
     
-    def _execute_technique(self, attacker: Dict, target: Dict, technique_id: int) -> Dict[str, Any]:
+    def _lean_damage(self, attacker: BattleYokai, target: BattleYokai, move_data: Dict[str, Any],
+                     attack_type: int, attacker_str: int, attacker_spr: int, defender_def: int,
+                     is_defending: bool, is_crit: bool, is_moxie: bool = False) -> Dict[str, Any]:
+        """
+        Lean engines' damage for attacks (1), techniques (2) and soultimates (3).
+
+        Same kernel and roll as the full path, just no breakdown; shared so
+        search clones can't drift from real battles.
+        """
+        total_damage, _ = get_damage(
+            move_data,
+            attacker_str,
+            attacker_spr,
+            target,
+            defender_def,
+            attack_type,
+            is_defending,
+            is_crit,
+            is_moxie,
+            attacker.attitude_str_boost,
+            attacker.attitude_spr_boost,
+            target.attitude_def_boost,
+            rng=self.rng
+        )
+        target.current_hp = max(0, target.current_hp - total_damage)
+        if target.current_hp == 0:
+            target.is_fainted = True
+        return {'success': True, 'type': ('attack', 'technique', 'soultimate')[attack_type - 1], 'damage': total_damage}
+    
+    def _execute_technique(self, attacker: BattleYokai, target: BattleYokai, technique_id: int) -> Dict[str, Any]:
         """Execute a technique using the damage calc logic"""
         technique_data = self._get_technique_data(technique_id)
         
@@ -362,18 +369,22 @@ class BattleEngine:
         
         # Get defender stats
         defender_def = self._calculate_stat(target, 'def')
-        defender_hp = target['current_hp']
+        defender_hp = target.current_hp
         
         # Check if defending
-        is_defending = 'guarding' in target.get('status_effects', [])
+        is_defending = target.has_status('guarding')
         
         # Check for critical hit (5% chance)
-        is_crit = random.random() < 0.05
+        is_crit = self.rng.random() < CRIT_CHANCE
         
         # Get attitude bonuses
-        attitude_str_boost = attacker.get('attitude_str_boost', 0)
-        attitude_spr_boost = attacker.get('attitude_spr_boost', 0)
-        attitude_def_boost = target.get('attitude_def_boost', 0)
+        attitude_str_boost = attacker.attitude_str_boost
+        attitude_spr_boost = attacker.attitude_spr_boost
+        attitude_def_boost = target.attitude_def_boost
+        
+        if self.lean:
+            return self._lean_damage(attacker, target, technique_data, 2, attacker_str, attacker_spr,
+                                     defender_def, is_defending, is_crit)
         
         # Calculate damage using damage_calc module
         damage_result = get_attack_damage(
@@ -389,16 +400,17 @@ class BattleEngine:
             is_moxie=False,
             attitude_str_boost=attitude_str_boost,
             attitude_spr_boost=attitude_spr_boost,
-            attitude_def_boost=attitude_def_boost
+            attitude_def_boost=attitude_def_boost,
+            rng=self.rng
         )
         
         total_damage = damage_result['damage']
         
         # Apply damage to target
-        target['current_hp'] = max(0, target['current_hp'] - total_damage)
+        target.current_hp = max(0, target.current_hp - total_damage)
         
-        if target['current_hp'] == 0:
-            target['is_fainted'] = True
+        if target.current_hp == 0:
+            target.is_fainted = True
         
         return {
             'success': True,
@@ -409,11 +421,11 @@ class BattleEngine:
             'element': technique_data.get('element'),
             'elemental_modifier': damage_result['multipliers']['elemental'],
             'damage_breakdown': damage_result,
-            'target_remaining_hp': target['current_hp'],
-            'target_fainted': target['is_fainted']
+            'target_remaining_hp': target.current_hp,
+            'target_fainted': target.is_fainted
         }
     
-    def _execute_inspirit(self, attacker: Dict, target: Dict, inspirit_id: int) -> Dict[str, Any]:
+    def _execute_inspirit(self, attacker: BattleYokai, target: BattleYokai, inspirit_id: int) -> Dict[str, Any]:
         """Execute an inspirit using data from database"""
         # Get inspirit data from database
         inspirit_data = self._get_inspirit_data(inspirit_id)
@@ -423,6 +435,11 @@ class BattleEngine:
                 'success': False,
                 'message': f'Inspirit {inspirit_id} not found in database'
             }
+        if not inspirit_has_effect(inspirit_data):
+            return {
+                'success': False,
+                'message': f'Inspirit {inspirit_id} has no effect the engine can apply'
+            }
         
         effect_type = inspirit_data['effect_type']
         tags = inspirit_data['tags']
@@ -453,27 +470,23 @@ class BattleEngine:
         
         # Handle allUp and allDown special tags
         if 'allUp' in tags:
-            for stat in ['str', 'spr', 'def', 'spd']:
-                target['stat_modifiers'][stat] += 1
-                target['stat_modifiers'][stat] = max(-6, min(6, target['stat_modifiers'][stat]))
+            for stat in STAGE_STATS:
+                target.shift_stage(stat, 1)
             effects_applied.append('all stats increased')
         elif 'allDown' in tags:
-            for stat in ['str', 'spr', 'def', 'spd']:
-                target['stat_modifiers'][stat] -= 1
-                target['stat_modifiers'][stat] = max(-6, min(6, target['stat_modifiers'][stat]))
+            for stat in STAGE_STATS:
+                target.shift_stage(stat, -1)
             effects_applied.append('all stats decreased')
         else:
-            # Handle individual stat modifications
+            # Handle individual stat modifications, clamped between -6 and +6
             for tag_key, (stat, modifier) in stat_modifiers.items():
                 if tag_key in tags:
-                    target['stat_modifiers'][stat] += modifier
-                    # Clamp stat modifiers between -6 and +6
-                    target['stat_modifiers'][stat] = max(-6, min(6, target['stat_modifiers'][stat]))
+                    target.shift_stage(stat, modifier)
                     effects_applied.append(f'{stat} {"increased" if modifier > 0 else "decreased"}')
         
         # Handle status effect inspirits
         if 'confusion' in tags.lower():
-            target['status_effects'].append({
+            target.add_status_effect({
                 'type': 'confusion',
                 'duration': 3,
                 'turns_remaining': 3
@@ -483,12 +496,12 @@ class BattleEngine:
         if 'drain' in tags.lower():
             # Drain effect - could restore HP to attacker
             drain_amount = int(target['hp'] * 0.1)  # 10% of max HP
-            target['current_hp'] = max(0, target['current_hp'] - drain_amount)
-            attacker['current_hp'] = min(attacker['hp'], attacker['current_hp'] + drain_amount)
+            target.current_hp = max(0, target.current_hp - drain_amount)
+            attacker.current_hp = min(attacker['hp'], attacker.current_hp + drain_amount)
             effects_applied.append(f'drained {drain_amount} HP')
         
         if 'seal' in tags.lower():
-            target['status_effects'].append({
+            target.add_status_effect({
                 'type': 'seal',
                 'duration': 2,
                 'turns_remaining': 2
@@ -501,12 +514,12 @@ class BattleEngine:
             'inspirit_name': inspirit_data['name'],
             'effect_type': effect_type,
             'effects_applied': effects_applied,
-            'target_remaining_hp': target['current_hp']
+            'target_remaining_hp': target.current_hp
         }
     
-    def _execute_soultimate(self, attacker: Dict, target: Dict, soultimate_id: int) -> Dict[str, Any]:
+    def _execute_soultimate(self, attacker: BattleYokai, target: BattleYokai, soultimate_id: int) -> Dict[str, Any]:
         """Execute a soultimate using the damage calc logic"""
-        if attacker['current_soul'] < 100:
+        if attacker.current_soul < 100:
             return {
                 'success': False,
                 'message': 'Not enough soul energy'
@@ -526,21 +539,26 @@ class BattleEngine:
         
         # Get defender stats
         defender_def = self._calculate_stat(target, 'def')
-        defender_hp = target['current_hp']
+        defender_hp = target.current_hp
         
         # Check if defending
-        is_defending = 'guarding' in target.get('status_effects', [])
+        is_defending = target.has_status('guarding')
         
         # Check for critical hit (5% chance)
-        is_crit = random.random() < 0.05
+        is_crit = self.rng.random() < CRIT_CHANCE
         
         # Check for Moxie skill (doubles Soultimate damage)
         is_moxie = attacker.get('skill_name', '').lower() == 'moxie'
         
         # Get attitude bonuses
-        attitude_str_boost = attacker.get('attitude_str_boost', 0)
-        attitude_spr_boost = attacker.get('attitude_spr_boost', 0)
-        attitude_def_boost = target.get('attitude_def_boost', 0)
+        attitude_str_boost = attacker.attitude_str_boost
+        attitude_spr_boost = attacker.attitude_spr_boost
+        attitude_def_boost = target.attitude_def_boost
+        
+        if self.lean:
+            attacker.current_soul = 0
+            return self._lean_damage(attacker, target, soultimate_data, 3, attacker_str, attacker_spr,
+                                     defender_def, is_defending, is_crit, is_moxie)
         
         # Calculate damage using damage_calc module
         damage_result = get_attack_damage(
@@ -556,20 +574,21 @@ class BattleEngine:
             is_moxie=is_moxie,
             attitude_str_boost=attitude_str_boost,
             attitude_spr_boost=attitude_spr_boost,
-            attitude_def_boost=attitude_def_boost
+            attitude_def_boost=attitude_def_boost,
+            rng=self.rng
         )
         
         total_damage = damage_result['damage']
         hits = damage_result['stats_used']['hit_amount']
         
         # Apply damage to target
-        target['current_hp'] = max(0, target['current_hp'] - total_damage)
+        target.current_hp = max(0, target.current_hp - total_damage)
         
         # Reset soul meter after using soultimate
-        attacker['current_soul'] = 0
+        attacker.current_soul = 0
         
-        if target['current_hp'] == 0:
-            target['is_fainted'] = True
+        if target.current_hp == 0:
+            target.is_fainted = True
         
         result = {
             'success': True,
@@ -582,15 +601,15 @@ class BattleEngine:
             'element': soultimate_data.get('element'),
             'elemental_modifier': damage_result['multipliers']['elemental'],
             'damage_breakdown': damage_result,
-            'target_remaining_hp': target['current_hp'],
-            'target_fainted': target['is_fainted']
+            'target_remaining_hp': target.current_hp,
+            'target_fainted': target.is_fainted
         }
         
         return result
     
-    def _calculate_stat(self, yokai: Dict, stat: str) -> int:
+    def _calculate_stat(self, yokai: BattleYokai, stat: str) -> int:
         base_stat = yokai.get(f'{stat}_stat', 100)
-        modifier = yokai['stat_modifiers'].get(stat, 0)
+        modifier = yokai.get_stage(stat)
         
         # Modifier stages: -6 to +6 like in mons, would need to read some of the yogon sheets to make sure this is how this works
         multiplier = max(0.25, min(4.0, 1.0 + (modifier * 0.5)))
@@ -601,19 +620,19 @@ class BattleEngine:
         """Update soul meters for all yokai"""
         for team in [self.state['team1'], self.state['team2']]:
             for yokai in team:
-                if not yokai['is_fainted']:
+                if not yokai.is_fainted:
                     # Gain soul each turn
-                    yokai['current_soul'] = min(100, yokai['current_soul'] + 10)
+                    yokai.current_soul = min(100, yokai.current_soul + 10)
     
     def is_battle_over(self) -> bool:
-        team1_alive = any(not y['is_fainted'] for y in self.state['team1'])
-        team2_alive = any(not y['is_fainted'] for y in self.state['team2'])
+        team1_alive = any(not y.is_fainted for y in self.state['team1'])
+        team2_alive = any(not y.is_fainted for y in self.state['team2'])
         
         return not (team1_alive and team2_alive)
     
     def get_winner(self) -> int:
-        team1_alive = any(not y['is_fainted'] for y in self.state['team1'])
-        team2_alive = any(not y['is_fainted'] for y in self.state['team2'])
+        team1_alive = any(not y.is_fainted for y in self.state['team1'])
+        team2_alive = any(not y.is_fainted for y in self.state['team2'])
         
         if team1_alive and not team2_alive:
             return 1
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# Entries kept in memory per battle (get_state() only shows the last 10)
+LOG_BUFFER_SIZE = 50
+
+_SAFE_ID = re.compile(r'[A-Za-z0-9_-]{1,64}')
+
+
+class BattleLogStore:
+    """
+    Append-only on-disk store for battle log entries, one JSON-lines file per battle.
+
+    Entries are written compactly and never rewritten, so appending a block
+    is a single buffered write and a full log is a sequential read.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    def _path(self, battle_id: Any) -> Path:
+        name = str(battle_id)
+        if not _SAFE_ID.fullmatch(name):
+            # Battle ids come from clients, never let them pick the file path
+            name = hashlib.sha256(name.encode()).hexdigest()
+        return self.directory / f"{name}.jsonl"
+
+    def append(self, battle_id: Any, entries: List[Dict[str, Any]]) -> None:
+        if not entries:
+            return
+        lines = ''.join(json.dumps(entry, separators=(',', ':'), default=str) + '\n' for entry in entries)
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._path(battle_id), 'a', encoding='utf-8') as f:
+                f.write(lines)
+
+    def read(self, battle_id: Any) -> List[Dict[str, Any]]:
+        path = self._path(battle_id)
+        if not path.exists():
+            return []
+        with open(path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def exists(self, battle_id: Any) -> bool:
+        return self._path(battle_id).exists()
+
+    def delete(self, battle_id: Any) -> None:
+        with self._lock:
+            self._path(battle_id).unlink(missing_ok=True)
+
+
+class BattleLog:
+    """
+    Bounded in-memory battle log that spills older entries to a BattleLogStore.
+
+    ``entries`` is a plain list holding the most recent entries. Once it
+    reaches twice ``capacity`` the oldest half is written to the store in one
+    block and dropped, so memory stays bounded and the store sees a few large
+    appends instead of one per action. Without a store, spilled entries are
+    discarded (headless simulations don't need them).
+    """
+
+    __slots__ = ('battle_id', 'store', 'capacity', 'entries', 'spilled')
+
+    def __init__(
+        self,
+        capacity: int = LOG_BUFFER_SIZE,
+        store: Optional[BattleLogStore] = None,
+        battle_id: Any = None
+    ):
+        if store is not None and battle_id is None:
+            raise ValueError("A battle_id is needed to spill the log to a store")
+        if store is not None:
+            # Clients pick battle ids, so one can come back: never append to an older battle's file
+            store.delete(battle_id)
+        self.battle_id = battle_id
+        self.store = store
+        self.capacity = capacity
+        self.entries: List[Dict[str, Any]] = []
+        self.spilled = 0
+
+    def __len__(self) -> int:
+        return self.spilled + len(self.entries)
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        self.entries.append(entry)
+        if len(self.entries) >= 2 * self.capacity:
+            self._spill(len(self.entries) - self.capacity)
+
+    def _spill(self, count: int) -> None:
+        oldest = self.entries[:count]
+        del self.entries[:count]
+        if self.store is not None:
+            self.store.append(self.battle_id, oldest)
+        self.spilled += count
+
+    def recent(self, count: int) -> List[Dict[str, Any]]:
+        return self.entries[-count:]
+
+    def flush(self) -> None:
+        """Write every in-memory entry to the store, e.g. when the battle ends"""
+        if self.store is not None and self.entries:
+            self._spill(len(self.entries))
+
+    def full_log(self) -> List[Dict[str, Any]]:
+        """Every entry of the battle, oldest first, as far as it was kept"""
+        stored = self.store.read(self.battle_id) if self.store is not None else []
+        return stored + self.entries
@@ -0,0 +1,141 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+import redis.asyncio as aioredis
+
+
+# KEYS: battle hash, live battles set, active battle counter
+# ARGV: battle id, worker id, ttl seconds
+# Returns the owner: ARGV[2] if the battle was new, else whoever claimed it first
+_CLAIM = """
+if redis.call('HSETNX', KEYS[1], 'owner', ARGV[2]) == 0 then
+    return redis.call('HGET', KEYS[1], 'owner')
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('SADD', KEYS[2], ARGV[1])
+redis.call('INCR', KEYS[3])
+return ARGV[2]
+"""
+
+# KEYS: battle hash, live battles set, active battle counter
+# ARGV: battle id
+_REMOVE = """
+redis.call('DEL', KEYS[1])
+if redis.call('SREM', KEYS[2], ARGV[1]) == 1 and tonumber(redis.call('GET', KEYS[3]) or '0') > 0 then
+    redis.call('DECR', KEYS[3])
+end
+return 0
+"""
+
+
+class BattleStore(ABC):
+    """
+    Live battle records shared by every socket worker.
+
+    A record says which worker owns the battle (the one holding its engine,
+    so the only one that may process its events), its status and which
+    socket ids play in it. The engine, state sync and AI stay in the
+    owner's memory. The first worker to ``claim`` a battle owns it until
+    ``remove``. Records are flat dicts of strings, ids included.
+    """
+
+    @abstractmethod
+    async def claim(self, battle_id: str, worker_id: str) -> str:
+        """Make ``worker_id`` the owner of a new battle; returns the actual owner"""
+
+    @abstractmethod
+    async def get(self, battle_id: str) -> Optional[Dict[str, str]]:
+        """The battle's record, or None if it isn't live"""
+
+    @abstractmethod
+    async def update(self, battle_id: str, **fields: Any) -> None:
+        """Set record fields"""
+
+    @abstractmethod
+    async def remove(self, battle_id: str) -> None:
+        """Drop the record"""
+
+    @abstractmethod
+    async def count(self) -> int:
+        """Live battles across all workers"""
+
+    async def owner(self, battle_id: str) -> Optional[str]:
+        record = await self.get(battle_id)
+        return record.get('owner') if record else None
+
+
+class MemoryBattleStore(BattleStore):
+    """Battle records in this process, for a single worker"""
+
+    def __init__(self):
+        self._battles: Dict[str, Dict[str, str]] = {}
+
+    async def claim(self, battle_id: str, worker_id: str) -> str:
+        record = self._battles.setdefault(str(battle_id), {'owner': worker_id})
+        return record['owner']
+
+    async def get(self, battle_id: str) -> Optional[Dict[str, str]]:
+        record = self._battles.get(str(battle_id))
+        return dict(record) if record is not None else None
+
+    async def update(self, battle_id: str, **fields: Any) -> None:
+        record = self._battles.setdefault(str(battle_id), {})
+        record.update((field, str(value)) for field, value in fields.items())
+
+    async def remove(self, battle_id: str) -> None:
+        self._battles.pop(str(battle_id), None)
+
+    async def count(self) -> int:
+        return len(self._battles)
+
+
+class RedisBattleStore(BattleStore):
+    """
+    Battle records in Redis, for several workers.
+
+    ``battle:{id}`` is a hash of the record. It expires ``ttl`` seconds
+    after the last update, so the records of a worker that died don't live
+    forever.
+    Claiming and removing also maintain the ``battles:live`` set and the
+    ``active_battles`` counter the matchmaking stats report; a dead
+    worker's battles stay counted there until something removes them.
+    """
+
+    LIVE_KEY = 'battles:live'
+    COUNTER_KEY = 'active_battles'
+
+    def __init__(self, client: aioredis.Redis, ttl: int = 6 * 3600):
+        self.client = client
+        self.ttl = ttl
+        self._claim = client.register_script(_CLAIM)
+        self._remove = client.register_script(_REMOVE)
+
+    @staticmethod
+    def battle_key(battle_id: str) -> str:
+        return f"battle:{battle_id}"
+
+    async def claim(self, battle_id: str, worker_id: str) -> str:
+        return await self._claim(
+            keys=[self.battle_key(battle_id), self.LIVE_KEY, self.COUNTER_KEY],
+            args=[battle_id, worker_id, self.ttl]
+        )
+
+    async def get(self, battle_id: str) -> Optional[Dict[str, str]]:
+        record = await self.client.hgetall(self.battle_key(battle_id))
+        return record or None
+
+    async def update(self, battle_id: str, **fields: Any) -> None:
+        key = self.battle_key(battle_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={field: str(value) for field, value in fields.items()})
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def remove(self, battle_id: str) -> None:
+        await self._remove(
+            keys=[self.battle_key(battle_id), self.LIVE_KEY, self.COUNTER_KEY],
+            args=[battle_id]
+        )
+
+    async def count(self) -> int:
+        return await self.client.scard(self.LIVE_KEY)
@@ -0,0 +1,284 @@
+from array import array
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+
+# Order of the stage modifiers inside BattleYokai.stages
+STAGE_STATS = ('str', 'spr', 'def', 'spd')
+_STAGE_INDEX = {stat: idx for idx, stat in enumerate(STAGE_STATS)}
+
+MIN_STAGE = -6
+MAX_STAGE = 6
+
+# Mutable combat fields, in the order they appear in the serialized state
+_COMBAT_FIELDS = (
+    'max_hp',
+    'current_hp',
+    'str_stat',
+    'spr_stat',
+    'def_stat',
+    'spd_stat',
+    'current_soul',
+)
+_BOOST_FIELDS = (
+    'attitude_str_boost',
+    'attitude_spr_boost',
+    'attitude_def_boost',
+    'attitude_spd_boost',
+)
+_SLOT_FIELDS = frozenset(_COMBAT_FIELDS + _BOOST_FIELDS + ('is_fainted',))
+
+# Fields that can change from turn to turn, what state deltas carry
+COMBAT_STATE_FIELDS = ('current_hp', 'current_soul', 'stat_modifiers', 'status_effects', 'is_fainted')
+
+
+class BattleYokai:
+    """
+    Combat state of one yokai inside a battle.
+
+    Only the fields that change during a fight live on the object; everything
+    else (name, resistances, move ids...) is read through ``data``, the yokai
+    row, which is shared rather than copied. Writes to row keys go to a small
+    per-fighter ``overrides`` dict so the shared row is never touched.
+
+    Supports the dict-style access the rest of the code base uses
+    (``yokai['current_hp']``, ``yokai.get('fire_res')``) and serializes with
+    ``to_dict()`` to the same shape the old dict-based fighters had.
+    """
+
+    __slots__ = (
+        'data',
+        'overrides',
+        'max_hp',
+        'current_hp',
+        'str_stat',
+        'spr_stat',
+        'def_stat',
+        'spd_stat',
+        'current_soul',
+        'stages',
+        'is_fainted',
+        'status_effects',
+        'attitude_str_boost',
+        'attitude_spr_boost',
+        'attitude_def_boost',
+        'attitude_spd_boost',
+    )
+
+    def __init__(
+        self,
+        data: Mapping[str, Any],
+        hp: int,
+        str_stat: int,
+        spr_stat: int,
+        def_stat: int,
+        spd_stat: int,
+        attitude_str_boost: int = 0,
+        attitude_spr_boost: int = 0,
+        attitude_def_boost: int = 0,
+        attitude_spd_boost: int = 0
+    ):
+        self.data = data
+        self.overrides: Optional[Dict[str, Any]] = None
+        self.max_hp = hp
+        self.current_hp = hp
+        self.str_stat = str_stat
+        self.spr_stat = spr_stat
+        self.def_stat = def_stat
+        self.spd_stat = spd_stat
+        self.current_soul = 0
+        self.stages = array('b', bytes(len(STAGE_STATS)))
+        self.is_fainted = False
+        # Created on first use, most fighters never get a status effect
+        self.status_effects: Optional[List[Any]] = None
+        self.attitude_str_boost = attitude_str_boost
+        self.attitude_spr_boost = attitude_spr_boost
+        self.attitude_def_boost = attitude_def_boost
+        self.attitude_spd_boost = attitude_spd_boost
+
+    def clone(self) -> 'BattleYokai':
+        """Independent copy of the combat state; the row itself stays shared"""
+        other = object.__new__(BattleYokai)
+        other.data = self.data
+        other.overrides = dict(self.overrides) if self.overrides is not None else None
+        other.max_hp = self.max_hp
+        other.current_hp = self.current_hp
+        other.str_stat = self.str_stat
+        other.spr_stat = self.spr_stat
+        other.def_stat = self.def_stat
+        other.spd_stat = self.spd_stat
+        other.current_soul = self.current_soul
+        other.stages = array('b', self.stages)
+        other.is_fainted = self.is_fainted
+        other.status_effects = list(self.status_effects) if self.status_effects is not None else None
+        other.attitude_str_boost = self.attitude_str_boost
+        other.attitude_spr_boost = self.attitude_spr_boost
+        other.attitude_def_boost = self.attitude_def_boost
+        other.attitude_spd_boost = self.attitude_spd_boost
+        return other
+
+    # Stage modifiers
+
+    def get_stage(self, stat: str) -> int:
+        idx = _STAGE_INDEX.get(stat)
+        return 0 if idx is None else self.stages[idx]
+
+    def shift_stage(self, stat: str, amount: int) -> int:
+        """Move a stat stage by ``amount``, clamped to -6..+6. Returns the new stage."""
+        idx = _STAGE_INDEX[stat]
+        stage = max(MIN_STAGE, min(MAX_STAGE, self.stages[idx] + amount))
+        self.stages[idx] = stage
+        return stage
+
+    # Status effects
+
+    def add_status_effect(self, effect: Any) -> None:
+        if self.status_effects is None:
+            self.status_effects = []
+        self.status_effects.append(effect)
+
+    def has_status(self, status: Any) -> bool:
+        return self.status_effects is not None and status in self.status_effects
+
+    # Dict-style access
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _SLOT_FIELDS:
+            return getattr(self, key)
+        if key == 'stat_modifiers':
+            # A copy: change stages through shift_stage()
+            return dict(zip(STAGE_STATS, self.stages))
+        if key == 'status_effects':
+            if self.status_effects is None:
+                self.status_effects = []
+            return self.status_effects
+        if self.overrides is not None and key in self.overrides:
+            return self.overrides[key]
+        return self.data[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _SLOT_FIELDS:
+            setattr(self, key, value)
+        elif key == 'stat_modifiers':
+            for stat, stage in value.items():
+                self.stages[_STAGE_INDEX[stat]] = stage
+        elif key == 'status_effects':
+            self.status_effects = list(value)
+        else:
+            if self.overrides is None:
+                self.overrides = {}
+            self.overrides[key] = value
+
+    def __contains__(self, key: object) -> bool:
+        return (
+            key in _SLOT_FIELDS
+            or key in ('stat_modifiers', 'status_effects')
+            or (self.overrides is not None and key in self.overrides)
+            or key in self.data
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def combat_state(self) -> Dict[str, Any]:
+        """The COMBAT_STATE_FIELDS subset of to_dict()"""
+        return {
+            'current_hp': self.current_hp,
+            'current_soul': self.current_soul,
+            'stat_modifiers': dict(zip(STAGE_STATS, self.stages)),
+            'status_effects': list(self.status_effects or ()),
+            'is_fainted': self.is_fainted,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to the dict layout used in get_state()"""
+        state = dict(self.data)
+        if self.overrides:
+            state.update(self.overrides)
+        for field in _COMBAT_FIELDS:
+            state[field] = getattr(self, field)
+        state['status_effects'] = list(self.status_effects or ())
+        state['stat_modifiers'] = dict(zip(STAGE_STATS, self.stages))
+        state['is_fainted'] = self.is_fainted
+        for field in _BOOST_FIELDS:
+            state[field] = getattr(self, field)
+        return state
+
+    def __repr__(self) -> str:
+        return (
+            f"BattleYokai({self.get('name', '?')!r}, "
+            f"hp={self.current_hp}/{self.max_hp}, soul={self.current_soul})"
+        )
+
+
+def build_battle_yokai(
+    yokai: Mapping[str, Any],
+    build: Optional[Mapping[str, Any]] = None
+) -> BattleYokai:
+    """
+    Compute final battle stats for a hydrated yokai row and wrap it in a BattleYokai.
+
+    ``build`` holds the team member's IVs, gym stats, attitude boosts and
+    equipment bonuses (see ``hydrate_team``); without it they are read from
+    the row itself. The row is shared by the fighter, never copied.
+    """
+    if build is None:
+        build = yokai
+
+    # Get IVs, gym stats (EVs), attitude boosts and equipment bonuses, or defaults
+    hp_iv = build.get('hp_iv', 0)
+    str_iv = build.get('str_iv', 0)
+    spr_iv = build.get('spr_iv', 0)
+    def_iv = build.get('def_iv', 0)
+    spd_iv = build.get('spd_iv', 0)
+
+    hp_gym = build.get('hp_gym', 0)
+    str_gym = build.get('str_gym', 0)
+    spr_gym = build.get('spr_gym', 0)
+    def_gym = build.get('def_gym', 0)
+    spd_gym = build.get('spd_gym', 0)
+
+    hp_boost = build.get('attitude_hp_boost', 0)
+    str_boost = build.get('attitude_str_boost', 0)
+    spr_boost = build.get('attitude_spr_boost', 0)
+    def_boost = build.get('attitude_def_boost', 0)
+    spd_boost = build.get('attitude_spd_boost', 0)
+
+    str_equip = build.get('equipment_str_bonus', 0)
+    spr_equip = build.get('equipment_spr_bonus', 0)
+    def_equip = build.get('equipment_def_bonus', 0)
+    spd_equip = build.get('equipment_spd_bonus', 0)
+
+    # Calculate final stats
+    # For now, use the stats directly if they exist, otherwise fall back to defaults
+    if 'bs_b_hp' in yokai:  # Using Battle Stats B (max level stats)
+        final_hp = yokai['bs_b_hp'] + hp_iv + hp_gym + hp_boost
+        final_str = yokai['bs_b_str'] + str_iv + str_gym + str_boost + str_equip
+        final_spr = yokai['bs_b_spr'] + spr_iv + spr_gym + spr_boost + spr_equip
+        final_def = yokai['bs_b_def'] + def_iv + def_gym + def_boost + def_equip
+        final_spd = yokai['bs_b_spd'] + spd_iv + spd_gym + spd_boost + spd_equip
+    else:
+        # Fallback to default stats
+        final_hp = yokai.get('hp', 100)
+        final_str = yokai.get('str', 50)
+        final_spr = yokai.get('spr', 50)
+        final_def = yokai.get('def', 50)
+        final_spd = yokai.get('spd', 50)
+
+    return BattleYokai(
+        yokai,
+        hp=final_hp,
+        str_stat=final_str,
+        spr_stat=final_spr,
+        def_stat=final_def,
+        spd_stat=final_spd,
+        attitude_str_boost=str_boost,
+        attitude_spr_boost=spr_boost,
+        attitude_def_boost=def_boost,
+        attitude_spd_boost=spd_boost
+    )
@@ -0,0 +1,260 @@
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import duckdb
+
+from app.core.catalog_cache import catalog_cache
+from app.core.config import settings
+from app.core.database import get_db
+
+
+# table name in the database -> attribute name on the catalog
+CATALOG_TABLES = {
+    'attacks': 'attacks',
+    'techniques': 'techniques',
+    'soultimate': 'soultimates',
+    'inspirit': 'inspirits',
+    'skills': 'skills',
+    'yokai': 'yokai',
+    'attitudes': 'attitudes',
+    'equipment': 'equipment',
+}
+
+
+class MoveCatalog:
+    """
+    Read-only, id-indexed snapshot of the static move, yokai and item tables.
+
+    Built once from the database and shared by every battle in the process,
+    so resolving a move is a dict lookup instead of a query. Rows are exposed
+    as read-only mappings; never mutate them, copy instead.
+    """
+
+    __slots__ = ('attacks', 'techniques', 'soultimates', 'inspirits', 'skills', 'yokai', 'attitudes', 'equipment')
+
+    def __init__(self, tables: Mapping[str, Dict[Any, Dict[str, Any]]]):
+        for table, attr in CATALOG_TABLES.items():
+            rows = tables.get(table, {})
+            frozen = {
+                row_id: MappingProxyType(dict(row))
+                for row_id, row in rows.items()
+            }
+            object.__setattr__(self, attr, MappingProxyType(frozen))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MoveCatalog is immutable")
+
+    def __reduce__(self):
+        # Mapping proxies can't be pickled, ship plain dicts to worker processes
+        tables = {
+            table: {row_id: dict(row) for row_id, row in getattr(self, attr).items()}
+            for table, attr in CATALOG_TABLES.items()
+        }
+        return (MoveCatalog, (tables,))
+
+
+def _fetch_table(db: duckdb.DuckDBPyConnection, table: str) -> Dict[Any, Dict[str, Any]]:
+    result = db.execute(f"SELECT * FROM {table}").fetchall()
+    columns = [desc[0] for desc in db.description]
+    rows = (dict(zip(columns, row)) for row in result)
+    return {row['id']: row for row in rows}
+
+
+def build_catalog(db: duckdb.DuckDBPyConnection) -> MoveCatalog:
+    """Read every catalog table from the database into a new MoveCatalog"""
+    return MoveCatalog({table: _fetch_table(db, table) for table in CATALOG_TABLES})
+
+
+def _sql_string(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+# Bump when the snapshot layout changes; older snapshots are then rejected
+SNAPSHOT_FORMAT = 2
+SNAPSHOT_MANIFEST = 'manifest.json'
+
+
+def seed_version(db: duckdb.DuckDBPyConnection) -> str:
+    """Digest of the seed file hashes in ``seed_metadata``; changes whenever a table is reseeded"""
+    version = hashlib.blake2b(digest_size=16)
+    for table_name, content_hash in db.execute(
+        "SELECT table_name, content_hash FROM seed_metadata ORDER BY table_name"
+    ).fetchall():
+        version.update(f'{table_name}:{content_hash};'.encode())
+    return version.hexdigest()
+
+
+def seed_stamp_path() -> Path:
+    """File beside the database holding its ``seed_version``, readable without opening DuckDB"""
+    return Path(f'{settings.DUCKDB_PATH}.seed_version')
+
+
+def write_seed_stamp(db: duckdb.DuckDBPyConnection) -> str:
+    """Record the database's current ``seed_version`` in its stamp file; the seeder calls this after every run"""
+    version = seed_version(db)
+    stamp = seed_stamp_path()
+    staging = stamp.with_name(f'.{stamp.name}-{os.getpid()}')
+    staging.write_text(version)
+    os.replace(staging, stamp)
+    return version
+
+
+def read_seed_stamp() -> Optional[str]:
+    try:
+        return seed_stamp_path().read_text().strip()
+    except FileNotFoundError:
+        return None
+
+
+def write_snapshot(db: duckdb.DuckDBPyConnection, path: str) -> Dict[str, Any]:
+    """
+    Export the catalog tables as a read-only snapshot directory.
+
+    One zstd Parquet file per table plus a manifest carrying the format, a
+    content version and the ``seed_version`` of the database it came from,
+    which ``load_snapshot`` checks against the live database. The directory is built next to ``path`` and swapped
+    in whole, so a worker starting meanwhile sees the old or the new one.
+    """
+    target = Path(path).resolve()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f'.{target.name}-', dir=target.parent))
+    os.chmod(staging, 0o755)  # mkdtemp is owner-only; workers may run as another user
+    try:
+        tables = {}
+        version = hashlib.blake2b(digest_size=16)
+        for table in CATALOG_TABLES:
+            file_name = f'{table}.parquet'
+            file_path = staging / file_name
+            db.execute(
+                f"COPY (SELECT * FROM {table} ORDER BY id) TO {_sql_string(str(file_path))} "
+                "(FORMAT PARQUET, COMPRESSION ZSTD)"
+            )
+            rows = db.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+            tables[table] = {'file': file_name, 'rows': rows}
+            version.update(file_name.encode())
+            version.update(file_path.read_bytes())
+
+        manifest = {
+            'format': SNAPSHOT_FORMAT,
+            'version': version.hexdigest(),
+            'seed_version': seed_version(db),
+            'tables': tables,
+        }
+        (staging / SNAPSHOT_MANIFEST).write_text(json.dumps(manifest, indent=2))
+
+        previous = None
+        if target.exists():
+            previous = target.with_name(f'.{target.name}-old-{os.getpid()}')
+            os.replace(target, previous)
+        os.replace(staging, target)
+        if previous is not None:
+            shutil.rmtree(previous, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return manifest
+
+
+def load_snapshot(path: str, expected_seed_version: Optional[str] = None) -> MoveCatalog:
+    """
+    Build a MoveCatalog from a snapshot directory written by ``write_snapshot``.
+
+    Reads the Parquet files with a private in-memory DuckDB instead of
+    querying the catalog tables. Only the battle catalog comes from here:
+    the catalog HTTP endpoints still read the database. With
+    ``expected_seed_version``, a snapshot written before the database was
+    last reseeded is rejected rather than served stale.
+    """
+    root = Path(path)
+    try:
+        manifest = json.loads((root / SNAPSHOT_MANIFEST).read_text())
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Unreadable catalog snapshot at {root}: {e}") from e
+    if manifest.get('format') != SNAPSHOT_FORMAT:
+        raise ValueError(f"Catalog snapshot format {manifest.get('format')} != {SNAPSHOT_FORMAT}, rebuild it")
+    if expected_seed_version is not None and manifest['seed_version'] != expected_seed_version:
+        raise ValueError(
+            f"Catalog snapshot at {root} is stale: written from seed version {manifest['seed_version']}, "
+            f"the database is at {expected_seed_version}. Rebuild it with seed_database.py --snapshot"
+        )
+
+    db = duckdb.connect()
+    try:
+        tables = {}
+        for table in CATALOG_TABLES:
+            file_path = _sql_string(str(root / manifest['tables'][table]['file']))
+            tables[table] = _fetch_table(db, f"read_parquet({file_path})")
+    finally:
+        db.close()
+    return MoveCatalog(tables)
+
+
+def _load_catalog() -> MoveCatalog:
+    """
+    From the configured snapshot if there is one, else from the database.
+
+    The snapshot is checked against the seed stamp the seeder leaves beside
+    the database, so loading it never opens the database file.
+    """
+    if settings.CATALOG_SNAPSHOT_PATH:
+        stamp = read_seed_stamp()
+        if stamp is None:
+            raise ValueError(f"No seed stamp at {seed_stamp_path()} to check the catalog snapshot against, "
+                             "run seed_database.py")
+        return load_snapshot(settings.CATALOG_SNAPSHOT_PATH, stamp)
+    with get_db() as db:
+        return build_catalog(db)
+
+
+_catalog: Optional[MoveCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> MoveCatalog:
+    """
+    Return the process-wide catalog, loading it on first use.
+
+    Callers should hold on to the returned object for the duration of a
+    battle rather than calling this repeatedly, so a reload mid-battle
+    can't mix two versions of the data.
+    """
+    catalog = _catalog
+    if catalog is None:
+        with _catalog_lock:
+            if _catalog is None:  # Double-check locking
+                _set_catalog(_load_catalog())
+            catalog = _catalog
+    return catalog
+
+
+def reload_catalog() -> MoveCatalog:
+    """
+    Rebuild the catalog and swap it in.
+
+    Loaded from ``CATALOG_SNAPSHOT_PATH`` when set, otherwise from the
+    database. The new catalog is fully built before the module reference is
+    replaced, so readers see either the old snapshot or the new one, never
+    a mix.
+    """
+    catalog = _load_catalog()
+    set_catalog(catalog)
+    catalog_cache.clear()
+    return catalog
+
+
+def set_catalog(catalog: MoveCatalog) -> None:
+    """Install an already built catalog, e.g. one shipped to a worker process"""
+    with _catalog_lock:
+        _set_catalog(catalog)
+
+
+def _set_catalog(catalog: MoveCatalog) -> None:
+    global _catalog
+    _catalog = catalog
@@ -0,0 +1,235 @@
+import asyncio
+import bisect
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.database import get_write_db
+from app.services.matchmaking_queue import TIERS, MatchmakingQueue
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATING = 1000
+
+# Match latencies kept for the percentiles
+LATENCY_SAMPLES = 10_000
+
+
+def rating_window(wait_ms: float, base: int, growth: float, maximum: int) -> float:
+    """Largest accepted rating gap after waiting ``wait_ms``: ``base`` plus ``growth`` per second, capped"""
+    return min(base + growth * wait_ms / 1000, maximum)
+
+
+def pair_players(
+    entries: List[Dict[str, Any]],
+    now_ms: int,
+    base: int = 100,
+    growth: float = 10.0,
+    maximum: int = 1000
+) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Greedy rating-window pairing of one batch of queue entries.
+
+    The longest waiting player goes first and takes the closest rated
+    unpaired player within its window. Everyone after it waited less, so
+    its window is the widest of the two. Runs in O(n log n) bisects over
+    the batch sorted by rating.
+    """
+    order = sorted(range(len(entries)), key=lambda idx: entries[idx].get('joined_at', now_ms))
+    by_rating = sorted(
+        (entries[idx].get('rating', DEFAULT_RATING), idx) for idx in range(len(entries))
+    )
+    ratings = [rating for rating, _ in by_rating]
+    paired = set()
+    pairs = []
+
+    for idx in order:
+        if idx in paired:
+            continue
+        entry = entries[idx]
+        rating = entry.get('rating', DEFAULT_RATING)
+        position = bisect.bisect_left(by_rating, (rating, idx))  # The entry itself
+
+        window = rating_window(now_ms - entry.get('joined_at', now_ms), base, growth, maximum)
+        best = None
+        for candidate in (position - 1, position + 1):
+            if 0 <= candidate < len(by_rating):
+                gap = abs(ratings[candidate] - rating)
+                if gap <= window and (best is None or gap < abs(ratings[best] - rating)):
+                    best = candidate
+        if best is None:
+            continue  # Stays in the batch for newer players to find
+
+        other = by_rating[best][1]
+        for taken in sorted((position, best), reverse=True):
+            del by_rating[taken]
+            del ratings[taken]
+        paired.update((idx, other))
+        pairs.append((entry, entries[other]))
+    return pairs
+
+
+def _sql_ints(values) -> str:
+    """Comma separated integer literals; DuckDB binds big parameter lists slowly"""
+    return ', '.join(str(int(value)) for value in values)
+
+
+def create_battle_records(tier: str, pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[Optional[int]]:
+    """
+    Insert one pending ``battles`` row per pair in a single write transaction.
+
+    Returns the battle id of each pair, or None for a pair naming a user or
+    team that doesn't exist (the row's foreign keys would reject it, and
+    retrying would fail the same way every pass).
+    """
+    if not pairs:
+        return []
+    players = [entry for pair in pairs for entry in pair]
+    with get_write_db() as db:
+        users = {row[0] for row in db.execute(
+            f"SELECT id FROM users WHERE id IN ({_sql_ints(entry['user_id'] for entry in players)})"
+        ).fetchall()}
+        teams = {row[0] for row in db.execute(
+            f"SELECT id FROM teams WHERE id IN ({_sql_ints(entry['team_id'] for entry in players)})"
+        ).fetchall()}
+
+        next_id = db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM battles").fetchone()[0]
+        ids: List[Optional[int]] = []
+        rows = []
+        for first, second in pairs:
+            if {first['user_id'], second['user_id']} <= users and {first['team_id'], second['team_id']} <= teams:
+                rows.append(f"({_sql_ints((next_id, first['user_id'], second['user_id'], first['team_id'], second['team_id']))})")
+                ids.append(next_id)
+                next_id += 1
+            else:
+                ids.append(None)
+        if rows:
+            # status and created_at take their defaults: 'pending', now
+            db.execute(
+                f"INSERT INTO battles (id, player1_id, player2_id, team1_id, team2_id) VALUES {', '.join(rows)}"
+            )
+    return ids
+
+
+class Matchmaker:
+    """
+    Background worker pairing queued players into battles.
+
+    Every tick it reads the oldest ``batch_size`` entries of each tier,
+    pairs them by rating (the window widens with wait time), claims the
+    pairs from the queue atomically, creates the ``battles`` rows and
+    hands each match to ``notify``. Redis calls are awaited on the async
+    client and the DuckDB insert runs in a worker thread, so the event loop
+    keeps serving sockets.
+    """
+
+    def __init__(
+        self,
+        queue: MatchmakingQueue,
+        notify: Callable[[Dict[str, Any]], Awaitable[None]],
+        create_battles: Callable[[str, List[Tuple[Dict[str, Any], Dict[str, Any]]]], List[Optional[int]]] = create_battle_records,
+        batch_size: int = 1000,
+        interval: float = 0.5,
+        window_base: int = 100,
+        window_growth: float = 10.0,
+        window_max: int = 1000
+    ):
+        self.queue = queue
+        self.notify = notify
+        self.create_battles = create_battles
+        self.batch_size = batch_size
+        self.interval = interval
+        self.window_base = window_base
+        self.window_growth = window_growth
+        self.window_max = window_max
+        self.matches = 0
+        self.started_at = time.monotonic()
+        self._latencies: deque = deque(maxlen=LATENCY_SAMPLES)
+
+    async def match_tier(self, tier: str) -> List[Dict[str, Any]]:
+        """One matching pass over ``tier``; returns the matches made"""
+        entries = await self.queue.peek(tier, self.batch_size)
+        if len(entries) < 2:
+            return []
+
+        now_ms = int(time.time() * 1000)
+        pairs = pair_players(entries, now_ms, self.window_base, self.window_growth, self.window_max)
+        claimed = await self.queue.claim_pairs(tier, [(a['user_id'], b['user_id']) for a, b in pairs])
+        pairs = [pair for pair, ok in zip(pairs, claimed) if ok]
+        if not pairs:
+            return []
+
+        try:
+            battle_ids = await asyncio.to_thread(self.create_battles, tier, pairs)
+        except Exception:
+            # Nobody got a battle, give everyone their place back
+            await self.queue.restore(tier, [entry for pair in pairs for entry in pair])
+            raise
+
+        matched_ms = int(time.time() * 1000)
+        matches = []
+        for battle_id, (first, second) in zip(battle_ids, pairs):
+            if battle_id is None:
+                logger.warning(
+                    "Dropped %s match of users %s and %s: unknown user or team",
+                    tier, first['user_id'], second['user_id']
+                )
+                continue
+            for entry in (first, second):
+                self._latencies.append(matched_ms - entry.get('joined_at', matched_ms))
+            matches.append({'battle_id': battle_id, 'tier': tier, 'players': [first, second]})
+        self.matches += len(matches)
+        return matches
+
+    async def run_once(self) -> int:
+        """Match every tier once and notify the players; returns the number of matches"""
+        total = 0
+        for tier in TIERS:
+            matches = await self.match_tier(tier)
+            for match in matches:
+                try:
+                    await self.notify(match)
+                except Exception:
+                    logger.exception("Failed to notify match %s", match['battle_id'])
+            total += len(matches)
+        return total
+
+    async def run(self) -> None:
+        """
+        Match forever; sleeps ``interval`` between passes that found nothing to do.
+
+        Failing passes (e.g. Redis unreachable) back off exponentially, up
+        to a minute, instead of logging twice a second.
+        """
+        failures = 0
+        while True:
+            try:
+                made = await self.run_once()
+                failures = 0
+            except Exception:
+                failures += 1
+                logger.exception("Matchmaking pass failed (%d in a row)", failures)
+                await asyncio.sleep(min(self.interval * 2 ** failures, 60))
+                continue
+            if not made:
+                await asyncio.sleep(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """Matches made and wait-to-match latency percentiles (ms) over the recent samples"""
+        samples = sorted(self._latencies)
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+
+        def percentile(p: float) -> Optional[float]:
+            if not samples:
+                return None
+            return samples[min(len(samples) - 1, max(0, math.ceil(p / 100 * len(samples)) - 1))]
+
+        return {
+            'matches': self.matches,
+            'matches_per_minute': self.matches * 60 / elapsed,
+            'latency_ms': {'p50': percentile(50), 'p90': percentile(90), 'p99': percentile(99)},
+            'samples': len(samples),
+        }
@@ -0,0 +1,346 @@
+import bisect
+import json
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+
+TIERS = ("OU", "UU", "RU", "NU")
+
+# Expired entries dropped per join, keeps a single script call short
+_PRUNE_BATCH = 500
+
+# KEYS: queue zset, entries hash
+# ARGV: user id, entry json, now ms, ttl ms
+# Returns the new 1-based position, or 0 if the user is already queued
+_JOIN = """
+local cutoff = tonumber(ARGV[3]) - tonumber(ARGV[4])
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', '(' .. cutoff, 'LIMIT', 0, %d)
+if #expired > 0 then
+    redis.call('ZREM', KEYS[1], unpack(expired))
+    redis.call('HDEL', KEYS[2], unpack(expired))
+end
+if redis.call('HEXISTS', KEYS[2], ARGV[1]) == 1 then
+    local score = tonumber(redis.call('ZSCORE', KEYS[1], ARGV[1]))
+    if score and score >= cutoff then
+        return 0
+    end
+end
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+return redis.call('ZRANK', KEYS[1], ARGV[1]) - redis.call('ZCOUNT', KEYS[1], '-inf', '(' .. cutoff) + 1
+""" % _PRUNE_BATCH
+
+# KEYS: queue zset, entries hash
+# ARGV: user id
+# Returns 1 if the user was removed, 0 if they weren't queued
+_LEAVE = """
+if redis.call('HDEL', KEYS[2], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+return 1
+"""
+
+# KEYS: queue zset, entries hash
+# ARGV: cutoff ms, count
+# Returns the entry JSON of the ``count`` oldest live players, oldest first
+_PEEK = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], ARGV[1], '+inf', 'LIMIT', 0, tonumber(ARGV[2]))
+if #ids == 0 then
+    return {}
+end
+return redis.call('HMGET', KEYS[2], unpack(ids))
+"""
+
+# KEYS: queue zset, entries hash
+# ARGV: user ids, two per pair
+# Removes each pair whose players are both still queued; returns 1/0 per pair
+_CLAIM_PAIRS = """
+local claimed = {}
+for i = 1, #ARGV, 2 do
+    local a, b = ARGV[i], ARGV[i + 1]
+    if redis.call('ZSCORE', KEYS[1], a) and redis.call('ZSCORE', KEYS[1], b) then
+        redis.call('ZREM', KEYS[1], a, b)
+        redis.call('HDEL', KEYS[2], a, b)
+        claimed[#claimed + 1] = 1
+    else
+        claimed[#claimed + 1] = 0
+    end
+end
+return claimed
+"""
+
+
+class MatchmakingQueue(ABC):
+    """
+    Per-tier matchmaking queues: the contract every backend implements.
+
+    Players are ordered by enqueue time (ms), ties by user id as a string.
+    Entries older than ``ttl`` seconds no longer count towards positions,
+    sizes or peeks, and a late player may join again; ``leave`` and
+    ``entry`` still see them until they're pruned. User ids are compared
+    as strings, so 7 and "7" are the same player. Each method is atomic
+    with respect to the others.
+    """
+
+    def __init__(self, ttl: int = 1800):
+        self.ttl_ms = ttl * 1000
+
+    @staticmethod
+    def _now_ms() -> int:
+        return int(time.time() * 1000)
+
+    @abstractmethod
+    async def join(self, tier: str, user_id: Any, entry: Dict[str, Any]) -> Optional[int]:
+        """Queue ``user_id`` with ``entry``; returns their position, or None if already queued"""
+
+    @abstractmethod
+    async def leave(self, tier: str, user_id: Any) -> bool:
+        """Take ``user_id`` out of the queue; False if they weren't in it"""
+
+    @abstractmethod
+    async def status(self, tier: str, user_id: Any) -> Tuple[Optional[int], int]:
+        """(1-based position or None, live entries in the queue)"""
+
+    @abstractmethod
+    async def entry(self, tier: str, user_id: Any) -> Optional[Dict[str, Any]]:
+        """The queued entry of ``user_id``, with its ``joined_at``"""
+
+    @abstractmethod
+    async def sizes(self) -> Dict[str, int]:
+        """Live entries per tier"""
+
+    @abstractmethod
+    async def peek(self, tier: str, count: int) -> List[Dict[str, Any]]:
+        """Entries of the ``count`` longest waiting live players, oldest first, without removing them"""
+
+    @abstractmethod
+    async def claim_pairs(self, tier: str, pairs: List[Tuple[Any, Any]]) -> List[bool]:
+        """
+        Take matched pairs out of the queue in one atomic call.
+
+        A pair is only removed if both players are still queued (neither
+        left nor was claimed by another matcher); the result says which were.
+        """
+
+    @abstractmethod
+    async def restore(self, tier: str, entries: List[Dict[str, Any]]) -> None:
+        """Put claimed entries back with their original join time, e.g. after a failed match"""
+
+    @abstractmethod
+    async def active_battles(self) -> int:
+        """Battles in progress, as counted by the battle servers"""
+
+
+class RedisMatchmakingQueue(MatchmakingQueue):
+    """
+    Matchmaking queues in Redis, shared by every API process.
+
+    Each tier is a sorted set of user ids scored by enqueue time (ms) plus a
+    hash of user id -> entry JSON. Join and leave are Lua scripts, so the
+    duplicate check and both writes happen atomically; positions come from
+    ZRANK/ZCOUNT, so every call is O(log n) in the queue length. Entries
+    older than ``ttl`` seconds no longer count and are pruned on join.
+    Every method is a coroutine on an async client, and multi-key reads go
+    out as one pipeline, so a call costs one round trip without blocking
+    the event loop.
+    """
+
+    def __init__(self, client: aioredis.Redis, ttl: int = 1800):
+        super().__init__(ttl)
+        self.client = client
+        self._join = client.register_script(_JOIN)
+        self._leave = client.register_script(_LEAVE)
+        self._peek = client.register_script(_PEEK)
+        self._claim_pairs = client.register_script(_CLAIM_PAIRS)
+
+    @staticmethod
+    def keys(tier: str) -> Tuple[str, str]:
+        # Hash tag keeps both keys of a tier in one cluster slot, as the scripts need
+        return f"matchmaking:{{{tier}}}:queue", f"matchmaking:{{{tier}}}:entries"
+
+    async def join(self, tier: str, user_id: Any, entry: Dict[str, Any]) -> Optional[int]:
+        entry = dict(entry, joined_at=self._now_ms())
+        position = await self._join(
+            keys=self.keys(tier),
+            args=[user_id, json.dumps(entry, separators=(',', ':')), entry['joined_at'], self.ttl_ms]
+        )
+        return int(position) or None
+
+    async def leave(self, tier: str, user_id: Any) -> bool:
+        return bool(await self._leave(keys=self.keys(tier), args=[user_id]))
+
+    async def status(self, tier: str, user_id: Any) -> Tuple[Optional[int], int]:
+        queue_key, _ = self.keys(tier)
+        cutoff = self._now_ms() - self.ttl_ms
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zrank(queue_key, user_id)
+            pipe.zscore(queue_key, user_id)
+            pipe.zcount(queue_key, '-inf', f'({cutoff}')
+            pipe.zcard(queue_key)
+            rank, score, expired, total = await pipe.execute()
+
+        position = None
+        if rank is not None and score >= cutoff:
+            position = rank - expired + 1
+        return position, total - expired
+
+    async def entry(self, tier: str, user_id: Any) -> Optional[Dict[str, Any]]:
+        _, entries_key = self.keys(tier)
+        raw = await self.client.hget(entries_key, user_id)
+        return json.loads(raw) if raw is not None else None
+
+    async def sizes(self) -> Dict[str, int]:
+        """Live entries per tier, in one round trip"""
+        cutoff = self._now_ms() - self.ttl_ms
+        async with self.client.pipeline(transaction=False) as pipe:
+            for tier in TIERS:
+                pipe.zcount(self.keys(tier)[0], cutoff, '+inf')
+            return dict(zip(TIERS, await pipe.execute()))
+
+    async def peek(self, tier: str, count: int) -> List[Dict[str, Any]]:
+        raw = await self._peek(keys=self.keys(tier), args=[self._now_ms() - self.ttl_ms, count])
+        return [json.loads(item) for item in raw if item is not None]
+
+    async def claim_pairs(self, tier: str, pairs: List[Tuple[Any, Any]]) -> List[bool]:
+        if not pairs:
+            return []
+        args = [user_id for pair in pairs for user_id in pair]
+        claimed = await self._claim_pairs(keys=self.keys(tier), args=args)
+        return [bool(ok) for ok in claimed]
+
+    async def restore(self, tier: str, entries: List[Dict[str, Any]]) -> None:
+        queue_key, entries_key = self.keys(tier)
+        async with self.client.pipeline(transaction=True) as pipe:
+            for entry in entries:
+                pipe.hset(entries_key, entry['user_id'], json.dumps(entry, separators=(',', ':')))
+                pipe.zadd(queue_key, {entry['user_id']: entry['joined_at']})
+            await pipe.execute()
+
+    async def active_battles(self) -> int:
+        return int(await self.client.get("active_battles") or 0)
+
+
+class _Tier:
+    """One in-memory tier: (joined ms, user id) in sorted order plus id -> (joined ms, entry)"""
+
+    __slots__ = ('order', 'entries')
+
+    def __init__(self):
+        self.order: List[Tuple[int, str]] = []
+        self.entries: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+    def add(self, member: str, joined_ms: int, entry: Dict[str, Any]) -> None:
+        self.remove(member)
+        self.entries[member] = (joined_ms, entry)
+        bisect.insort(self.order, (joined_ms, member))
+
+    def remove(self, member: str) -> bool:
+        found = self.entries.pop(member, None)
+        if found is None:
+            return False
+        del self.order[bisect.bisect_left(self.order, (found[0], member))]
+        return True
+
+    def expired(self, cutoff: int) -> int:
+        """Entries joined before ``cutoff``; they sort first"""
+        return bisect.bisect_left(self.order, (cutoff, ''))
+
+
+class MemoryMatchmakingQueue(MatchmakingQueue):
+    """
+    Matchmaking queues in this process's memory, for single-node servers,
+    tests and load experiments without Redis.
+
+    Each tier keeps its players in a list sorted by (join time, user id),
+    the order of the Redis sorted set, so positions are a bisect and peeks
+    a slice; a dict maps user id to entry. Methods never await in the
+    middle, so each one is atomic on the event loop, like the Redis scripts.
+    Queues aren't shared between processes: run a single API worker.
+
+    ``battle_count`` reports the battles in progress, normally the battle
+    store's ``count``; without one there are none.
+    """
+
+    def __init__(self, ttl: int = 1800, battle_count: Optional[Callable[[], Awaitable[int]]] = None):
+        super().__init__(ttl)
+        self._tiers: Dict[str, _Tier] = {tier: _Tier() for tier in TIERS}
+        self.battle_count = battle_count
+
+    def _tier(self, tier: str) -> _Tier:
+        queue = self._tiers.get(tier)
+        if queue is None:
+            queue = self._tiers[tier] = _Tier()
+        return queue
+
+    @staticmethod
+    def _copy(entry: Dict[str, Any]) -> Dict[str, Any]:
+        # Same as the JSON round trip through Redis: callers can't alias the stored entry
+        return json.loads(json.dumps(entry))
+
+    async def join(self, tier: str, user_id: Any, entry: Dict[str, Any]) -> Optional[int]:
+        queue = self._tier(tier)
+        member = str(user_id)
+        now_ms = self._now_ms()
+        cutoff = now_ms - self.ttl_ms
+        expired = queue.expired(cutoff)
+        for _, stale in queue.order[:min(expired, _PRUNE_BATCH)]:
+            queue.remove(stale)
+
+        current = queue.entries.get(member)
+        if current is not None and current[0] >= cutoff:
+            return None
+        queue.add(member, now_ms, self._copy(dict(entry, joined_at=now_ms)))
+        return bisect.bisect_left(queue.order, (now_ms, member)) - queue.expired(cutoff) + 1
+
+    async def leave(self, tier: str, user_id: Any) -> bool:
+        return self._tier(tier).remove(str(user_id))
+
+    async def status(self, tier: str, user_id: Any) -> Tuple[Optional[int], int]:
+        queue = self._tier(tier)
+        cutoff = self._now_ms() - self.ttl_ms
+        expired = queue.expired(cutoff)
+        current = queue.entries.get(str(user_id))
+
+        position = None
+        if current is not None and current[0] >= cutoff:
+            position = bisect.bisect_left(queue.order, (current[0], str(user_id))) - expired + 1
+        return position, len(queue.order) - expired
+
+    async def entry(self, tier: str, user_id: Any) -> Optional[Dict[str, Any]]:
+        current = self._tier(tier).entries.get(str(user_id))
+        return self._copy(current[1]) if current is not None else None
+
+    async def sizes(self) -> Dict[str, int]:
+        cutoff = self._now_ms() - self.ttl_ms
+        return {tier: len(self._tier(tier).order) - self._tier(tier).expired(cutoff) for tier in TIERS}
+
+    async def peek(self, tier: str, count: int) -> List[Dict[str, Any]]:
+        queue = self._tier(tier)
+        start = queue.expired(self._now_ms() - self.ttl_ms)
+        return [self._copy(queue.entries[member][1]) for _, member in queue.order[start:start + count]]
+
+    async def claim_pairs(self, tier: str, pairs: List[Tuple[Any, Any]]) -> List[bool]:
+        queue = self._tier(tier)
+        claimed = []
+        for first, second in pairs:
+            first, second = str(first), str(second)
+            ok = first in queue.entries and second in queue.entries
+            if ok:
+                queue.remove(first)
+                queue.remove(second)
+            claimed.append(ok)
+        return claimed
+
+    async def restore(self, tier: str, entries: List[Dict[str, Any]]) -> None:
+        queue = self._tier(tier)
+        for entry in entries:
+            queue.add(str(entry['user_id']), entry['joined_at'], self._copy(entry))
+
+    async def active_battles(self) -> int:
+        if self.battle_count is None:
+            return 0
+        return await self.battle_count()
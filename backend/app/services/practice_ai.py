@@ -0,0 +1,206 @@
+from typing import Any, Dict, List, Optional, Tuple
+import math
+import random
+import time
+
+from app.services.battle_engine import BattleEngine, inspirit_has_effect
+from app.services.catalog import MoveCatalog
+
+
+# (action type, move id, target index), hashable stand-in for an action dict
+ActionKey = Tuple[str, Any, int]
+
+# Played when the active yokai has no usable move: the engine rejects the attack, i.e. the turn is passed
+PASS: ActionKey = ('attack', None, 0)
+
+# Move types a yokai can pick, with the row key holding the move id
+_MOVE_KEYS = (
+    ('attack', 'attack_id'),
+    ('technique', 'technique_id'),
+    ('inspirit', 'inspirit_id'),
+    ('soultimate', 'soultimate_id'),
+)
+
+
+def _active_index(team) -> int:
+    for idx, yokai in enumerate(team):
+        if not yokai.is_fainted:
+            return idx
+    return 0
+
+
+def legal_actions(engine: BattleEngine, player_num: int) -> List[ActionKey]:
+    """Every move the active yokai can use, against every opponent still standing"""
+    own_team = engine.state[f'team{player_num}']
+    other_team = engine.state['team2' if player_num == 1 else 'team1']
+    yokai = own_team[_active_index(own_team)]
+
+    moves = []
+    for action_type, move_key in _MOVE_KEYS:
+        move_id = yokai.get(move_key)
+        if move_id is None:
+            continue
+        if action_type == 'soultimate' and yokai.current_soul < 100:
+            continue
+        if action_type == 'inspirit':
+            # Only inspirits with parsed effects can be executed by the engine
+            if not inspirit_has_effect(engine.catalog.inspirits.get(move_id)):
+                continue
+        moves.append((action_type, move_id))
+
+    targets = [idx for idx, target in enumerate(other_team) if not target.is_fainted] or [0]
+    return [(action_type, move_id, target) for action_type, move_id in moves for target in targets]
+
+
+def _choices(engine: BattleEngine, player_num: int) -> List[ActionKey]:
+    """``legal_actions``, or just passing when there are none"""
+    return legal_actions(engine, player_num) or [PASS]
+
+
+def to_action(engine: BattleEngine, player_num: int, key: ActionKey) -> Dict[str, Any]:
+    action_type, move_id, target_index = key
+    return {
+        'type': action_type,
+        'yokai_index': _active_index(engine.state[f'team{player_num}']),
+        'target_index': target_index,
+        'move_id': move_id
+    }
+
+
+def evaluate(engine: BattleEngine) -> float:
+    """Value of a position for player 1: 1 win, 0 loss, else driven by remaining HP share"""
+    if engine.is_battle_over():
+        return {1: 1.0, 2: 0.0}.get(engine.get_winner(), 0.5)
+
+    def hp_share(team) -> float:
+        max_hp = sum(yokai.max_hp for yokai in team)
+        return sum(yokai.current_hp for yokai in team) / max_hp if max_hp else 0.0
+
+    return 0.5 + 0.5 * (hp_share(engine.state['team1']) - hp_share(engine.state['team2']))
+
+
+class _Node:
+    """
+    Open-loop search node: one per sequence of joint actions from the root.
+
+    Both players pick independently (decoupled UCT), so each keeps its own
+    per-action statistics; outcomes aren't stored, every iteration replays
+    the sequence on a fresh clone with its own damage rolls.
+    """
+
+    __slots__ = ('stats', 'children')
+
+    def __init__(self):
+        # player num -> action key -> [visits, total value for that player]
+        self.stats: Dict[int, Dict[ActionKey, List[float]]] = {1: {}, 2: {}}
+        self.children: Dict[Tuple[ActionKey, ActionKey], '_Node'] = {}
+
+
+class PracticeAI:
+    """
+    Monte Carlo tree search opponent for practice battles.
+
+    ``choose_action`` searches until ``think_time`` seconds have passed (or
+    ``max_iterations`` if given) on lean clones of the engine, then plays the
+    most visited move. It is CPU bound and blocking: call it from a worker
+    thread (``asyncio.to_thread``), never on the event loop.
+    """
+
+    def __init__(
+        self,
+        think_time: float = 1.0,
+        max_iterations: Optional[int] = None,
+        max_depth: int = 4,
+        rollout_turns: int = 8,
+        exploration: float = 1.4,
+        seed: Optional[int] = None
+    ):
+        if think_time <= 0 and not max_iterations:
+            raise ValueError("The AI needs a positive think_time or max_iterations")
+        self.think_time = think_time
+        self.max_iterations = max_iterations
+        self.max_depth = max_depth
+        self.rollout_turns = rollout_turns
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+
+    def choose_action(self, engine: BattleEngine, player_num: int) -> Dict[str, Any]:
+        """Pick ``player_num``'s action for the current turn; ``engine`` is not modified"""
+        candidates = _choices(engine, player_num)
+        if len(candidates) == 1:
+            return to_action(engine, player_num, candidates[0])
+
+        root = _Node()
+        deadline = time.perf_counter() + self.think_time
+        iterations = 0
+        while True:
+            self._iterate(engine, root)
+            iterations += 1
+            if self.max_iterations is not None and iterations >= self.max_iterations:
+                break
+            if self.think_time > 0 and time.perf_counter() >= deadline:
+                break
+
+        stats = root.stats[player_num]
+        best = max(candidates, key=lambda key: stats.get(key, (0, 0))[0])
+        return to_action(engine, player_num, best)
+
+    def _iterate(self, engine: BattleEngine, root: _Node) -> None:
+        sim = engine.clone(rng=random.Random(self.rng.getrandbits(64)))
+        node = root
+        path = []
+
+        # Selection and expansion
+        for _ in range(self.max_depth):
+            if sim.is_battle_over():
+                break
+            key1 = self._select(node, 1, _choices(sim, 1))
+            key2 = self._select(node, 2, _choices(sim, 2))
+            path.append((node, key1, key2))
+            sim.process_action(1, to_action(sim, 1, key1))
+            sim.process_action(2, to_action(sim, 2, key2))
+
+            child = node.children.get((key1, key2))
+            if child is None:
+                node.children[(key1, key2)] = _Node()
+                break
+            node = child
+
+        # Random playout
+        for _ in range(self.rollout_turns):
+            if sim.is_battle_over():
+                break
+            sim.process_action(1, to_action(sim, 1, self.rng.choice(_choices(sim, 1))))
+            sim.process_action(2, to_action(sim, 2, self.rng.choice(_choices(sim, 2))))
+
+        value = evaluate(sim)
+        for node, key1, key2 in path:
+            for player_num, key, player_value in ((1, key1, value), (2, key2, 1.0 - value)):
+                entry = node.stats[player_num].setdefault(key, [0, 0.0])
+                entry[0] += 1
+                entry[1] += player_value
+
+    def _select(self, node: _Node, player_num: int, candidates: List[ActionKey]) -> ActionKey:
+        if not candidates:
+            return PASS
+        stats = node.stats[player_num]
+        unvisited = [key for key in candidates if key not in stats]
+        if unvisited:
+            return self.rng.choice(unvisited)
+
+        total = sum(stats[key][0] for key in candidates)
+        log_total = math.log(total)
+
+        def ucb(key: ActionKey) -> float:
+            visits, value = stats[key]
+            return value / visits + self.exploration * math.sqrt(log_total / visits)
+
+        return max(candidates, key=ucb)
+
+
+def random_team(catalog: MoveCatalog, size: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """Team entries for ``size`` random catalog yokai, for practice opponents"""
+    ids = sorted(catalog.yokai, key=str)
+    if not ids:
+        return []
+    return [{'id': yokai_id} for yokai_id in rng.sample(ids, min(size, len(ids)))]
@@ -0,0 +1,122 @@
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import re
+import threading
+
+from app.services.catalog import MoveCatalog
+
+
+BUILD_STATS = ('hp', 'str', 'spr', 'def', 'spd')
+EQUIPMENT_STATS = ('str', 'spr', 'def', 'spd')
+
+# Flat build keys a team entry may carry directly (e.g. hp_iv, attitude_str_boost)
+_FLAT_BUILD_KEYS = frozenset(
+    [f'{stat}_iv' for stat in BUILD_STATS]
+    + [f'{stat}_gym' for stat in BUILD_STATS]
+    + [f'attitude_{stat}_boost' for stat in BUILD_STATS]
+    + [f'equipment_{stat}_bonus' for stat in EQUIPMENT_STATS]
+)
+
+# Equipment bonuses are stored as text like "+10" or "-5"
+_BONUS = re.compile(r'[+-]?\d+')
+
+
+class NameIndex:
+    """Case-insensitive name -> row lookups for the attitude and equipment tables"""
+
+    __slots__ = ('attitudes', 'equipment')
+
+    def __init__(self, catalog: MoveCatalog):
+        self.attitudes = {str(row['name']).lower(): row for row in catalog.attitudes.values()}
+        self.equipment = {str(row['name']).lower(): row for row in catalog.equipment.values()}
+
+
+_index: Optional[Tuple[MoveCatalog, NameIndex]] = None
+_index_lock = threading.Lock()
+
+
+def get_name_index(catalog: MoveCatalog) -> NameIndex:
+    """Name index for ``catalog``, rebuilt only when the catalog is reloaded"""
+    global _index
+    cached = _index
+    if cached is not None and cached[0] is catalog:
+        return cached[1]
+    with _index_lock:
+        if _index is None or _index[0] is not catalog:
+            _index = (catalog, NameIndex(catalog))
+        return _index[1]
+
+
+def _lookup(table: Mapping[Any, Mapping[str, Any]], by_name: Dict[str, Mapping[str, Any]], key: Any):
+    """Find a row by id (int or numeric string) or by name"""
+    if key is None:
+        return None
+    row = table.get(key)
+    if row is None and isinstance(key, str):
+        if key.isdigit():
+            row = table.get(int(key))
+        if row is None:
+            row = by_name.get(key.lower())
+    return row
+
+
+def _parse_bonus(value: Any) -> int:
+    if isinstance(value, int):
+        return value
+    # Ranged bonuses ("5-15") aren't modelled, they count as no bonus
+    if isinstance(value, str) and _BONUS.fullmatch(value.strip()):
+        return int(value)
+    return 0
+
+
+def member_build(entry: Mapping[str, Any], catalog: MoveCatalog, index: NameIndex) -> Dict[str, int]:
+    """
+    IVs, gym stats, attitude boosts and equipment bonuses of one team entry.
+
+    Understands the team format stored by the teams API (``ivs``,
+    ``gym_points``, ``attitude_id``, ``equipment``) as well as flat keys
+    such as ``str_iv``; flat keys win.
+    """
+    build: Dict[str, int] = {}
+
+    for stat, value in (entry.get('ivs') or {}).items():
+        build[f'{stat}_iv'] = value
+    for stat, value in (entry.get('gym_points') or {}).items():
+        build[f'{stat}_gym'] = value
+
+    attitude = _lookup(catalog.attitudes, index.attitudes, entry.get('attitude_id'))
+    if attitude is not None:
+        for stat in BUILD_STATS:
+            build[f'attitude_{stat}_boost'] = attitude.get(f'boost_{stat}') or 0
+
+    for equipment_id in entry.get('equipment') or ():
+        item = _lookup(catalog.equipment, index.equipment, equipment_id)
+        if item is None:
+            continue
+        for stat in EQUIPMENT_STATS:
+            key = f'equipment_{stat}_bonus'
+            build[key] = build.get(key, 0) + _parse_bonus(item.get(f'{stat}_bonus'))
+
+    for key in _FLAT_BUILD_KEYS.intersection(entry.keys()):
+        build[key] = entry[key]
+
+    return build
+
+
+def hydrate_team(
+    team: List[Mapping[str, Any]],
+    catalog: MoveCatalog
+) -> List[Tuple[Mapping[str, Any], Dict[str, int]]]:
+    """
+    Resolve a team in one pass over the in-memory catalog, no database work.
+
+    Each entry is looked up by ``id`` (or ``yokai_id``, as stored by the
+    teams API). Entries that aren't in the catalog are used as the yokai row
+    themselves. Returns ``(row, build)`` pairs for ``build_battle_yokai``.
+    """
+    index = get_name_index(catalog)
+    hydrated = []
+    for entry in team:
+        yokai_id = entry.get('id', entry.get('yokai_id'))
+        row = catalog.yokai.get(yokai_id) if yokai_id is not None else None
+        hydrated.append((row if row is not None else entry, member_build(entry, catalog, index)))
+    return hydrated
@@ -0,0 +1,136 @@
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import threading
+
+import numpy as np
+
+from app.services.battle_yokai import build_battle_yokai
+from app.services.catalog import MoveCatalog
+from app.services.team_hydration import get_name_index, member_build
+from damage_calc import RESISTANCE_KEYS, get_batch_damage
+
+
+# move type -> (catalog attribute, damage_calc attack type)
+MOVE_TYPES = {
+    'attack': ('attacks', 1),
+    'technique': ('techniques', 2),
+    'soultimate': ('soultimates', 3),
+}
+
+
+class YokaiColumns:
+    """
+    Column arrays of the catalog yokai, as defenders at full stats.
+
+    Row i of every array belongs to ``ids[i]``. Built once per catalog so a
+    threat matrix is a handful of array operations instead of a loop over rows.
+    """
+
+    __slots__ = ('ids', 'names', 'hp', 'defence', 'resistances')
+
+    def __init__(self, yokai: Mapping[Any, Mapping[str, Any]]):
+        rows = list(yokai.values())
+        self.ids = [row['id'] for row in rows]
+        self.names = [row.get('name') for row in rows]
+        self.hp = np.array([row.get('bs_b_hp') or 0 for row in rows], dtype=np.int64)
+        self.defence = np.array([row.get('bs_b_def') or 0 for row in rows], dtype=np.int64)
+        self.resistances = {
+            column: np.array([_resistance(row.get(column)) for row in rows], dtype=np.float64)
+            for column in set(RESISTANCE_KEYS.values())
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def _resistance(value: Any) -> float:
+    return 1.0 if value is None else float(value)
+
+
+_columns: Optional[Tuple[MoveCatalog, YokaiColumns]] = None
+_columns_lock = threading.Lock()
+
+
+def get_yokai_columns(catalog: MoveCatalog) -> YokaiColumns:
+    """Column arrays for ``catalog``, rebuilt only when the catalog is reloaded"""
+    global _columns
+    cached = _columns
+    if cached is not None and cached[0] is catalog:
+        return cached[1]
+    with _columns_lock:
+        if _columns is None or _columns[0] is not catalog:
+            _columns = (catalog, YokaiColumns(catalog.yokai))
+        return _columns[1]
+
+
+def build_threat_matrix(
+    catalog: MoveCatalog,
+    attacker: Mapping[str, Any],
+    move_type: str,
+    move_id: str,
+    is_defending: bool = False,
+    is_crit: bool = False,
+    is_moxie: bool = False
+) -> Dict[str, Any]:
+    """
+    Damage of one attacker's move against every yokai in the catalog.
+
+    ``attacker`` is a team entry: a yokai id plus optional IVs, gym stats,
+    attitude and equipment (see ``member_build``). Raises KeyError for an unknown yokai or move and
+    ValueError for an unknown move type.
+    """
+    if move_type not in MOVE_TYPES:
+        raise ValueError(f"Unknown move type {move_type!r}")
+    table, attack_type = MOVE_TYPES[move_type]
+
+    move = getattr(catalog, table).get(move_id)
+    if move is None:
+        raise KeyError(f"{move_type} {move_id} not found")
+    yokai = catalog.yokai.get(attacker['id'])
+    if yokai is None:
+        raise KeyError(f"Yokai {attacker['id']} not found")
+
+    fighter = build_battle_yokai(yokai, member_build(attacker, catalog, get_name_index(catalog)))
+    columns = get_yokai_columns(catalog)
+
+    damage = get_batch_damage(
+        attack_data=move,
+        attacker_str=fighter.str_stat,
+        attacker_spr=fighter.spr_stat,
+        defender_def=columns.defence,
+        defender_hp=columns.hp,
+        defender_resistances=columns.resistances,
+        attack_type=attack_type,
+        is_defending=is_defending,
+        is_crit=is_crit,
+        is_moxie=is_moxie,
+        attitude_str_boost=fighter.attitude_str_boost,
+        attitude_spr_boost=fighter.attitude_spr_boost
+    )
+
+    # Strongest hits first
+    order = np.argsort(-damage['max'], kind='stable')
+    results: List[Dict[str, Any]] = [
+        {
+            'yokai_id': columns.ids[idx],
+            'name': columns.names[idx],
+            'hp': int(columns.hp[idx]),
+            'min_damage': int(damage['min'][idx]),
+            'max_damage': int(damage['max'][idx]),
+            'hits_to_ko_min': _hits(damage['hits_to_ko_min'][idx]),
+            'hits_to_ko_max': _hits(damage['hits_to_ko_max'][idx]),
+        }
+        for idx in order.tolist()
+    ]
+
+    return {
+        'attacker_id': attacker['id'],
+        'move_type': move_type,
+        'move_id': move_id,
+        'move_name': move.get('command'),
+        'results': results,
+    }
+
+
+def _hits(value: float) -> Optional[int]:
+    # None when the move can't KO (no damage)
+    return int(value) if np.isfinite(value) else None
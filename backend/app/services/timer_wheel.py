@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel: any number of deadlines, one task.
+
+    Time advances in ``tick`` second steps. Level 0 has one slot per tick,
+    each level above has slots ``slots`` times wider; a deadline sits in
+    the lowest level whose current window contains it, and moves down a
+    level when the wheel turns onto its slot. Deadlines beyond the top
+    level wait in an overflow bucket. Scheduling, rescheduling and
+    cancelling are O(1), and each tick only touches the slots due, so the
+    cost per tick stays flat however many deadlines are pending.
+
+    Keys are unique: scheduling a key again replaces its deadline.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 64, levels: int = 4,
+                 clock: Callable[[], float] = time.monotonic):
+        self.tick = tick
+        self.slots = slots
+        self.clock = clock
+        self._start = clock()
+        self._current = 0  # Ticks processed so far
+        self._spans = [slots ** level for level in range(levels + 1)]
+        self._wheels: List[List[Dict[Hashable, int]]] = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._overflow: Dict[Hashable, int] = {}
+        self._where: Dict[Hashable, Dict[Hashable, int]] = {}  # Key -> the bucket holding it
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def _now_ticks(self, now: Optional[float] = None) -> float:
+        return ((self.clock() if now is None else now) - self._start) / self.tick
+
+    def _place(self, key: Hashable, expire: int) -> None:
+        for level, wheel in enumerate(self._wheels):
+            span = self._spans[level + 1]
+            if expire // span == self._current // span:
+                bucket = wheel[(expire // self._spans[level]) % self.slots]
+                break
+        else:
+            bucket = self._overflow
+        bucket[key] = expire
+        self._where[key] = bucket
+
+    def schedule(self, key: Hashable, delay: float) -> None:
+        """Expire ``key`` in ``delay`` seconds, rounded up to the next tick"""
+        self.cancel(key)
+        expire = max(self._current + 1, math.ceil(self._now_ticks() + delay / self.tick))
+        self._place(key, expire)
+
+    def cancel(self, key: Hashable) -> bool:
+        bucket = self._where.pop(key, None)
+        if bucket is None:
+            return False
+        del bucket[key]
+        return True
+
+    def _cascade(self, bucket: Dict[Hashable, int]) -> None:
+        entries = list(bucket.items())
+        bucket.clear()
+        for key, expire in entries:
+            self._place(key, expire)
+
+    def advance(self, now: Optional[float] = None) -> List[Hashable]:
+        """Turn the wheel up to ``now``; returns the keys that expired, oldest first"""
+        target = int(self._now_ticks(now))
+        if not self._where:
+            self._current = max(self._current, target)
+            return []
+
+        expired = []
+        while self._current < target:
+            self._current += 1
+            if self._current % self._spans[-1] == 0:
+                self._cascade(self._overflow)
+            for level in range(len(self._wheels) - 1, 0, -1):
+                if self._current % self._spans[level] == 0:
+                    self._cascade(self._wheels[level][(self._current // self._spans[level]) % self.slots])
+
+            due = self._wheels[0][self._current % self.slots]
+            for key in due:
+                del self._where[key]
+                expired.append(key)
+            due.clear()
+        return expired
+
+    async def run(self, on_expire: Callable[[Any], Awaitable[None]]) -> None:
+        """
+        Run ``on_expire(key)`` for every deadline that passes, until cancelled.
+
+        Each callback gets its own task, so a slow one doesn't hold up the
+        deadlines behind it.
+        """
+        running = set()
+
+        def finished(task: asyncio.Task) -> None:
+            running.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                logger.error("Timer callback failed", exc_info=task.exception())
+
+        while True:
+            await asyncio.sleep(self.tick)
+            for key in self.advance():
+                task = asyncio.create_task(on_expire(key))
+                running.add(task)
+                task.add_done_callback(finished)
@@ -0,0 +1,78 @@
+import json
+import logging
+import os
+import socket
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+
+import redis.asyncio as aioredis
+
+from app.services.battle_store import BattleStore
+
+
+logger = logging.getLogger(__name__)
+
+
+def new_worker_id() -> str:
+    """Unique per process start, so a restarted worker never inherits stale battles"""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+class BattleRouter:
+    """
+    Pins every live battle to the worker that created it.
+
+    The worker that claims a battle in the store holds its engine and is
+    the only one that processes its events. A socket connected to another
+    worker has its events for that battle published on the owner's Redis
+    channel (``battles:worker:{id}``); the owner's ``listen`` loop runs
+    them like local events. Replies reach sockets on any worker through
+    Socket.IO's Redis client manager. Without a Redis ``client`` there is
+    one worker, which owns everything.
+    """
+
+    def __init__(self, store: BattleStore, client: Optional[aioredis.Redis] = None, worker_id: Optional[str] = None):
+        self.store = store
+        self.client = client
+        self.worker_id = worker_id or new_worker_id()
+        self.forwarded = 0
+        self.received = 0
+
+    @staticmethod
+    def channel(worker_id: str) -> str:
+        return f"battles:worker:{worker_id}"
+
+    async def owner(self, battle_id: str, claim: bool = False) -> Optional[str]:
+        """Worker owning ``battle_id``; with ``claim``, this worker if nobody did yet"""
+        if claim:
+            return await self.store.claim(battle_id, self.worker_id)
+        return await self.store.owner(battle_id)
+
+    def is_local(self, owner: Optional[str]) -> bool:
+        return owner is None or owner == self.worker_id or self.client is None
+
+    async def forward(self, owner: str, event: str, sid: str, data: Any) -> bool:
+        """Hand an event to the owning worker; False if no worker listens on its channel"""
+        message = json.dumps({'event': event, 'sid': sid, 'data': data}, separators=(',', ':'))
+        receivers = await self.client.publish(self.channel(owner), message)
+        self.forwarded += 1
+        return receivers > 0
+
+    async def listen(self, handle: Callable[[str, str, Any], Awaitable[None]]) -> None:
+        """
+        Run forwarded events through ``handle(event, sid, data)`` until cancelled.
+
+        Events are handled one at a time, in the order they were published,
+        so two players' actions on a battle can't interleave mid-turn.
+        """
+        async with self.client.pubsub() as pubsub:
+            await pubsub.subscribe(self.channel(self.worker_id))
+            async for message in pubsub.listen():
+                if message['type'] != 'message':
+                    continue
+                self.received += 1
+                try:
+                    payload = json.loads(message['data'])
+                    await handle(payload['event'], payload['sid'], payload['data'])
+                except Exception:
+                    logger.exception("Failed to handle forwarded battle event %r", message['data'][:200])
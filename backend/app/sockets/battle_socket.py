@@ -1,128 +1,561 @@
 import socketio
+import asyncio
 import json
-import redis
+import logging
+import random
+import uuid
 from app.core.config import settings
 from app.services.battle_engine import BattleEngine
+from app.services.battle_log import BattleLogStore
+from app.services.battle_store import MemoryBattleStore
+from app.services.catalog import get_catalog
+from app.services.practice_ai import PASS, PracticeAI, legal_actions, random_team, to_action
+from app.services.timer_wheel import TimerWheel
+from app.sockets.battle_router import BattleRouter
+from app.sockets.session_registry import SessionRegistry
+from app.sockets.spectator_feed import SpectatorBroadcaster, SpectatorFeed
+from app.sockets.state_sync import BattleStateSync
 
-redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+battle_log_store = BattleLogStore(settings.BATTLE_LOG_DIR)
 
+logger = logging.getLogger(__name__)
 
+
+# Battles this worker owns: engine, state sync, AI and player sids
 active_battles = {}
 
+# Single worker until the lifespan swaps in a Redis backed router
+battle_router = BattleRouter(MemoryBattleStore())
+
+# Sockets connected to this worker: their users and battles
+sessions = SessionRegistry()
+
+# Throttled spectator updates of the battles this worker owns, sent by a lifespan task
+spectator_broadcaster = SpectatorBroadcaster(settings.SPECTATOR_UPDATE_INTERVAL)
+
+# Turn deadlines of the battles this worker owns, keyed by battle id; see turn_expired
+turn_timers = TimerWheel(tick=settings.TURN_TIMER_TICK)
+
+
+def user_room(user_id) -> str:
+    """Room holding every connection of one user, for messages not tied to a battle"""
+    return f"user:{user_id}"
+
+
+async def notify_match(sio: socketio.AsyncServer, match):
+    """Tell both players of a matchmaker pairing which battle to join"""
+    first, second = match['players']
+    for player, opponent in ((first, second), (second, first)):
+        await sio.emit('match_found', {
+            'battle_id': match['battle_id'],
+            'tier': match['tier'],
+            'opponent': {
+                'user_id': opponent['user_id'],
+                'username': opponent.get('username'),
+                'team_id': opponent.get('team_id'),
+                'rating': opponent.get('rating')
+            }
+        }, room=user_room(player['user_id']))
+
+
+def battle_room(battle_id) -> str:
+    """Room of a battle's players: events both of them get go out once"""
+    return f"battle:{battle_id}"
+
+
+def _players_view(battle):
+    """Both sides of a battle, for sockets that don't play in it"""
+    return {
+        str(number): {
+            'user_id': battle.get(f'player{number}_id'),
+            'team': battle.get(f'player{number}_team')
+        }
+        for number in (1, 2)
+    }
+
+
+def _player_sids(battle):
+    """Connected human players of a battle (practice battles only have player 1)"""
+    return [sid for sid in (battle.get('player1_sid'), battle.get('player2_sid')) if sid]
+
+
+def _battle_key(data):
+    """Battle ids as strings: clients send matchmaker ids as numbers, the store keeps strings"""
+    battle_id = data.get('battle_id') if isinstance(data, dict) else None
+    return str(battle_id) if battle_id else None
+
+
+async def _end_battle(sio, battle_id):
+    battle = active_battles.pop(battle_id, None)
+    if battle is not None:
+        for player_sid in _player_sids(battle):
+            sessions.leave(player_sid, battle_id)  # Sockets on other workers drop it on disconnect
+        spectator_broadcaster.discard(battle['feed'])
+        await battle['feed'].close(sio)
+        if 'engine' in battle:
+            # Every way a battle ends persists the tail, so /api/battles/{id}/log can rebuild it
+            battle['engine'].log.flush()
+    turn_timers.cancel(battle_id)
+    await sio.close_room(battle_room(battle_id))
+    await battle_router.store.remove(battle_id)
+
+
+def _player_number(battle, user_id):
+    """1 or 2 if ``user_id`` already plays in ``battle``, else None"""
+    for number in (1, 2):
+        if battle.get(f'player{number}_id') is not None and str(battle[f'player{number}_id']) == str(user_id):
+            return number
+    return None
+
+
+async def _rejoin_battle(sio, sid, battle_id, battle, number):
+    """A player came back on a new socket: point the battle at it and resend the full state"""
+    room = battle_room(battle_id)
+    await sio.leave_room(battle[f'player{number}_sid'], room)
+    await sio.enter_room(sid, room)
+    battle[f'player{number}_sid'] = sid
+    await battle_router.store.update(battle_id, **{f'player{number}_sid': sid})
+    if 'sync' not in battle:
+        await sio.emit('waiting_for_opponent', to=sid)
+        return
+    opponent = 2 if number == 1 else 1
+    await sio.emit('battle_start', {
+        'opponent': {
+            'user_id': battle.get(f'player{opponent}_id'),
+            'team': battle.get(f'player{opponent}_team')
+        },
+        'state': battle['sync'].snapshot()
+    }, to=sid)
+
+
+async def _join_battle(sio, sid, data):
+    battle_id = _battle_key(data)
+    user_id = data['user_id']
+    team_data = data.get('team')
+
+    battle = active_battles.get(battle_id)
+    number = _player_number(battle, user_id) if battle is not None else None
+    if number is not None:
+        await _rejoin_battle(sio, sid, battle_id, battle, number)
+    elif battle is None:
+        active_battles[battle_id] = {
+            'player1_sid': sid,
+            'player1_id': user_id,
+            'player1_team': team_data,
+            'status': 'waiting',
+            'feed': SpectatorFeed(battle_id, settings.SPECTATOR_MAX_PENDING)
+        }
+        await sio.enter_room(sid, battle_room(battle_id))
+        turn_timers.schedule(battle_id, settings.BATTLE_IDLE_TIMEOUT)
+        await battle_router.store.update(battle_id, status='waiting', player1_sid=sid, player1_id=user_id)
+        await sio.emit('waiting_for_opponent', to=sid)
+    else:
+        battle['player2_sid'] = sid
+        battle['player2_id'] = user_id
+        battle['player2_team'] = team_data
+        battle['status'] = 'active'
+        battle['missed'] = {1: 0, 2: 0}
+
+        battle['engine'] = BattleEngine(
+            battle['player1_team'],
+            battle['player2_team'],
+            battle_id=battle_id,
+            log_store=battle_log_store
+        )
+        battle['sync'] = BattleStateSync(battle['engine'])
+        await sio.enter_room(sid, battle_room(battle_id))
+        await battle_router.store.update(battle_id, status='active', player2_sid=sid, player2_id=user_id)
+
+        # The only full snapshot of the battle, every turn after this is a state_delta
+        game_state = battle['sync'].snapshot()
+
+        # The one event whose payload differs per player: each sees the other as opponent
+        await sio.emit('battle_start', {
+            'opponent': {
+                'user_id': battle['player1_id'],
+                'team': battle['player1_team']
+            },
+            'state': game_state
+        }, to=sid)
+
+        await sio.emit('battle_start', {
+            'opponent': {
+                'user_id': battle['player2_id'],
+                'team': battle['player2_team']
+            },
+            'state': game_state
+        }, to=battle['player1_sid'])
+
+        # Spectators who arrived while it was waiting
+        await battle['feed'].start(sio, battle['engine'], _players_view(battle))
+        turn_timers.schedule(battle_id, settings.TURN_TIMEOUT)
+
+
+async def _battle_action(sio, sid, data):
+    battle_id = _battle_key(data)
+    action = data.get('action')
+
+    if battle_id not in active_battles:
+        await sio.emit('error', {'message': 'Battle not found'}, to=sid)
+        return
+
+    battle = active_battles[battle_id]
+    engine = battle.get('engine')
+
+    if not engine:
+        await sio.emit('error', {'message': 'Battle engine not initialized'}, to=sid)
+        return
+
+    if sid not in _player_sids(battle):
+        # Only the two players can act; spectators just watch their feed
+        await sio.emit('error', {'message': 'Not a player in this battle'}, to=sid)
+        return
+
+    if battle.get('ai_thinking'):
+        await sio.emit('error', {'message': 'Opponent is still choosing'}, to=sid)
+        return
+
+    player_num = 1 if sid == battle['player1_sid'] else 2
+    battle['missed'][player_num] = 0
+    await _play(sio, battle_id, battle, player_num, action)
+
+
+async def _play(sio, battle_id, battle, player_num, action):
+    """Submit ``player_num``'s action, chosen by the player or by their turn timer"""
+    engine = battle['engine']
+    if battle.get('ai'):
+        # The AI picks first, on a clone and off the event loop, so it never sees this action
+        battle['ai_thinking'] = True
+        try:
+            ai_action = await asyncio.to_thread(battle['ai'].choose_action, engine.clone(), 2)
+        except Exception:
+            # A failed search must not cost the player their turn
+            logger.exception("Practice AI failed in battle %s", battle_id)
+            ai_action = _default_action(engine, 2)
+        finally:
+            battle['ai_thinking'] = False
+        if active_battles.get(battle_id) is not battle:
+            return  # Player left while the AI was thinking
+        engine.process_action(2, ai_action)
+
+    result = engine.process_action(player_num, action)
+    # The embedded full state is what state_delta replaces
+    result.pop('state', None)
+
+    room = battle_room(battle_id)
+    if result.get('status') == 'waiting':
+        # Only the player who chose gets the acknowledgement; the room just
+        # learns they're ready, never what they picked
+        player_sid = battle[f'player{player_num}_sid']
+        await sio.emit('action_result', result, to=player_sid)
+        await sio.emit('player_ready', {'player': player_num}, room=room, skip_sid=player_sid)
+        return
+
+    # Everything below is the same for both players: one emit per event,
+    # encoded once for the whole room
+    await sio.emit('action_result', result, room=room)
+
+    delta = battle['sync'].delta()
+    if delta:
+        await sio.emit('state_delta', delta, room=room)
+
+    # Spectators get it with the broadcaster's next coalesced update
+    spectator_broadcaster.mark(battle['feed'], result)
+
+    if engine.is_battle_over():
+        await _finish_battle(sio, battle_id, battle, {'winner': engine.get_winner()})
+    else:
+        turn_timers.schedule(battle_id, settings.TURN_TIMEOUT)
+
+
+async def _finish_battle(sio, battle_id, battle, outcome):
+    await sio.emit('battle_end', outcome, room=battle_room(battle_id))
+    await battle['feed'].finish(sio, 'battle_end', outcome)
+    await _end_battle(sio, battle_id)
+
+
+def _default_action(engine, player_num):
+    """The move played for someone whose turn clock ran out: the first one they can use"""
+    actions = legal_actions(engine, player_num)
+    return to_action(engine, player_num, actions[0] if actions else PASS)
+
+
+async def turn_expired(sio, battle_id):
+    """
+    A battle's deadline passed, see ``turn_timers``.
+
+    A battle still waiting for its second player is dropped. In a running
+    battle, every player who hasn't chosen this turn gets their default
+    action played, and forfeits once they've let more than
+    TURN_TIMEOUT_FORFEIT_AFTER turns in a row run out. A battle both
+    players walked away from ends that way too.
+    """
+    battle = active_battles.get(battle_id)
+    if battle is None:
+        return
+    room = battle_room(battle_id)
+
+    if 'engine' not in battle:
+        await sio.emit('battle_expired', {'battle_id': battle_id}, room=room)
+        await battle['feed'].finish(sio, 'battle_expired', {'battle_id': battle_id})
+        await _end_battle(sio, battle_id)
+        return
+
+    if battle.get('ai_thinking'):
+        # The player chose in time, the practice AI is answering
+        turn_timers.schedule(battle_id, settings.TURN_TIMEOUT)
+        return
+
+    engine = battle['engine']
+    humans = (1,) if battle.get('ai') else (1, 2)
+    idle = [number for number in humans if engine.pending_actions[f'player{number}'] is None]
+
+    forfeits = []
+    for number in idle:
+        battle['missed'][number] += 1
+        if battle['missed'][number] > settings.TURN_TIMEOUT_FORFEIT_AFTER:
+            forfeits.append(number)
+
+    if forfeits:
+        winner = 0 if len(forfeits) == 2 else 3 - forfeits[0]
+        await _finish_battle(sio, battle_id, battle, {'winner': winner, 'forfeit': forfeits})
+        return
+
+    for number in idle:
+        await sio.emit('turn_timeout', {'player': number}, room=room)
+        await _play(sio, battle_id, battle, number, _default_action(engine, number))
+        if active_battles.get(battle_id) is not battle:
+            return
+
+
+async def _request_state(sio, sid, data):
+    """Full snapshot for a client whose version no longer matches a delta's base_version"""
+    battle_id = _battle_key(data)
+
+    battle = active_battles.get(battle_id)
+    if not battle or 'sync' not in battle:
+        await sio.emit('error', {'message': 'Battle not found'}, to=sid)
+        return
+
+    await sio.emit('game_state', battle['sync'].snapshot(), to=sid)
+
+
+async def _chat_message(sio, sid, data):
+    battle_id = _battle_key(data)
+    message = data.get('message')
+
+    if battle_id not in active_battles:
+        return
+
+    battle = active_battles[battle_id]
+
+    opponent_sid = battle.get('player2_sid') if sid == battle['player1_sid'] else battle['player1_sid']
+    if opponent_sid:
+        await sio.emit('chat_message', {'message': message}, to=opponent_sid)
+
+
+async def _player_left(sio, sid, data):
+    """A player's socket disconnected from whichever worker it was on"""
+    battle_id = _battle_key(data)
+    battle = active_battles.get(battle_id)
+    if battle is not None:
+        if sid not in _player_sids(battle):
+            return  # The player already rejoined on another socket
+        await sio.emit('opponent_disconnected', room=battle_room(battle_id))
+        await battle['feed'].finish(sio, 'opponent_disconnected')
+    await _end_battle(sio, battle_id)
+
+
+async def _spectate(sio, sid, data):
+    """Watch a battle through its spectator feed, see SpectatorFeed"""
+    battle = active_battles.get(_battle_key(data))
+    if battle is None:
+        await sio.emit('error', {'message': 'Battle not found'}, to=sid)
+        return
+    await battle['feed'].add(sio, sid)
+
+
+async def _stop_spectating(sio, sid, data):
+    battle = active_battles.get(_battle_key(data))
+    if battle is not None:
+        await battle['feed'].remove(sio, sid)
+
+
+async def _spectator_ack(sio, sid, data):
+    """A spectator applied the update with ``version``"""
+    battle = active_battles.get(_battle_key(data))
+    if battle is not None:
+        await battle['feed'].ack(sio, sid, data.get('version'))
+
+
+# Events that belong to one battle, run by the worker owning it
+BATTLE_EVENTS = {
+    'join_battle': _join_battle,
+    'battle_action': _battle_action,
+    'request_state': _request_state,
+    'chat_message': _chat_message,
+    'player_left': _player_left,
+    'spectate': _spectate,
+    'stop_spectating': _stop_spectating,
+    'spectator_ack': _spectator_ack,
+}
+
+
+async def handle_event(sio, event, sid, data):
+    """Run a battle event on this worker, e.g. one forwarded by another worker"""
+    await BATTLE_EVENTS[event](sio, sid, data)
+
+
+async def dispatch(sio, event, sid, data, claim=False):
+    """
+    Run a battle event here if this worker owns the battle, else forward it.
+
+    ``claim`` makes this worker the owner of a battle nobody owns yet.
+    """
+    battle_id = _battle_key(data)
+    if battle_id:
+        owner = await battle_router.owner(battle_id, claim=claim)
+        if not battle_router.is_local(owner):
+            if not await battle_router.forward(owner, event, sid, data):
+                # Its worker is gone and the engine with it
+                await battle_router.store.remove(battle_id)
+                await sio.emit('error', {'message': 'Battle not found'}, to=sid)
+            return
+    await handle_event(sio, event, sid, data)
+
 
 def register_events(sio: socketio.AsyncServer):
-    
-    
+
+
     @sio.event
-    async def connect(sid, environ):
-        
+    async def connect(sid, environ, auth=None):
+
         print(f"Client connected: {sid}")
+        # Clients may identify right away with io({auth: {user_id}})
+        user_id = auth.get('user_id') if isinstance(auth, dict) else None
+        if user_id:
+            sessions.bind_user(sid, user_id)
+            await sio.enter_room(sid, user_room(user_id))
         await sio.emit('connected', {'sid': sid}, to=sid)
-    
+
     @sio.event
     async def disconnect(sid):
         print(f"Client disconnected: {sid}")
-        
-        for battle_id, battle_data in list(active_battles.items()):
-            if sid in [battle_data.get('player1_sid'), battle_data.get('player2_sid')]:
-                await sio.emit('opponent_disconnected', to=battle_data.get('player1_sid'))
-                await sio.emit('opponent_disconnected', to=battle_data.get('player2_sid'))
-                del active_battles[battle_id]
-    
+
+        for battle_id in sessions.watching(sid):
+            await dispatch(sio, 'stop_spectating', sid, {'battle_id': battle_id})
+        _, battle_ids = sessions.drop(sid)
+        for battle_id in battle_ids:
+            await dispatch(sio, 'player_left', sid, {'battle_id': battle_id})
+
     @sio.event
-    async def join_battle(sid, data):
-        battle_id = data.get('battle_id')
+    async def identify(sid, data):
+        """Subscribe this connection to its user's room, e.g. for match_found"""
         user_id = data.get('user_id')
-        team_data = data.get('team')
-        
-        if not battle_id or not user_id:
+        if not user_id:
+            await sio.emit('error', {'message': 'Invalid user'}, to=sid)
+            return
+        sessions.bind_user(sid, user_id)
+        await sio.enter_room(sid, user_room(user_id))
+
+    @sio.event
+    async def join_battle(sid, data):
+        # Checked before claiming, so a bad request doesn't create a battle record
+        if not data.get('battle_id') or not data.get('user_id'):
             await sio.emit('error', {'message': 'Invalid battle data'}, to=sid)
             return
-        
-        if battle_id not in active_battles:
-            active_battles[battle_id] = {
-                'player1_sid': sid,
-                'player1_id': user_id,
-                'player1_team': team_data,
-                'status': 'waiting'
-            }
-            await sio.emit('waiting_for_opponent', to=sid)
+        battle_id = _battle_key(data)
+        previous_sid = sessions.bind_user(sid, data['user_id'])
+        if previous_sid is not None:
+            # Reconnected: the old socket's disconnect must not end this battle
+            sessions.move(previous_sid, sid, battle_id)
         else:
-            battle = active_battles[battle_id]
-            battle['player2_sid'] = sid
-            battle['player2_id'] = user_id
-            battle['player2_team'] = team_data
-            battle['status'] = 'active'
-            
-            battle['engine'] = BattleEngine(
-                battle['player1_team'],
-                battle['player2_team']
-            )
-
-            await sio.emit('battle_start', {
-                'opponent': {
-                    'user_id': battle['player1_id'],
-                    'team': battle['player1_team']
-                }
-            }, to=sid)
-            
-            await sio.emit('battle_start', {
-                'opponent': {
-                    'user_id': battle['player2_id'],
-                    'team': battle['player2_team']
-                }
-            }, to=battle['player1_sid'])
-            
-
-            game_state = battle['engine'].get_state()
-            await sio.emit('game_state', game_state, to=battle['player1_sid'])
-            await sio.emit('game_state', game_state, to=battle['player2_sid'])
-    
+            sessions.join(sid, battle_id)
+        await dispatch(sio, 'join_battle', sid, data, claim=True)
+
     @sio.event
     async def battle_action(sid, data):
-        battle_id = data.get('battle_id')
-        action = data.get('action')
-        
-        if battle_id not in active_battles:
-            await sio.emit('error', {'message': 'Battle not found'}, to=sid)
+        await dispatch(sio, 'battle_action', sid, data)
+
+    @sio.event
+    async def start_practice(sid, data):
+        """Single-player battle against the practice AI (player 2)"""
+        user_id = data.get('user_id')
+        team_data = data.get('team')
+
+        if not user_id or not team_data:
+            await sio.emit('error', {'message': 'Invalid practice data'}, to=sid)
             return
-        
-        battle = active_battles[battle_id]
-        engine = battle.get('engine')
-        
-        if not engine:
-            await sio.emit('error', {'message': 'Battle engine not initialized'}, to=sid)
+
+        catalog = get_catalog()
+        ai_team = data.get('opponent_team') or random_team(catalog, len(team_data), random.Random())
+        if not ai_team:
+            await sio.emit('error', {'message': 'No yokai available for the practice opponent'}, to=sid)
             return
-        
-        player_num = 1 if sid == battle['player1_sid'] else 2
-        
-        result = engine.process_action(player_num, action)
-        
-        await sio.emit('action_result', result, to=battle['player1_sid'])
-        await sio.emit('action_result', result, to=battle['player2_sid'])
-        
-        if engine.is_battle_over():
-            winner = engine.get_winner()
-            await sio.emit('battle_end', {'winner': winner}, to=battle['player1_sid'])
-            await sio.emit('battle_end', {'winner': winner}, to=battle['player2_sid'])
-            
-            del active_battles[battle_id] # might need a better way to free this memory
-        else:
-            game_state = engine.get_state()
-            await sio.emit('game_state', game_state, to=battle['player1_sid'])
-            await sio.emit('game_state', game_state, to=battle['player2_sid'])
-    
+
+        battle_id = f"practice_{uuid.uuid4().hex}"
+        engine = BattleEngine(
+            team_data,
+            ai_team,
+            catalog=catalog,
+            battle_id=battle_id,
+            log_store=battle_log_store
+        )
+        battle = {
+            'player1_sid': sid,
+            'player1_id': user_id,
+            'player1_team': team_data,
+            'player2_team': ai_team,
+            'status': 'active',
+            'engine': engine,
+            'sync': BattleStateSync(engine),
+            'ai': PracticeAI(think_time=settings.PRACTICE_AI_THINK_TIME),
+            'ai_thinking': False,
+            'missed': {1: 0, 2: 0},
+            'feed': SpectatorFeed(battle_id, settings.SPECTATOR_MAX_PENDING)
+        }
+        active_battles[battle_id] = battle
+        sessions.bind_user(sid, user_id)
+        sessions.join(sid, battle_id)
+        await sio.enter_room(sid, battle_room(battle_id))
+        # The player's socket is on this worker, so every event of the battle arrives here
+        await battle_router.owner(battle_id, claim=True)
+        await battle_router.store.update(battle_id, status='active', player1_sid=sid, player1_id=user_id)
+        await battle['feed'].start(sio, engine, _players_view(battle))
+        turn_timers.schedule(battle_id, settings.TURN_TIMEOUT)
+
+        await sio.emit('battle_start', {
+            'battle_id': battle_id,
+            'opponent': {
+                'user_id': None,
+                'team': ai_team
+            },
+            'state': battle['sync'].snapshot()
+        }, to=sid)
+
+    @sio.event
+    async def request_state(sid, data):
+        await dispatch(sio, 'request_state', sid, data)
+
     @sio.event
     async def chat_message(sid, data):
-        battle_id = data.get('battle_id')
-        message = data.get('message')
-        
-        if battle_id not in active_battles:
+        await dispatch(sio, 'chat_message', sid, data)
+
+    @sio.event
+    async def spectate_battle(sid, data):
+        if not _battle_key(data):
+            await sio.emit('error', {'message': 'Invalid battle data'}, to=sid)
             return
-        
-        battle = active_battles[battle_id]
-        
-        opponent_sid = battle['player2_sid'] if sid == battle['player1_sid'] else battle['player1_sid']
-        await sio.emit('chat_message', {'message': message}, to=opponent_sid)
-    
+        sessions.watch(sid, _battle_key(data))
+        await dispatch(sio, 'spectate', sid, data)
+
+    @sio.event
+    async def stop_spectating(sid, data):
+        sessions.unwatch(sid, _battle_key(data))
+        await dispatch(sio, 'stop_spectating', sid, data)
+
+    @sio.event
+    async def spectator_ack(sid, data):
+        await dispatch(sio, 'spectator_ack', sid, data)
+
     return sio
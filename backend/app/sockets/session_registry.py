@@ -0,0 +1,82 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class SessionRegistry:
+    """
+    Who is on which socket of this worker, and which battles each socket plays or watches.
+
+    Kept in step with joins, reconnects and teardown so ``disconnect`` and
+    the battle handlers look a socket up in O(1) instead of scanning every
+    live battle. Only sockets connected to this worker are tracked; the
+    battles themselves may be owned by any worker. Ids are strings.
+    """
+
+    __slots__ = ('_sid_battles', '_sid_watching', '_sid_user', '_user_sid')
+
+    def __init__(self):
+        self._sid_battles: Dict[str, Set[str]] = {}
+        self._sid_watching: Dict[str, Set[str]] = {}
+        self._sid_user: Dict[str, str] = {}
+        self._user_sid: Dict[str, str] = {}
+
+    def bind_user(self, sid: str, user_id) -> Optional[str]:
+        """
+        Record ``user_id`` as connected on ``sid``; returns their previous
+        socket if they had another one, i.e. this is a reconnect.
+        """
+        user_id = str(user_id)
+        previous = self._user_sid.get(user_id)
+        self._user_sid[user_id] = sid
+        self._sid_user[sid] = user_id
+        return previous if previous != sid else None
+
+    def join(self, sid: str, battle_id: str) -> None:
+        self._sid_battles.setdefault(sid, set()).add(battle_id)
+
+    def leave(self, sid: str, battle_id: str) -> None:
+        battles = self._sid_battles.get(sid)
+        if battles is not None:
+            battles.discard(battle_id)
+            if not battles:
+                del self._sid_battles[sid]
+
+    def move(self, old_sid: str, new_sid: str, battle_id: str) -> None:
+        """A reconnected player's battle follows them to the new socket"""
+        self.leave(old_sid, battle_id)
+        self.join(new_sid, battle_id)
+
+    def battles_of(self, sid: str) -> List[str]:
+        return sorted(self._sid_battles.get(sid, ()))
+
+    def watch(self, sid: str, battle_id: str) -> None:
+        self._sid_watching.setdefault(sid, set()).add(battle_id)
+
+    def unwatch(self, sid: str, battle_id: str) -> None:
+        watching = self._sid_watching.get(sid)
+        if watching is not None:
+            watching.discard(battle_id)
+            if not watching:
+                del self._sid_watching[sid]
+
+    def watching(self, sid: str) -> List[str]:
+        """Battles ``sid`` spectates"""
+        return sorted(self._sid_watching.get(sid, ()))
+
+    def sid_of(self, user_id) -> Optional[str]:
+        return self._user_sid.get(str(user_id))
+
+    def user_of(self, sid: str) -> Optional[str]:
+        return self._sid_user.get(sid)
+
+    def drop(self, sid: str) -> Tuple[Optional[str], List[str]]:
+        """
+        Forget a disconnected socket; returns its user and the battles it was in.
+
+        The user's mapping survives if they already reconnected on another socket.
+        """
+        battles = sorted(self._sid_battles.pop(sid, ()))
+        self._sid_watching.pop(sid, None)
+        user_id = self._sid_user.pop(sid, None)
+        if user_id is not None and self._user_sid.get(user_id) == sid:
+            del self._user_sid[user_id]
+        return user_id, battles
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Dict, Optional, Set
+
+from app.services.battle_engine import BattleEngine
+from app.sockets.state_sync import BattleStateSync
+
+
+logger = logging.getLogger(__name__)
+
+
+def spectator_room(battle_id) -> str:
+    """Room of a battle's spectators, apart from its players' room"""
+    return f"battle:{battle_id}:spectators"
+
+
+class SpectatorFeed:
+    """
+    What the spectators of one battle have been sent, kept apart from its players.
+
+    Players get every event as it happens. Spectators get at most one
+    ``spectator_update`` per broadcaster interval: every turn resolved
+    since the previous update coalesced into one delta, from a
+    ``BattleStateSync`` of their own, sent as a single emit to the
+    spectator room.
+
+    Spectators acknowledge updates (``spectator_ack``) with the version
+    they applied. One that falls more than ``max_pending`` updates behind
+    leaves the room, so no more than that is ever queued for a slow
+    client. Its next acknowledgement gets it a full snapshot instead of
+    the deltas it missed, and puts it back in the room.
+    """
+
+    __slots__ = ('battle_id', 'max_pending', 'sync', 'players', 'results', '_acked', '_stale')
+
+    def __init__(self, battle_id: str, max_pending: int):
+        self.battle_id = battle_id
+        self.max_pending = max_pending
+        self.sync: Optional[BattleStateSync] = None  # Until the second player joins
+        self.players: Dict[str, Any] = {}
+        self.results = deque(maxlen=max_pending)  # Turns since the last update
+        self._acked: Dict[str, int] = {}
+        self._stale: Set[str] = set()
+
+    @property
+    def room(self) -> str:
+        return spectator_room(self.battle_id)
+
+    @property
+    def spectators(self) -> int:
+        return len(self._acked) + len(self._stale)
+
+    def view(self) -> Dict[str, Any]:
+        """Both sides of the battle and its full state, at the feed's version"""
+        return {'battle_id': self.battle_id, 'players': self.players, 'state': self.sync.snapshot()}
+
+    async def start(self, sio, engine: BattleEngine, players: Dict[str, Any]) -> None:
+        """The battle began: spectators who were waiting get the opening state"""
+        self.sync = BattleStateSync(engine)
+        self.players = players
+        await sio.emit('battle_start', self.view(), room=self.room)
+
+    async def add(self, sio, sid: str) -> None:
+        self._stale.discard(sid)
+        self._acked[sid] = self.sync.version if self.sync else 0
+        await sio.enter_room(sid, self.room)
+        if self.sync is None:
+            await sio.emit('waiting_for_opponent', {'battle_id': self.battle_id}, to=sid)
+        else:
+            await sio.emit('spectate_start', self.view(), to=sid)
+
+    async def remove(self, sio, sid: str) -> None:
+        self._acked.pop(sid, None)
+        self._stale.discard(sid)
+        await sio.leave_room(sid, self.room)
+
+    def mark(self, result: Dict[str, Any]) -> None:
+        """A turn resolved; it goes out with the next update"""
+        self.results.append(result)
+
+    async def ack(self, sio, sid: str, version) -> None:
+        if sid in self._acked:
+            if isinstance(version, int):
+                self._acked[sid] = max(self._acked[sid], version)
+        elif sid in self._stale and self.sync is not None:
+            # Caught up with what it had queued: resync with a snapshot
+            self._stale.discard(sid)
+            self._acked[sid] = self.sync.version
+            await sio.enter_room(sid, self.room)
+            await sio.emit('spectator_snapshot', self.view(), to=sid)
+
+    async def flush(self, sio) -> bool:
+        """Send the coalesced update, if anything changed; False if nothing was sent"""
+        if self.sync is None:
+            return False
+        delta = self.sync.delta()
+        results = list(self.results)
+        self.results.clear()
+        if delta is None:
+            return False
+
+        for sid, acked in list(self._acked.items()):
+            if self.sync.version - acked > self.max_pending:
+                del self._acked[sid]
+                self._stale.add(sid)
+                await sio.leave_room(sid, self.room)
+
+        if self._acked:
+            await sio.emit('spectator_update', {**delta, 'results': results}, room=self.room)
+        return True
+
+    async def finish(self, sio, event: str, data=None) -> None:
+        """Last update and the event that ended the battle"""
+        await self.flush(sio)
+        await sio.emit(event, data, room=self.room)
+
+    async def close(self, sio) -> None:
+        self._acked.clear()
+        self._stale.clear()
+        await sio.close_room(self.room)
+
+
+class SpectatorBroadcaster:
+    """
+    One task sending every battle's spectator updates, each at most once per ``interval``.
+
+    The players' path only marks a battle's feed dirty. Building and
+    sending spectator updates happens here, in its own task, yielding to
+    the event loop between battles so spectators never delay a player's
+    events.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._dirty: Dict[str, SpectatorFeed] = {}
+
+    def mark(self, feed: SpectatorFeed, result: Dict[str, Any]) -> None:
+        feed.mark(result)
+        if feed.spectators:
+            self._dirty[feed.battle_id] = feed
+        else:
+            feed.results.clear()  # Nobody to coalesce for
+
+    def discard(self, feed: SpectatorFeed) -> None:
+        self._dirty.pop(feed.battle_id, None)
+
+    async def flush(self, sio) -> int:
+        """Send the updates of every battle that changed; returns how many went out"""
+        dirty, self._dirty = self._dirty, {}
+        sent = 0
+        for feed in dirty.values():
+            try:
+                sent += await feed.flush(sio)
+            except Exception:
+                logger.exception("Failed to update spectators of battle %s", feed.battle_id)
+            await asyncio.sleep(0)
+        return sent
+
+    async def run(self, sio) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush(sio)
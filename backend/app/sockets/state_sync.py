@@ -0,0 +1,78 @@
+from typing import Any, Dict, List, Optional
+from app.services.battle_engine import BattleEngine
+
+
+TEAMS = ('team1', 'team2')
+
+
+class BattleStateSync:
+    """
+    Tracks what clients of one battle have already been sent.
+
+    Clients get one full snapshot (``snapshot()``), then a ``delta()`` per
+    turn with only the combat fields that changed (see
+    ``COMBAT_STATE_FIELDS``). Every delta bumps ``version`` and carries the
+    ``base_version`` it applies on top of; a client whose local version
+    doesn't match ``base_version`` should ask for a fresh snapshot instead.
+    """
+
+    __slots__ = ('engine', 'version', '_last_states', '_last_turn')
+
+    def __init__(self, engine: BattleEngine):
+        self.engine = engine
+        self.version = 0
+        self._last_states = self._combat_states()
+        self._last_turn = engine.state['turn']
+
+    def _combat_states(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {
+            team: [yokai.combat_state() for yokai in self.engine.state[team]]
+            for team in TEAMS
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Full game state tagged with the current version"""
+        state = self.engine.get_state()
+        state['version'] = self.version
+        return state
+
+    def delta(self) -> Optional[Dict[str, Any]]:
+        """
+        Changes since the previous delta, or None if nothing changed.
+
+        Shape: ``{'version', 'base_version', 'turn', 'phase',
+        'changes': {'team1': {index: {field: value}}, 'team2': {...}}}``
+        """
+        current = self._combat_states()
+        turn = self.engine.state['turn']
+
+        changes = {}
+        for team in TEAMS:
+            previous = self._last_states[team]
+            team_changes = {}
+            for idx, fields in enumerate(current[team]):
+                changed = {
+                    field: value
+                    for field, value in fields.items()
+                    if previous[idx][field] != value
+                }
+                if changed:
+                    team_changes[idx] = changed
+            if team_changes:
+                changes[team] = team_changes
+
+        if not changes and turn == self._last_turn:
+            return None
+
+        base_version = self.version
+        self.version += 1
+        self._last_states = current
+        self._last_turn = turn
+
+        return {
+            'version': self.version,
+            'base_version': base_version,
+            'turn': turn,
+            'phase': self.engine.current_phase,
+            'changes': changes
+        }
@@ -0,0 +1,113 @@
+"""
+Memory used by the fighters of a battle: the old dict-spread layout vs BattleYokai.
+
+Both layouts are built from the same yokai rows, which stay alive for the
+whole run the way catalog rows do, so the numbers are the per-battle cost only.
+
+    uv run python benchmarks/bench_battle_memory.py --battles 2000
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.battle_yokai import build_battle_yokai
+
+
+TEAM_SIZE = 6
+
+
+def legacy_battle_yokai(yokai: Dict[str, Any]) -> Dict[str, Any]:
+    """The fighter layout BattleEngine._initialize_team used to build"""
+    return {
+        **yokai,
+        'max_hp': yokai['bs_b_hp'],
+        'current_hp': yokai['bs_b_hp'],
+        'str_stat': yokai['bs_b_str'],
+        'spr_stat': yokai['bs_b_spr'],
+        'def_stat': yokai['bs_b_def'],
+        'spd_stat': yokai['bs_b_spd'],
+        'current_soul': 0,
+        'status_effects': [],
+        'stat_modifiers': {'str': 0, 'spr': 0, 'def': 0, 'spd': 0},
+        'is_fainted': False,
+        'attitude_str_boost': 0,
+        'attitude_spr_boost': 0,
+        'attitude_def_boost': 0,
+        'attitude_spd_boost': 0
+    }
+
+
+def load_rows() -> List[Dict[str, Any]]:
+    try:
+        from app.core.database import get_db
+        with get_db() as db:
+            result = db.execute("SELECT * FROM yokai ORDER BY id LIMIT 100").fetchall()
+            columns = [desc[0] for desc in db.description]
+            rows = [dict(zip(columns, row)) for row in result]
+        if rows:
+            return rows
+    except Exception as e:
+        print(f"Could not read yokai table ({e}), using synthetic rows")
+
+    # Same column set as the yokai table
+    return [
+        {
+            'id': f'{idx:03d}', 'name': f'Yokai {idx}', 'image': f'{idx:03d}.webp',
+            'bs_a_hp': 30, 'bs_a_str': 9, 'bs_a_spr': 5, 'bs_a_def': 6, 'bs_a_spd': 8,
+            'bs_b_hp': 300 + idx, 'bs_b_str': 160, 'bs_b_spr': 70, 'bs_b_def': 82, 'bs_b_spd': 130,
+            'fire_res': 0.7, 'water_res': 1.3, 'electric_res': 1.0, 'earth_res': 1.0,
+            'wind_res': 1.0, 'ice_res': 1.0, 'equipment_slots': 1,
+            'attack_prob': 0.6, 'attack_id': '0xB0B0A793', 'technique_prob': 0.25,
+            'technique_id': '0x1727DAD7', 'inspirit_prob': 0.1, 'inspirit_id': '0x49AEBFE0',
+            'guard_prob': 0.05, 'soultimate_id': '0xAD8EF3F5', 'skill_id': 1,
+            'rank': 'E', 'tribe': 'Brave', 'artwork_image': f'yokai{idx}.png',
+            'tier': 'PU', 'extra': ''
+        }
+        for idx in range(100)
+    ]
+
+
+def measure(build: Callable[[Dict[str, Any]], Any], rows: List[Dict[str, Any]], battles: int) -> float:
+    """Average bytes allocated per battle (two teams of TEAM_SIZE)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    battles_kept = []
+    for battle in range(battles):
+        teams = []
+        for side in range(2):
+            offset = (battle * 2 + side) * TEAM_SIZE
+            teams.append([build(rows[(offset + i) % len(rows)]) for i in range(TEAM_SIZE)])
+        battles_kept.append(teams)
+
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del battles_kept
+    return (after - before) / battles
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure per-battle fighter memory")
+    parser.add_argument('--battles', type=int, default=2000, help='Number of battles to build (default: 2000)')
+    args = parser.parse_args()
+
+    rows = load_rows()
+
+    legacy = measure(legacy_battle_yokai, rows, args.battles)
+    slotted = measure(build_battle_yokai, rows, args.battles)
+
+    print(f"Battles built:        {args.battles} ({2 * TEAM_SIZE} fighters each)")
+    print(f"dict-spread fighters: {legacy:10.0f} bytes/battle")
+    print(f"BattleYokai fighters: {slotted:10.0f} bytes/battle")
+    print(f"Reduction:            {legacy / slotted:10.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
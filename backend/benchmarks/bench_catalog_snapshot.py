@@ -0,0 +1,103 @@
+"""
+Worker startup: catalog from the DuckDB file vs from the Parquet snapshot.
+
+Seeds a scratch database from seed_data/, writes a snapshot next to it, then
+starts fresh worker processes that load the catalog the way the app does,
+through _load_catalog with or without CATALOG_SNAPSHOT_PATH (the snapshot
+path includes its seed stamp check). Reports startup time, resident memory
+and whether the worker opened the database file. Each worker pays the same
+imports, so the difference is the catalog source.
+
+    uv run python benchmarks/bench_catalog_snapshot.py --workers 4
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+# Runs in each worker: load the catalog, print timings and memory as JSON
+WORKER = """
+import json, resource, time
+start = time.perf_counter()
+from app.core import database
+from app.services import catalog as catalog_module
+imported = time.perf_counter()
+catalog = catalog_module._load_catalog()
+loaded = time.perf_counter()
+
+def rss_kb():
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'load_ms': (loaded - imported) * 1000,
+    'rss_mb': rss_kb() / 1024,
+    'opened_db': database.duckdb_conn is not None,
+    'yokai': len(catalog.yokai),
+}))
+"""
+
+
+def prepare(workdir: Path) -> tuple:
+    """Seeded database and snapshot paths"""
+    db_path = workdir / 'bench.duckdb'
+    snapshot_path = workdir / 'catalog_snapshot'
+    env = dict(os.environ, DUCKDB_PATH=str(db_path), PYTHONPATH=str(BACKEND))
+    subprocess.run(
+        [sys.executable, str(BACKEND / 'seed_database.py'),
+         '--seed-dir', str(BACKEND / 'seed_data'), '--snapshot', str(snapshot_path)],
+        cwd=workdir, env=env, check=True, stdout=subprocess.DEVNULL
+    )
+    return db_path, snapshot_path
+
+
+def run_worker(db_path: Path, snapshot_path: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=str(BACKEND), DUCKDB_PATH=str(db_path), DUCKDB_READ_ONLY='true',
+               CATALOG_SNAPSHOT_PATH=snapshot_path)
+    result = subprocess.run(
+        [sys.executable, '-c', WORKER],
+        cwd=BACKEND, env=env, check=True, capture_output=True, text=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(label: str, runs: list) -> None:
+    load = statistics.median(run['load_ms'] for run in runs)
+    imports = statistics.median(run['import_ms'] for run in runs)
+    rss = statistics.median(run['rss_mb'] for run in runs)
+    opened = 'opens' if any(run['opened_db'] for run in runs) else 'never opens'
+    print(f"{label:18s} startup {imports + load:7.1f} ms (load {load:6.1f} ms)   RSS {rss:6.1f} MB   "
+          f"{opened} the database   ({runs[0]['yokai']} yokai)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Catalog load time and RSS per worker")
+    parser.add_argument('--workers', type=int, default=4, help='Worker processes per mode (default: 4)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench_snapshot_') as tmp:
+        db_path, snapshot_path = prepare(Path(tmp))
+        duckdb_runs = [run_worker(db_path, '') for _ in range(args.workers)]
+        snapshot_runs = [run_worker(db_path, str(snapshot_path)) for _ in range(args.workers)]
+        snapshot_size = sum(f.stat().st_size for f in snapshot_path.iterdir())
+
+        print(f"Workers per mode:  {args.workers} (medians)")
+        print(f"Database file:     {db_path.stat().st_size / 1024:7.1f} KB")
+        print(f"Snapshot:          {snapshot_size / 1024:7.1f} KB")
+        summarize('DuckDB file', duckdb_runs)
+        summarize('Parquet snapshot', snapshot_runs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
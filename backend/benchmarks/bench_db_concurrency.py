@@ -0,0 +1,102 @@
+"""
+Concurrent throughput of GET /api/yokai/: one shared connection vs per-thread cursors.
+
+Requests go through the real ASGI app (FastAPI runs the sync endpoint in its
+threadpool), against a scratch database filled with synthetic yokai. The
+"shared" run swaps the endpoint's get_db back to a single shared connection.
+
+    uv run python benchmarks/bench_db_concurrency.py --requests 400 --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Point the app at a scratch database before settings are imported
+os.environ['DUCKDB_PATH'] = os.path.join(tempfile.mkdtemp(prefix='bench_db_'), 'bench.duckdb')
+
+import httpx
+
+from app.api import yokai as yokai_api
+from app.core.database import get_duckdb, init_db
+from main import app
+
+
+def seed(count: int) -> None:
+    init_db(drop_existing=True)
+    get_duckdb().executemany(
+        """
+        INSERT INTO yokai (id, name, bs_a_hp, bs_a_str, bs_a_spr, bs_a_def, bs_a_spd,
+                           bs_b_hp, bs_b_str, bs_b_spr, bs_b_def, bs_b_spd,
+                           attack_id, soultimate_id, rank, tribe)
+        VALUES (?, ?, 30, 9, 5, 6, 8, 300, 160, 70, 82, 130, '0xB0B0A793', '0xAD8EF3F5', 'E', 'Brave')
+        """,
+        [(f'{idx:04d}', f'Yokai {idx}') for idx in range(count)]
+    )
+
+
+_shared_lock = threading.Lock()
+
+
+@contextmanager
+def shared_get_db():
+    """
+    get_db before per-thread cursors: every thread on the one global connection.
+
+    Locked, because the unlocked original can crash DuckDB once requests
+    overlap; this is the best case for a single connection.
+    """
+    with _shared_lock:
+        yield get_duckdb()
+
+
+async def run(requests: int, concurrency: int) -> float:
+    """Requests per second for ``requests`` calls, at most ``concurrency`` in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        async def one():
+            async with semaphore:
+                response = await client.get('/api/yokai/')
+                response.raise_for_status()
+
+        await one()  # Warm up
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Concurrent /api/yokai/ throughput")
+    parser.add_argument('--requests', type=int, default=400, help='Requests per run (default: 400)')
+    parser.add_argument('--concurrency', type=int, default=16, help='Requests in flight (default: 16)')
+    parser.add_argument('--yokai', type=int, default=700, help='Rows in the yokai table (default: 700)')
+    args = parser.parse_args()
+
+    seed(args.yokai)
+
+    per_thread_get_db = yokai_api.get_db
+    yokai_api.get_db = shared_get_db
+    try:
+        shared = asyncio.run(run(args.requests, args.concurrency))
+    finally:
+        yokai_api.get_db = per_thread_get_db
+    per_thread = asyncio.run(run(args.requests, args.concurrency))
+
+    print(f"CPUs:                {os.cpu_count()}")
+    print(f"Requests:            {args.requests} ({args.concurrency} in flight, {args.yokai} yokai each)")
+    print(f"shared connection:   {shared:8.1f} req/s")
+    print(f"per-thread cursors:  {per_thread:8.1f} req/s")
+    print(f"Speedup:             {per_thread / shared:8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Matchmaker throughput: drain a queue of N players into battles.
+
+Players (with users/teams rows in a scratch database) join the four tier
+queues with normally distributed ratings and join times spread over the
+last minute; the matcher then runs passes until no more pairs form.
+Redis is fakeredis in-process, which is slower per command than a real
+server, so the numbers are a lower bound; ``--backend memory`` uses the
+in-process queue instead.
+
+    uv run python benchmarks/bench_matchmaker.py --players 20000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Point the app at a scratch database before settings are imported
+os.environ['DUCKDB_PATH'] = os.path.join(tempfile.mkdtemp(prefix='bench_mm_'), 'bench.duckdb')
+
+import fakeredis
+
+from app.core.database import get_duckdb, init_db
+from app.services.matchmaker import Matchmaker
+from app.services.matchmaking_queue import TIERS, MatchmakingQueue, MemoryMatchmakingQueue, RedisMatchmakingQueue
+
+
+async def seed(queue: MatchmakingQueue, players: int, rng: random.Random) -> None:
+    init_db(drop_existing=True)
+    db = get_duckdb()
+    db.executemany(
+        "INSERT INTO users (id, username, hashed_password) VALUES (?, ?, 'x')",
+        [(user_id, f'player{user_id}') for user_id in range(1, players + 1)]
+    )
+    db.executemany(
+        "INSERT INTO teams (id, name, owner_id, yokai_ids) VALUES (?, 'Team', ?, '[]')",
+        [(user_id, user_id) for user_id in range(1, players + 1)]
+    )
+
+    now_ms = int(time.time() * 1000)
+    entries = {tier: [] for tier in TIERS}
+    for user_id in range(1, players + 1):
+        tier = TIERS[user_id % len(TIERS)]
+        entries[tier].append({
+            'user_id': user_id, 'username': f'player{user_id}', 'team_id': user_id, 'tier': tier,
+            'rating': int(rng.gauss(1500, 300)), 'joined_at': now_ms - rng.randint(0, 60_000)
+        })
+    # restore() takes entries with their join times, in one round trip per tier
+    for tier, tier_entries in entries.items():
+        await queue.restore(tier, tier_entries)
+
+
+async def drain(matchmaker: Matchmaker) -> tuple:
+    passes = 0
+    start = time.perf_counter()
+    while await matchmaker.run_once():
+        passes += 1
+    elapsed = time.perf_counter() - start
+    left = sum((await matchmaker.queue.sizes()).values())
+    return passes, elapsed, left
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Matchmaker throughput")
+    parser.add_argument('--players', type=int, default=20000, help='Queued players (default: 20000)')
+    parser.add_argument('--batch', type=int, default=1000, help='Entries per tier per pass (default: 1000)')
+    parser.add_argument('--backend', choices=('redis', 'memory'), default='redis', help='Queue backend (default: redis)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.backend == 'memory':
+        queue = MemoryMatchmakingQueue(ttl=1800)
+    else:
+        queue = RedisMatchmakingQueue(fakeredis.FakeAsyncRedis(decode_responses=True), ttl=1800)
+    asyncio.run(seed(queue, args.players, random.Random(args.seed)))
+
+    async def notify(match):
+        pass
+
+    matchmaker = Matchmaker(queue, notify, batch_size=args.batch)
+    passes, elapsed, left = asyncio.run(drain(matchmaker))
+    stats = matchmaker.stats()
+
+    print(f"Players:        {args.players} over {len(TIERS)} tiers, batch {args.batch}, {args.backend} queue")
+    print(f"Matches:        {stats['matches']} in {passes} passes, {elapsed:.2f}s ({left} left unmatched)")
+    print(f"Throughput:     {stats['matches'] / elapsed * 60:,.0f} matches/min")
+    print(f"Wait to match:  p50 {stats['latency_ms']['p50']} ms, p90 {stats['latency_ms']['p90']} ms, "
+          f"p99 {stats['latency_ms']['p99']} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Matchmaking queue throughput per backend: join, status, peek + claim, leave.
+
+N players join the four tiers, everyone reads their status, the queue is
+drained by peeking batches and claiming them in pairs, then a second round
+of joins is undone with leaves. Each phase reports operations per second.
+The Redis backend runs on in-process fakeredis unless ``--redis-url`` is
+given, so its numbers include fakeredis' own Python overhead.
+
+    uv run python benchmarks/bench_matchmaking_queue.py --players 20000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import fakeredis
+import redis.asyncio as aioredis
+
+from app.services.matchmaking_queue import TIERS, MatchmakingQueue, MemoryMatchmakingQueue, RedisMatchmakingQueue
+
+BATCH = 1000
+
+
+def make_queue(backend: str, redis_url: str = None) -> MatchmakingQueue:
+    if backend == 'memory':
+        return MemoryMatchmakingQueue(ttl=1800)
+    if redis_url:
+        return RedisMatchmakingQueue(aioredis.from_url(redis_url, decode_responses=True), ttl=1800)
+    return RedisMatchmakingQueue(fakeredis.FakeAsyncRedis(decode_responses=True), ttl=1800)
+
+
+def _entry(user_id: int) -> dict:
+    return {'user_id': user_id, 'username': f'player{user_id}', 'team_id': user_id,
+            'tier': TIERS[user_id % len(TIERS)], 'rating': 1000 + user_id % 700}
+
+
+async def phases(queue: MatchmakingQueue, players: int) -> dict:
+    if isinstance(queue, RedisMatchmakingQueue):
+        for tier in TIERS:
+            await queue.client.delete(*queue.keys(tier))
+    user_ids = range(1, players + 1)
+    timings = {}
+
+    start = time.perf_counter()
+    for user_id in user_ids:
+        await queue.join(TIERS[user_id % len(TIERS)], user_id, _entry(user_id))
+    timings['join'] = (players, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for user_id in user_ids:
+        await queue.status(TIERS[user_id % len(TIERS)], user_id)
+    timings['status'] = (players, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    claimed = 0
+    for tier in TIERS:
+        while True:
+            entries = await queue.peek(tier, BATCH)
+            if len(entries) < 2:
+                break
+            pairs = [(entries[idx]['user_id'], entries[idx + 1]['user_id']) for idx in range(0, len(entries) - 1, 2)]
+            claimed += 2 * sum(await queue.claim_pairs(tier, pairs))
+    timings['peek+claim'] = (claimed, time.perf_counter() - start)
+
+    for user_id in user_ids:
+        await queue.join(TIERS[user_id % len(TIERS)], user_id, _entry(user_id))
+    start = time.perf_counter()
+    for user_id in user_ids:
+        await queue.leave(TIERS[user_id % len(TIERS)], user_id)
+    timings['leave'] = (players, time.perf_counter() - start)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Matchmaking queue throughput per backend")
+    parser.add_argument('--players', type=int, default=20000, help='Players per phase (default: 20000)')
+    parser.add_argument('--redis-url', help='Benchmark the Redis backend against this server instead of fakeredis')
+    args = parser.parse_args()
+
+    print(f"Players: {args.players} over {len(TIERS)} tiers, claims in batches of {BATCH}")
+    for backend in ('memory', 'redis'):
+        timings = asyncio.run(phases(make_queue(backend, args.redis_url), args.players))
+        line = '   '.join(f"{phase} {count / elapsed:>9,.0f}/s" for phase, (count, elapsed) in timings.items())
+        print(f"{backend:7s} {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Event loop lag while matchmaking endpoints hit Redis: sync vs async client.
+
+A ticker coroutine sleeps 1 ms at a time and records how late it wakes up,
+standing in for the Socket.IO traffic sharing the loop. Meanwhile N
+concurrent "requests" each read a player's queue status plus the active
+battle counter, the way ``GET /api/matchmaking/status`` does:
+
+- sync: one blocking ``redis.Redis`` pipeline + GET per request, called
+  from the coroutine like the old handlers did
+- async: ``RedisMatchmakingQueue.status`` and the GET gathered on the shared
+  ``redis.asyncio`` pool
+
+Without ``--redis-url`` a fakeredis TCP server runs in a child process, so
+every call pays a real socket round trip (and no GIL is shared with it).
+
+    uv run python benchmarks/bench_redis_loop_lag.py --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import redis
+import redis.asyncio as aioredis
+
+from app.services.matchmaking_queue import RedisMatchmakingQueue
+
+TIER = 'OU'
+PLAYERS = 5000
+
+# Replies go out as several small writes; without TCP_NODELAY, Nagle plus
+# delayed ACKs add ~40 ms to every pipeline, which a real server doesn't
+SERVER = """
+import socket, sys
+from fakeredis import TcpFakeServer
+
+class Server(TcpFakeServer):
+    request_queue_size = 256  # socketserver's default backlog of 5 resets pool connects
+
+    def get_request(self):
+        conn, addr = super().get_request()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return conn, addr
+
+Server(('127.0.0.1', int(sys.argv[1]))).serve_forever()
+"""
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server() -> tuple:
+    port = free_port()
+    process = subprocess.Popen([sys.executable, '-c', SERVER, str(port)])
+    url = f'redis://127.0.0.1:{port}/0'
+    client = redis.from_url(url)
+    for _ in range(100):
+        try:
+            client.ping()
+            return process, url
+        except redis.ConnectionError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("fakeredis server did not start")
+
+
+def seed(url: str) -> None:
+    client = redis.from_url(url, decode_responses=True)
+    queue_key, entries_key = RedisMatchmakingQueue.keys(TIER)
+    now_ms = int(time.time() * 1000)
+    client.delete(queue_key, entries_key)
+    client.zadd(queue_key, {str(user_id): now_ms + user_id for user_id in range(PLAYERS)})
+    client.hset(entries_key, mapping={str(user_id): '{}' for user_id in range(PLAYERS)})
+    client.set('active_battles', 42)
+
+
+async def ticker(stop: asyncio.Event, lags: list) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append((time.perf_counter() - start - 0.001) * 1000)
+
+
+async def run(mode: str, url: str, requests: int, concurrency: int) -> dict:
+    queue_key, _ = RedisMatchmakingQueue.keys(TIER)
+    sync_client = redis.from_url(url, decode_responses=True)
+    async_client = aioredis.Redis(connection_pool=aioredis.BlockingConnectionPool.from_url(
+        url, decode_responses=True, max_connections=concurrency
+    ))
+    queue = RedisMatchmakingQueue(async_client, ttl=1800)
+    cutoff = int(time.time() * 1000) - 1_800_000
+
+    async def sync_status(user_id: int) -> None:
+        pipe = sync_client.pipeline(transaction=True)
+        pipe.zrank(queue_key, user_id)
+        pipe.zscore(queue_key, user_id)
+        pipe.zcount(queue_key, '-inf', f'({cutoff}')
+        pipe.zcard(queue_key)
+        pipe.execute()
+        sync_client.get('active_battles')
+
+    async def async_status(user_id: int) -> None:
+        await asyncio.gather(queue.status(TIER, user_id), async_client.get('active_battles'))
+
+    handler = sync_status if mode == 'sync' else async_status
+    pending = iter(range(requests))
+
+    async def worker() -> None:
+        for user_id in pending:
+            await handler(user_id % PLAYERS)
+
+    stop = asyncio.Event()
+    lags: list = []
+    tick = asyncio.create_task(ticker(stop, lags))
+    await asyncio.sleep(0.05)  # Baseline ticks before the load starts
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await tick
+    await async_client.aclose()
+    sync_client.close()
+
+    lags.sort()
+    return {
+        'rps': requests / elapsed,
+        'p50': statistics.median(lags),
+        'p99': lags[min(len(lags) - 1, int(len(lags) * 0.99))],
+        'max': lags[-1],
+        'ticks': len(lags),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Event loop lag under Redis load, sync vs async client")
+    parser.add_argument('--requests', type=int, default=2000, help='Status reads per mode (default: 2000)')
+    parser.add_argument('--concurrency', type=int, default=50, help='Concurrent requests (default: 50)')
+    parser.add_argument('--redis-url', help='Benchmark against this server instead of a local fakeredis')
+    args = parser.parse_args()
+
+    process = None
+    url = args.redis_url
+    if url is None:
+        process, url = start_server()
+    try:
+        seed(url)
+        print(f"Requests: {args.requests} per mode, {args.concurrency} concurrent, {PLAYERS} queued players")
+        for mode in ('sync', 'async'):
+            result = asyncio.run(run(mode, url, args.requests, args.concurrency))
+            print(f"{mode:6s} {result['rps']:8,.0f} req/s   loop lag p50 {result['p50']:6.2f} ms   "
+                  f"p99 {result['p99']:7.2f} ms   max {result['max']:7.2f} ms   ({result['ticks']} ticks)")
+    finally:
+        if process is not None:
+            process.kill()
+            process.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+CPU per turn delivering a battle's events: one emit per socket vs one emit to the battle room.
+
+A real AsyncServer with many sockets connected to it; only the Engine.IO
+send at the end is stubbed out, so packet building, JSON encoding and task
+scheduling all count. The payloads are real action_result/state_delta
+events of a battle played on a synthetic catalog.
+
+    uv run python benchmarks/bench_room_fanout.py --spectators 50 200 1000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import socketio
+
+from app.services.battle_engine import BattleEngine
+from app.services.catalog import MoveCatalog
+from app.sockets.battle_socket import battle_room
+from app.sockets.state_sync import BattleStateSync
+
+
+ATTACK = {'type': 'attack', 'yokai_index': 0, 'target_index': 0, 'move_id': 'punch'}
+
+
+def _yokai(idx: int) -> Dict[str, Any]:
+    return {
+        'id': f'{idx:03d}', 'name': f'Yokai {idx}', 'image': f'{idx:03d}.webp',
+        'bs_a_hp': 30, 'bs_a_str': 9, 'bs_a_spr': 5, 'bs_a_def': 6, 'bs_a_spd': 8,
+        'bs_b_hp': 3000, 'bs_b_str': 160, 'bs_b_spr': 70, 'bs_b_def': 82, 'bs_b_spd': 100 + idx,
+        'fire_res': 0.7, 'water_res': 1.3, 'electric_res': 1.0, 'earth_res': 1.0,
+        'wind_res': 1.0, 'ice_res': 1.0, 'equipment_slots': 1,
+        'attack_prob': 0.6, 'attack_id': 'punch', 'technique_prob': 0.25,
+        'technique_id': None, 'inspirit_prob': 0.1, 'inspirit_id': None,
+        'guard_prob': 0.05, 'soultimate_id': None, 'skill_id': 1,
+        'rank': 'E', 'tribe': 'Brave', 'artwork_image': f'yokai{idx}.png',
+        'tier': 'PU', 'extra': ''
+    }
+
+
+def turn_events(turns: int) -> List[List[Tuple[str, Any]]]:
+    """The public events of each turn, as _battle_action emits them"""
+    catalog = MoveCatalog({
+        'attacks': {'punch': {'id': 'punch', 'command': 'Punch', 'bp': 60}},
+        'yokai': {f'{idx:03d}': _yokai(idx) for idx in range(12)},
+    })
+    engine = BattleEngine([{'id': f'{idx:03d}'} for idx in range(6)],
+                          [{'id': f'{idx:03d}'} for idx in range(6, 12)], catalog=catalog, seed=1)
+    sync = BattleStateSync(engine)
+    sync.snapshot()
+
+    events = []
+    for _ in range(turns):
+        engine.process_action(1, ATTACK)
+        result = engine.process_action(2, ATTACK)
+        result.pop('state', None)
+        events.append([('action_result', result), ('state_delta', sync.delta())])
+    return events
+
+
+async def build_server(sockets: int) -> Tuple[socketio.AsyncServer, List[str]]:
+    sio = socketio.AsyncServer(async_mode='asgi')
+    sent = [0]
+
+    async def send_eio_packet(eio_sid, eio_pkt):
+        sent[0] += 1
+
+    sio._send_eio_packet = send_eio_packet
+    sids = []
+    for idx in range(sockets):
+        sid = await sio.manager.connect(f'eio-{idx}', '/')
+        await sio.enter_room(sid, battle_room('1'))
+        sids.append(sid)
+    sio.sent = sent
+    return sio, sids
+
+
+async def per_socket(sio: socketio.AsyncServer, sids: List[str], turn) -> None:
+    for event, data in turn:
+        for sid in sids:
+            await sio.emit(event, data, to=sid)
+
+
+async def to_room(sio: socketio.AsyncServer, sids: List[str], turn) -> None:
+    for event, data in turn:
+        await sio.emit(event, data, room=battle_room('1'))
+
+
+async def measure(deliver, sockets: int, events) -> Tuple[float, int]:
+    """CPU milliseconds per turn and packets handed to Engine.IO"""
+    sio, sids = await build_server(sockets)
+    start = time.process_time()
+    for turn in events:
+        await deliver(sio, sids, turn)
+    elapsed = time.process_time() - start
+    return elapsed * 1000 / len(events), sio.sent[0]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--spectators', type=int, nargs='+', default=[10, 100, 500])
+    parser.add_argument('--turns', type=int, default=50)
+    args = parser.parse_args()
+
+    events = turn_events(args.turns)
+    print(f"{'sockets':>8} {'per-socket ms/turn':>19} {'room ms/turn':>13} {'speedup':>8}")
+    for spectators in args.spectators:
+        sockets = spectators + 2
+        single, single_sent = await measure(per_socket, sockets, events)
+        room, room_sent = await measure(to_room, sockets, events)
+        assert single_sent == room_sent  # Same packets reach the same sockets
+        print(f"{sockets:>8} {single:>19.2f} {room:>13.2f} {single / room:>7.1f}x")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
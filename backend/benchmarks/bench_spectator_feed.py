@@ -0,0 +1,82 @@
+"""
+Players' CPU per turn with many spectators: spectators in the players' room vs the throttled feed.
+
+With spectators in the players' room every turn is sent to all of them
+before the handler returns. With SpectatorFeed the players' path only
+marks the feed dirty; the broadcaster sends one coalesced update per
+interval, whatever the number of turns. Same real AsyncServer and turn
+payloads as bench_room_fanout.py.
+
+    uv run python benchmarks/bench_spectator_feed.py --spectators 100 500 1000 --turns-per-interval 3
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from bench_room_fanout import build_server, turn_events
+
+from app.services.battle_engine import BattleEngine
+from app.sockets.battle_socket import battle_room
+from app.sockets.spectator_feed import SpectatorBroadcaster, SpectatorFeed
+
+
+async def shared_room(spectators: int, events) -> float:
+    """Players' milliseconds per turn, spectators in the players' room"""
+    sio, _ = await build_server(spectators + 2)
+    start = time.process_time()
+    for turn in events:
+        for event, data in turn:
+            await sio.emit(event, data, room=battle_room('1'))
+    return (time.process_time() - start) * 1000 / len(events)
+
+
+async def with_feed(spectators: int, events, engine: BattleEngine, per_interval: int):
+    """Players' and broadcaster's milliseconds per turn, spectators on the feed"""
+    sio, sids = await build_server(2)
+    feed = SpectatorFeed('1', max_pending=8)
+    await feed.start(sio, engine, {})
+    for idx in range(spectators):
+        sid = await sio.manager.connect(f'spectator-{idx}', '/')
+        await feed.add(sio, sid)
+    broadcaster = SpectatorBroadcaster(interval=0.5)
+
+    players = spectators_cpu = 0.0
+    for number, turn in enumerate(events, 1):
+        start = time.process_time()
+        for event, data in turn:
+            await sio.emit(event, data, room=battle_room('1'))
+        broadcaster.mark(feed, turn[0][1])
+        players += time.process_time() - start
+
+        if number % per_interval == 0:
+            engine.state['turn'] += 1  # Something for the delta to carry
+            start = time.process_time()
+            await broadcaster.flush(sio)
+            spectators_cpu += time.process_time() - start
+            for sid in list(feed._acked):
+                await feed.ack(sio, sid, feed.sync.version)
+    return players * 1000 / len(events), spectators_cpu * 1000 / len(events)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--spectators', type=int, nargs='+', default=[100, 500, 1000])
+    parser.add_argument('--turns', type=int, default=60)
+    parser.add_argument('--turns-per-interval', type=int, default=3)
+    args = parser.parse_args()
+
+    events = turn_events(args.turns)
+    engine = BattleEngine([], [])
+    print(f"{'spectators':>10} {'shared room ms/turn':>20} {'feed: players':>14} {'feed: broadcaster':>18}")
+    for spectators in args.spectators:
+        shared = await shared_room(spectators, events)
+        players, broadcast = await with_feed(spectators, events, engine, args.turns_per_interval)
+        print(f"{spectators:>10} {shared:>20.2f} {players:>14.2f} {broadcast:>18.2f}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Time to compute one move against every yokai: a get_attack_damage loop vs the numpy kernel.
+
+Uses synthetic yokai rows so the catalog size can be scaled past the real one.
+
+    uv run python benchmarks/bench_threat_matrix.py --yokai 1000
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.catalog import MoveCatalog
+from app.services.threat_matrix import build_threat_matrix, get_yokai_columns
+from damage_calc import get_attack_damage, get_batch_damage
+
+
+def build_catalog(count: int) -> MoveCatalog:
+    yokai = {
+        f'{idx:04d}': {
+            'id': f'{idx:04d}', 'name': f'Yokai {idx}',
+            'bs_b_hp': 200 + idx % 200, 'bs_b_str': 100 + idx % 90, 'bs_b_spr': 100 + idx % 70,
+            'bs_b_def': 60 + idx % 120, 'bs_b_spd': 100,
+            'fire_res': 0.7 + (idx % 4) * 0.2, 'water_res': 1.0, 'electric_res': 1.0,
+            'earth_res': 1.0, 'wind_res': 1.0, 'ice_res': 1.0,
+        }
+        for idx in range(count)
+    }
+    return MoveCatalog({
+        'techniques': {'blaze': {
+            'id': 'blaze', 'command': 'Blaze', 'lv1_power': 45, 'lv10_power': 90, 'n_hits': 1, 'element': 'Fire',
+        }},
+        'yokai': yokai,
+    })
+
+
+def loop_matrix(catalog: MoveCatalog) -> None:
+    """One get_attack_damage call per defender and roll bound, what the endpoint would do without the kernel"""
+    attacker = catalog.yokai['0000']
+    move = catalog.techniques['blaze']
+    for defender in catalog.yokai.values():
+        for _ in range(2):
+            get_attack_damage(move, attacker['bs_b_str'], attacker['bs_b_spr'], defender,
+                              defender['bs_b_def'], defender['bs_b_hp'], 2)
+
+
+def kernel_damage(catalog: MoveCatalog) -> None:
+    attacker = catalog.yokai['0000']
+    columns = get_yokai_columns(catalog)
+    get_batch_damage(catalog.techniques['blaze'], attacker['bs_b_str'], attacker['bs_b_spr'],
+                     columns.defence, columns.hp, columns.resistances, 2)
+
+
+def full_matrix(catalog: MoveCatalog) -> None:
+    """Kernel plus building the sorted response rows"""
+    build_threat_matrix(catalog, {'id': '0000'}, 'technique', 'blaze')
+
+
+def best_of(func: Callable[[MoveCatalog], None], catalog: MoveCatalog, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(catalog)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time a threat matrix over the whole catalog")
+    parser.add_argument('--yokai', type=int, default=1000, help='Number of yokai in the catalog (default: 1000)')
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per method, best is kept (default: 20)')
+    args = parser.parse_args()
+
+    catalog = build_catalog(args.yokai)
+    get_yokai_columns(catalog)  # Built once per catalog load, not per request
+
+    loop = best_of(loop_matrix, catalog, args.repeat)
+    kernel = best_of(kernel_damage, catalog, args.repeat)
+    matrix = best_of(full_matrix, catalog, args.repeat)
+
+    print(f"Yokai:                  {args.yokai}")
+    print(f"get_attack_damage loop: {loop * 1000:8.2f} ms")
+    print(f"numpy kernel:           {kernel * 1000:8.2f} ms ({loop / kernel:.0f}x faster)")
+    print(f"full threat matrix:     {matrix * 1000:8.2f} ms (kernel + response rows)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Turn deadlines for many live battles: one asyncio.sleep task per battle vs one TimerWheel.
+
+Every battle resolves a turn and gets a fresh deadline (the old one
+cancelled), repeated for a few rounds; then the event loop idles for a
+while with every deadline pending. Reports CPU per rescheduled deadline,
+CPU per idle second and memory held by the pending deadlines.
+
+    uv run python benchmarks/bench_turn_timers.py --battles 1000 10000 50000
+"""
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from typing import Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.timer_wheel import TimerWheel
+
+
+TURN_TIMEOUT = 60.0
+
+
+async def expired(battle_id) -> None:
+    pass
+
+
+async def sleep_tasks(battles: int, rounds: int, idle: float) -> Tuple[float, float, int]:
+    async def deadline(battle_id):
+        await asyncio.sleep(TURN_TIMEOUT)
+        await expired(battle_id)
+
+    tasks = {}
+    gc.collect()
+    tracemalloc.start()
+    start = time.process_time()
+    for _ in range(rounds):
+        for battle_id in range(battles):
+            task = tasks.get(battle_id)
+            if task is not None:
+                task.cancel()
+            tasks[battle_id] = asyncio.create_task(deadline(battle_id))
+        await asyncio.sleep(0)  # Let the cancelled tasks unwind
+    schedule = time.process_time() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.process_time()
+    await asyncio.sleep(idle)
+    idle_cpu = time.process_time() - start
+
+    for task in tasks.values():
+        task.cancel()
+    await asyncio.gather(*tasks.values(), return_exceptions=True)
+    return schedule / (battles * rounds), idle_cpu / idle, memory
+
+
+async def timer_wheel(battles: int, rounds: int, idle: float) -> Tuple[float, float, int]:
+    wheel = TimerWheel(tick=1.0)
+    gc.collect()
+    tracemalloc.start()
+    start = time.process_time()
+    for _ in range(rounds):
+        for battle_id in range(battles):
+            wheel.schedule(battle_id, TURN_TIMEOUT)
+    schedule = time.process_time() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    runner = asyncio.create_task(wheel.run(expired))
+    start = time.process_time()
+    await asyncio.sleep(idle)
+    idle_cpu = time.process_time() - start
+    runner.cancel()
+    return schedule / (battles * rounds), idle_cpu / idle, memory
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--battles', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--idle', type=float, default=3.0, help='seconds to idle with every deadline pending')
+    args = parser.parse_args()
+
+    print(f"{'battles':>8} {'timers':>12} {'us/reschedule':>14} {'idle cpu %':>11} {'memory MB':>10}")
+    for battles in args.battles:
+        for name, run in (('sleep tasks', sleep_tasks), ('timer wheel', timer_wheel)):
+            per_schedule, idle_cpu, memory = await run(battles, args.rounds, args.idle)
+            print(f"{battles:>8} {name:>12} {per_schedule * 1e6:>14.2f} {idle_cpu * 100:>11.3f} {memory / 1e6:>10.2f}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -1,12 +1,36 @@
 import random
 from typing import Dict, Any, Tuple, Optional, List
 
+import numpy as np
+
 
 #based on DamageCalc.js from hilwin's website repo, which I assume has proper logic
 
 
-def get_random_multiplier() -> float:
-    return round(random.uniform(0.9, 1.1), 2)
+CRIT_CHANCE = 0.05
+CRIT_MULTIPLIER = 1.25
+
+# Defender resistance column for each move element (yokai table columns)
+RESISTANCE_KEYS = {
+    'fire': 'fire_res',
+    'water': 'water_res',
+    'lightning': 'electric_res',
+    'electric': 'electric_res',
+    'earth': 'earth_res',
+    'wind': 'wind_res',
+    'ice': 'ice_res'
+}
+
+
+# get_random_multiplier() rounds a uniform draw to 2 decimals, so the roll is
+# one of 21 values; 0.90 and 1.10 only get half a bucket each
+DAMAGE_ROLLS = tuple(round(0.9 + i * 0.01, 2) for i in range(21))
+DAMAGE_ROLL_WEIGHTS = tuple(0.025 if i in (0, 20) else 0.05 for i in range(21))
+
+
+def get_random_multiplier(rng: Optional[random.Random] = None) -> float:
+    """Damage roll between 0.90 and 1.10, drawn from ``rng`` (global random if None)"""
+    return round((rng or random).uniform(0.9, 1.1), 2)
 
 
 def calculate_stats(
@@ -50,6 +74,93 @@ def calculate_stats(
     return (final_hp, final_str, final_spr, final_def, final_spd)
 
 
+def _move_field(attack_data: Dict[str, Any], *keys: str) -> Any:
+    """
+    First set value among ``keys``: catalog rows use the seeded column names
+    (``lv10_power``, ``n_hits``, ``element``), hand-built moves the legacy ones
+    """
+    for key in keys:
+        value = attack_data.get(key)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def resolve_attack(
+    attack_data: Dict[str, Any],
+    attacker_str: int,
+    attacker_spr: int,
+    attack_type: int,
+    attitude_str_boost: int = 0,
+    attitude_spr_boost: int = 0
+) -> Tuple[int, int, int, Optional[str]]:
+    """
+    Work out the defender-independent inputs of a move
+    
+    Returns:
+        (power, attack stat used, hit amount, resistance column or None)
+    """
+    power = int(_move_field(attack_data, 'bp', 'lv10_power', 'Lv10_power') or 0)
+    hits = int(_move_field(attack_data, 'n_hits', 'N_Hits', 'hits') or 1)
+    chosen_attack_stat = 0
+    hit_amount = 1
+    res_key = None
+    
+    if attack_type == 1:  # Physical Attack
+        chosen_attack_stat = attacker_str + attitude_str_boost
+        hit_amount = hits
+    
+    elif attack_type == 2:  # Technique
+        chosen_attack_stat = attacker_spr + attitude_spr_boost
+        element = _move_field(attack_data, 'element', 'Element', 'attribute')
+        
+        if element:
+            res_key = RESISTANCE_KEYS.get(element.lower())
+        
+        hit_amount = 1
+    
+    elif attack_type == 3:  # Soultimate
+        chosen_attack_stat = attacker_str + attitude_str_boost
+        
+        element = _move_field(attack_data, 'element', 'element_type', 'Element')
+        if element and element.lower() != 'none':
+            chosen_attack_stat = attacker_spr + attitude_spr_boost
+            res_key = RESISTANCE_KEYS.get(element.lower())
+        
+        hit_amount = hits
+    
+    return power, chosen_attack_stat, hit_amount, res_key
+
+
+def get_raw_damage(attack_stat: float, power: float, defence: float) -> float:
+    raw_damage = (attack_stat / 2 + power / 2 - defence / 4)
+    
+    if raw_damage < 1:
+        raw_damage = 1
+    
+    return raw_damage
+
+
+def get_final_damage(
+    raw_damage: float,
+    random_multiplier: float,
+    defence_multiplier: float,
+    elemental_resistance: float,
+    crit_multiplier: float,
+    moxie_multiplier: float
+) -> int:
+    final_damage = (
+        raw_damage * 
+        random_multiplier * 
+        defence_multiplier * 
+        elemental_resistance * 
+        crit_multiplier * 
+        moxie_multiplier
+    )
+    
+    return round(final_damage)
+
+
 def get_attack_damage(
     attack_data: Dict[str, Any],
     attacker_str: int,
@@ -63,7 +174,8 @@ def get_attack_damage(
     is_moxie: bool = False,
     attitude_str_boost: int = 0,
     attitude_spr_boost: int = 0,
-    attitude_def_boost: int = 0
+    attitude_def_boost: int = 0,
+    rng: Optional[random.Random] = None
 ) -> Dict[str, Any]:
     """
     Calculate damage for an attack based on type and conditions
@@ -82,90 +194,46 @@ def get_attack_damage(
         attitude_str_boost: STR boost from attitude
         attitude_spr_boost: SPR boost from attitude
         attitude_def_boost: DEF boost from attitude
+        rng: Random generator for the damage roll (global random if None)
     
     Returns:
         Dictionary with damage, hits to KO, and other combat info
     """
-    power = int(attack_data.get('bp', 0) or attack_data.get('Lv10_power', 0))
-    elemental_resistance = 1.0
-    chosen_attack_stat = 0
-    hit_amount = 1
+    power, chosen_attack_stat, hit_amount, res_key = resolve_attack(
+        attack_data,
+        attacker_str,
+        attacker_spr,
+        attack_type,
+        attitude_str_boost,
+        attitude_spr_boost
+    )
+    elemental_resistance = defender_data.get(res_key, 1.0) if res_key else 1.0
     crit_multiplier = 1.0
     defence = defender_def + attitude_def_boost
     
-    if attack_type == 1:  # Physical Attack
-        chosen_attack_stat = attacker_str + attitude_str_boost
-        hit_amount = attack_data.get('N_Hits', 1) or attack_data.get('hits', 1)
-    
-    elif attack_type == 2:  # Technique
-        chosen_attack_stat = attacker_spr + attitude_spr_boost
-        element = attack_data.get('Element') or attack_data.get('attribute')
-        
-        if element:
-            # Get elemental resistance from defender
-            resistance_map = {
-                'fire': 'fire_res',
-                'water': 'water_res',
-                'lightning': 'lightning_res',
-                'earth': 'earth_res',
-                'wind': 'wind_res',
-                'ice': 'ice_res'
-            }
-            res_key = resistance_map.get(element.lower())
-            if res_key:
-                elemental_resistance = defender_data.get(res_key, 1.0)
-        
-        hit_amount = 1
-    
-    elif attack_type == 3:  
-        chosen_attack_stat = attacker_str + attitude_str_boost
-        
-        element = attack_data.get('element_type') or attack_data.get('Element')
-        if element and element.lower() != 'none':
-            chosen_attack_stat = attacker_spr + attitude_spr_boost
-            
-            resistance_map = {
-                'fire': 'fire_res',
-                'water': 'water_res',
-                'lightning': 'lightning_res',
-                'earth': 'earth_res',
-                'wind': 'wind_res',
-                'ice': 'ice_res'
-            }
-            res_key = resistance_map.get(element.lower())
-            if res_key:
-                elemental_resistance = defender_data.get(res_key, 1.0)
-        
-        hit_amount = attack_data.get('N_Hits', 1) or attack_data.get('hits', 1)
-    
-    random_multiplier = get_random_multiplier()
+    random_multiplier = get_random_multiplier(rng)
     
     defence_multiplier = 0.5 if is_defending else 1.0
     
     if is_crit:
         defence = 0
-        crit_multiplier = 1.25
+        crit_multiplier = CRIT_MULTIPLIER
     
     moxie_multiplier = 1.0
     if is_moxie and attack_type == 3:
         moxie_multiplier = 2.0
     
-    raw_damage = (chosen_attack_stat / 2 + power / 2 - defence / 4)
-    
-    if raw_damage < 1:
-        raw_damage = 1
+    raw_damage = get_raw_damage(chosen_attack_stat, power, defence)
     
-    final_damage = (
-        raw_damage * 
-        random_multiplier * 
-        defence_multiplier * 
-        elemental_resistance * 
-        crit_multiplier * 
+    final_damage = get_final_damage(
+        raw_damage,
+        random_multiplier,
+        defence_multiplier,
+        elemental_resistance,
+        crit_multiplier,
         moxie_multiplier
     )
     
-    final_damage = round(final_damage)
-    
     hits_to_ko = calculate_hits_to_ko(final_damage, defender_hp)
     
     return {
@@ -188,6 +256,53 @@ def get_attack_damage(
     }
 
 
+def get_damage(
+    attack_data: Dict[str, Any],
+    attacker_str: int,
+    attacker_spr: int,
+    defender_data: Dict[str, Any],
+    defender_def: int,
+    attack_type: int,
+    is_defending: bool = False,
+    is_crit: bool = False,
+    is_moxie: bool = False,
+    attitude_str_boost: int = 0,
+    attitude_spr_boost: int = 0,
+    attitude_def_boost: int = 0,
+    rng: Optional[random.Random] = None
+) -> Tuple[int, int]:
+    """
+    Lean get_attack_damage for search and simulation: no breakdown dicts
+    
+    Draws the same roll from ``rng`` and returns the same damage.
+    
+    Returns:
+        (damage, hit amount)
+    """
+    power, chosen_attack_stat, hit_amount, res_key = resolve_attack(
+        attack_data,
+        attacker_str,
+        attacker_spr,
+        attack_type,
+        attitude_str_boost,
+        attitude_spr_boost
+    )
+    elemental_resistance = defender_data.get(res_key, 1.0) if res_key else 1.0
+    random_multiplier = get_random_multiplier(rng)
+    defence = 0 if is_crit else defender_def + attitude_def_boost
+    
+    final_damage = get_final_damage(
+        get_raw_damage(chosen_attack_stat, power, defence),
+        random_multiplier,
+        0.5 if is_defending else 1.0,
+        elemental_resistance,
+        CRIT_MULTIPLIER if is_crit else 1.0,
+        2.0 if is_moxie and attack_type == 3 else 1.0
+    )
+    
+    return final_damage, hit_amount
+
+
 def calculate_hits_to_ko(damage: int, defender_hp: int) -> int:
     """
     Calculate how many hits it takes to KO the defender
@@ -250,6 +365,148 @@ def validate_gym_stats(gym_stats: List[int]) -> bool:
     return True
 
 
+def get_damage_distribution(
+    attack_data: Dict[str, Any],
+    attacker_str: int,
+    attacker_spr: int,
+    defender_data: Dict[str, Any],
+    defender_def: int,
+    defender_hp: int,
+    attack_type: int,
+    is_moxie: bool = False,
+    attitude_str_boost: int = 0,
+    attitude_spr_boost: int = 0,
+    attitude_def_boost: int = 0,
+    crit_chance: float = CRIT_CHANCE
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Exact damage distribution of one hit, without sampling
+    
+    Every damage roll is evaluated with and without a crit, against an open
+    and a guarding defender, in a single array pass using the same arithmetic
+    as get_attack_damage (so each outcome matches it exactly).
+    
+    Returns:
+        {'open': {...}, 'guarding': {...}}, each with 'damage' (damage -> probability),
+        'min', 'max', 'expected' and 'ko_chance' (chance one hit KOs defender_hp)
+    """
+    power, chosen_attack_stat, hit_amount, res_key = resolve_attack(
+        attack_data,
+        attacker_str,
+        attacker_spr,
+        attack_type,
+        attitude_str_boost,
+        attitude_spr_boost
+    )
+    elemental_resistance = defender_data.get(res_key, 1.0) if res_key else 1.0
+    defence = defender_def + attitude_def_boost
+    moxie_multiplier = 2.0 if is_moxie and attack_type == 3 else 1.0
+    
+    # Axes: guard (open, guarding) x crit (no, yes) x roll
+    raw_damage = np.array([
+        get_raw_damage(chosen_attack_stat, power, defence),
+        get_raw_damage(chosen_attack_stat, power, 0)
+    ])
+    crit_multiplier = np.array([1.0, CRIT_MULTIPLIER])
+    defence_multiplier = np.array([1.0, 0.5])
+    rolls = np.array(DAMAGE_ROLLS)
+    
+    damage = (
+        raw_damage[None, :, None] *
+        rolls[None, None, :] *
+        defence_multiplier[:, None, None] *
+        elemental_resistance *
+        crit_multiplier[None, :, None] *
+        moxie_multiplier
+    )
+    # np.rint rounds half to even, like round()
+    damage = np.rint(damage).astype(np.int64)
+    
+    weights = np.array(DAMAGE_ROLL_WEIGHTS)[None, :] * np.array([1.0 - crit_chance, crit_chance])[:, None]
+    
+    distribution = {}
+    for guard_idx, state in enumerate(('open', 'guarding')):
+        values, inverse = np.unique(damage[guard_idx], return_inverse=True)
+        probabilities = np.bincount(inverse.ravel(), weights=weights.ravel())
+        possible = probabilities > 0
+        values, probabilities = values[possible], probabilities[possible]
+        distribution[state] = {
+            'damage': dict(zip(values.tolist(), probabilities.tolist())),
+            'min': int(values[0]),
+            'max': int(values[-1]),
+            'expected': float(np.dot(values, probabilities)),
+            'ko_chance': float(probabilities[values >= defender_hp].sum())
+        }
+    
+    return distribution
+
+
+def get_batch_damage(
+    attack_data: Dict[str, Any],
+    attacker_str: int,
+    attacker_spr: int,
+    defender_def: np.ndarray,
+    defender_hp: np.ndarray,
+    defender_resistances: Dict[str, np.ndarray],
+    attack_type: int,
+    is_defending: bool = False,
+    is_crit: bool = False,
+    is_moxie: bool = False,
+    attitude_str_boost: int = 0,
+    attitude_spr_boost: int = 0,
+    attitude_def_boost: int = 0
+) -> Dict[str, np.ndarray]:
+    """
+    Damage range of one move against many defenders at once
+    
+    Same arithmetic as get_attack_damage, applied to column arrays: entry i
+    of the result is what get_attack_damage gives for defender i with the
+    lowest and highest damage roll.
+    
+    Args:
+        defender_def: DEF stat per defender
+        defender_hp: HP per defender
+        defender_resistances: resistance column name -> value per defender
+            (missing columns count as 1.0)
+    
+    Returns:
+        Arrays 'min', 'max', 'hits_to_ko_min' (from max damage) and
+        'hits_to_ko_max' (from min damage, inf when a hit does no damage)
+    """
+    power, chosen_attack_stat, hit_amount, res_key = resolve_attack(
+        attack_data,
+        attacker_str,
+        attacker_spr,
+        attack_type,
+        attitude_str_boost,
+        attitude_spr_boost
+    )
+    elemental_resistance = defender_resistances.get(res_key, 1.0) if res_key else 1.0
+    crit_multiplier = CRIT_MULTIPLIER if is_crit else 1.0
+    defence_multiplier = 0.5 if is_defending else 1.0
+    moxie_multiplier = 2.0 if is_moxie and attack_type == 3 else 1.0
+    
+    defence = np.zeros(len(defender_def)) if is_crit else defender_def + attitude_def_boost
+    raw_damage = np.maximum(chosen_attack_stat / 2 + power / 2 - defence / 4, 1)
+    
+    damage = {}
+    for bound, roll in (('min', DAMAGE_ROLLS[0]), ('max', DAMAGE_ROLLS[-1])):
+        damage[bound] = np.rint(
+            raw_damage *
+            roll *
+            defence_multiplier *
+            elemental_resistance *
+            crit_multiplier *
+            moxie_multiplier
+        ).astype(np.int64)
+    
+    with np.errstate(divide='ignore'):
+        damage['hits_to_ko_min'] = np.ceil(defender_hp / damage['max'])
+        damage['hits_to_ko_max'] = np.ceil(defender_hp / damage['min'])
+    
+    return damage
+
+
 def calculate_damage_range(
     attack_data: Dict[str, Any],
     attacker_str: int,
@@ -265,54 +522,27 @@ def calculate_damage_range(
     attitude_def_boost: int = 0
 ) -> Dict[str, int]:
     """
-    Calculate minimum and maximum damage range (accounting for random multiplier)
+    Calculate minimum and maximum damage range over every damage roll
     
     Returns:
         Dictionary with 'min' and 'max' damage values
     """
-    min_result = get_attack_damage(
-        attack_data=attack_data,
-        attacker_str=attacker_str,
-        attacker_spr=attacker_spr,
-        defender_data=defender_data,
-        defender_def=defender_def,
-        defender_hp=100,  # TODO: Placeholder
-        attack_type=attack_type,
-        is_defending=is_defending,
-        is_crit=is_crit,
-        is_moxie=is_moxie,
-        attitude_str_boost=attitude_str_boost,
-        attitude_spr_boost=attitude_spr_boost,
-        attitude_def_boost=attitude_def_boost
-    )
-    
-    # Calculate with maximum multiplier (1.1)
-    max_result = get_attack_damage(
+    distribution = get_damage_distribution(
         attack_data=attack_data,
         attacker_str=attacker_str,
         attacker_spr=attacker_spr,
         defender_data=defender_data,
         defender_def=defender_def,
-        defender_hp=100,  # TODO: Placeholder
+        defender_hp=0,
         attack_type=attack_type,
-        is_defending=is_defending,
-        is_crit=is_crit,
         is_moxie=is_moxie,
         attitude_str_boost=attitude_str_boost,
         attitude_spr_boost=attitude_spr_boost,
-        attitude_def_boost=attitude_def_boost
-    )
-    
-    base_multipliers = (
-        min_result['multipliers']['defence'] *
-        min_result['multipliers']['elemental'] *
-        min_result['multipliers']['crit'] *
-        min_result['multipliers']['moxie']
-    )
-    
-    raw = min_result['raw_damage']
+        attitude_def_boost=attitude_def_boost,
+        crit_chance=1.0 if is_crit else 0.0
+    )['guarding' if is_defending else 'open']
     
     return {
-        'min': round(raw * 0.9 * base_multipliers),
-        'max': round(raw * 1.1 * base_multipliers)
+        'min': distribution['min'],
+        'max': distribution['max']
     }
@@ -1,23 +1,85 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from functools import partial
+import asyncio
 import socketio
 from app.core.config import settings
-from app.core.database import init_db
-from app.api import yokai, teams, matchmaking, battles, users, attacks, attitudes, equipment, inspirits, skills, soul_gems, soultimates, techniques
+from app.core.catalog_cache import CatalogCacheMiddleware
+from app.core.database import ReadOnlyDatabaseError, init_db
+from app.core.redis import close_redis, get_redis
+from app.services.battle_store import RedisBattleStore
+from app.services.catalog import reload_catalog
+from app.services.matchmaker import Matchmaker
+from app.api import yokai, teams, matchmaking, battles, users, attacks, attitudes, equipment, inspirits, skills, soul_gems, soultimates, techniques, damage
 from app.sockets import battle_socket
+from app.sockets.battle_router import BattleRouter
 
 
-sio = socketio.AsyncServer(
-    async_mode='asgi',
-    cors_allowed_origins=settings.CORS_ORIGINS.split(',')
-)
+if settings.BATTLE_BACKEND == "redis":
+    # Several workers: emits reach sockets on any of them through Redis, and
+    # websocket only, since polling requests of one client could hit different workers
+    sio = socketio.AsyncServer(
+        async_mode='asgi',
+        cors_allowed_origins=settings.CORS_ORIGINS.split(','),
+        client_manager=socketio.AsyncRedisManager(settings.REDIS_URL),
+        transports=['websocket']
+    )
+else:
+    sio = socketio.AsyncServer(
+        async_mode='asgi',
+        cors_allowed_origins=settings.CORS_ORIGINS.split(',')
+    )
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    reload_catalog()
+    
+    tasks = []
+    if settings.BATTLE_BACKEND == "redis":
+        battle_socket.battle_router = BattleRouter(
+            RedisBattleStore(get_redis(), ttl=settings.BATTLE_STORE_TTL),
+            client=get_redis()
+        )
+        tasks.append(asyncio.create_task(
+            battle_socket.battle_router.listen(partial(battle_socket.handle_event, sio))
+        ))
+    
+    tasks.append(asyncio.create_task(battle_socket.spectator_broadcaster.run(sio)))
+    tasks.append(asyncio.create_task(
+        battle_socket.turn_timers.run(partial(battle_socket.turn_expired, sio))
+    ))
+    
+    # The matcher writes battle records, so it runs on the writer process
+    run_matchmaker = settings.MATCHMAKER_ENABLED
+    if run_matchmaker is None:
+        run_matchmaker = not settings.DUCKDB_READ_ONLY
+    elif run_matchmaker and settings.DUCKDB_READ_ONLY:
+        raise RuntimeError("The matchmaker writes battle records: it can't run with DUCKDB_READ_ONLY")
+    if run_matchmaker:
+        app.state.matchmaker = Matchmaker(
+            await matchmaking.get_matchmaking_queue(),
+            notify=partial(battle_socket.notify_match, sio),
+            batch_size=settings.MATCHMAKER_BATCH_SIZE,
+            interval=settings.MATCHMAKER_INTERVAL,
+            window_base=settings.MATCHMAKING_RATING_WINDOW,
+            window_growth=settings.MATCHMAKING_RATING_WINDOW_GROWTH,
+            window_max=settings.MATCHMAKING_RATING_WINDOW_MAX
+        )
+        tasks.append(asyncio.create_task(app.state.matchmaker.run()))
+    
     yield
+    
+    for task in tasks:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await close_redis()
 
 
 app = FastAPI(
@@ -27,6 +89,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Added first so CORS stays the outermost layer
+app.add_middleware(CatalogCacheMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS.split(','),
@@ -48,6 +113,13 @@ app.include_router(skills.router, prefix="/api/skills", tags=["skills"])
 app.include_router(soul_gems.router, prefix="/api/soul-gems", tags=["soul-gems"])
 app.include_router(soultimates.router, prefix="/api/soultimates", tags=["soultimates"])
 app.include_router(techniques.router, prefix="/api/techniques", tags=["techniques"])
+app.include_router(damage.router, prefix="/api/damage", tags=["damage"])
+
+
+@app.exception_handler(ReadOnlyDatabaseError)
+async def read_only_database(request: Request, exc: ReadOnlyDatabaseError):
+    return JSONResponse(status_code=503, content={"detail": "Read-only battle worker: send writes to the writer process"})
+
 
 battle_socket.register_events(sio)
 
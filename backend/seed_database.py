@@ -1,12 +1,19 @@
 
 import sys
-import json
+import hashlib
 import logging
+import os
+import shutil
+import time
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Dict, Optional, Tuple
 import argparse
 
+import duckdb
+
 from app.core.database import get_duckdb, init_db
+from app.core.config import settings
+from app.services.catalog import seed_stamp_path, write_seed_stamp, write_snapshot
 
 
 logging.basicConfig(
@@ -24,39 +31,154 @@ class SeedingError(Exception):
     pass
 
 
-def load_json_data(file_path: Path) -> List[Dict[str, Any]]:
+# Column of the target table -> (SQL type, expression over the raw JSON columns)
+ColumnSpec = Dict[str, Tuple[str, str]]
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def bulk_load(
+    table: str,
+    file_path: Path,
+    json_columns: Dict[str, str],
+    columns: ColumnSpec,
+    required: Tuple[str, ...] = (),
+    key: str = 'id'
+) -> Tuple[int, int]:
     """
-    Load and parse JSON data from a file.
-    
+    Sync ``table`` with a JSON array file using set-based statements.
+
+    DuckDB's JSON reader parses the file with the declared raw types,
+    each target column is computed and ``TRY_CAST`` in SQL, and rows that
+    would have failed (bad values, missing required columns, duplicate
+    keys) are logged and left out instead of aborting the whole load.
+    Rows that differ from the table are upserted by ``key`` and rows no
+    longer in the file are deleted, so the table ends up mirroring it.
+
     Args:
+        table: Target table
         file_path: Path to the JSON file
-        
+        json_columns: JSON key -> DuckDB type it is read as
+        columns: Target column -> (SQL type, source expression); the
+            expression may use the JSON keys and ``__row`` (1-based index)
+        required: Target columns that may not be NULL, besides ``key``
+        key: Primary key column; later duplicates are rejected
+
     Returns:
-        Parsed JSON data as a list of dictionaries
-        
+        (valid rows in the file, rows in the file)
+
     Raises:
-        SeedingError: If file cannot be read or parsed
+        SeedingError: If the file cannot be read or the insert fails
     """
+    if not file_path.is_file():
+        raise SeedingError(f"File not found: {file_path}")
+
+    checks = []
+    for column, (sql_type, source) in columns.items():
+        checks.append(
+            f"CASE WHEN ({source}) IS NOT NULL AND TRY_CAST(({source}) AS {sql_type}) IS NULL "
+            f"THEN {_literal(column + ': cannot convert ')} || CAST(({source}) AS VARCHAR) END"
+        )
+    for column in (key,) + tuple(required):
+        sql_type, source = columns[column]
+        checks.append(
+            f"CASE WHEN ({source}) IS NULL THEN {_literal(column + ': missing')} END"
+        )
+
+    casts = ', '.join(
+        f"TRY_CAST(({source}) AS {sql_type}) AS {_quote(column)}"
+        for column, (sql_type, source) in columns.items()
+    )
+    json_struct = ', '.join(f"{_literal(name)}: {_literal(sql_type)}" for name, sql_type in json_columns.items())
+    target = ', '.join(_quote(column) for column in columns)
+    key_column = _quote(key)
+
+    db = get_duckdb()
     try:
-        if not file_path.exists():
-            raise SeedingError(f"File not found: {file_path}")
-        
-        if not file_path.is_file():
-            raise SeedingError(f"Not a file: {file_path}")
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-        if not isinstance(data, list):
-            raise SeedingError(f"Expected list in {file_path}, got {type(data).__name__}")
-            
-        logger.debug(f"Loaded {len(data)} records from {file_path.name}")
-        return data
-        
-    except json.JSONDecodeError as e:
-        raise SeedingError(f"Invalid JSON in {file_path}: {e}")
-    except Exception as e:
-        raise SeedingError(f"Error reading {file_path}: {e}")
+        db.execute(f"""
+            CREATE OR REPLACE TEMP TABLE seed_staging AS
+            SELECT * EXCLUDE (errors),
+                CASE
+                    WHEN len(errors) = 0 AND row_number() OVER (
+                        PARTITION BY len(errors) = 0, {key_column} ORDER BY __row
+                    ) > 1 THEN [{_literal(key + ': duplicate ')} || CAST({key_column} AS VARCHAR)]
+                    ELSE errors
+                END AS errors
+            FROM (
+                SELECT __row, {casts},
+                    list_filter([{', '.join(checks)}], error -> error IS NOT NULL) AS errors
+                FROM (
+                    SELECT row_number() OVER () AS __row, *
+                    FROM read_json(?, format = 'array', columns = {{{json_struct}}})
+                ) AS raw
+            ) AS converted
+        """, [str(file_path)])
+
+        for row, errors in db.execute(
+            "SELECT __row, errors FROM seed_staging WHERE len(errors) > 0 ORDER BY __row"
+        ).fetchall():
+            logger.warning(f"Failed to migrate {table} at index {row}: {'; '.join(errors)}")
+
+        removed = db.execute(f"""
+            DELETE FROM {table}
+            WHERE {key_column} NOT IN (SELECT {key_column} FROM seed_staging WHERE len(errors) = 0)
+        """).fetchone()[0]
+        upserted = db.execute(f"""
+            INSERT OR REPLACE INTO {table} ({target})
+            SELECT {target} FROM seed_staging
+            WHERE len(errors) = 0 AND {key_column} IN (
+                SELECT {key_column} FROM (
+                    SELECT {target} FROM seed_staging WHERE len(errors) = 0
+                    EXCEPT
+                    SELECT {target} FROM {table}
+                ) AS changed
+            )
+            ORDER BY __row
+        """).fetchone()[0]
+        migrated, total = db.execute(
+            "SELECT count(*) FILTER (WHERE len(errors) = 0), count(*) FROM seed_staging"
+        ).fetchone()
+        db.execute("DROP TABLE seed_staging")
+    except duckdb.Error as e:
+        raise SeedingError(f"Failed to load {file_path}: {e}")
+
+    logger.debug(f"{table}: {upserted} rows upserted, {removed} removed")
+    return migrated, total
+
+
+def _migrate(label: str, table: str, file_name: str, data_dir: Path, **spec) -> int:
+    logger.info(f"Migrating {label} data...")
+    start = time.perf_counter()
+    migrated, total = bulk_load(table, data_dir / file_name, **spec)
+    logger.info(f"Migrated {migrated}/{total} {label} in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return migrated
+
+
+# Power / hits / soul charge come as strings; empty means unknown
+def _int_or_null(key: str) -> Tuple[str, str]:
+    return 'INTEGER', f"NULLIF({_quote(key)}, '')"
+
+
+_MOVE_JSON = {
+    'ID': 'VARCHAR', 'Command': 'VARCHAR', 'Lv1_power': 'VARCHAR', 'Lv10_power': 'VARCHAR',
+    'N_Hits': 'VARCHAR', 'Element': 'VARCHAR', 'Extra': 'VARCHAR',
+}
+
+_MOVE_COLUMNS: ColumnSpec = {
+    'id': ('VARCHAR', '"ID"'),
+    'command': ('VARCHAR', '"Command"'),
+    'lv1_power': _int_or_null('Lv1_power'),
+    'lv10_power': _int_or_null('Lv10_power'),
+    'n_hits': ('INTEGER', '''coalesce(NULLIF("N_Hits", ''), '1')'''),
+    'element': ('VARCHAR', '"Element"'),
+    'extra': ('VARCHAR', '''coalesce("Extra", '')'''),
+}
 
 
 def migrate_yokai(data_dir: Path) -> int:
@@ -72,74 +194,50 @@ def migrate_yokai(data_dir: Path) -> int:
     Raises:
         SeedingError: If migration fails
     """
-    logger.info("Migrating Yokai data...")
-    
-    try:
-        data = load_json_data(data_dir / "yokai.json")
-        db = get_duckdb()
-        
-        migrated = 0
-        for idx, yokai in enumerate(data, start=1):
-            try:
-                db.execute("""
-                    INSERT INTO yokai (
-                        id, name, image, 
-                        bs_a_hp, bs_a_str, bs_a_spr, bs_a_def, bs_a_spd,
-                        bs_b_hp, bs_b_str, bs_b_spr, bs_b_def, bs_b_spd,
-                        fire_res, water_res, electric_res, earth_res, wind_res, ice_res,
-                        equipment_slots, attack_prob, attack_id, technique_prob, technique_id,
-                        inspirit_prob, inspirit_id, guard_prob, soultimate_id, skill_id,
-                        rank, tribe, artwork_image, tier, extra
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, [
-                    yokai.get('ID'),
-                    yokai.get('name'),
-                    yokai.get('image'),
-                    yokai.get('BS_A_HP'),
-                    yokai.get('BS_A_Str'),
-                    yokai.get('BS_A_Spr'),
-                    yokai.get('BS_A_Def'),
-                    yokai.get('BS_A_Spd'),
-                    yokai.get('BS_B_HP'),
-                    yokai.get('BS_B_Str'),
-                    yokai.get('BS_B_Spr'),
-                    yokai.get('BS_B_Def'),
-                    yokai.get('BS_B_Spd'),
-                    yokai.get('Fire', 1.0),
-                    yokai.get('Water', 1.0),
-                    yokai.get('Electric', 1.0),
-                    yokai.get('Earth', 1.0),
-                    yokai.get('Wind', 1.0),
-                    yokai.get('Ice', 1.0),
-                    yokai.get('Equipment', 1),
-                    yokai.get('AttackProb', 0.5),
-                    yokai.get('attack'),
-                    yokai.get('techniqueProb', 0.2),
-                    yokai.get('technique'),
-                    yokai.get('inspiritProb', 0.1),
-                    yokai.get('inspirit'),
-                    yokai.get('GuardProb', 0.05),
-                    yokai.get('soultimate'),
-                    yokai.get('skill'),
-                    yokai.get('rank'),
-                    yokai.get('tribe'),
-                    yokai.get('artwork_image'),
-                    yokai.get('tier'),
-                    yokai.get('Extra', '')
-                ])
-                migrated += 1
-            except Exception as e:
-                logger.warning(f"Failed to migrate yokai at index {idx}: {e}")
-                continue
-        
-        logger.info(f"Migrated {migrated}/{len(data)} Yokai")
-        return migrated
-        
-    except SeedingError:
-        raise
-    except Exception as e:
-        raise SeedingError(f"Failed to migrate yokai: {e}")
-
+    resistances = {
+        f'{element.lower()}_res': ('FLOAT', f'coalesce("{element}", 1.0)')
+        for element in ('Fire', 'Water', 'Electric', 'Earth', 'Wind', 'Ice')
+    }
+    base_stats = {
+        f'bs_{form.lower()}_{stat.lower()}': ('INTEGER', f'"BS_{form}_{stat}"')
+        for form in ('A', 'B') for stat in ('HP', 'Str', 'Spr', 'Def', 'Spd')
+    }
+    return _migrate(
+        'Yokai', 'yokai', 'yokai.json', data_dir,
+        json_columns={
+            'ID': 'VARCHAR', 'name': 'VARCHAR', 'image': 'VARCHAR',
+            **{f'BS_{form}_{stat}': 'VARCHAR' for form in ('A', 'B') for stat in ('HP', 'Str', 'Spr', 'Def', 'Spd')},
+            **{element: 'DOUBLE' for element in ('Fire', 'Water', 'Electric', 'Earth', 'Wind', 'Ice')},
+            'Equipment': 'VARCHAR', 'AttackProb': 'DOUBLE', 'attack': 'VARCHAR',
+            'techniqueProb': 'DOUBLE', 'technique': 'VARCHAR', 'inspiritProb': 'DOUBLE',
+            'inspirit': 'VARCHAR', 'GuardProb': 'DOUBLE', 'soultimate': 'VARCHAR', 'skill': 'VARCHAR',
+            'rank': 'VARCHAR', 'tribe': 'VARCHAR', 'artwork_image': 'VARCHAR', 'tier': 'VARCHAR',
+            'Extra': 'VARCHAR',
+        },
+        columns={
+            'id': ('VARCHAR', '"ID"'),
+            'name': ('VARCHAR', '"name"'),
+            'image': ('VARCHAR', '"image"'),
+            **base_stats,
+            **resistances,
+            'equipment_slots': ('INTEGER', '''coalesce("Equipment", '1')'''),
+            'attack_prob': ('FLOAT', 'coalesce("AttackProb", 0.5)'),
+            'attack_id': ('VARCHAR', '"attack"'),
+            'technique_prob': ('FLOAT', 'coalesce("techniqueProb", 0.2)'),
+            'technique_id': ('VARCHAR', '"technique"'),
+            'inspirit_prob': ('FLOAT', 'coalesce("inspiritProb", 0.1)'),
+            'inspirit_id': ('VARCHAR', '"inspirit"'),
+            'guard_prob': ('FLOAT', 'coalesce("GuardProb", 0.05)'),
+            'soultimate_id': ('VARCHAR', '"soultimate"'),
+            'skill_id': ('INTEGER', '"skill"'),
+            'rank': ('VARCHAR', '"rank"'),
+            'tribe': ('VARCHAR', '"tribe"'),
+            'artwork_image': ('VARCHAR', '"artwork_image"'),
+            'tier': ('VARCHAR', '"tier"'),
+            'extra': ('VARCHAR', '''coalesce("Extra", '')'''),
+        },
+        required=('name',)
+    )
 
 def migrate_attacks(data_dir: Path) -> int:
     """
@@ -154,41 +252,10 @@ def migrate_attacks(data_dir: Path) -> int:
     Raises:
         SeedingError: If migration fails
     """
-    logger.info("Migrating attacks data...")
-    
-    try:
-        data = load_json_data(data_dir / "attacks.json")
-        db = get_duckdb()
-        
-        migrated = 0
-        for idx, attack in enumerate(data, start=1):
-            try:
-                db.execute("""
-                    INSERT INTO attacks (
-                        id, command, lv1_power, lv10_power, n_hits, element, extra
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, [
-                    attack.get('ID'),
-                    attack.get('Command'),
-                    int(attack.get('Lv1_power', 0)) if attack.get('Lv1_power') else None,
-                    int(attack.get('Lv10_power', 0)) if attack.get('Lv10_power') else None,
-                    int(attack.get('N_Hits', 1)) if attack.get('N_Hits') else 1,
-                    attack.get('Element'),
-                    attack.get('Extra', '')
-                ])
-                migrated += 1
-            except Exception as e:
-                logger.warning(f"Failed to migrate attack at index {idx}: {e}")
-                continue
-        
-        logger.info(f"Migrated {migrated}/{len(data)} attacks")
-        return migrated
-        
-    except SeedingError:
-        raise
-    except Exception as e:
-        raise SeedingError(f"Failed to migrate attacks: {e}")
-
+    return _migrate(
+        'attacks', 'attacks', 'attacks.json', data_dir,
+        json_columns=_MOVE_JSON, columns=_MOVE_COLUMNS, required=('command',)
+    )
 
 def migrate_techniques(data_dir: Path) -> int:
     """
@@ -203,41 +270,10 @@ def migrate_techniques(data_dir: Path) -> int:
     Raises:
         SeedingError: If migration fails
     """
-    logger.info("Migrating techniques data...")
-    
-    try:
-        data = load_json_data(data_dir / "techniques.json")
-        db = get_duckdb()
-        
-        migrated = 0
-        for idx, technique in enumerate(data, start=1):
-            try:
-                db.execute("""
-                    INSERT INTO techniques (
-                        id, command, lv1_power, lv10_power, n_hits, element, extra
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, [
-                    technique.get('ID'),
-                    technique.get('Command'),
-                    int(technique.get('Lv1_power', 0)) if technique.get('Lv1_power') else None,
-                    int(technique.get('Lv10_power', 0)) if technique.get('Lv10_power') else None,
-                    int(technique.get('N_Hits', 1)) if technique.get('N_Hits') else 1,
-                    technique.get('Element'),
-                    technique.get('Extra', '')
-                ])
-                migrated += 1
-            except Exception as e:
-                logger.warning(f"Failed to migrate technique at index {idx}: {e}")
-                continue
-        
-        logger.info(f"Migrated {migrated}/{len(data)} techniques")
-        return migrated
-        
-    except SeedingError:
-        raise
-    except Exception as e:
-        raise SeedingError(f"Failed to migrate techniques: {e}")
-
+    return _migrate(
+        'techniques', 'techniques', 'techniques.json', data_dir,
+        json_columns=_MOVE_JSON, columns=_MOVE_COLUMNS, required=('command',)
+    )
 
 def migrate_soultimate(data_dir: Path) -> int:
     """
@@ -252,43 +288,15 @@ def migrate_soultimate(data_dir: Path) -> int:
     Raises:
         SeedingError: If migration fails
     """
-    logger.info("Migrating soultimate data...")
-    
-    try:
-        data = load_json_data(data_dir / "soultimates.json")
-        db = get_duckdb()
-        
-        migrated = 0
-        for idx, soultimate in enumerate(data, start=1):
-            try:
-                db.execute("""
-                    INSERT INTO soultimate (
-                        id, command, lv1_power, lv10_power, lv1_soul_charge, lv10_soul_charge, n_hits, element, extra
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, [
-                    soultimate.get('ID'),
-                    soultimate.get('Command'),
-                    int(soultimate.get('Lv1_power', 0)) if soultimate.get('Lv1_power') else None,
-                    int(soultimate.get('Lv10_power', 0)) if soultimate.get('Lv10_power') else None,
-                    int(soultimate.get('Lv1_soul_charge', 0)) if soultimate.get('Lv1_soul_charge') else None,
-                    int(soultimate.get('Lv10_soul_charge', 0)) if soultimate.get('Lv10_soul_charge') else None,
-                    int(soultimate.get('N_Hits', 1)) if soultimate.get('N_Hits') else 1,
-                    soultimate.get('Element'),
-                    soultimate.get('Extra', '')
-                ])
-                migrated += 1
-            except Exception as e:
-                logger.warning(f"Failed to migrate soultimate at index {idx}: {e}")
-                continue
-        
-        logger.info(f"Migrated {migrated}/{len(data)} soultimates")
-        return migrated
-        
-    except SeedingError:
-        raise
-    except Exception as e:
-        raise SeedingError(f"Failed to migrate soultimates: {e}")
-
+    columns = dict(_MOVE_COLUMNS)
+    columns['lv1_soul_charge'] = _int_or_null('Lv1_soul_charge')
+    columns['lv10_soul_charge'] = _int_or_null('Lv10_soul_charge')
+    return _migrate(
+        'soultimates', 'soultimate', 'soultimates.json', data_dir,
+        json_columns={**_MOVE_JSON, 'Lv1_soul_charge': 'VARCHAR', 'Lv10_soul_charge': 'VARCHAR'},
+        columns=columns,
+        required=('command',)
+    )
 
 def migrate_inspirit(data_dir: Path) -> int:
     """
@@ -303,41 +311,17 @@ def migrate_inspirit(data_dir: Path) -> int:
     Raises:
         SeedingError: If migration fails
     """
-    logger.info("Migrating inspirit data...")
-    
-    try:
-        data = load_json_data(data_dir / "inspirits.json")
-        db = get_duckdb()
-        
-        migrated = 0
-        for idx, inspirit in enumerate(data, start=1):
-            try:
-                # Convert effects array to JSON string
-                effects_json = json.dumps(inspirit.get('Effect', []))
-                
-                db.execute("""
-                    INSERT INTO inspirit (
-                        id, command, effects, image
-                    ) VALUES (?, ?, ?, ?)
-                """, [
-                    inspirit.get('ID'),
-                    inspirit.get('Command'),
-                    effects_json,
-                    inspirit.get('image')
-                ])
-                migrated += 1
-            except Exception as e:
-                logger.warning(f"Failed to migrate inspirit at index {idx}: {e}")
-                continue
-        
-        logger.info(f"Migrated {migrated}/{len(data)} inspirits")
-        return migrated
-        
-    except SeedingError:
-        raise
-    except Exception as e:
-        raise SeedingError(f"Failed to migrate inspirits: {e}")
-
+    return _migrate(
+        'inspirits', 'inspirit', 'inspirits.json', data_dir,
+        json_columns={'ID': 'VARCHAR', 'Command': 'VARCHAR', 'Effect': 'JSON', 'image': 'VARCHAR'},
+        columns={
+            'id': ('VARCHAR', '"ID"'),
+            'command': ('VARCHAR', '"Command"'),
+            'effects': ('JSON', '''coalesce("Effect", '[]')'''),
+            'image': ('VARCHAR', '"image"'),
+        },
+        required=('command',)
+    )
 
 def migrate_skills(data_dir: Path) -> int:
     """
@@ -352,37 +336,16 @@ def migrate_skills(data_dir: Path) -> int:
     Raises:
         SeedingError: If migration fails
     """
-    logger.info("Migrating skills data...")
-    
-    try:
-        data = load_json_data(data_dir / "skills.json")
-        db = get_duckdb()
-        
-        migrated = 0
-        for idx, skill in enumerate(data, start=1):
-            try:
-                db.execute("""
-                    INSERT INTO skills (
-                        id, name, description
-                    ) VALUES (?, ?, ?)
-                """, [
-                    skill.get('ID'),
-                    skill.get('name'),
-                    skill.get('description')
-                ])
-                migrated += 1
-            except Exception as e:
-                logger.warning(f"Failed to migrate skill at index {idx}: {e}")
-                continue
-        
-        logger.info(f"Migrated {migrated}/{len(data)} skills")
-        return migrated
-        
-    except SeedingError:
-        raise
-    except Exception as e:
-        raise SeedingError(f"Failed to migrate skills: {e}")
-
+    return _migrate(
+        'skills', 'skills', 'skills.json', data_dir,
+        json_columns={'ID': 'VARCHAR', 'name': 'VARCHAR', 'description': 'VARCHAR'},
+        columns={
+            'id': ('INTEGER', '"ID"'),
+            'name': ('VARCHAR', '"name"'),
+            'description': ('VARCHAR', '"description"'),
+        },
+        required=('name', 'description')
+    )
 
 def migrate_attitudes(data_dir: Path) -> int:
     """
@@ -397,42 +360,17 @@ def migrate_attitudes(data_dir: Path) -> int:
     Raises:
         SeedingError: If migration fails
     """
-    logger.info("Migrating attitudes data...")
-    
-    try:
-        data = load_json_data(data_dir / "attitudes.json")
-        db = get_duckdb()
-        
-        migrated = 0
-        for idx, attitude in enumerate(data, start=1):
-            try:
-                boost = attitude.get('boost', [0, 0, 0, 0, 0])
-                db.execute("""
-                    INSERT INTO attitudes (
-                        id, name, boost_hp, boost_str, boost_spr, boost_def, boost_spd
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, [
-                    idx,
-                    attitude.get('name'),
-                    boost[0] if len(boost) > 0 else 0,
-                    boost[1] if len(boost) > 1 else 0,
-                    boost[2] if len(boost) > 2 else 0,
-                    boost[3] if len(boost) > 3 else 0,
-                    boost[4] if len(boost) > 4 else 0,
-                ])
-                migrated += 1
-            except Exception as e:
-                logger.warning(f"Failed to migrate attitude at index {idx}: {e}")
-                continue
-        
-        logger.info(f"Migrated {migrated}/{len(data)} attitudes")
-        return migrated
-        
-    except SeedingError:
-        raise
-    except Exception as e:
-        raise SeedingError(f"Failed to migrate attitudes: {e}")
-
+    # Attitudes have no id in the file: they are numbered in file order
+    boosts = {
+        f'boost_{stat}': ('INTEGER', f'''coalesce("boost"->>{idx}, '0')''')
+        for idx, stat in enumerate(('hp', 'str', 'spr', 'def', 'spd'))
+    }
+    return _migrate(
+        'attitudes', 'attitudes', 'attitudes.json', data_dir,
+        json_columns={'name': 'VARCHAR', 'boost': 'JSON'},
+        columns={'id': ('INTEGER', '__row'), 'name': ('VARCHAR', '"name"'), **boosts},
+        required=('name',)
+    )
 
 def migrate_equipment(data_dir: Path) -> int:
     """
@@ -447,42 +385,25 @@ def migrate_equipment(data_dir: Path) -> int:
     Raises:
         SeedingError: If migration fails
     """
-    logger.info("Migrating equipment data...")
-    
-    try:
-        data = load_json_data(data_dir / "equipment.json")
-        db = get_duckdb()
-        
-        migrated = 0
-        for idx, equipment in enumerate(data, start=1):
-            try:
-                db.execute("""
-                    INSERT INTO equipment (
-                        id, name, description, str_bonus, spr_bonus, def_bonus, spd_bonus, image
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, [
-                    idx,
-                    equipment.get('name'),
-                    equipment.get('description'),
-                    equipment.get('STR', ''),
-                    equipment.get('SPR', ''),
-                    equipment.get('DEF', ''),
-                    equipment.get('SPD', ''),
-                    equipment.get('image')
-                ])
-                migrated += 1
-            except Exception as e:
-                logger.warning(f"Failed to migrate equipment at index {idx}: {e}")
-                continue
-        
-        logger.info(f"Migrated {migrated}/{len(data)} equipment items")
-        return migrated
-        
-    except SeedingError:
-        raise
-    except Exception as e:
-        raise SeedingError(f"Failed to migrate equipment: {e}")
-
+    bonuses = {
+        f'{stat.lower()}_bonus': ('VARCHAR', f'''coalesce("{stat}", '')''')
+        for stat in ('STR', 'SPR', 'DEF', 'SPD')
+    }
+    return _migrate(
+        'equipment items', 'equipment', 'equipment.json', data_dir,
+        json_columns={
+            'name': 'VARCHAR', 'description': 'VARCHAR', 'STR': 'VARCHAR', 'SPR': 'VARCHAR',
+            'DEF': 'VARCHAR', 'SPD': 'VARCHAR', 'image': 'VARCHAR',
+        },
+        columns={
+            'id': ('INTEGER', '__row'),
+            'name': ('VARCHAR', '"name"'),
+            'description': ('VARCHAR', '"description"'),
+            **bonuses,
+            'image': ('VARCHAR', '"image"'),
+        },
+        required=('name',)
+    )
 
 def migrate_soul_gems(data_dir: Path) -> int:
     """
@@ -497,37 +418,110 @@ def migrate_soul_gems(data_dir: Path) -> int:
     Raises:
         SeedingError: If migration fails
     """
-    logger.info("Migrating soul gems data...")
+    return _migrate(
+        'soul gems', 'soul_gems', 'soul_gems.json', data_dir,
+        json_columns={'name': 'VARCHAR', 'description': 'VARCHAR', 'image': 'VARCHAR'},
+        columns={
+            'id': ('INTEGER', '__row'),
+            'name': ('VARCHAR', '"name"'),
+            'description': ('VARCHAR', '"description"'),
+            'image': ('VARCHAR', '"image"'),
+        },
+        required=('name',)
+    )
+
+# Catalog table -> (seed file, migration), in loading order
+SEED_FILES = {
+    'skills': ('skills.json', migrate_skills),
+    'attacks': ('attacks.json', migrate_attacks),
+    'techniques': ('techniques.json', migrate_techniques),
+    'soultimate': ('soultimates.json', migrate_soultimate),
+    'inspirit': ('inspirits.json', migrate_inspirit),
+    'yokai': ('yokai.json', migrate_yokai),
+    'attitudes': ('attitudes.json', migrate_attitudes),
+    'equipment': ('equipment.json', migrate_equipment),
+    'soul_gems': ('soul_gems.json', migrate_soul_gems),
+}
+
+# Hashed along with every seed file: bump it when a column mapping changes
+# so existing databases reload the affected tables
+SEED_FORMAT_VERSION = 1
+
+
+def file_hash(file_path: Path) -> str:
+    """
+    Content hash of a seed file.
     
-    try:
-        data = load_json_data(data_dir / "soul_gems.json")
-        db = get_duckdb()
+    Args:
+        file_path: Path to the JSON file
+        
+    Returns:
+        Hex SHA-256 of the format version and the file bytes
+    """
+    digest = hashlib.sha256(f"seed-format-{SEED_FORMAT_VERSION}\n".encode())
+    digest.update(file_path.read_bytes())
+    return digest.hexdigest()
+
+
+def is_up_to_date(db, table: str, content_hash: str) -> bool:
+    """
+    Whether ``table`` was last seeded from a file with this hash and still holds its rows.
+    
+    Args:
+        db: Database connection
+        table: Catalog table name
+        content_hash: Hash of the current seed file
         
-        migrated = 0
-        for idx, gem in enumerate(data, start=1):
-            try:
-                db.execute("""
-                    INSERT INTO soul_gems (
-                        id, name, description, image
-                    ) VALUES (?, ?, ?, ?)
-                """, [
-                    idx,
-                    gem.get('name'),
-                    gem.get('description'),
-                    gem.get('image')
-                ])
-                migrated += 1
-            except Exception as e:
-                logger.warning(f"Failed to migrate soul gem at index {idx}: {e}")
-                continue
+    Returns:
+        True if seeding the table can be skipped
+    """
+    recorded = db.execute(
+        "SELECT content_hash, row_count FROM seed_metadata WHERE table_name = ?", [table]
+    ).fetchone()
+    if recorded is None or recorded[0] != content_hash:
+        return False
+    return db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == recorded[1]
+
+
+def seed_table(db, table: str, data_dir: Path, force: bool = False) -> Optional[int]:
+    """
+    Sync one catalog table with its seed file, unless the file is unchanged.
+    
+    The upsert and the new hash are committed together, so a failed load
+    leaves the previous contents and hash in place.
+    
+    Args:
+        db: Database connection
+        table: Catalog table name (key of SEED_FILES)
+        data_dir: Directory containing seed data files
+        force: Reload even if the file hash matches
         
-        logger.info(f"Migrated {migrated}/{len(data)} soul gems")
-        return migrated
+    Returns:
+        Number of records migrated, or None if the table was skipped
         
-    except SeedingError:
+    Raises:
+        SeedingError: If migration fails
+    """
+    file_name, migrate = SEED_FILES[table]
+    content_hash = file_hash(data_dir / file_name)
+    if not force and is_up_to_date(db, table, content_hash):
+        logger.info(f"Skipping {table}: {file_name} unchanged")
+        return None
+
+    db.execute("BEGIN TRANSACTION")
+    try:
+        migrated = migrate(data_dir)
+        row_count = db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        db.execute(
+            "INSERT OR REPLACE INTO seed_metadata (table_name, file_name, content_hash, row_count, seeded_at) "
+            "VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)",
+            [table, file_name, content_hash, row_count]
+        )
+    except BaseException:
+        db.execute("ROLLBACK")
         raise
-    except Exception as e:
-        raise SeedingError(f"Failed to migrate soul gems: {e}")
+    db.execute("COMMIT")
+    return migrated
 
 
 def validate_seed_directory(data_dir: Path) -> None:
@@ -573,13 +567,13 @@ def validate_seed_directory(data_dir: Path) -> None:
     logger.info(f"Seed directory validated: {data_dir}")
 
 
-def print_summary(db, stats: Dict[str, int]) -> None:
+def print_summary(db, stats: Dict[str, Optional[int]]) -> None:
     """
     Print summary of seeded data.
     
     Args:
         db: Database connection
-        stats: Dictionary of table names to record counts
+        stats: Dictionary of table names to record counts (None if skipped)
     """
     logger.info("DATABASE SEEDING SUMMARY")
     
@@ -591,47 +585,77 @@ def print_summary(db, stats: Dict[str, int]) -> None:
             actual_count = db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
             migrated_count = stats.get(table, 0)
             status = "good" if actual_count > 0 else "bad"
-            logger.info(f"  {status} {table:20s}: {migrated_count:4d} migrated, {actual_count:4d} in DB")
+            if migrated_count is None:
+                logger.info(f"  {status} {table:20s}: unchanged, {actual_count:4d} in DB")
+            else:
+                logger.info(f"  {status} {table:20s}: {migrated_count:4d} migrated, {actual_count:4d} in DB")
         except Exception as e:
             logger.error(f" {table:20s}: Error querying - {e}")
 
 
 
-def main(data_dir: Path) -> int:
+def write_replica(db, path: Path) -> None:
+    """
+    Copy the seeded database (and its seed stamp) for read-only battle workers.
+
+    DuckDB won't let other processes open a file while the writer has it
+    open, even read-only, so workers get their own copy. The checkpoint
+    folds the WAL into the file first; the copy is built beside ``path``
+    and swapped in whole.
+    """
+    db.execute("CHECKPOINT")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for source, target in ((Path(settings.DUCKDB_PATH), path),
+                           (seed_stamp_path(), Path(f'{path}.seed_version'))):
+        staging = target.with_name(f'.{target.name}-{os.getpid()}')
+        shutil.copyfile(source, staging)
+        os.replace(staging, target)
+
+
+def main(data_dir: Path, force: bool = False, snapshot: Optional[Path] = None,
+         replica: Optional[Path] = None) -> int:
     """
     Main seeding function.
     
+    Only tables whose seed file changed since the last run are loaded.
+    
     Args:
         data_dir: Directory containing JSON seed files
+        force: Drop and rebuild every catalog table
+        snapshot: Also export the catalog snapshot read by workers to this directory
+        replica: Also copy the database here for read-only workers
         
     Returns:
         Exit code (0 for success, 1 for failure)
     """
     try:
         logger.info("Starting database seeding process...")
+        start = time.perf_counter()
         logger.info(f"Seed directory: {data_dir.absolute()}")
         validate_seed_directory(data_dir)
         
         logger.info("Initializing database schema...")
-        init_db(drop_existing=True)
+        init_db(drop_existing=force)
         logger.info("Database schema initialized successfully")
-        stats = {}
         
-      
-        stats['skills'] = migrate_skills(data_dir)
-        stats['attacks'] = migrate_attacks(data_dir)
-        stats['techniques'] = migrate_techniques(data_dir)
-        stats['soultimate'] = migrate_soultimate(data_dir)
-        stats['inspirit'] = migrate_inspirit(data_dir)
-        stats['yokai'] = migrate_yokai(data_dir)
-        stats['attitudes'] = migrate_attitudes(data_dir)
-        stats['equipment'] = migrate_equipment(data_dir)
-        stats['soul_gems'] = migrate_soul_gems(data_dir)
-
         db = get_duckdb()
+        stats = {}
+        for table in SEED_FILES:
+            stats[table] = seed_table(db, table, data_dir, force=force)
+
         print_summary(db, stats)
+        # Lets snapshot workers tell whether their snapshot is current without opening the database
+        write_seed_stamp(db)
+        
+        if snapshot is not None:
+            manifest = write_snapshot(db, str(snapshot))
+            logger.info(f"Wrote catalog snapshot {manifest['version']} to {snapshot}")
+        
+        if replica is not None:
+            write_replica(db, replica)
+            logger.info(f"Wrote read-only replica to {replica}")
         
-        logger.info("Database seeding completed successfully!")
+        logger.info(f"Database seeding completed successfully in {time.perf_counter() - start:.2f}s!")
         return 0
         
     except SeedingError as e:
@@ -662,6 +686,15 @@ Examples:
   
   # Verbose logging
   uv run seed_database.py --seed-dir ./seed_data --verbose
+  
+  # Drop and reload every table, even if the seed files are unchanged
+  uv run seed_database.py --force
+  
+  # Also export the catalog snapshot (serve it with CATALOG_SNAPSHOT_PATH)
+  uv run seed_database.py --snapshot ./data/catalog_snapshot
+  
+  # Also copy the database for read-only battle workers (DUCKDB_READ_ONLY)
+  uv run seed_database.py --replica ./data/somen_spirits_replica.duckdb
         """
     )
     
@@ -672,6 +705,26 @@ Examples:
         help='Directory containing JSON seed files (default: ./seed_data)'
     )
     
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Drop and rebuild all catalog tables instead of only changed ones'
+    )
+    
+    parser.add_argument(
+        '--snapshot',
+        type=str,
+        default=None,
+        help='Write the read-only catalog snapshot used by workers to this directory'
+    )
+    
+    parser.add_argument(
+        '--replica',
+        type=str,
+        default=None,
+        help='Copy the seeded database to this path for read-only workers'
+    )
+    
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -688,5 +741,7 @@ if __name__ == "__main__":
         logging.getLogger().setLevel(logging.DEBUG)
         logger.debug("Verbose logging enabled")
     data_dir = Path(args.seed_dir).resolve()    
-    exit_code = main(data_dir)
+    snapshot = Path(args.snapshot).resolve() if args.snapshot else None
+    replica = Path(args.replica).resolve() if args.replica else None
+    exit_code = main(data_dir, force=args.force, snapshot=snapshot, replica=replica)
     sys.exit(exit_code)
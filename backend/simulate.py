@@ -0,0 +1,419 @@
+import sys
+import json
+import math
+import time
+import random
+import hashlib
+import logging
+import secrets
+import argparse
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.services import catalog as catalog_module
+from app.services.battle_engine import BattleEngine, inspirit_has_effect
+from app.services.catalog import MoveCatalog
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_TURNS = 200
+
+# Chunks per worker; more chunks balance uneven battle lengths, fewer cut IPC
+CHUNKS_PER_WORKER = 4
+
+
+class SimulationError(Exception):
+    pass
+
+
+Policy = Callable[[BattleEngine, int, random.Random], Dict[str, Any]]
+
+
+def _first_alive(team) -> int:
+    for idx, yokai in enumerate(team):
+        if not yokai.is_fainted:
+            return idx
+    return 0
+
+
+def _action(engine: BattleEngine, player_num: int, action_type: str, move_key: str) -> Dict[str, Any]:
+    own_team = engine.state[f'team{player_num}']
+    other_team = engine.state['team2' if player_num == 1 else 'team1']
+    yokai_index = _first_alive(own_team)
+    return {
+        'type': action_type,
+        'yokai_index': yokai_index,
+        'target_index': _first_alive(other_team),
+        'move_id': own_team[yokai_index].get(move_key)
+    }
+
+
+def attack_policy(engine: BattleEngine, player_num: int, rng: random.Random) -> Dict[str, Any]:
+    """Always use the active yokai's basic attack"""
+    return _action(engine, player_num, 'attack', 'attack_id')
+
+
+def greedy_policy(engine: BattleEngine, player_num: int, rng: random.Random) -> Dict[str, Any]:
+    """Soultimate when the soul meter is full, otherwise technique, otherwise attack"""
+    yokai = engine.state[f'team{player_num}'][_first_alive(engine.state[f'team{player_num}'])]
+    if yokai.current_soul >= 100 and yokai.get('soultimate_id'):
+        return _action(engine, player_num, 'soultimate', 'soultimate_id')
+    if yokai.get('technique_id'):
+        return _action(engine, player_num, 'technique', 'technique_id')
+    return _action(engine, player_num, 'attack', 'attack_id')
+
+
+def random_policy(engine: BattleEngine, player_num: int, rng: random.Random) -> Dict[str, Any]:
+    """Pick between the yokai's moves using its attack/technique/inspirit probabilities"""
+    yokai = engine.state[f'team{player_num}'][_first_alive(engine.state[f'team{player_num}'])]
+    if yokai.current_soul >= 100 and yokai.get('soultimate_id'):
+        return _action(engine, player_num, 'soultimate', 'soultimate_id')
+
+    choices = [('attack', 'attack_id', yokai.get('attack_prob') or 0.5)]
+    if yokai.get('technique_id'):
+        choices.append(('technique', 'technique_id', yokai.get('technique_prob') or 0.2))
+    # Only inspirits with parsed effects can be executed by the engine
+    if yokai.get('inspirit_id') and inspirit_has_effect(engine.catalog.inspirits.get(yokai.get('inspirit_id'))):
+        choices.append(('inspirit', 'inspirit_id', yokai.get('inspirit_prob') or 0.1))
+
+    action_type, move_key, _ = rng.choices(choices, weights=[c[2] for c in choices])[0]
+    return _action(engine, player_num, action_type, move_key)
+
+
+POLICIES: Dict[str, Policy] = {
+    'attack': attack_policy,
+    'greedy': greedy_policy,
+    'random': random_policy,
+}
+
+
+def run_battle(
+    team1: List[Dict],
+    team2: List[Dict],
+    policy1: Policy,
+    policy2: Policy,
+    rng: random.Random,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    catalog: Optional[MoveCatalog] = None,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Play one battle to completion (or max_turns) without a socket session.
+
+    ``rng`` drives the policies' choices and ``seed`` the engine's own rolls.
+
+    Returns:
+        Dictionary with winner (0 = draw), turns played and damage dealt per team
+    """
+    engine = BattleEngine(team1, team2, catalog=catalog, seed=seed)
+    damage = {1: 0, 2: 0}
+
+    while not engine.is_battle_over() and engine.turn < max_turns:
+        engine.process_action(1, policy1(engine, 1, rng))
+        engine.process_action(2, policy2(engine, 2, rng))
+
+        for entry in reversed(engine.state['log']):
+            if entry['turn'] != engine.turn:
+                break
+            damage[entry['player']] += entry['result'].get('damage') or 0
+
+    return {
+        'winner': engine.get_winner() if engine.is_battle_over() else 0,
+        'turns': engine.turn,
+        'damage': damage
+    }
+
+
+def derive_seed(base_seed: int, *path: Any) -> int:
+    """
+    Derive an independent 64-bit seed from a base seed and a path like (battle_index,).
+
+    Hashing instead of ``base_seed + i`` keeps neighbouring battles' streams
+    unrelated, and the result only depends on the battle index, not on which
+    worker or chunk played it.
+    """
+    digest = hashlib.blake2b(repr((base_seed, *path)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def _empty_totals() -> Dict[str, Any]:
+    return {
+        'battles': 0,
+        'wins': Counter(),
+        'turns': Counter(),
+        'damage': Counter(),
+    }
+
+
+def _merge_totals(totals: Dict[str, Any], partial: Dict[str, Any]) -> None:
+    totals['battles'] += partial['battles']
+    totals['wins'].update(partial['wins'])
+    totals['turns'].update(partial['turns'])
+    totals['damage'].update(partial['damage'])
+
+
+def _run_chunk(
+    team1: List[Dict],
+    team2: List[Dict],
+    policy1_name: str,
+    policy2_name: str,
+    start: int,
+    count: int,
+    max_turns: int,
+    base_seed: int,
+    catalog: Optional[MoveCatalog] = None
+) -> Dict[str, Any]:
+    policy1 = POLICIES[policy1_name]
+    policy2 = POLICIES[policy2_name]
+    # In a worker this is the catalog installed by _init_worker
+    catalog = catalog if catalog is not None else catalog_module.get_catalog()
+
+    totals = _empty_totals()
+    for battle_index in range(start, start + count):
+        battle_seed = derive_seed(base_seed, battle_index)
+        policy_rng = random.Random(derive_seed(battle_seed, 'policy'))
+        outcome = run_battle(team1, team2, policy1, policy2, policy_rng, max_turns, catalog, battle_seed)
+        totals['battles'] += 1
+        totals['wins'][outcome['winner']] += 1
+        totals['turns'][outcome['turns']] += 1
+        totals['damage'].update(outcome['damage'])
+    return totals
+
+
+def _init_worker(catalog: MoveCatalog) -> None:
+    # Workers never open the database, they get the parent's catalog instead
+    catalog_module.set_catalog(catalog)
+
+
+def _split(total: int, parts: int) -> List[int]:
+    base, extra = divmod(total, parts)
+    return [base + (1 if idx < extra else 0) for idx in range(parts) if base or idx < extra]
+
+
+def run_simulation(
+    team1: List[Dict],
+    team2: List[Dict],
+    battles: int,
+    policy1: str = 'greedy',
+    policy2: str = 'greedy',
+    workers: int = 1,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    seed: Optional[int] = None,
+    catalog: Optional[MoveCatalog] = None
+) -> Dict[str, Any]:
+    """
+    Run ``battles`` headless battles between two teams and aggregate the results.
+
+    Args:
+        team1: Team entries for player 1 (``{'id': yokai_id, ...}``)
+        team2: Team entries for player 2
+        battles: Number of battles to play
+        policy1: Name of the action policy for player 1 (see POLICIES)
+        policy2: Name of the action policy for player 2
+        workers: Worker processes; 0 runs everything in this process
+        max_turns: Battles still going after this many turns count as draws
+        seed: Base seed; battle i is seeded with derive_seed(seed, i), so a run
+            is reproducible for any number of workers. Random if None
+        catalog: Catalog to simulate with (defaults to the process-wide one)
+
+    Returns:
+        Dictionary with win rates, a turn-count histogram, damage totals and throughput
+    """
+    for name in (policy1, policy2):
+        if name not in POLICIES:
+            raise SimulationError(f"Unknown policy '{name}', expected one of {sorted(POLICIES)}")
+    if battles < 1:
+        raise SimulationError("Need at least one battle to simulate")
+
+    catalog = catalog if catalog is not None else catalog_module.get_catalog()
+    for team in (team1, team2):
+        missing = [
+            yokai_id for yokai_id in (entry.get('id', entry.get('yokai_id')) for entry in team)
+            if yokai_id not in catalog.yokai
+        ]
+        if missing:
+            raise SimulationError(f"Unknown yokai ids: {', '.join(map(str, missing))}")
+
+    base_seed = seed if seed is not None else secrets.randbits(64)
+    totals = _empty_totals()
+    started = time.perf_counter()
+
+    if workers <= 0:
+        partial = _run_chunk(team1, team2, policy1, policy2, 0, battles, max_turns, base_seed, catalog)
+        _merge_totals(totals, partial)
+        workers_used = 1
+    else:
+        counts = _split(battles, workers * CHUNKS_PER_WORKER)
+        starts = [sum(counts[:idx]) for idx in range(len(counts))]
+        # spawn, not fork: the parent may hold a DuckDB connection with live threads
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(catalog,)
+        ) as pool:
+            futures = [
+                pool.submit(_run_chunk, team1, team2, policy1, policy2, start, count, max_turns, base_seed)
+                for start, count in zip(starts, counts)
+            ]
+            for future in futures:
+                _merge_totals(totals, future.result())
+        workers_used = workers
+
+    elapsed = time.perf_counter() - started
+    return build_report(totals, elapsed, workers_used, base_seed)
+
+
+def build_report(totals: Dict[str, Any], elapsed: float, workers: int, seed: int) -> Dict[str, Any]:
+    battles = totals['battles']
+    wins = totals['wins']
+    turns = totals['turns']
+    battles_per_sec = battles / elapsed if elapsed > 0 else math.inf
+
+    return {
+        'battles': battles,
+        'seed': seed,
+        'wins': {'team1': wins[1], 'team2': wins[2], 'draw': wins[0]},
+        'win_rates': {
+            'team1': wins[1] / battles,
+            'team2': wins[2] / battles,
+            'draw': wins[0] / battles
+        },
+        'turns': {
+            'histogram': dict(sorted(turns.items())),
+            'mean': sum(t * n for t, n in turns.items()) / battles
+        },
+        'damage': {
+            'team1_total': totals['damage'][1],
+            'team2_total': totals['damage'][2],
+            'team1_per_battle': totals['damage'][1] / battles,
+            'team2_per_battle': totals['damage'][2] / battles
+        },
+        'throughput': {
+            'workers': workers,
+            'elapsed_sec': elapsed,
+            'battles_per_sec': battles_per_sec,
+            'battles_per_sec_per_worker': battles_per_sec / workers
+        }
+    }
+
+
+def _parse_team(value: Any) -> List[Dict]:
+    if isinstance(value, str):
+        value = [part.strip() for part in value.split(',') if part.strip()]
+    if not isinstance(value, list) or not value:
+        raise SimulationError(f"Expected a non-empty team, got {value!r}")
+    return [entry if isinstance(entry, dict) else {'id': str(entry)} for entry in value]
+
+
+def load_team_file(file_path: Path) -> Dict[str, List[Dict]]:
+    """
+    Load both teams from a JSON file shaped like
+    ``{"team1": ["001", ...], "team2": [{"id": "002"}, ...]}``.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise SimulationError(f"Could not read team file {file_path}: {e}")
+
+    if not isinstance(data, dict) or 'team1' not in data or 'team2' not in data:
+        raise SimulationError(f"Team file {file_path} needs 'team1' and 'team2' keys")
+    return {'team1': _parse_team(data['team1']), 'team2': _parse_team(data['team2'])}
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    logger.info("SIMULATION SUMMARY")
+    logger.info(f"  battles            : {report['battles']}")
+    logger.info(f"  seed               : {report['seed']}")
+    for side in ('team1', 'team2', 'draw'):
+        logger.info(f"  {side:18s} : {report['wins'][side]:6d} ({report['win_rates'][side]:.1%})")
+    logger.info(f"  mean turns         : {report['turns']['mean']:.2f}")
+    logger.info(f"  damage per battle  : {report['damage']['team1_per_battle']:.1f} / "
+                f"{report['damage']['team2_per_battle']:.1f}")
+    throughput = report['throughput']
+    logger.info(f"  throughput         : {throughput['battles_per_sec']:.1f} battles/s, "
+                f"{throughput['battles_per_sec_per_worker']:.1f} battles/s per worker "
+                f"({throughput['workers']} workers)")
+    logger.info("  turn histogram:")
+    for turns, count in report['turns']['histogram'].items():
+        logger.info(f"    {turns:4d} turns: {count}")
+
+
+def main(args: argparse.Namespace) -> int:
+    try:
+        if args.team_file:
+            teams = load_team_file(Path(args.team_file))
+        elif args.team1 and args.team2:
+            teams = {'team1': _parse_team(args.team1), 'team2': _parse_team(args.team2)}
+        else:
+            raise SimulationError("Pass --team-file or both --team1 and --team2")
+
+        report = run_simulation(
+            teams['team1'],
+            teams['team2'],
+            battles=args.battles,
+            policy1=args.policy1 or args.policy,
+            policy2=args.policy2 or args.policy,
+            workers=args.workers,
+            max_turns=args.max_turns,
+            seed=args.seed
+        )
+    except SimulationError as e:
+        logger.error(f"  Simulation error: {e}")
+        return 1
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run headless Somen Spirits battles in bulk",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # 10k greedy mirror battles on every core
+  uv run simulate.py --team1 001,002,003 --team2 004,005,006 -n 10000
+
+  # Teams from a file, random vs greedy, 4 workers, JSON output
+  uv run simulate.py --team-file teams.json --policy1 random --policy2 greedy -w 4 --json
+        """
+    )
+
+    parser.add_argument('--team1', type=str, help='Comma-separated yokai ids for player 1')
+    parser.add_argument('--team2', type=str, help='Comma-separated yokai ids for player 2')
+    parser.add_argument('--team-file', type=str, help='JSON file with "team1" and "team2" lists')
+    parser.add_argument('-n', '--battles', type=int, default=1000, help='Number of battles (default: 1000)')
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=multiprocessing.cpu_count(),
+        help='Worker processes, 0 to run in-process (default: CPU count)'
+    )
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='greedy', help='Policy for both players')
+    parser.add_argument('--policy1', choices=sorted(POLICIES), help='Policy for player 1')
+    parser.add_argument('--policy2', choices=sorted(POLICIES), help='Policy for player 2')
+    parser.add_argument('--max-turns', type=int, default=DEFAULT_MAX_TURNS, help='Turn cap before a draw')
+    parser.add_argument('--seed', type=int, help='Base seed, reuse the reported one to reproduce a run')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
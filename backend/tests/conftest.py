@@ -2,8 +2,13 @@ import pytest
 import sys
 import os
 from typing import Generator
+
+# No background matcher polling Redis while the app runs under TestClient
+os.environ.setdefault("MATCHMAKER_ENABLED", "false")
+
 from fastapi.testclient import TestClient
 from app.core.database import init_db, get_db, get_duckdb
+from app.services.catalog import reload_catalog
 from main import socket_app
 
 
@@ -41,6 +46,8 @@ def test_db():
             ('tech_002', 'Test Waterfall', 75, 95, 'Water', 1)
     """)
     
+    reload_catalog()
+    
     yield
     
 
@@ -143,3 +150,46 @@ def sample_battle_state():
         'weather': None,
         'field_effects': []
     }
+
+
+class FakeSio:
+    """Socket.IO server stand-in: keeps registered handlers, rooms and records emits"""
+
+    def __init__(self):
+        self.handlers = {}
+        self.emitted = []
+        self.delivered = []
+        self.rooms = {}
+
+    def event(self, handler):
+        self.handlers[handler.__name__] = handler
+        return handler
+
+    async def emit(self, event, data=None, to=None, room=None, skip_sid=None, **kwargs):
+        target = to or room
+        self.emitted.append((event, data, target))
+        skip = skip_sid if isinstance(skip_sid, list) else [skip_sid]
+        # A room delivers to its members at the time of the emit, a sid to itself
+        for sid in sorted(self.rooms.get(target, {target})):
+            if sid not in skip:
+                self.delivered.append((sid, event, data))
+
+    async def enter_room(self, sid, room, **kwargs):
+        self.rooms.setdefault(room, set()).add(sid)
+
+    async def leave_room(self, sid, room, **kwargs):
+        self.rooms.get(room, set()).discard(sid)
+
+    async def close_room(self, room, **kwargs):
+        self.rooms.pop(room, None)
+
+    def events(self, to=None):
+        """Events sent, or with ``to``, the events that reached that sid"""
+        if to is None:
+            return [event for event, _, _ in self.emitted]
+        return [event for sid, event, _ in self.delivered if sid == to]
+
+
+@pytest.fixture
+def fake_sio():
+    return FakeSio()
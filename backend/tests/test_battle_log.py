@@ -0,0 +1,196 @@
+import pytest
+from app.core.database import get_duckdb
+from app.services.matchmaker import create_battle_records
+from app.services.battle_store import MemoryBattleStore
+from app.sockets import battle_socket
+from app.sockets.battle_router import BattleRouter
+from app.sockets.session_registry import SessionRegistry
+from app.services.battle_engine import BattleEngine
+from app.services.battle_log import BattleLog, BattleLogStore
+from app.services.catalog import MoveCatalog
+
+
+def _entry(turn):
+    return {'turn': turn, 'player': 1, 'action': {'type': 'attack'}, 'result': {'damage': turn}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BattleLogStore(str(tmp_path / 'battle_logs'))
+
+
+class TestBattleLogStore:
+
+    def test_append_and_read(self, store):
+        store.append('battle_1', [_entry(1), _entry(2)])
+        store.append('battle_1', [_entry(3)])
+
+        assert [e['turn'] for e in store.read('battle_1')] == [1, 2, 3]
+        assert store.read('other') == []
+
+    def test_unsafe_ids_stay_inside_directory(self, store, tmp_path):
+        store.append('../../escape', [_entry(1)])
+
+        assert not (tmp_path / 'escape.jsonl').exists()
+        assert store.read('../../escape') == [_entry(1)]
+
+    def test_delete(self, store):
+        store.append('battle_1', [_entry(1)])
+        store.delete('battle_1')
+
+        assert not store.exists('battle_1')
+
+
+class TestBattleLog:
+
+    def test_memory_stays_bounded(self, store):
+        log = BattleLog(capacity=5, store=store, battle_id='b')
+
+        for turn in range(1, 101):
+            log.append(_entry(turn))
+
+        assert len(log.entries) < 10
+        assert len(log) == 100
+        assert log.recent(3) == [_entry(98), _entry(99), _entry(100)]
+
+    def test_full_log_reconstructs_every_entry(self, store):
+        log = BattleLog(capacity=5, store=store, battle_id='b')
+
+        for turn in range(1, 38):
+            log.append(_entry(turn))
+
+        assert [e['turn'] for e in log.full_log()] == list(range(1, 38))
+
+    def test_flush_writes_remaining_entries(self, store):
+        log = BattleLog(capacity=5, store=store, battle_id='b')
+        for turn in range(1, 4):
+            log.append(_entry(turn))
+
+        log.flush()
+
+        assert log.entries == []
+        assert [e['turn'] for e in store.read('b')] == [1, 2, 3]
+
+    def test_without_store_old_entries_are_dropped(self):
+        log = BattleLog(capacity=5)
+
+        for turn in range(1, 51):
+            log.append(_entry(turn))
+
+        assert len(log.entries) < 10
+        assert log.full_log()[-1] == _entry(50)
+
+    def test_reused_battle_id_starts_a_new_file(self, store):
+        store.append('battle_1', [_entry(1)])
+        log = BattleLog(capacity=1, store=store, battle_id='battle_1')
+        log.append(_entry(7))
+        log.flush()
+        assert [e['turn'] for e in store.read('battle_1')] == [7]
+
+    def test_store_needs_battle_id(self, store):
+        with pytest.raises(ValueError):
+            BattleLog(store=store)
+
+
+class TestEngineLog:
+
+    def test_long_battle_keeps_recent_entries_and_spills_the_rest(self, store):
+        catalog = MoveCatalog({'attacks': {'tap': {'id': 'tap', 'command': 'Tap', 'bp': 0}}})
+        fighter = {'name': 'Tank', 'bs_b_hp': 100000, 'bs_b_str': 10, 'bs_b_spr': 10,
+                   'bs_b_def': 500, 'bs_b_spd': 10}
+        engine = BattleEngine([fighter], [fighter], catalog=catalog, seed=1,
+                              battle_id='long_battle', log_store=store)
+        action = {'type': 'attack', 'yokai_index': 0, 'target_index': 0, 'move_id': 'tap'}
+
+        for _ in range(200):
+            engine.process_action(1, action)
+            engine.process_action(2, action)
+
+        assert len(engine.state['log']) < 2 * engine.log.capacity
+        assert len(engine.get_state()['log']) == 10
+        assert engine.get_state()['log'][-1]['turn'] == 200
+        assert len(engine.log.full_log()) == 400
+
+
+def _long_engine(store, battle_id, turns):
+    catalog = MoveCatalog({'attacks': {'tap': {'id': 'tap', 'command': 'Tap', 'bp': 0}}})
+    fighter = {'name': 'Tank', 'bs_b_hp': 100000, 'bs_b_str': 10, 'bs_b_spr': 10,
+               'bs_b_def': 500, 'bs_b_spd': 10}
+    engine = BattleEngine([fighter], [fighter], catalog=catalog, seed=1,
+                          battle_id=battle_id, log_store=store)
+    action = {'type': 'attack', 'yokai_index': 0, 'target_index': 0, 'move_id': 'tap'}
+    for _ in range(turns):
+        engine.process_action(1, action)
+        engine.process_action(2, action)
+    return engine
+
+
+class TestBattleLogEndpoint:
+
+    def test_live_battle_includes_memory_tail(self, client, store, monkeypatch):
+        monkeypatch.setattr(battle_socket, 'battle_log_store', store)
+        engine = _long_engine(store, 987656, 60)
+        monkeypatch.setattr(battle_socket, 'active_battles', {'987656': {'engine': engine}})
+
+        body = client.get('/api/battles/987656/log').json()
+
+        assert len(body['log']) == 120
+        assert body['turns'] == 60
+
+    def test_recorded_live_battle_includes_memory_tail(self, client, store, monkeypatch, test_db):
+        # Matchmade battles have a row with no battle_log while they run
+        db = get_duckdb()
+        for user_id in (911, 912):
+            db.execute("INSERT INTO users (id, username, hashed_password) VALUES (?, ?, 'x')",
+                       [user_id, f'log_player{user_id}'])
+            db.execute("INSERT INTO teams (id, name, owner_id, yokai_ids) VALUES (?, 'Team', ?, '[]')",
+                       [user_id, user_id])
+        try:
+            [battle_id] = create_battle_records('OU', [({'user_id': 911, 'team_id': 911},
+                                                        {'user_id': 912, 'team_id': 912})])
+            monkeypatch.setattr(battle_socket, 'battle_log_store', store)
+            engine = _long_engine(store, battle_id, 60)
+            monkeypatch.setattr(battle_socket, 'active_battles', {str(battle_id): {'engine': engine}})
+            assert len(store.read(battle_id)) < 120
+
+            body = client.get(f'/api/battles/{battle_id}/log').json()
+
+            assert len(body['log']) == 120
+            assert body['turns'] == 60
+        finally:
+            db.execute("DELETE FROM battles WHERE player1_id = 911")
+            db.execute("DELETE FROM teams WHERE id IN (911, 912)")
+            db.execute("DELETE FROM users WHERE id IN (911, 912)")
+
+    def test_log_endpoint_reads_spilled_log(self, client, store, monkeypatch):
+        monkeypatch.setattr(battle_socket, 'battle_log_store', store)
+        store.append(987654, [_entry(1), _entry(2)])
+
+        response = client.get('/api/battles/987654/log')
+
+        assert response.status_code == 200
+        assert [e['turn'] for e in response.json()['log']] == [1, 2]
+
+    def test_log_endpoint_unknown_battle(self, client, store, monkeypatch):
+        monkeypatch.setattr(battle_socket, 'battle_log_store', store)
+
+        response = client.get('/api/battles/987655/log')
+
+        assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+class TestTeardownFlushesLog:
+
+    async def test_disconnect_persists_whole_log(self, fake_sio, store, monkeypatch):
+        monkeypatch.setattr(battle_socket, 'battle_router', BattleRouter(MemoryBattleStore()))
+        monkeypatch.setattr(battle_socket, 'sessions', SessionRegistry())
+        engine = _long_engine(store, 'left_battle', 30)
+        battle = {'player1_sid': 'sid1', 'player2_sid': 'sid2', 'engine': engine,
+                  'feed': battle_socket.SpectatorFeed('left_battle', 8)}
+        monkeypatch.setattr(battle_socket, 'active_battles', {'left_battle': battle})
+
+        await battle_socket.dispatch(fake_sio, 'player_left', 'sid2', {'battle_id': 'left_battle'})
+
+        assert 'left_battle' not in battle_socket.active_battles
+        assert len(store.read('left_battle')) == 60
@@ -0,0 +1,53 @@
+import pytest
+from app.services.battle_store import MemoryBattleStore
+from app.sockets import battle_socket
+from app.sockets.battle_router import BattleRouter
+from app.sockets.session_registry import SessionRegistry
+
+ATTACK = {'type': 'attack', 'yokai_index': 0, 'target_index': 0, 'move_id': 'attack_001'}
+
+
+@pytest.mark.asyncio
+class TestBattleRooms:
+    @pytest.fixture
+    def handlers(self, fake_sio, monkeypatch):
+        monkeypatch.setattr(battle_socket, 'battle_router', BattleRouter(MemoryBattleStore()))
+        monkeypatch.setattr(battle_socket, 'active_battles', {})
+        monkeypatch.setattr(battle_socket, 'sessions', SessionRegistry())
+        battle_socket.register_events(fake_sio)
+        return fake_sio.handlers
+
+    async def _start(self, handlers, team):
+        await handlers['join_battle']('sid1', {'battle_id': 9, 'user_id': 1, 'team': team})
+        await handlers['join_battle']('sid2', {'battle_id': 9, 'user_id': 2, 'team': team})
+
+    async def test_players_share_the_room(self, handlers, fake_sio, test_db, sample_team):
+        await self._start(handlers, sample_team)
+        assert fake_sio.rooms[battle_socket.battle_room('9')] == {'sid1', 'sid2'}
+
+    async def test_turn_is_one_emit_per_event(self, handlers, fake_sio, test_db, sample_team):
+        await self._start(handlers, sample_team)
+        fake_sio.emitted.clear()
+
+        await handlers['battle_action']('sid1', {'battle_id': 9, 'action': ATTACK})
+        # The choice stays private, the opponent only learns player 1 is ready
+        assert fake_sio.emitted[0] == ('action_result', {'status': 'waiting', 'message': 'Waiting for opponent action'}, 'sid1')
+        assert fake_sio.emitted[1] == ('player_ready', {'player': 1}, 'battle:9')
+        assert 'player_ready' not in fake_sio.events('sid1')
+
+        fake_sio.emitted.clear()
+        await handlers['battle_action']('sid2', {'battle_id': 9, 'action': ATTACK})
+        assert [(event, target) for event, _, target in fake_sio.emitted] == [
+            ('action_result', 'battle:9'), ('state_delta', 'battle:9')
+        ]
+        for sid in ('sid1', 'sid2'):
+            assert fake_sio.events(sid)[-2:] == ['action_result', 'state_delta']
+
+    async def test_room_follows_reconnect_and_closes(self, handlers, fake_sio, test_db, sample_team):
+        await self._start(handlers, sample_team)
+        await handlers['join_battle']('sid4', {'battle_id': 9, 'user_id': 1, 'team': sample_team})
+        assert fake_sio.rooms['battle:9'] == {'sid2', 'sid4'}
+
+        await handlers['disconnect']('sid2')
+        assert fake_sio.events('sid4')[-1] == 'opponent_disconnected'
+        assert 'battle:9' not in fake_sio.rooms
@@ -0,0 +1,111 @@
+import asyncio
+import pytest
+from app.services.battle_store import MemoryBattleStore, RedisBattleStore
+from app.sockets import battle_socket
+from app.sockets.battle_router import BattleRouter
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture(params=['redis', 'memory'])
+def store(request):
+    """Every store must pass the same contract tests"""
+    if request.param == 'redis':
+        return RedisBattleStore(fakeredis.FakeAsyncRedis(decode_responses=True), ttl=60)
+    return MemoryBattleStore()
+
+
+@pytest.mark.asyncio
+class TestBattleStore:
+    async def test_first_claim_wins(self, store):
+        assert await store.claim('7', 'worker-a') == 'worker-a'
+        assert await store.claim('7', 'worker-b') == 'worker-a'
+        assert await store.owner('7') == 'worker-a'
+        assert await store.owner('8') is None
+        assert await store.count() == 1
+
+    async def test_record(self, store):
+        await store.claim('7', 'worker-a')
+        await store.update('7', status='waiting', player1_sid='sid1', player1_id=3)
+        await store.update('7', status='active', player2_sid='sid2', player2_id=4)
+
+        assert await store.get('7') == {
+            'owner': 'worker-a', 'status': 'active',
+            'player1_sid': 'sid1', 'player1_id': '3', 'player2_sid': 'sid2', 'player2_id': '4'
+        }
+
+    async def test_remove(self, store):
+        for battle_id in ('7', '8'):
+            await store.claim(battle_id, 'worker-a')
+            await store.update(battle_id, player1_sid='sid1')
+        await store.remove('7')
+        await store.remove('7')  # Already gone
+
+        assert await store.get('7') is None
+        assert (await store.get('8'))['player1_sid'] == 'sid1'
+        assert await store.count() == 1
+        # The same id can start over, e.g. on another worker
+        assert await store.claim('7', 'worker-b') == 'worker-b'
+
+
+@pytest.mark.asyncio
+class TestRedisBattleStore:
+    async def test_active_battles_counter(self):
+        store = RedisBattleStore(fakeredis.FakeAsyncRedis(decode_responses=True))
+        await store.claim('1', 'worker-a')
+        await store.claim('2', 'worker-a')
+        await store.claim('2', 'worker-b')
+        await store.remove('1')
+        await store.remove('1')
+        assert await store.client.get('active_battles') == '1'
+
+
+@pytest.fixture
+def routers():
+    """Two workers sharing one Redis"""
+    server = fakeredis.FakeServer()
+
+    def router(worker_id):
+        client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        return BattleRouter(RedisBattleStore(client), client=client, worker_id=worker_id)
+
+    return router('worker-a'), router('worker-b')
+
+
+@pytest.mark.asyncio
+class TestBattleRouting:
+    async def test_event_forwarded_to_owner(self, routers, fake_sio, monkeypatch):
+        worker_a, worker_b = routers
+        received = []
+
+        async def handle(event, sid, data):
+            received.append((event, sid, data))
+
+        listener = asyncio.create_task(worker_a.listen(handle))
+        await asyncio.sleep(0.05)  # Subscribed
+
+        # Player 1 created the battle on worker A, player 2 is connected to worker B
+        assert await worker_a.owner('5', claim=True) == 'worker-a'
+        monkeypatch.setattr(battle_socket, 'battle_router', worker_b)
+        sio = fake_sio
+        await battle_socket.dispatch(sio, 'join_battle', 'sid-b', {'battle_id': 5, 'user_id': 2}, claim=True)
+
+        for _ in range(100):
+            if received:
+                break
+            await asyncio.sleep(0.01)
+        listener.cancel()
+
+        assert received == [('join_battle', 'sid-b', {'battle_id': 5, 'user_id': 2})]
+        assert sio.emitted == []  # Nothing ran on worker B
+        assert (worker_b.forwarded, worker_a.received) == (1, 1)
+
+    async def test_dead_owner_drops_battle(self, routers, fake_sio, monkeypatch):
+        worker_a, worker_b = routers
+        await worker_a.owner('5', claim=True)  # Worker A isn't listening: it died
+        monkeypatch.setattr(battle_socket, 'battle_router', worker_b)
+        sio = fake_sio
+
+        await battle_socket.dispatch(sio, 'battle_action', 'sid-b', {'battle_id': '5', 'action': {}})
+        assert sio.emitted == [('error', {'message': 'Battle not found'}, 'sid-b')]
+        assert await worker_b.store.get('5') is None
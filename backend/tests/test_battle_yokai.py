@@ -0,0 +1,131 @@
+import json
+import pytest
+from types import MappingProxyType
+from app.services.battle_yokai import BattleYokai, build_battle_yokai
+
+
+@pytest.fixture
+def yokai_row():
+    return MappingProxyType({
+        'id': 'test_001',
+        'name': 'Test Jibanyan',
+        'bs_b_hp': 250,
+        'bs_b_str': 120,
+        'bs_b_spr': 110,
+        'bs_b_def': 115,
+        'bs_b_spd': 130,
+        'fire_res': 1.0,
+        'tribe': 'Charming',
+    })
+
+
+class TestBuildBattleYokai:
+
+    def test_final_stats_from_battle_stats_b(self, yokai_row):
+        fighter = build_battle_yokai(yokai_row)
+
+        assert fighter.max_hp == 250
+        assert fighter.current_hp == 250
+        assert fighter.str_stat == 120
+        assert fighter.spd_stat == 130
+        assert fighter.current_soul == 0
+        assert fighter.is_fainted is False
+
+    def test_references_row_without_copying(self, yokai_row):
+        fighter = build_battle_yokai(yokai_row)
+
+        assert fighter.data is yokai_row
+
+    def test_no_instance_dict(self, yokai_row):
+        fighter = build_battle_yokai(yokai_row)
+
+        assert not hasattr(fighter, '__dict__')
+
+
+class TestDictAccess:
+
+    def test_reads_combat_and_row_fields(self, yokai_row):
+        fighter = build_battle_yokai(yokai_row)
+
+        assert fighter['current_hp'] == 250
+        assert fighter['name'] == 'Test Jibanyan'
+        assert fighter.get('missing', 'default') == 'default'
+        assert 'fire_res' in fighter
+        assert 'missing' not in fighter
+
+    def test_writes_to_row_fields_do_not_touch_shared_row(self, yokai_row):
+        first = build_battle_yokai(yokai_row)
+        second = build_battle_yokai(yokai_row)
+
+        first['fire_res'] = 2.0
+
+        assert first['fire_res'] == 2.0
+        assert second['fire_res'] == 1.0
+        assert yokai_row['fire_res'] == 1.0
+
+    def test_writes_to_combat_fields(self, yokai_row):
+        fighter = build_battle_yokai(yokai_row)
+
+        fighter['current_hp'] = 10
+        fighter['is_fainted'] = True
+
+        assert fighter.current_hp == 10
+        assert fighter.is_fainted is True
+
+
+class TestStagesAndEffects:
+
+    def test_shift_stage_clamps(self, yokai_row):
+        fighter = build_battle_yokai(yokai_row)
+
+        for _ in range(10):
+            fighter.shift_stage('str', 1)
+        for _ in range(10):
+            fighter.shift_stage('def', -1)
+
+        assert fighter.get_stage('str') == 6
+        assert fighter.get_stage('def') == -6
+        assert fighter['stat_modifiers'] == {'str': 6, 'spr': 0, 'def': -6, 'spd': 0}
+
+    def test_status_effects(self, yokai_row):
+        fighter = build_battle_yokai(yokai_row)
+
+        assert fighter.has_status('guarding') is False
+        fighter.add_status_effect('guarding')
+        assert fighter.has_status('guarding') is True
+
+
+class TestSerialization:
+
+    def test_to_dict_matches_legacy_layout(self, yokai_row):
+        fighter = build_battle_yokai(yokai_row)
+        fighter.shift_stage('spd', 2)
+
+        state = fighter.to_dict()
+
+        assert state == {
+            **yokai_row,
+            'max_hp': 250,
+            'current_hp': 250,
+            'str_stat': 120,
+            'spr_stat': 110,
+            'def_stat': 115,
+            'spd_stat': 130,
+            'current_soul': 0,
+            'status_effects': [],
+            'stat_modifiers': {'str': 0, 'spr': 0, 'def': 0, 'spd': 2},
+            'is_fainted': False,
+            'attitude_str_boost': 0,
+            'attitude_spr_boost': 0,
+            'attitude_def_boost': 0,
+            'attitude_spd_boost': 0
+        }
+
+    def test_to_dict_is_json_serializable(self, yokai_row):
+        fighter = build_battle_yokai(yokai_row)
+        fighter['fire_res'] = 0.5
+
+        decoded = json.loads(json.dumps(fighter.to_dict()))
+
+        assert decoded['fire_res'] == 0.5
+        assert decoded['name'] == 'Test Jibanyan'
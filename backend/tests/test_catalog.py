@@ -0,0 +1,164 @@
+import json
+import pytest
+from app.core.database import get_duckdb
+from app.services.battle_engine import BattleEngine
+from app.services import catalog as catalog_module
+from app.services.catalog import MoveCatalog, get_catalog, load_snapshot, reload_catalog, write_snapshot
+
+
+def _fighter(name):
+    return {
+        'name': name,
+        'bs_b_hp': 200,
+        'bs_b_str': 100,
+        'bs_b_spr': 100,
+        'bs_b_def': 100,
+        'bs_b_spd': 100,
+    }
+
+
+class TestMoveCatalog:
+
+    def test_catalog_loads_seeded_moves(self, test_db):
+        catalog = reload_catalog()
+
+        assert catalog.attacks['attack_001']['command'] == 'Test Punch'
+        assert catalog.techniques['tech_001']['element'] == 'Fire'
+
+    def test_catalog_rows_are_read_only(self, test_db):
+        catalog = get_catalog()
+
+        with pytest.raises(TypeError):
+            catalog.attacks['attack_001']['command'] = 'Changed'
+        with pytest.raises(TypeError):
+            catalog.attacks['new_attack'] = {}
+        with pytest.raises(AttributeError):
+            catalog.attacks = {}
+
+    def test_reload_swaps_catalog(self, test_db):
+        old_catalog = get_catalog()
+        db = get_duckdb()
+        db.execute("""
+            INSERT INTO attacks (id, command, lv1_power, lv10_power, n_hits)
+            VALUES ('attack_reload', 'Reload Punch', 10, 20, 1)
+        """)
+        try:
+            new_catalog = reload_catalog()
+
+            assert get_catalog() is new_catalog
+            assert 'attack_reload' in new_catalog.attacks
+            assert 'attack_reload' not in old_catalog.attacks
+        finally:
+            db.execute("DELETE FROM attacks WHERE id = 'attack_reload'")
+            reload_catalog()
+
+
+class TestEngineUsesCatalog:
+
+    def test_engine_resolves_moves_without_database(self, monkeypatch):
+        catalog = MoveCatalog({
+            'attacks': {'a1': {'id': 'a1', 'command': 'Catalog Punch', 'bp': 60}},
+        })
+        engine = BattleEngine([_fighter('Attacker')], [_fighter('Defender')], catalog=catalog)
+
+        def fail_get_db():
+            raise AssertionError("move lookup should not touch the database")
+
+        monkeypatch.setattr(catalog_module, 'get_db', fail_get_db)
+
+        attacker = engine.state['team1'][0]
+        target = engine.state['team2'][0]
+        result = engine._execute_attack(attacker, target, attack_id='a1')
+
+        assert result['success']
+        assert result['attack_name'] == 'Catalog Punch'
+
+    def test_engine_keeps_its_catalog_snapshot(self, test_db):
+        engine = BattleEngine([_fighter('Attacker')], [_fighter('Defender')])
+        pinned = engine.catalog
+
+        reload_catalog()
+
+        assert engine.catalog is pinned
+        assert engine._get_attack_data('attack_001') is not None
+
+
+class TestCatalogSnapshot:
+
+    def _plain(self, catalog):
+        return {
+            attr: {row_id: dict(row) for row_id, row in getattr(catalog, attr).items()}
+            for attr in catalog_module.CATALOG_TABLES.values()
+        }
+
+    def test_snapshot_round_trip(self, test_db, tmp_path):
+        db = get_duckdb()
+        manifest = write_snapshot(db, str(tmp_path / 'snapshot'))
+
+        assert manifest['tables']['attacks']['rows'] == 2
+        assert self._plain(load_snapshot(str(tmp_path / 'snapshot'))) == self._plain(catalog_module.build_catalog(db))
+
+    def test_rewrite_replaces_snapshot(self, test_db, tmp_path):
+        path = str(tmp_path / 'snapshot')
+        first = write_snapshot(get_duckdb(), path)
+        second = write_snapshot(get_duckdb(), path)
+
+        assert first['version'] == second['version']
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['snapshot']
+
+    def test_rejects_other_format(self, test_db, tmp_path):
+        path = tmp_path / 'snapshot'
+        write_snapshot(get_duckdb(), str(path))
+        manifest = json.loads((path / 'manifest.json').read_text())
+        manifest['format'] = catalog_module.SNAPSHOT_FORMAT + 1
+        (path / 'manifest.json').write_text(json.dumps(manifest))
+
+        with pytest.raises(ValueError):
+            load_snapshot(str(path))
+        with pytest.raises(ValueError):
+            load_snapshot(str(tmp_path / 'missing'))
+
+    @pytest.fixture
+    def stamp(self, tmp_path, monkeypatch):
+        path = tmp_path / 'db.duckdb.seed_version'
+        monkeypatch.setattr(catalog_module, 'seed_stamp_path', lambda: path)
+        return path
+
+    def test_rejects_stale_snapshot(self, test_db, tmp_path, monkeypatch, stamp):
+        db = get_duckdb()
+        path = tmp_path / 'snapshot'
+        manifest = write_snapshot(db, str(path))
+        monkeypatch.setattr(catalog_module.settings, 'CATALOG_SNAPSHOT_PATH', str(path))
+        with pytest.raises(ValueError, match='seed stamp'):
+            catalog_module._load_catalog()
+
+        assert catalog_module.write_seed_stamp(db) == manifest['seed_version']
+        assert catalog_module._load_catalog().attacks['attack_001']['command'] == 'Test Punch'
+
+        # Reseeding a table after the export makes the snapshot stale
+        db.execute("INSERT INTO seed_metadata (table_name, file_name, content_hash, row_count) "
+                   "VALUES ('attacks', 'attacks.json', 'new', 2)")
+        try:
+            catalog_module.write_seed_stamp(db)
+            with pytest.raises(ValueError, match='stale'):
+                catalog_module._load_catalog()
+        finally:
+            db.execute("DELETE FROM seed_metadata WHERE table_name = 'attacks'")
+
+    def test_reload_prefers_configured_snapshot(self, test_db, tmp_path, monkeypatch, stamp):
+        path = tmp_path / 'snapshot'
+        write_snapshot(get_duckdb(), str(path))
+        catalog_module.write_seed_stamp(get_duckdb())
+        monkeypatch.setattr(catalog_module.settings, 'CATALOG_SNAPSHOT_PATH', str(path))
+        calls = []
+        monkeypatch.setattr(catalog_module, 'build_catalog', lambda db: calls.append(db))
+        # The snapshot path never opens the database
+        monkeypatch.setattr(catalog_module, 'get_db', lambda: calls.append('get_db'))
+
+        try:
+            catalog = reload_catalog()
+            assert catalog.attacks['attack_001']['command'] == 'Test Punch'
+            assert calls == []
+        finally:
+            monkeypatch.undo()
+            reload_catalog()
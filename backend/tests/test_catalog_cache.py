@@ -0,0 +1,93 @@
+import gzip
+import pytest
+from app.core.catalog_cache import CachedResponse, CatalogCache, catalog_cache
+from app.core.database import get_db
+
+
+@pytest.fixture
+def fresh_cache():
+    """The app's cache, emptied and re-checking table versions on every request"""
+    ttl = catalog_cache.version_ttl
+    catalog_cache.version_ttl = 0
+    catalog_cache.clear()
+    yield catalog_cache
+    catalog_cache.version_ttl = ttl
+    catalog_cache.clear()
+
+
+class TestCatalogCache:
+    def test_table_for_path(self):
+        assert CatalogCache.table_for('/api/yokai/') == 'yokai'
+        assert CatalogCache.table_for('/api/yokai/name/Test') == 'yokai'
+        assert CatalogCache.table_for('/api/soul-gems/') == 'soul_gems'
+        assert CatalogCache.table_for('/api/soultimates/x') == 'soultimate'
+        assert CatalogCache.table_for('/api/teams/') is None
+        assert CatalogCache.table_for('/api/yokaix') is None
+
+    def test_key_ignores_query_order(self):
+        assert CatalogCache.key_for('/api/yokai/', b'rank=D&tribe=Brave') == \
+            CatalogCache.key_for('/api/yokai/', b'tribe=Brave&rank=D')
+        assert CatalogCache.key_for('/api/yokai/', b'rank=D') != CatalogCache.key_for('/api/yokai/', b'rank=E')
+
+    def test_large_bodies_are_gzipped(self):
+        body = b'[' + b','.join(b'{"id": "%d"}' % idx for idx in range(200)) + b']'
+        entry = CachedResponse('v1', body, b'application/json')
+        assert gzip.decompress(entry.gzipped) == body
+        assert CachedResponse('v1', b'[]', b'application/json').gzipped is None
+
+    def test_lru_bound(self):
+        cache = CatalogCache(max_entries=2)
+        for idx in range(3):
+            cache.put(('/api/yokai/', str(idx)), CachedResponse('v', b'[]', b'application/json'))
+        assert len(cache) == 2
+        assert cache.get(('/api/yokai/', '0'), 'v') is None
+        assert cache.get(('/api/yokai/', '2'), 'v') is not None
+
+    def test_stale_version_misses(self):
+        cache = CatalogCache()
+        cache.put(('/api/yokai/', ''), CachedResponse('v1', b'[]', b'application/json'))
+        assert cache.get(('/api/yokai/', ''), 'v1') is not None
+        assert cache.get(('/api/yokai/', ''), 'v2') is None
+
+
+class TestCatalogCacheMiddleware:
+    def test_hit_serves_same_bytes_with_etag(self, client, fresh_cache):
+        first = client.get('/api/techniques/')
+        assert first.status_code == 200
+        assert len(fresh_cache) == 1
+        second = client.get('/api/techniques/')
+        assert second.content == first.content
+        assert second.headers['etag'] == first.headers['etag']
+        assert second.headers['content-type'] == 'application/json'
+
+    def test_if_none_match_returns_304(self, client, fresh_cache):
+        etag = client.get('/api/techniques/').headers['etag']
+        response = client.get('/api/techniques/', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.content == b''
+        assert response.headers['etag'] == etag
+
+    def test_filters_cached_separately(self, client, fresh_cache):
+        all_techniques = client.get('/api/techniques/').json()
+        filtered = client.get('/api/techniques/', params={'element': 'Fire'}).json()
+        assert len(all_techniques) >= 2
+        assert [technique['id'] for technique in filtered] == ['tech_001']
+        assert len(fresh_cache) == 2
+
+    def test_not_found_is_not_cached(self, client, fresh_cache):
+        response = client.get('/api/techniques/does_not_exist')
+        assert response.status_code == 404
+        assert len(fresh_cache) == 0
+
+    def test_table_change_invalidates(self, client, fresh_cache):
+        before = client.get('/api/techniques/tech_001')
+        with get_db() as db:
+            db.execute("UPDATE techniques SET command = 'Test Inferno' WHERE id = 'tech_001'")
+        try:
+            after = client.get('/api/techniques/tech_001', headers={'If-None-Match': before.headers['etag']})
+            assert after.status_code == 200
+            assert after.json()['command'] == 'Test Inferno'
+            assert after.headers['etag'] != before.headers['etag']
+        finally:
+            with get_db() as db:
+                db.execute("UPDATE techniques SET command = 'Test Blaze' WHERE id = 'tech_001'")
@@ -1,9 +1,14 @@
 import pytest
+import random
 from damage_calc import (
     get_random_multiplier,
     calculate_stats,
     get_attack_damage,
-    calculate_hits_to_ko
+    get_damage_distribution,
+    calculate_damage_range,
+    calculate_hits_to_ko,
+    DAMAGE_ROLLS,
+    CRIT_CHANCE
 )
 
 
@@ -21,6 +26,15 @@ class TestRandomMultiplier:
     def test_random_multiplier_precision(self):
         multiplier = get_random_multiplier()
         assert round(multiplier, 2) == multiplier
+    
+    def test_random_multiplier_uses_injected_rng(self):
+        first = [get_random_multiplier(random.Random(42)) for _ in range(5)]
+        second = [get_random_multiplier(random.Random(42)) for _ in range(5)]
+        assert first == second
+        
+        rng_a = random.Random(7)
+        rng_b = random.Random(7)
+        assert [get_random_multiplier(rng_a) for _ in range(20)] == [get_random_multiplier(rng_b) for _ in range(20)]
 
 
 class TestCalculateStats:
@@ -310,6 +324,117 @@ class TestGetAttackDamage:
         assert boosted_result['damage'] > normal_result['damage']
 
 
+class TestSeededDamage:
+    
+    def test_same_seed_same_damage(self):
+        attack_data = {'bp': 60, 'hits': 1}
+        defender_data = {'fire_res': 1.0}
+        
+        def roll(seed):
+            rng = random.Random(seed)
+            return [
+                get_attack_damage(
+                    attack_data,
+                    attacker_str=80,
+                    attacker_spr=75,
+                    defender_data=defender_data,
+                    defender_def=70,
+                    defender_hp=220,
+                    attack_type=1,
+                    rng=rng
+                )['damage']
+                for _ in range(10)
+            ]
+        
+        assert roll(123) == roll(123)
+
+
+class FixedRoll:
+    """Stand-in rng whose damage roll is always ``value``"""
+    
+    def __init__(self, value):
+        self.value = value
+    
+    def uniform(self, a, b):
+        return self.value
+
+
+class TestDamageDistribution:
+    
+    CASES = [
+        ({'bp': 60, 'hits': 1}, 1, {'fire_res': 1.0}),
+        ({'bp': 85, 'attribute': 'Fire'}, 2, {'fire_res': 1.3}),
+        ({'bp': 140, 'element_type': 'Water'}, 3, {'water_res': 0.7}),
+        ({'bp': 5, 'hits': 1}, 1, {}),
+    ]
+    
+    @pytest.mark.parametrize('attack_data,attack_type,defender_data', CASES)
+    def test_matches_get_attack_damage_for_every_outcome(self, attack_data, attack_type, defender_data):
+        distribution = get_damage_distribution(
+            attack_data, attacker_str=180, attacker_spr=150,
+            defender_data=defender_data, defender_def=120, defender_hp=200,
+            attack_type=attack_type, is_moxie=True, attitude_def_boost=10
+        )
+        
+        for state, is_defending in (('open', False), ('guarding', True)):
+            outcomes = {
+                get_attack_damage(
+                    attack_data, 180, 150, defender_data, 120, 200, attack_type,
+                    is_defending=is_defending, is_crit=is_crit, is_moxie=True,
+                    attitude_def_boost=10, rng=FixedRoll(roll)
+                )['damage']
+                for roll in DAMAGE_ROLLS
+                for is_crit in (False, True)
+            }
+            assert set(distribution[state]['damage']) == outcomes
+    
+    def test_probabilities_sum_to_one(self):
+        distribution = get_damage_distribution(
+            {'bp': 60}, 150, 100, {}, 90, 150, attack_type=1
+        )
+        
+        for state in ('open', 'guarding'):
+            assert sum(distribution[state]['damage'].values()) == pytest.approx(1.0)
+    
+    def test_crit_outcomes_get_crit_chance(self):
+        # Crits ignore defence, so with a high DEF they never overlap normal hits
+        distribution = get_damage_distribution(
+            {'bp': 60}, 150, 100, {}, 800, 1000, attack_type=1
+        )['open']
+        
+        assert distribution['min'] == 1
+        crit_probability = sum(p for damage, p in distribution['damage'].items() if damage > 1)
+        assert crit_probability == pytest.approx(CRIT_CHANCE)
+    
+    def test_ko_chance(self):
+        distribution = get_damage_distribution(
+            {'bp': 60}, 150, 100, {}, 90, 0, attack_type=1
+        )
+        assert distribution['open']['ko_chance'] == pytest.approx(1.0)
+        
+        distribution = get_damage_distribution(
+            {'bp': 60}, 150, 100, {}, 90, 10000, attack_type=1
+        )
+        assert distribution['open']['ko_chance'] == 0.0
+        
+        # Somewhere between the weakest and strongest hit
+        hp = (distribution['open']['min'] + distribution['open']['max']) // 2
+        distribution = get_damage_distribution(
+            {'bp': 60}, 150, 100, {}, 90, hp, attack_type=1
+        )
+        assert 0.0 < distribution['open']['ko_chance'] < 1.0
+        assert distribution['open']['ko_chance'] > distribution['guarding']['ko_chance']
+    
+    def test_damage_range_covers_extreme_rolls(self):
+        args = ({'bp': 60}, 150, 100, {}, 90, 300, 1)
+        low = get_attack_damage(*args, rng=FixedRoll(0.9))['damage']
+        high = get_attack_damage(*args, rng=FixedRoll(1.1))['damage']
+        
+        damage_range = calculate_damage_range({'bp': 60}, 150, 100, {}, 90, attack_type=1)
+        
+        assert damage_range == {'min': low, 'max': high}
+
+
 class TestCalculateHitsToKO:
     
     def test_hits_to_ko_calculation(self):
@@ -1,5 +1,22 @@
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
 import pytest
-from app.core.database import get_db
+import threading
+import duckdb
+import redis
+import websockets
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from app.core.database import get_db, get_write_db, get_duckdb
+
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
 
 class TestDatabaseTables:
@@ -129,3 +146,271 @@ class TestDatabaseIntegrity:
         result = db_connection.execute("SELECT * FROM techniques WHERE lv1_power < 0").fetchall()
         assert len(result) == 0
 
+
+
+class TestConnectionHandling:
+    
+    def test_same_thread_reuses_cursor(self, test_db):
+        with get_db() as first, get_db() as second:
+            assert first is second
+            assert first is not get_duckdb()
+    
+    def test_threads_get_their_own_cursor(self, test_db):
+        barrier = threading.Barrier(4)
+        
+        def cursor_id(_):
+            with get_db() as db:
+                barrier.wait()
+                return id(db)
+        
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            ids = set(pool.map(cursor_id, range(4)))
+        
+        assert len(ids) == 4
+    
+    def test_concurrent_reads_keep_their_own_description(self, test_db):
+        queries = [
+            ("SELECT id, name FROM yokai", ['id', 'name']),
+            ("SELECT command FROM attacks", ['command']),
+        ]
+        
+        def run(idx):
+            query, expected = queries[idx % 2]
+            with get_db() as db:
+                db.execute(query).fetchall()
+                return [desc[0] for desc in db.description] == expected
+        
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert all(pool.map(run, range(64)))
+    
+    def test_write_commits_and_is_visible_to_other_threads(self, test_db):
+        with get_write_db() as db:
+            db.execute("INSERT INTO skills (id, name, description) VALUES (9001, 'Write Path', 'test')")
+        
+        def read(_):
+            with get_db() as db:
+                return db.execute("SELECT name FROM skills WHERE id = 9001").fetchone()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                assert pool.submit(read, None).result() == ('Write Path',)
+        finally:
+            with get_write_db() as db:
+                db.execute("DELETE FROM skills WHERE id = 9001")
+    
+    def test_write_rolls_back_on_error(self, test_db):
+        with pytest.raises(RuntimeError):
+            with get_write_db() as db:
+                db.execute("INSERT INTO skills (id, name, description) VALUES (9002, 'Rolled Back', 'test')")
+                raise RuntimeError("abort")
+        
+        with get_db() as db:
+            assert db.execute("SELECT * FROM skills WHERE id = 9002").fetchone() is None
+    
+    def test_concurrent_writers_get_unique_ids(self, test_db):
+        def insert(_):
+            with get_write_db() as db:
+                new_id = (db.execute("SELECT MAX(id) FROM skills WHERE id >= 9100").fetchone()[0] or 9099) + 1
+                db.execute("INSERT INTO skills (id, name, description) VALUES (?, 'Concurrent', 'test')", [new_id])
+        
+        try:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(insert, range(20)))
+            
+            with get_db() as db:
+                ids = [row[0] for row in db.execute("SELECT id FROM skills WHERE id >= 9100").fetchall()]
+            assert sorted(ids) == list(range(9100, 9120))
+        finally:
+            with get_write_db() as db:
+                db.execute("DELETE FROM skills WHERE id >= 9100")
+
+
+class _SocketClient:
+    """Just enough Socket.IO over a raw websocket to play a battle: emit, and wait for an event"""
+
+    def __init__(self, ws, events):
+        self.ws = ws
+        self.events = events
+        self._reader = asyncio.create_task(self._read())
+
+    @classmethod
+    async def connect(cls, port, auth):
+        ws = await websockets.connect(f'ws://127.0.0.1:{port}/socket.io/?EIO=4&transport=websocket')
+        assert (await ws.recv()).startswith('0')  # Engine.IO open
+        await ws.send('40' + json.dumps(auth))
+        events = []
+        while not (packet := await ws.recv()).startswith('40'):  # Connect handlers may emit before the ack
+            events.append(json.loads(packet[2:]))
+        return cls(ws, events)
+
+    async def _read(self):
+        async for packet in self.ws:
+            if packet == '2':
+                await self.ws.send('3')
+            elif packet.startswith('42'):
+                self.events.append(json.loads(packet[2:]))
+
+    async def emit(self, event, data):
+        await self.ws.send('42' + json.dumps([event, data]))
+
+    async def wait_for(self, event, timeout=15):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            for name, *args in self.events:
+                if name == event:
+                    return args[0] if args else None
+            await asyncio.sleep(0.05)
+        raise AssertionError(f'No {event} within {timeout}s, got {[e[0] for e in self.events]}')
+
+    async def close(self):
+        self._reader.cancel()
+        await self.ws.close()
+
+
+@pytest.mark.slow
+class TestMultipleWorkers:
+    """Real processes on one database file, the way a multi-process deployment runs them"""
+
+    def _env(self, tmp_path, **overrides):
+        env = dict(os.environ, DUCKDB_PATH=str(tmp_path / 'db.duckdb'), BATTLE_LOG_DIR=str(tmp_path / 'logs'),
+                   MATCHMAKER_ENABLED='false', MATCHMAKING_BACKEND='memory', BATTLE_BACKEND='memory')
+        env.update(overrides)
+        return {key: value for key, value in env.items() if value is not None}
+
+    def _init_db(self, env):
+        return subprocess.run([sys.executable, '-c', 'from app.core.database import init_db; init_db()'],
+                              cwd=BACKEND, env=env, capture_output=True, text=True, timeout=60)
+
+    def _port(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
+    @contextmanager
+    def _serve(self, tmp_path, name, env, workers=1):
+        """uvicorn on a free port, yielded once all its workers started"""
+        port = self._port()
+        log_path = tmp_path / f'{name}.log'
+        with open(log_path, 'w') as log:
+            server = subprocess.Popen(
+                [sys.executable, '-m', 'uvicorn', 'main:socket_app', '--host', '127.0.0.1',
+                 '--port', str(port), '--workers', str(workers)],
+                cwd=BACKEND, env=env, stdout=log, stderr=log
+            )
+        try:
+            deadline = time.monotonic() + 60
+            while log_path.read_text().count('Application startup complete') < workers:
+                assert server.poll() is None and time.monotonic() < deadline, log_path.read_text()
+                time.sleep(0.2)
+            assert 'Application startup failed' not in log_path.read_text()
+            yield port
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    def _request(self, port, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(f'http://127.0.0.1:{port}{path}', data=data,
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+    def test_second_writer_gets_clear_error(self, tmp_path):
+        env = self._env(tmp_path)
+        assert self._init_db(env).returncode == 0
+
+        holder = duckdb.connect(env['DUCKDB_PATH'])
+        try:
+            result = self._init_db(env)
+        finally:
+            holder.close()
+        assert result.returncode != 0
+        assert 'DUCKDB_READ_ONLY' in result.stderr
+
+    def test_two_read_only_workers_boot(self, tmp_path):
+        env = self._env(tmp_path)
+        assert self._init_db(env).returncode == 0
+
+        with self._serve(tmp_path, 'workers', self._env(tmp_path, DUCKDB_READ_ONLY='true'), workers=2) as port:
+            assert all(self._request(port, '/api/yokai/')[0] == 200 for _ in range(10))
+            assert self._request(port, '/api/users/register', {'username': 'w', 'password': 'pw'})[0] == 503
+
+    @pytest.mark.asyncio
+    async def test_writer_and_battle_workers_play_a_match(self, tmp_path):
+        fakeredis = pytest.importorskip('fakeredis')
+        redis_port = self._port()
+        redis_server = fakeredis.TcpFakeServer(('127.0.0.1', redis_port), server_type='redis')
+        threading.Thread(target=redis_server.serve_forever, daemon=True).start()
+
+        # The TCP fake drops a connection after any error reply, NOSCRIPT included, so load the scripts up front
+        from app.services import battle_store, matchmaking_queue
+        loader = redis.Redis(port=redis_port)
+        for script in (battle_store._CLAIM, battle_store._REMOVE, matchmaking_queue._JOIN, matchmaking_queue._LEAVE,
+                       matchmaking_queue._PEEK, matchmaking_queue._CLAIM_PAIRS):
+            loader.script_load(script)
+        loader.close()
+
+        primary, replica = tmp_path / 'db.duckdb', tmp_path / 'replica.duckdb'
+        shared = dict(BATTLE_BACKEND='redis', MATCHMAKING_BACKEND='redis', MATCHMAKER_ENABLED=None,
+                      MATCHMAKER_INTERVAL='0.1', REDIS_URL=f'redis://127.0.0.1:{redis_port}/0')
+        seeded = subprocess.run(
+            [sys.executable, 'seed_database.py', '--seed-dir', 'seed_data', '--replica', str(replica)],
+            cwd=BACKEND, env=self._env(tmp_path, **shared), capture_output=True, text=True, timeout=120
+        )
+        assert seeded.returncode == 0, seeded.stderr
+        db = duckdb.connect(str(replica), read_only=True)
+        yokai_id, attack_id = db.execute(
+            "SELECT id, attack_id FROM yokai WHERE attack_id IN (SELECT id FROM attacks) ORDER BY id LIMIT 1"
+        ).fetchone()
+        db.close()
+        db = duckdb.connect(str(primary))
+        db.execute("INSERT INTO users (id, username, hashed_password) VALUES (1, 'ann', 'x'), (2, 'bob', 'x')")
+        db.execute("INSERT INTO teams (id, name, owner_id, yokai_ids) VALUES (1, 'ann', 1, '[]'), (2, 'bob', 2, '[]')")
+        db.close()
+
+        worker_env = self._env(tmp_path, DUCKDB_PATH=str(replica), DUCKDB_READ_ONLY='true', **shared)
+        clients = []
+        try:
+            with self._serve(tmp_path, 'writer', self._env(tmp_path, **shared)) as writer, \
+                    self._serve(tmp_path, 'worker_a', worker_env) as worker_a, \
+                    self._serve(tmp_path, 'worker_b', worker_env) as worker_b:
+                # Accounts are writes: the writer takes them, battle workers refuse
+                account = {'username': 'cy', 'password': 'pw'}
+                assert self._request(worker_a, '/api/users/register', account)[0] == 503
+                assert self._request(writer, '/api/users/register', account)[0] == 200
+
+                # ann plays through worker A, bob through worker B
+                players = []
+                for user_id, name, port in ((1, 'ann', worker_a), (2, 'bob', worker_b)):
+                    client = await _SocketClient.connect(port, {'user_id': user_id})
+                    clients.append(client)
+                    players.append((user_id, name, port, client))
+
+                # Each queues on its own worker; the writer's matcher pairs them
+                for user_id, name, port, _ in players:
+                    status, _ = self._request(port, '/api/matchmaking/join',
+                                              {'user_id': user_id, 'username': name, 'team_id': user_id})
+                    assert status == 200
+                battle_ids = {(await client.wait_for('match_found'))['battle_id'] for client in clients}
+                assert len(battle_ids) == 1
+                battle_id = battle_ids.pop()
+
+                # Whichever worker claims the battle, the other forwards its player's events
+                for user_id, _, _, client in players:
+                    await client.emit('join_battle', {'battle_id': battle_id, 'user_id': user_id,
+                                                      'team': [{'id': yokai_id}]})
+                for client in clients:
+                    await client.wait_for('battle_start')
+                for client in clients:
+                    await client.emit('battle_action', {'battle_id': battle_id, 'action': {
+                        'type': 'attack', 'yokai_index': 0, 'target_index': 0, 'move_id': attack_id}})
+                for client in clients:
+                    delta = await client.wait_for('state_delta')
+                    assert delta['version'] == 1
+        finally:
+            for client in clients:
+                await client.close()
+            redis_server.shutdown()
@@ -284,3 +284,59 @@ class TestEdgeCases:
         
         assert 'team1' in engine.state
         assert 'team2' in engine.state
+
+
+class TestSeededBattles:
+    
+    def _play(self, engine, turns):
+        for _ in range(turns):
+            engine.process_action(1, {'type': 'attack', 'yokai_index': 0, 'target_index': 0, 'move_id': 'attack_001'})
+            engine.process_action(2, {'type': 'attack', 'yokai_index': 0, 'target_index': 0, 'move_id': 'attack_002'})
+    
+    def _hp(self, engine):
+        return [[yokai.current_hp for yokai in engine.state[team]] for team in ('team1', 'team2')]
+    
+    def test_moves_deal_damage(self, test_db, sample_team):
+        engine = BattleEngine(sample_team, sample_team, seed=1234)
+        before = self._hp(engine)
+        
+        self._play(engine, 3)
+        
+        after = self._hp(engine)
+        assert after[0][0] < before[0][0]
+        assert after[1][0] < before[1][0]
+    
+    def test_same_seed_same_battle(self, test_db, sample_team):
+        engine1 = BattleEngine(sample_team, sample_team, seed=1234)
+        engine2 = BattleEngine(sample_team, sample_team, seed=1234)
+        
+        self._play(engine1, 5)
+        self._play(engine2, 5)
+        
+        assert engine1.get_state() == engine2.get_state()
+    
+    def test_different_seeds_different_battles(self, test_db, sample_team):
+        battles = []
+        for seed in range(5):
+            engine = BattleEngine(sample_team, sample_team, seed=seed)
+            self._play(engine, 5)
+            battles.append(self._hp(engine))
+        
+        # Damage rolls come from the seed, so the outcomes can't all match
+        assert len({repr(hp) for hp in battles}) > 1
+    
+    def test_engine_records_its_seed(self, sample_team):
+        engine = BattleEngine(sample_team, sample_team)
+        
+        assert isinstance(engine.seed, int)
+    
+    def test_replay_from_seed_and_actions(self, test_db, sample_team):
+        engine = BattleEngine(sample_team, sample_team)
+        before = self._hp(engine)
+        self._play(engine, 5)
+        assert self._hp(engine) != before
+        
+        replayed = BattleEngine.replay(sample_team, sample_team, engine.seed, engine.action_history)
+        
+        assert replayed.get_state() == engine.get_state()
+        assert replayed.action_history == engine.action_history
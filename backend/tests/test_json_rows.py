@@ -0,0 +1,107 @@
+import json
+import duckdb
+import pytest
+from typing import Any, Dict, List, Union
+from pydantic import BaseModel
+from app.api.inspirits import InspiritResponse
+from app.core.json_rows import fetch_json_list, fetch_json_one
+
+
+class RowModel(BaseModel):
+    id: str
+    power: int
+    resistance: float
+    element: str | None = None
+    effects: Union[Dict[str, Any], List[Any], None] = None
+
+
+@pytest.fixture
+def db():
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE moves (
+            id VARCHAR, power INTEGER, resistance FLOAT, element VARCHAR,
+            effects JSON, unused VARCHAR
+        )
+    """)
+    conn.execute("""
+        INSERT INTO moves VALUES
+            ('b', 60, 0.7, 'Fire', '{"tags": ["STR-"]}', 'x'),
+            ('a', 45, 1.3, NULL, NULL, 'y'),
+            ('c', 90, 1.0, 'Ice "Cold"', '[1, 2]', 'z')
+    """)
+    yield conn
+    conn.close()
+
+
+def _pydantic(db, model, query, params=None):
+    """The old path: dict per row, validated and dumped by pydantic"""
+    result = db.execute(query, params or []).fetchall()
+    columns = [desc[0] for desc in db.description]
+    rows = []
+    for row in result:
+        row = dict(zip(columns, row))
+        if isinstance(row.get('effects'), str):
+            row['effects'] = json.loads(row['effects'])
+        rows.append(model(**row).model_dump(mode='json'))
+    return rows
+
+
+class TestFetchJson:
+
+    def test_list_matches_pydantic(self, db):
+        query = "SELECT * FROM moves ORDER BY power DESC"
+
+        assert json.loads(fetch_json_list(db, RowModel, query)) == _pydantic(db, RowModel, query)
+
+    def test_keeps_query_order_and_params(self, db):
+        rows = json.loads(fetch_json_list(db, RowModel, "SELECT * FROM moves WHERE power > ? ORDER BY id", [50]))
+
+        assert [row['id'] for row in rows] == ['b', 'c']
+
+    def test_only_model_fields_are_sent(self, db):
+        rows = json.loads(fetch_json_list(db, RowModel, "SELECT * FROM moves"))
+
+        assert all(set(row) == set(RowModel.model_fields) for row in rows)
+
+    def test_empty_result(self, db):
+        assert fetch_json_list(db, RowModel, "SELECT * FROM moves WHERE 1=0") == b'[]'
+
+    def test_one(self, db):
+        row = fetch_json_one(db, RowModel, "SELECT * FROM moves WHERE id = ?", ['c'])
+
+        assert json.loads(row) == _pydantic(db, RowModel, "SELECT * FROM moves WHERE id = 'c'")[0]
+        assert fetch_json_one(db, RowModel, "SELECT * FROM moves WHERE id = ?", ['missing']) is None
+
+    def test_null_in_required_field_fails(self, db):
+        db.execute("INSERT INTO moves VALUES ('d', NULL, 1.0, NULL, NULL, NULL)")
+
+        with pytest.raises(duckdb.Error):
+            fetch_json_list(db, RowModel, "SELECT * FROM moves")
+
+    def test_missing_column_fails(self, db):
+        with pytest.raises(duckdb.Error):
+            fetch_json_list(db, InspiritResponse, "SELECT * FROM moves")
+
+
+class TestJsonEndpoints:
+
+    def test_attack_list(self, client):
+        response = client.get('/api/attacks/')
+
+        assert response.status_code == 200
+        attacks = {attack['id']: attack for attack in response.json()}
+        assert attacks['attack_001'] == {
+            'id': 'attack_001', 'command': 'Test Punch', 'lv1_power': 40, 'lv10_power': 50,
+            'n_hits': 1, 'element': None, 'extra': None
+        }
+
+    def test_technique_filter(self, client):
+        response = client.get('/api/techniques/', params={'element': 'Fire'})
+
+        assert response.status_code == 200
+        assert [technique['id'] for technique in response.json()] == ['tech_001']
+
+    def test_single_and_missing(self, client):
+        assert client.get('/api/attacks/attack_002').json()['command'] == 'Test Bonk'
+        assert client.get('/api/attacks/missing').status_code == 404
@@ -0,0 +1,132 @@
+import pytest
+from app.core.database import get_duckdb
+from app.services.matchmaker import Matchmaker, create_battle_records, pair_players, rating_window
+from app.services.matchmaking_queue import MemoryMatchmakingQueue, RedisMatchmakingQueue
+
+fakeredis = pytest.importorskip("fakeredis")
+
+NOW = 10_000_000
+
+
+def _entry(user_id, rating, waited_ms=0, team_id=None):
+    return {
+        'user_id': user_id, 'username': f'player{user_id}', 'team_id': team_id or user_id,
+        'tier': 'OU', 'rating': rating, 'joined_at': NOW - waited_ms
+    }
+
+
+def _ids(pairs):
+    return [tuple(sorted((a['user_id'], b['user_id']))) for a, b in pairs]
+
+
+class TestPairing:
+    def test_window_widens_with_wait(self):
+        assert rating_window(0, 100, 10, 1000) == 100
+        assert rating_window(30_000, 100, 10, 1000) == 400
+        assert rating_window(600_000, 100, 10, 1000) == 1000
+
+    def test_pairs_closest_rating_within_window(self):
+        entries = [_entry(1, 1000, 5_000), _entry(2, 1300), _entry(3, 1080), _entry(4, 1310)]
+        assert sorted(_ids(pair_players(entries, NOW))) == [(1, 3), (2, 4)]
+
+    def test_too_far_apart_until_waited(self):
+        entries = [_entry(1, 1000), _entry(2, 1500)]
+        assert pair_players(entries, NOW) == []
+
+        entries = [_entry(1, 1000, 40_000), _entry(2, 1500)]
+        assert _ids(pair_players(entries, NOW)) == [(1, 2)]
+
+    def test_oldest_player_picks_first(self):
+        # 2 is closer to 3, but 1 waited longest and 2 is within its window
+        entries = [_entry(1, 1000, 20_000), _entry(2, 1090, 1_000), _entry(3, 1095)]
+        assert _ids(pair_players(entries, NOW)) == [(1, 2)]
+
+    def test_everyone_paired_at_most_once(self):
+        entries = [_entry(idx, 1000 + (idx * 37) % 400, idx * 1000) for idx in range(200)]
+        user_ids = [user_id for pair in _ids(pair_players(entries, NOW)) for user_id in pair]
+        assert len(user_ids) == len(set(user_ids))
+        assert len(user_ids) >= 190
+
+
+@pytest.fixture
+def players(test_db):
+    """Users 901-904 with one team each"""
+    db = get_duckdb()
+    for user_id in range(901, 905):
+        db.execute(
+            "INSERT INTO users (id, username, hashed_password) VALUES (?, ?, 'x')",
+            [user_id, f'mm_player{user_id}']
+        )
+        db.execute(
+            "INSERT INTO teams (id, name, owner_id, yokai_ids) VALUES (?, 'Team', ?, '[]')",
+            [user_id, user_id]
+        )
+    yield list(range(901, 905))
+    db.execute("DELETE FROM battles WHERE player1_id BETWEEN 901 AND 904")
+    db.execute("DELETE FROM teams WHERE id BETWEEN 901 AND 904")
+    db.execute("DELETE FROM users WHERE id BETWEEN 901 AND 904")
+
+
+class TestMatchmaker:
+    @pytest.fixture(params=['redis', 'memory'])
+    def queue(self, request):
+        if request.param == 'redis':
+            return RedisMatchmakingQueue(fakeredis.FakeAsyncRedis(decode_responses=True), ttl=600)
+        return MemoryMatchmakingQueue(ttl=600)
+
+    def test_battle_records(self, players):
+        pairs = [(_entry(901, 1000), _entry(902, 1000)), (_entry(903, 1000), _entry(999, 1000))]
+        first_id, missing = create_battle_records('OU', pairs)
+
+        assert missing is None
+        row = get_duckdb().execute(
+            "SELECT player1_id, player2_id, team1_id, team2_id, status FROM battles WHERE id = ?", [first_id]
+        ).fetchone()
+        assert row == (901, 902, 901, 902, 'pending')
+
+    @pytest.mark.asyncio
+    async def test_match_notifies_both_players(self, players, queue):
+        for user_id, rating in zip(players, (1000, 1500, 1020, 1490)):
+            await queue.join('OU', user_id, _entry(user_id, rating))
+        notified = []
+
+        async def notify(match):
+            notified.append(match)
+
+        matchmaker = Matchmaker(queue, notify)
+        assert await matchmaker.run_once() == 2
+
+        assert sorted(_ids([m['players'] for m in notified])) == [(901, 903), (902, 904)]
+        assert await queue.status('OU', 901) == (None, 0)
+        stats = matchmaker.stats()
+        assert stats['matches'] == 2 and stats['samples'] == 4
+        assert stats['latency_ms']['p50'] is not None
+
+    @pytest.mark.asyncio
+    async def test_failed_insert_requeues(self, queue):
+        for user_id in (1, 2):
+            await queue.join('OU', user_id, _entry(user_id, 1000))
+
+        def broken(tier, pairs):
+            raise RuntimeError("database down")
+
+        matchmaker = Matchmaker(queue, notify=None, create_battles=broken)
+        with pytest.raises(RuntimeError):
+            await matchmaker.match_tier('OU')
+        assert (await queue.status('OU', 1))[0] == 1
+        assert (await queue.status('OU', 2))[0] == 2
+
+    @pytest.mark.asyncio
+    async def test_left_player_is_not_matched(self, queue, monkeypatch):
+        for user_id in (1, 2):
+            await queue.join('OU', user_id, _entry(user_id, 1000))
+        real_claim = queue.claim_pairs
+
+        async def leave_first(tier, pairs):
+            await queue.leave(tier, 1)  # Leaves between the peek and the claim
+            return await real_claim(tier, pairs)
+
+        monkeypatch.setattr(queue, 'claim_pairs', leave_first)
+        matchmaker = Matchmaker(queue, notify=None, create_battles=lambda tier, pairs: [1] * len(pairs))
+        assert await matchmaker.match_tier('OU') == []
+        assert await queue.status('OU', 2) == (1, 1)
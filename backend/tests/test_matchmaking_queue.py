@@ -0,0 +1,252 @@
+import asyncio
+import json
+import pytest
+from app.core.config import settings
+from app.api.matchmaking import get_matchmaking_queue
+from app.core.redis import close_redis, get_redis
+from app.services.battle_store import MemoryBattleStore
+from app.services.matchmaking_queue import MatchmakingQueue, MemoryMatchmakingQueue, RedisMatchmakingQueue
+from app.sockets import battle_socket
+from app.sockets.battle_router import BattleRouter
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable enqueue time in ms"""
+    now = {'ms': 1_000_000}
+    monkeypatch.setattr(MatchmakingQueue, '_now_ms', staticmethod(lambda: now['ms']))
+    return now
+
+
+@pytest.fixture(params=['redis', 'memory'])
+def queue(request, clock):
+    """Every backend must pass the same contract tests"""
+    if request.param == 'redis':
+        return RedisMatchmakingQueue(fakeredis.FakeAsyncRedis(decode_responses=True), ttl=60)
+    return MemoryMatchmakingQueue(ttl=60)
+
+
+@pytest.fixture
+def redis_queue(clock):
+    return RedisMatchmakingQueue(fakeredis.FakeAsyncRedis(decode_responses=True), ttl=60)
+
+
+def _entry(user_id, rating=1000):
+    return {'user_id': user_id, 'username': f'player{user_id}', 'team_id': 1, 'tier': 'OU', 'rating': rating}
+
+
+@pytest.mark.asyncio
+class TestMatchmakingQueue:
+    async def test_join_in_order(self, queue, clock):
+        for user_id in (10, 20, 30):
+            clock['ms'] += 1
+            assert await queue.join('OU', user_id, _entry(user_id)) == (user_id // 10)
+
+        assert await queue.status('OU', 20) == (2, 3)
+        assert await queue.status('OU', 99) == (None, 3)
+        assert (await queue.entry('OU', 30))['username'] == 'player30'
+
+    async def test_same_time_orders_by_id(self, queue):
+        for user_id in (3, 20, 1):
+            await queue.join('OU', user_id, _entry(user_id))
+        # Member strings compare: '1' < '20' < '3'
+        assert [entry['user_id'] for entry in await queue.peek('OU', 10)] == [1, 20, 3]
+        assert await queue.status('OU', '3') == (3, 3)
+
+    async def test_duplicate_join_rejected(self, queue):
+        assert await queue.join('OU', 1, _entry(1)) == 1
+        assert await queue.join('OU', 1, _entry(1)) is None
+        assert await queue.join('OU', '1', _entry(1)) is None
+        assert await queue.status('OU', 1) == (1, 1)
+
+    async def test_tiers_are_separate(self, queue):
+        await queue.join('OU', 1, _entry(1))
+        assert await queue.join('UU', 1, _entry(1)) == 1
+        assert await queue.sizes() == {'OU': 1, 'UU': 1, 'RU': 0, 'NU': 0}
+
+    async def test_leave(self, queue, clock):
+        for user_id in (1, 2, 3):
+            clock['ms'] += 1
+            await queue.join('OU', user_id, _entry(user_id))
+
+        assert await queue.leave('OU', 2) is True
+        assert await queue.leave('OU', 2) is False
+        assert await queue.status('OU', 3) == (2, 2)
+        assert await queue.entry('OU', 2) is None
+
+    async def test_expired_entries_dont_count(self, queue, clock):
+        await queue.join('OU', 1, _entry(1))
+        clock['ms'] += 30_000
+        await queue.join('OU', 2, _entry(2))
+        clock['ms'] += 40_000  # Player 1 is now past the 60 s ttl
+
+        assert await queue.status('OU', 1) == (None, 1)
+        assert await queue.status('OU', 2) == (1, 1)
+        assert (await queue.sizes())['OU'] == 1
+        assert [entry['user_id'] for entry in await queue.peek('OU', 10)] == [2]
+
+        # Rejoining after expiry works, at the back of the queue
+        assert await queue.join('OU', 1, _entry(1)) == 2
+        assert await queue.status('OU', 1) == (2, 2)
+
+    async def test_entry_records_join_time(self, queue, clock):
+        await queue.join('OU', 1, _entry(1))
+        entry = await queue.entry('OU', 1)
+        assert entry['joined_at'] == clock['ms']
+
+        entry['rating'] = 0  # Callers get a copy
+        assert (await queue.entry('OU', 1))['rating'] == 1000
+
+    async def test_peek_oldest_first(self, queue, clock):
+        for user_id in (5, 6, 7):
+            clock['ms'] += 1
+            await queue.join('OU', user_id, _entry(user_id))
+
+        assert [entry['user_id'] for entry in await queue.peek('OU', 2)] == [5, 6]
+        assert await queue.peek('UU', 2) == []
+        assert (await queue.sizes())['OU'] == 3
+
+    async def test_claim_pairs(self, queue, clock):
+        for user_id in (1, 2, 3, 4):
+            clock['ms'] += 1
+            await queue.join('OU', user_id, _entry(user_id))
+        await queue.leave('OU', 4)
+
+        assert await queue.claim_pairs('OU', [(1, 2), (3, 4)]) == [True, False]
+        assert await queue.claim_pairs('OU', [(1, 3)]) == [False]
+        assert await queue.claim_pairs('OU', []) == []
+        assert await queue.status('OU', 3) == (1, 1)
+
+    async def test_restore_keeps_join_time(self, queue, clock):
+        await queue.join('OU', 1, _entry(1))
+        clock['ms'] += 1
+        await queue.join('OU', 2, _entry(2))
+        first = await queue.entry('OU', 1)
+        assert await queue.claim_pairs('OU', [(1, 2)]) == [True]
+
+        clock['ms'] += 1
+        await queue.join('OU', 3, _entry(3))
+        await queue.restore('OU', [first])
+        assert await queue.status('OU', 1) == (1, 2)
+        assert await queue.entry('OU', 1) == first
+
+    async def test_active_battles_default(self, queue):
+        assert await queue.active_battles() == 0
+
+
+@pytest.mark.asyncio
+class TestRedisMatchmakingQueue:
+    async def test_join_prunes_expired(self, redis_queue, clock):
+        for user_id in range(5):
+            await redis_queue.join('OU', user_id, _entry(user_id))
+        clock['ms'] += 120_000
+        await redis_queue.join('OU', 99, _entry(99))
+
+        queue_key, entries_key = RedisMatchmakingQueue.keys('OU')
+        assert await redis_queue.client.zcard(queue_key) == 1
+        assert await redis_queue.client.hkeys(entries_key) == ['99']
+
+    async def test_many_players(self, redis_queue, clock):
+        count = 10_000
+        queue_key, entries_key = RedisMatchmakingQueue.keys('OU')
+        await redis_queue.client.zadd(queue_key, {str(idx): clock['ms'] for idx in range(count)})
+        await redis_queue.client.hset(entries_key, mapping={str(idx): '{}' for idx in range(count)})
+
+        clock['ms'] += 1
+        assert await redis_queue.join('OU', 'last', _entry(0)) == count + 1
+        assert await redis_queue.status('OU', 'last') == (count + 1, count + 1)
+
+
+@pytest.mark.asyncio
+class TestMemoryMatchmakingQueue:
+    async def test_join_prunes_expired(self, clock):
+        queue = MemoryMatchmakingQueue(ttl=60)
+        for user_id in range(5):
+            await queue.join('OU', user_id, _entry(user_id))
+        clock['ms'] += 120_000
+        await queue.join('OU', 99, _entry(99))
+        assert list(queue._tier('OU').entries) == ['99']
+
+    async def test_active_battles_from_store(self):
+        store = MemoryBattleStore()
+        queue = MemoryMatchmakingQueue(ttl=60, battle_count=store.count)
+        await store.claim('1', 'worker')
+        await store.claim('2', 'worker')
+        assert await queue.active_battles() == 2
+        await store.remove('1')
+        assert await queue.active_battles() == 1
+
+    async def test_many_players(self, clock):
+        queue = MemoryMatchmakingQueue(ttl=60)
+        count = 10_000
+        for user_id in range(count):
+            await queue.join('OU', user_id, _entry(user_id))
+        clock['ms'] += 1
+        assert await queue.join('OU', 'last', _entry(0)) == count + 1
+        assert await queue.status('OU', 'last') == (count + 1, count + 1)
+
+
+class TestMatchmakingEndpoints:
+    @pytest.fixture
+    def fake_queue(self, queue):
+        from main import app
+        app.dependency_overrides[get_matchmaking_queue] = lambda: queue
+        yield queue
+        del app.dependency_overrides[get_matchmaking_queue]
+
+    def test_join_status_leave(self, client, fake_queue):
+        body = {'user_id': 7, 'username': 'seven', 'team_id': 3, 'tier': 'UU'}
+        response = client.post('/api/matchmaking/join', json=body)
+        assert response.status_code == 200
+        assert response.json()['position'] == 1
+        assert client.post('/api/matchmaking/join', json=body).status_code == 400
+
+        status = client.get('/api/matchmaking/status', params={'user_id': 7, 'tier': 'UU'}).json()
+        assert status == {'in_queue': True, 'position': 1, 'total_in_queue': 1, 'active_battles': 0}
+        assert client.get('/api/matchmaking/stats').json()['queues']['UU'] == 1
+
+        assert client.post('/api/matchmaking/leave', params={'user_id': 7, 'tier': 'UU'}).status_code == 200
+        assert client.post('/api/matchmaking/leave', params={'user_id': 7, 'tier': 'UU'}).status_code == 404
+
+    def test_active_battles_counter(self, client, redis_queue):
+        from main import app
+        app.dependency_overrides[get_matchmaking_queue] = lambda: redis_queue
+        asyncio.run(redis_queue.client.set('active_battles', 3))
+        assert client.get('/api/matchmaking/stats').json()['active_battles'] == 3
+        status = client.get('/api/matchmaking/status', params={'user_id': 1}).json()
+        assert status['active_battles'] == 3 and status['in_queue'] is False
+        del app.dependency_overrides[get_matchmaking_queue]
+
+
+class TestSharedRedis:
+    def test_one_pool_per_event_loop(self):
+        async def clients():
+            first = get_redis()
+            queue = await get_matchmaking_queue()
+            return first, get_redis(), queue
+
+        first, second, queue = asyncio.run(clients())
+        assert first is second and queue.client is first
+        assert first.connection_pool.max_connections == settings.REDIS_MAX_CONNECTIONS
+
+        # A new loop can't reuse the old loop's connections
+        other, _, other_queue = asyncio.run(clients())
+        assert other is not first and other_queue is not queue
+        asyncio.run(close_redis())
+
+    def test_backend_from_settings(self, monkeypatch):
+        monkeypatch.setattr(settings, 'MATCHMAKING_BACKEND', 'memory')
+        first = asyncio.run(get_matchmaking_queue())
+        assert isinstance(first, MemoryMatchmakingQueue)
+        # Live battles come from the socket layer's battle store
+        monkeypatch.setattr(battle_socket, 'battle_router', BattleRouter(MemoryBattleStore()))
+        asyncio.run(battle_socket.battle_router.store.claim('1', 'worker'))
+        assert asyncio.run(first.active_battles()) == 1
+        # One queue for the whole process, whichever loop asks
+        assert asyncio.run(get_matchmaking_queue()) is first
+
+        monkeypatch.setattr(settings, 'MATCHMAKING_BACKEND', 'redis')
+        assert isinstance(asyncio.run(get_matchmaking_queue()), RedisMatchmakingQueue)
+        asyncio.run(close_redis())
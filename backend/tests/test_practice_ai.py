@@ -0,0 +1,195 @@
+import random
+import time
+import pytest
+from app.services.battle_engine import BattleEngine
+from app.services.battle_store import MemoryBattleStore
+from app.services.catalog import MoveCatalog
+from app.services.practice_ai import PracticeAI, legal_actions, random_team
+from app.services.timer_wheel import TimerWheel
+from app.sockets import battle_socket
+from app.sockets.battle_router import BattleRouter
+from app.sockets.session_registry import SessionRegistry
+from app.sockets.spectator_feed import SpectatorBroadcaster
+
+
+def _yokai(yokai_id, **moves):
+    return {
+        'id': yokai_id, 'name': f'Yokai {yokai_id}',
+        'bs_b_hp': 300, 'bs_b_str': 150, 'bs_b_spr': 150, 'bs_b_def': 80, 'bs_b_spd': 100,
+        'attack_id': 'tap', 'technique_id': None, 'inspirit_id': None, 'soultimate_id': None,
+        **moves
+    }
+
+
+@pytest.fixture
+def catalog():
+    return MoveCatalog({
+        'attacks': {
+            'tap': {'id': 'tap', 'command': 'Tap', 'bp': 1},
+            'punch': {'id': 'punch', 'command': 'Punch', 'bp': 60},
+        },
+        'techniques': {'blaze': {'id': 'blaze', 'command': 'Blaze', 'bp': 200, 'attribute': 'Fire'}},
+        'yokai': {
+            '001': _yokai('001'),
+            '002': _yokai('002', attack_id='punch'),
+            '003': _yokai('003', technique_id='blaze'),
+        },
+    })
+
+
+def _engine(catalog, seed=1, **kwargs):
+    return BattleEngine([{'id': '002'}, {'id': '001'}], [{'id': '003'}, {'id': '001'}],
+                        catalog=catalog, seed=seed, **kwargs)
+
+
+def _play(engine, turns):
+    for _ in range(turns):
+        if engine.is_battle_over():
+            break
+        engine.process_action(1, {'type': 'attack', 'yokai_index': 0, 'target_index': 0, 'move_id': 'punch'})
+        engine.process_action(2, {'type': 'technique', 'yokai_index': 0, 'target_index': 0, 'move_id': 'blaze'})
+
+
+def _hp(engine):
+    return [[yokai.current_hp for yokai in engine.state[team]] for team in ('team1', 'team2')]
+
+
+class TestEngineClone:
+
+    def test_clone_is_independent(self, catalog):
+        engine = _engine(catalog)
+        _play(engine, 1)
+        before = _hp(engine)
+
+        clone = engine.clone()
+        _play(clone, 3)
+        clone.state['team1'][0].shift_stage('str', 2)
+
+        assert _hp(engine) == before
+        assert engine.state['team1'][0].get_stage('str') == 0
+        assert clone.state['team1'][0].data is engine.state['team1'][0].data
+
+    def test_clone_continues_the_same_rolls(self, catalog):
+        engine = _engine(catalog, seed=99)
+        _play(engine, 1)
+
+        clone = engine.clone(lean=False)
+        _play(engine, 3)
+        _play(clone, 3)
+
+        assert _hp(clone) == _hp(engine)
+
+    def test_lean_engine_matches_full_engine(self, catalog):
+        full = _engine(catalog, seed=5)
+        lean = _engine(catalog, seed=5, lean=True)
+
+        _play(full, 4)
+        _play(lean, 4)
+
+        assert _hp(lean) == _hp(full)
+        assert lean.state['log'] == []
+        assert lean.action_history == []
+
+    def test_lean_soultimate_matches_full_engine(self, catalog):
+        tables = {table: dict(getattr(catalog, attr)) for table, attr in
+                  (('attacks', 'attacks'), ('techniques', 'techniques'), ('yokai', 'yokai'))}
+        tables['soultimate'] = {'nova': {'id': 'nova', 'command': 'Nova', 'lv10_power': 150, 'element': 'Ice'}}
+        tables['yokai']['002'] = _yokai('002', attack_id='punch', soultimate_id='nova')
+        soul_catalog = MoveCatalog(tables)
+        engines = [_engine(soul_catalog, seed=7), _engine(soul_catalog, seed=7, lean=True)]
+
+        for engine in engines:
+            engine.state['team1'][0].current_soul = 100
+            engine.process_action(1, {'type': 'soultimate', 'yokai_index': 0, 'target_index': 0, 'move_id': 'nova'})
+            engine.process_action(2, {'type': 'technique', 'yokai_index': 0, 'target_index': 0, 'move_id': 'blaze'})
+
+        full, lean = engines
+        assert _hp(lean) == _hp(full)
+        assert _hp(full)[1][0] < 300
+        assert lean.state['team1'][0].current_soul == full.state['team1'][0].current_soul
+
+
+class TestPracticeAI:
+
+    def test_legal_actions(self, catalog):
+        engine = _engine(catalog)
+
+        assert set(legal_actions(engine, 2)) == {('attack', 'tap', 0), ('attack', 'tap', 1),
+                                                 ('technique', 'blaze', 0), ('technique', 'blaze', 1)}
+
+    def test_prefers_the_stronger_move(self, catalog):
+        engine = _engine(catalog)
+        ai = PracticeAI(think_time=0, max_iterations=300, seed=3)
+
+        action = ai.choose_action(engine, 2)
+
+        assert action['type'] == 'technique'
+        assert action['move_id'] == 'blaze'
+
+    def test_does_not_touch_the_engine(self, catalog):
+        engine = _engine(catalog)
+        before = _hp(engine)
+
+        PracticeAI(think_time=0, max_iterations=50, seed=1).choose_action(engine, 2)
+
+        assert _hp(engine) == before
+        assert engine.turn == 0
+        assert engine.action_history == []
+
+    def test_think_time_is_bounded(self, catalog):
+        engine = _engine(catalog)
+        ai = PracticeAI(think_time=0.05, seed=1)
+
+        start = time.perf_counter()
+        ai.choose_action(engine, 2)
+
+        assert time.perf_counter() - start < 0.5
+
+    def test_side_without_moves_passes(self, catalog):
+        # Client-chosen teams can name yokai the catalog doesn't know: no legal actions
+        engine = BattleEngine([{'id': 'nope', 'hp': 100}], [{'id': '003'}, {'id': '001'}], catalog=catalog, seed=1)
+        assert legal_actions(engine, 1) == []
+        ai = PracticeAI(think_time=0, max_iterations=50, seed=1)
+
+        assert ai.choose_action(engine.clone(), 1)['move_id'] is None
+        assert ai.choose_action(engine.clone(), 2)['type'] in ('attack', 'technique')
+
+    def test_needs_a_budget(self):
+        with pytest.raises(ValueError):
+            PracticeAI(think_time=0)
+
+    def test_random_team(self, catalog):
+        team = random_team(catalog, 2, random.Random(1))
+
+        assert len(team) == 2
+        assert all(entry['id'] in catalog.yokai for entry in team)
+
+
+class FailingAI:
+    def choose_action(self, engine, player_num):
+        raise RuntimeError('search failed')
+
+
+@pytest.mark.asyncio
+class TestPracticeBattleSocket:
+    @pytest.fixture
+    def handlers(self, fake_sio, monkeypatch):
+        monkeypatch.setattr(battle_socket, 'battle_router', BattleRouter(MemoryBattleStore()))
+        monkeypatch.setattr(battle_socket, 'active_battles', {})
+        monkeypatch.setattr(battle_socket, 'sessions', SessionRegistry())
+        monkeypatch.setattr(battle_socket, 'spectator_broadcaster', SpectatorBroadcaster(interval=0.5))
+        monkeypatch.setattr(battle_socket, 'turn_timers', TimerWheel(tick=1.0))
+        battle_socket.register_events(fake_sio)
+        return fake_sio.handlers
+
+    async def test_failed_search_plays_default_action(self, handlers, fake_sio, test_db, sample_team):
+        await handlers['start_practice']('sid1', {'user_id': 1, 'team': sample_team, 'opponent_team': sample_team})
+        battle_id, battle = next(iter(battle_socket.active_battles.items()))
+        battle['ai'] = FailingAI()
+
+        await handlers['battle_action']('sid1', {'battle_id': battle_id, 'action': {
+            'type': 'attack', 'yokai_index': 0, 'target_index': 0, 'move_id': 'attack_001'}})
+
+        assert battle['engine'].turn == 1
+        assert not battle['ai_thinking']
+        assert 'action_result' in fake_sio.events('sid1')
@@ -0,0 +1,131 @@
+import json
+import logging
+import pytest
+from app.core.database import get_duckdb
+import seed_database
+from seed_database import SeedingError, bulk_load, seed_table, _MOVE_COLUMNS, _MOVE_JSON
+
+
+@pytest.fixture
+def scratch_table(test_db):
+    db = get_duckdb()
+    db.execute("""
+        CREATE TABLE seed_test_moves (
+            id VARCHAR PRIMARY KEY, command VARCHAR NOT NULL, lv1_power INTEGER,
+            lv10_power INTEGER, n_hits INTEGER DEFAULT 1, element VARCHAR, extra VARCHAR
+        )
+    """)
+    yield 'seed_test_moves'
+    db.execute("DROP TABLE seed_test_moves")
+    db.execute("DELETE FROM seed_metadata WHERE table_name = 'seed_test_moves'")
+
+
+def _write(tmp_path, rows):
+    path = tmp_path / 'moves.json'
+    path.write_text(json.dumps(rows))
+    return path
+
+
+class TestBulkLoad:
+    def test_converts_and_defaults(self, scratch_table, tmp_path):
+        path = _write(tmp_path, [
+            {'ID': '0x01', 'Command': 'Batter', 'Lv1_power': '15', 'Lv10_power': '33', 'N_Hits': '3', 'Element': None},
+            {'ID': '0x02', 'Command': 'Bonk', 'Lv1_power': '', 'Lv10_power': '40', 'N_Hits': '', 'Extra': 'x'},
+        ])
+        assert bulk_load(scratch_table, path, _MOVE_JSON, _MOVE_COLUMNS, required=('command',)) == (2, 2)
+
+        rows = get_duckdb().execute(
+            f"SELECT id, command, lv1_power, lv10_power, n_hits, element, extra FROM {scratch_table} ORDER BY id"
+        ).fetchall()
+        assert rows == [
+            ('0x01', 'Batter', 15, 33, 3, None, ''),
+            ('0x02', 'Bonk', None, 40, 1, None, 'x'),
+        ]
+
+    def test_bad_rows_reported_and_skipped(self, scratch_table, tmp_path, caplog):
+        path = _write(tmp_path, [
+            {'ID': '0x01', 'Command': 'Good', 'Lv10_power': '10'},
+            {'ID': '0x02', 'Command': 'Bad power', 'Lv10_power': 'lots'},
+            {'ID': '0x03', 'Lv10_power': '10'},
+            {'ID': '0x01', 'Command': 'Duplicate', 'Lv10_power': '10'},
+            {'Command': 'No id'},
+        ])
+        with caplog.at_level(logging.WARNING):
+            assert bulk_load(scratch_table, path, _MOVE_JSON, _MOVE_COLUMNS, required=('command',)) == (1, 5)
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert any('index 2' in m and 'lv10_power: cannot convert lots' in m for m in messages)
+        assert any('index 3' in m and 'command: missing' in m for m in messages)
+        assert any('index 4' in m and 'id: duplicate 0x01' in m for m in messages)
+        assert any('index 5' in m and 'id: missing' in m for m in messages)
+        assert get_duckdb().execute(f"SELECT command FROM {scratch_table}").fetchall() == [('Good',)]
+
+    def test_unreadable_file(self, scratch_table, tmp_path):
+        with pytest.raises(SeedingError):
+            bulk_load(scratch_table, tmp_path / 'missing.json', _MOVE_JSON, _MOVE_COLUMNS)
+
+        path = tmp_path / 'broken.json'
+        path.write_text('{"ID": ')
+        with pytest.raises(SeedingError):
+            bulk_load(scratch_table, path, _MOVE_JSON, _MOVE_COLUMNS)
+
+    def test_reload_upserts_and_removes(self, scratch_table, tmp_path):
+        path = _write(tmp_path, [
+            {'ID': '0x01', 'Command': 'Batter', 'Lv10_power': '33'},
+            {'ID': '0x02', 'Command': 'Bonk', 'Lv10_power': '40'},
+        ])
+        bulk_load(scratch_table, path, _MOVE_JSON, _MOVE_COLUMNS)
+
+        path = _write(tmp_path, [
+            {'ID': '0x01', 'Command': 'Batter', 'Lv10_power': '35'},
+            {'ID': '0x03', 'Command': 'Slam', 'Lv10_power': '50'},
+        ])
+        assert bulk_load(scratch_table, path, _MOVE_JSON, _MOVE_COLUMNS) == (2, 2)
+
+        rows = get_duckdb().execute(f"SELECT id, lv10_power FROM {scratch_table} ORDER BY id").fetchall()
+        assert rows == [('0x01', 35), ('0x03', 50)]
+
+
+class TestSeedTable:
+    @pytest.fixture
+    def seed_files(self, scratch_table, monkeypatch):
+        calls = []
+
+        def migrate(data_dir):
+            calls.append(data_dir)
+            return bulk_load(scratch_table, data_dir / 'moves.json', _MOVE_JSON, _MOVE_COLUMNS)[0]
+
+        monkeypatch.setitem(seed_database.SEED_FILES, scratch_table, ('moves.json', migrate))
+        return calls
+
+    def test_unchanged_file_is_skipped(self, scratch_table, seed_files, tmp_path):
+        db = get_duckdb()
+        _write(tmp_path, [{'ID': '0x01', 'Command': 'Batter'}])
+        assert seed_table(db, scratch_table, tmp_path) == 1
+        assert seed_table(db, scratch_table, tmp_path) is None
+        assert len(seed_files) == 1
+
+        # Forced, or the file changed
+        assert seed_table(db, scratch_table, tmp_path, force=True) == 1
+        _write(tmp_path, [{'ID': '0x01', 'Command': 'Batter'}, {'ID': '0x02', 'Command': 'Bonk'}])
+        assert seed_table(db, scratch_table, tmp_path) == 2
+        assert len(seed_files) == 3
+
+    def test_emptied_table_is_reloaded(self, scratch_table, seed_files, tmp_path):
+        db = get_duckdb()
+        _write(tmp_path, [{'ID': '0x01', 'Command': 'Batter'}])
+        seed_table(db, scratch_table, tmp_path)
+        db.execute(f"DELETE FROM {scratch_table}")
+        assert seed_table(db, scratch_table, tmp_path) == 1
+
+    def test_failed_load_keeps_previous_hash(self, scratch_table, seed_files, tmp_path):
+        db = get_duckdb()
+        _write(tmp_path, [{'ID': '0x01', 'Command': 'Batter'}])
+        seed_table(db, scratch_table, tmp_path)
+        (tmp_path / 'moves.json').write_text('[{"ID": ')
+        with pytest.raises(SeedingError):
+            seed_table(db, scratch_table, tmp_path)
+
+        assert db.execute(f"SELECT id FROM {scratch_table}").fetchall() == [('0x01',)]
+        _write(tmp_path, [{'ID': '0x01', 'Command': 'Batter'}])
+        assert seed_table(db, scratch_table, tmp_path) is None
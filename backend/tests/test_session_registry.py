@@ -0,0 +1,94 @@
+import pytest
+from app.services.battle_store import MemoryBattleStore
+from app.sockets import battle_socket
+from app.sockets.battle_router import BattleRouter
+from app.sockets.session_registry import SessionRegistry
+
+
+class TestSessionRegistry:
+    def test_battles_by_sid(self):
+        sessions = SessionRegistry()
+        sessions.join('sid1', '7')
+        sessions.join('sid1', '8')
+        sessions.leave('sid1', '7')
+        sessions.leave('sid2', '7')  # Unknown socket
+
+        assert sessions.battles_of('sid1') == ['8']
+        assert sessions.drop('sid1') == (None, ['8'])
+        assert sessions.battles_of('sid1') == []
+
+    def test_user_sockets(self):
+        sessions = SessionRegistry()
+        assert sessions.bind_user('sid1', 3) is None
+        assert sessions.bind_user('sid1', '3') is None  # Same socket again
+        assert sessions.sid_of(3) == 'sid1'
+        assert sessions.user_of('sid1') == '3'
+
+        # Reconnect: the new socket takes over, the old one's disconnect doesn't undo it
+        assert sessions.bind_user('sid2', 3) == 'sid1'
+        assert sessions.drop('sid1') == ('3', [])
+        assert sessions.sid_of(3) == 'sid2'
+        sessions.drop('sid2')
+        assert sessions.sid_of(3) is None
+
+    def test_move(self):
+        sessions = SessionRegistry()
+        sessions.join('sid1', '7')
+        sessions.join('sid1', '8')
+        sessions.move('sid1', 'sid2', '7')
+        assert sessions.battles_of('sid1') == ['8']
+        assert sessions.battles_of('sid2') == ['7']
+
+
+@pytest.mark.asyncio
+class TestSocketSessions:
+    @pytest.fixture
+    def handlers(self, fake_sio, monkeypatch):
+        monkeypatch.setattr(battle_socket, 'battle_router', BattleRouter(MemoryBattleStore()))
+        monkeypatch.setattr(battle_socket, 'active_battles', {})
+        monkeypatch.setattr(battle_socket, 'sessions', SessionRegistry())
+        battle_socket.register_events(fake_sio)
+        return fake_sio.handlers
+
+    async def _start(self, handlers, team):
+        await handlers['join_battle']('sid1', {'battle_id': 9, 'user_id': 1, 'team': team})
+        # Numeric and string ids are the same battle
+        await handlers['join_battle']('sid2', {'battle_id': '9', 'user_id': 2, 'team': team})
+
+    async def test_join_and_disconnect(self, handlers, fake_sio, test_db, sample_team):
+        await self._start(handlers, sample_team)
+        assert fake_sio.events('sid1') == ['waiting_for_opponent', 'battle_start']
+        assert fake_sio.events('sid2') == ['battle_start']
+
+        record = await battle_socket.battle_router.store.get('9')
+        assert record['owner'] == battle_socket.battle_router.worker_id and record['status'] == 'active'
+        assert battle_socket.sessions.battles_of('sid2') == ['9']
+
+        await handlers['disconnect']('sid2')
+        assert fake_sio.events('sid1')[-1] == 'opponent_disconnected'
+        assert '9' not in battle_socket.active_battles
+        assert await battle_socket.battle_router.store.get('9') is None
+        assert battle_socket.sessions.battles_of('sid1') == []
+
+    async def test_disconnect_outside_battle(self, handlers, fake_sio):
+        await handlers['connect']('sid1', {}, {'user_id': 4})
+        assert fake_sio.rooms['user:4'] == {'sid1'}
+        await handlers['disconnect']('sid1')
+        assert battle_socket.sessions.sid_of(4) is None
+        assert fake_sio.events() == ['connected']
+
+    async def test_reconnect_keeps_battle(self, handlers, fake_sio, test_db, sample_team):
+        await self._start(handlers, sample_team)
+
+        # Player 1 comes back on a new socket before the old one times out
+        await handlers['join_battle']('sid3', {'battle_id': 9, 'user_id': 1, 'team': sample_team})
+        assert fake_sio.events('sid3') == ['battle_start']
+        assert battle_socket.active_battles['9']['player1_sid'] == 'sid3'
+        assert battle_socket.active_battles['9']['player2_id'] == 2
+
+        await handlers['disconnect']('sid1')
+        assert '9' in battle_socket.active_battles
+        assert 'opponent_disconnected' not in fake_sio.events()
+
+        await handlers['chat_message']('sid2', {'battle_id': 9, 'message': 'hi'})
+        assert fake_sio.emitted[-1] == ('chat_message', {'message': 'hi'}, 'sid3')
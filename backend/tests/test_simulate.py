@@ -0,0 +1,171 @@
+import json
+import pytest
+from app.services.battle_engine import BattleEngine
+from app.services.catalog import MoveCatalog
+from simulate import (
+    SimulationError,
+    derive_seed,
+    load_team_file,
+    run_simulation,
+)
+
+
+def _yokai(yokai_id, hp, str_stat, spd):
+    return {
+        'id': yokai_id,
+        'name': f'Yokai {yokai_id}',
+        'bs_b_hp': hp,
+        'bs_b_str': str_stat,
+        'bs_b_spr': 80,
+        'bs_b_def': 80,
+        'bs_b_spd': spd,
+        'attack_id': 'punch',
+        'technique_id': None,
+        'inspirit_id': None,
+        'soultimate_id': None,
+    }
+
+
+@pytest.fixture
+def sim_catalog():
+    return MoveCatalog({
+        'attacks': {'punch': {'id': 'punch', 'command': 'Punch', 'bp': 60}},
+        'yokai': {
+            'strong': _yokai('strong', 300, 200, 150),
+            'weak': _yokai('weak', 150, 60, 50),
+        },
+    })
+
+
+class TestRunSimulation:
+
+    def test_stronger_team_wins(self, sim_catalog):
+        report = run_simulation(
+            [{'id': 'strong'}], [{'id': 'weak'}],
+            battles=20, policy1='attack', policy2='attack', workers=0, catalog=sim_catalog
+        )
+
+        assert report['battles'] == 20
+        assert report['wins']['team1'] == 20
+        assert report['win_rates']['team1'] == 1.0
+        assert sum(report['turns']['histogram'].values()) == 20
+        assert report['damage']['team1_total'] > report['damage']['team2_total']
+
+    def test_reports_throughput(self, sim_catalog):
+        report = run_simulation(
+            [{'id': 'strong'}], [{'id': 'weak'}],
+            battles=5, workers=0, catalog=sim_catalog
+        )
+
+        assert report['throughput']['workers'] == 1
+        assert report['throughput']['battles_per_sec'] > 0
+
+    def test_max_turns_counts_as_draw(self, sim_catalog):
+        report = run_simulation(
+            [{'id': 'strong'}], [{'id': 'strong'}],
+            battles=3, policy1='attack', policy2='attack', workers=0, max_turns=1, catalog=sim_catalog
+        )
+
+        assert report['wins']['draw'] == 3
+        assert report['turns']['histogram'] == {1: 3}
+
+    def test_unknown_yokai_rejected(self, sim_catalog):
+        with pytest.raises(SimulationError):
+            run_simulation([{'id': 'nope'}], [{'id': 'weak'}], battles=1, workers=0, catalog=sim_catalog)
+
+    def test_unknown_policy_rejected(self, sim_catalog):
+        with pytest.raises(SimulationError):
+            run_simulation(
+                [{'id': 'strong'}], [{'id': 'weak'}],
+                battles=1, policy1='psychic', workers=0, catalog=sim_catalog
+            )
+
+    def test_same_seed_same_report(self, sim_catalog):
+        kwargs = dict(battles=10, policy1='random', policy2='random', workers=0, seed=99, catalog=sim_catalog)
+
+        first = run_simulation([{'id': 'strong'}], [{'id': 'weak'}], **kwargs)
+        second = run_simulation([{'id': 'strong'}], [{'id': 'weak'}], **kwargs)
+
+        assert first['seed'] == 99
+        assert first['turns'] == second['turns']
+        assert first['damage'] == second['damage']
+
+    def test_derived_seeds_are_distinct(self):
+        seeds = {derive_seed(1, idx) for idx in range(1000)}
+
+        assert len(seeds) == 1000
+        assert derive_seed(1, 5) == derive_seed(1, 5)
+
+    @pytest.mark.slow
+    def test_process_pool_matches_totals(self, sim_catalog):
+        report = run_simulation(
+            [{'id': 'strong'}], [{'id': 'weak'}],
+            battles=9, policy1='attack', policy2='attack', workers=2, catalog=sim_catalog
+        )
+
+        assert report['battles'] == 9
+        assert report['wins']['team1'] == 9
+        assert report['throughput']['workers'] == 2
+
+    @pytest.mark.slow
+    def test_results_independent_of_worker_count(self, sim_catalog):
+        kwargs = dict(battles=12, policy1='random', policy2='random', seed=7, catalog=sim_catalog)
+
+        inline = run_simulation([{'id': 'strong'}], [{'id': 'weak'}], workers=0, **kwargs)
+        pooled = run_simulation([{'id': 'strong'}], [{'id': 'weak'}], workers=2, **kwargs)
+
+        assert inline['turns'] == pooled['turns']
+        assert inline['damage'] == pooled['damage']
+
+
+class TestRealSchemaRows:
+
+    @pytest.fixture
+    def inspirit_catalog(self):
+        # Inspirit rows as seed_database.py stores them: an effects JSON, no parsed effect_type/tags
+        yokai = {
+            yokai_id: {**_yokai(yokai_id, 300, 120, 100), 'inspirit_id': '0xINSP', 'inspirit_prob': 0.9}
+            for yokai_id in ('001', '002')
+        }
+        return MoveCatalog({
+            'attacks': {'punch': {'id': 'punch', 'command': 'Punch', 'bp': 60}},
+            'inspirits': {'0xINSP': {'id': '0xINSP', 'command': 'Confuse', 'effects': '[{"type": "confusion"}]', 'image': None}},
+            'yokai': yokai,
+        })
+
+    def test_random_policy_skips_unparsed_inspirits(self, inspirit_catalog):
+        report = run_simulation(
+            [{'id': '001'}], [{'yokai_id': '002'}],
+            battles=5, policy1='random', policy2='random', workers=0, seed=1, catalog=inspirit_catalog
+        )
+        assert report['battles'] == 5
+
+    def test_engine_rejects_unparsed_inspirit(self, inspirit_catalog):
+        engine = BattleEngine([{'id': '001'}], [{'id': '002'}], catalog=inspirit_catalog, seed=1)
+        action = {'type': 'inspirit', 'yokai_index': 0, 'target_index': 0, 'move_id': '0xINSP'}
+        engine.process_action(1, action)
+        result = engine.process_action(2, action)
+        assert result['status'] == 'resolved'
+
+    def test_unknown_yokai_id_entry_rejected(self, sim_catalog):
+        with pytest.raises(SimulationError, match='nobody'):
+            run_simulation([{'yokai_id': 'nobody'}], [{'id': 'weak'}], battles=1, workers=0, catalog=sim_catalog)
+
+
+class TestTeamFile:
+
+    def test_load_team_file(self, tmp_path):
+        team_file = tmp_path / 'teams.json'
+        team_file.write_text(json.dumps({'team1': ['001', '002'], 'team2': [{'id': '003', 'hp_iv': 5}]}))
+
+        teams = load_team_file(team_file)
+
+        assert teams['team1'] == [{'id': '001'}, {'id': '002'}]
+        assert teams['team2'] == [{'id': '003', 'hp_iv': 5}]
+
+    def test_team_file_missing_team(self, tmp_path):
+        team_file = tmp_path / 'teams.json'
+        team_file.write_text(json.dumps({'team1': ['001']}))
+
+        with pytest.raises(SimulationError):
+            load_team_file(team_file)
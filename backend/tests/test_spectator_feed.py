@@ -0,0 +1,153 @@
+import pytest
+from app.services.battle_engine import BattleEngine
+from app.services.battle_store import MemoryBattleStore
+from app.services.catalog import MoveCatalog
+from app.sockets import battle_socket
+from app.sockets.battle_router import BattleRouter
+from app.sockets.session_registry import SessionRegistry
+from app.sockets.spectator_feed import SpectatorBroadcaster, SpectatorFeed
+
+PUNCH = {'type': 'attack', 'yokai_index': 0, 'target_index': 0, 'move_id': 'punch'}
+ATTACK = {'type': 'attack', 'yokai_index': 0, 'target_index': 0, 'move_id': 'attack_001'}
+
+
+def _yokai(idx):
+    return {
+        'id': f'{idx:03d}', 'name': f'Yokai {idx}',
+        'bs_b_hp': 3000, 'bs_b_str': 160, 'bs_b_spr': 70, 'bs_b_def': 82, 'bs_b_spd': 100 + idx,
+        'attack_id': 'punch', 'rank': 'E', 'tribe': 'Brave'
+    }
+
+
+@pytest.fixture
+def engine():
+    catalog = MoveCatalog({
+        'attacks': {'punch': {'id': 'punch', 'command': 'Punch', 'bp': 60}},
+        'yokai': {f'{idx:03d}': _yokai(idx) for idx in range(4)},
+    })
+    return BattleEngine([{'id': '000'}, {'id': '001'}], [{'id': '002'}, {'id': '003'}], catalog=catalog, seed=1)
+
+
+def _play_turn(engine):
+    engine.process_action(1, PUNCH)
+    return engine.process_action(2, PUNCH)
+
+
+@pytest.mark.asyncio
+class TestSpectatorFeed:
+    async def _watched(self, fake_sio, engine):
+        feed = SpectatorFeed('7', max_pending=2)
+        await feed.start(fake_sio, engine, {'1': {'user_id': 1}, '2': {'user_id': 2}})
+        await feed.add(fake_sio, 'watcher')
+        return feed
+
+    async def test_turns_coalesce_into_one_update(self, fake_sio, engine):
+        feed = await self._watched(fake_sio, engine)
+        broadcaster = SpectatorBroadcaster(interval=0.5)
+        for _ in range(3):
+            broadcaster.mark(feed, _play_turn(engine))
+        assert fake_sio.events('watcher') == ['spectate_start']  # Nothing until the broadcaster runs
+
+        assert await broadcaster.flush(fake_sio) == 1
+        event, update, target = fake_sio.emitted[-1]
+        assert (event, target) == ('spectator_update', 'battle:7:spectators')
+        assert (update['base_version'], update['version'], update['turn']) == (0, 1, 3)
+        assert len(update['results']) == 2  # Only the newest max_pending turns are kept
+        assert update['changes']['team1'][0]['current_hp'] == engine.state['team1'][0].current_hp
+
+        # Nothing new: nothing sent
+        assert await broadcaster.flush(fake_sio) == 0
+
+    async def test_slow_spectator_gets_snapshot(self, fake_sio, engine):
+        feed = await self._watched(fake_sio, engine)
+        await feed.add(fake_sio, 'fast')
+        for version in range(1, 5):
+            _play_turn(engine)
+            await feed.flush(fake_sio)
+            await feed.ack(fake_sio, 'fast', version)
+
+        # 'watcher' never acked: it left the room after max_pending updates
+        assert fake_sio.events('watcher') == ['spectate_start', 'spectator_update', 'spectator_update']
+        assert fake_sio.events('fast').count('spectator_update') == 4
+        assert fake_sio.rooms['battle:7:spectators'] == {'fast'}
+
+        # Caught up with its queue: a snapshot instead of the missed deltas
+        await feed.ack(fake_sio, 'watcher', 2)
+        event, view, target = fake_sio.emitted[-1]
+        assert (event, target) == ('spectator_snapshot', 'watcher')
+        assert view['state']['version'] == 4
+        assert fake_sio.rooms['battle:7:spectators'] == {'fast', 'watcher'}
+
+    async def test_no_spectators_no_work(self, fake_sio, engine):
+        feed = SpectatorFeed('7', max_pending=2)
+        await feed.start(fake_sio, engine, {})
+        broadcaster = SpectatorBroadcaster(interval=0.5)
+        broadcaster.mark(feed, _play_turn(engine))
+        assert await broadcaster.flush(fake_sio) == 0
+        assert not feed.results
+
+
+@pytest.mark.asyncio
+class TestSpectatorSockets:
+    @pytest.fixture
+    def handlers(self, fake_sio, monkeypatch):
+        monkeypatch.setattr(battle_socket, 'battle_router', BattleRouter(MemoryBattleStore()))
+        monkeypatch.setattr(battle_socket, 'active_battles', {})
+        monkeypatch.setattr(battle_socket, 'sessions', SessionRegistry())
+        monkeypatch.setattr(battle_socket, 'spectator_broadcaster', SpectatorBroadcaster(interval=0.5))
+        battle_socket.register_events(fake_sio)
+        return fake_sio.handlers
+
+    async def _start(self, handlers, team):
+        await handlers['join_battle']('sid1', {'battle_id': 9, 'user_id': 1, 'team': team})
+        await handlers['join_battle']('sid2', {'battle_id': 9, 'user_id': 2, 'team': team})
+
+    async def test_spectator_off_the_players_path(self, handlers, fake_sio, test_db, sample_team):
+        await self._start(handlers, sample_team)
+        await handlers['spectate_battle']('sid3', {'battle_id': '9'})
+        event, view, _ = fake_sio.emitted[-1]
+        assert event == 'spectate_start'
+        assert view['players']['1']['user_id'] == 1 and view['players']['2']['user_id'] == 2
+
+        await handlers['battle_action']('sid1', {'battle_id': 9, 'action': ATTACK})
+        await handlers['battle_action']('sid2', {'battle_id': 9, 'action': ATTACK})
+        assert fake_sio.events('sid3') == ['spectate_start']
+        assert 'spectator_update' not in fake_sio.events('sid1')
+
+        await battle_socket.spectator_broadcaster.flush(fake_sio)
+        assert fake_sio.events('sid3') == ['spectate_start', 'spectator_update']
+
+        # Watching isn't playing
+        await handlers['battle_action']('sid3', {'battle_id': 9, 'action': ATTACK})
+        assert fake_sio.emitted[-1] == ('error', {'message': 'Not a player in this battle'}, 'sid3')
+
+    async def test_spectator_waits_for_start(self, handlers, fake_sio, test_db, sample_team):
+        await handlers['join_battle']('sid1', {'battle_id': 9, 'user_id': 1, 'team': sample_team})
+        await handlers['spectate_battle']('sid3', {'battle_id': 9})
+        await handlers['join_battle']('sid2', {'battle_id': 9, 'user_id': 2, 'team': sample_team})
+
+        assert fake_sio.events('sid3') == ['waiting_for_opponent', 'battle_start']
+        assert fake_sio.events('sid1') == ['waiting_for_opponent', 'battle_start']
+
+    async def test_stop_and_disconnect(self, handlers, fake_sio, test_db, sample_team):
+        await self._start(handlers, sample_team)
+        await handlers['spectate_battle']('sid3', {'battle_id': 9})
+        await handlers['spectate_battle']('sid4', {'battle_id': 9})
+
+        await handlers['stop_spectating']('sid3', {'battle_id': 9})
+        await handlers['disconnect']('sid4')
+        assert battle_socket.active_battles['9']['feed'].spectators == 0
+        assert fake_sio.rooms['battle:9:spectators'] == set()
+        assert battle_socket.sessions.watching('sid3') == []
+
+    async def test_spectators_see_the_end(self, handlers, fake_sio, test_db, sample_team):
+        await self._start(handlers, sample_team)
+        await handlers['spectate_battle']('sid3', {'battle_id': 9})
+        await handlers['disconnect']('sid1')
+
+        assert fake_sio.events('sid3')[-1] == 'opponent_disconnected'
+        assert 'battle:9:spectators' not in fake_sio.rooms
+
+    async def test_spectate_unknown_battle(self, handlers, fake_sio):
+        await handlers['spectate_battle']('sid3', {'battle_id': 404})
+        assert fake_sio.emitted == [('error', {'message': 'Battle not found'}, 'sid3')]
@@ -0,0 +1,112 @@
+import json
+import pytest
+from app.services.battle_engine import BattleEngine
+from app.services.catalog import MoveCatalog
+from app.sockets.state_sync import BattleStateSync
+
+
+def _yokai(idx):
+    return {
+        'id': f'{idx:03d}', 'name': f'Yokai {idx}', 'image': f'{idx:03d}.webp',
+        'bs_a_hp': 30, 'bs_a_str': 9, 'bs_a_spr': 5, 'bs_a_def': 6, 'bs_a_spd': 8,
+        'bs_b_hp': 300, 'bs_b_str': 160, 'bs_b_spr': 70, 'bs_b_def': 82, 'bs_b_spd': 100 + idx,
+        'fire_res': 0.7, 'water_res': 1.3, 'electric_res': 1.0, 'earth_res': 1.0,
+        'wind_res': 1.0, 'ice_res': 1.0, 'equipment_slots': 1,
+        'attack_prob': 0.6, 'attack_id': 'punch', 'technique_prob': 0.25,
+        'technique_id': None, 'inspirit_prob': 0.1, 'inspirit_id': None,
+        'guard_prob': 0.05, 'soultimate_id': None, 'skill_id': 1,
+        'rank': 'E', 'tribe': 'Brave', 'artwork_image': f'yokai{idx}.png',
+        'tier': 'PU', 'extra': ''
+    }
+
+
+@pytest.fixture
+def engine():
+    catalog = MoveCatalog({
+        'attacks': {'punch': {'id': 'punch', 'command': 'Punch', 'bp': 60}},
+        'yokai': {f'{idx:03d}': _yokai(idx) for idx in range(12)},
+    })
+    team1 = [{'id': f'{idx:03d}'} for idx in range(6)]
+    team2 = [{'id': f'{idx:03d}'} for idx in range(6, 12)]
+    return BattleEngine(team1, team2, catalog=catalog, seed=1)
+
+
+def _play_turn(engine):
+    engine.process_action(1, {'type': 'attack', 'yokai_index': 0, 'target_index': 0, 'move_id': 'punch'})
+    engine.process_action(2, {'type': 'attack', 'yokai_index': 0, 'target_index': 0, 'move_id': 'punch'})
+
+
+def _apply(state, delta):
+    """What a client does with a delta"""
+    assert state['version'] == delta['base_version']
+    for team, team_changes in delta['changes'].items():
+        for idx, fields in team_changes.items():
+            state[team][int(idx)].update(fields)
+    state['version'] = delta['version']
+    state['turn'] = delta['turn']
+    state['phase'] = delta['phase']
+
+
+class TestBattleStateSync:
+
+    def test_snapshot_is_versioned_full_state(self, engine):
+        sync = BattleStateSync(engine)
+
+        snapshot = sync.snapshot()
+
+        assert snapshot['version'] == 0
+        assert len(snapshot['team1']) == 6
+        assert snapshot['team1'][0]['name'] == 'Yokai 0'
+
+    def test_delta_only_carries_changed_fields(self, engine):
+        sync = BattleStateSync(engine)
+        _play_turn(engine)
+
+        delta = sync.delta()
+
+        assert delta['version'] == 1
+        assert delta['base_version'] == 0
+        assert delta['turn'] == 1
+        # Both active yokai took damage
+        assert 'current_hp' in delta['changes']['team1'][0]
+        assert 'current_hp' in delta['changes']['team2'][0]
+        # Nobody's name or stats are resent
+        for team_changes in delta['changes'].values():
+            for fields in team_changes.values():
+                assert 'name' not in fields
+                assert 'bs_b_hp' not in fields
+
+    def test_no_delta_when_nothing_changed(self, engine):
+        sync = BattleStateSync(engine)
+
+        assert sync.delta() is None
+        assert sync.version == 0
+
+    def test_waiting_action_produces_no_delta(self, engine):
+        sync = BattleStateSync(engine)
+        engine.process_action(1, {'type': 'attack', 'yokai_index': 0, 'target_index': 0, 'move_id': 'punch'})
+
+        assert sync.delta() is None
+
+    def test_applying_deltas_reconstructs_state(self, engine):
+        sync = BattleStateSync(engine)
+        client_state = json.loads(json.dumps(sync.snapshot()))
+
+        for _ in range(5):
+            _play_turn(engine)
+            delta = json.loads(json.dumps(sync.delta()))
+            _apply(client_state, delta)
+
+        server_state = sync.snapshot()
+        assert client_state['team1'] == server_state['team1']
+        assert client_state['team2'] == server_state['team2']
+        assert client_state['version'] == server_state['version'] == 5
+
+    def test_delta_is_much_smaller_than_full_state(self, engine):
+        sync = BattleStateSync(engine)
+        _play_turn(engine)
+
+        full_bytes = len(json.dumps(engine.get_state()))
+        delta_bytes = len(json.dumps(sync.delta()))
+
+        assert full_bytes > 10 * delta_bytes
@@ -0,0 +1,92 @@
+import pytest
+from app.services.battle_engine import BattleEngine
+from app.services.catalog import MoveCatalog
+from app.services.team_hydration import hydrate_team
+
+
+def _yokai(yokai_id):
+    return {
+        'id': yokai_id, 'name': f'Yokai {yokai_id}',
+        'bs_b_hp': 300, 'bs_b_str': 150, 'bs_b_spr': 120, 'bs_b_def': 100, 'bs_b_spd': 110,
+    }
+
+
+@pytest.fixture
+def catalog():
+    return MoveCatalog({
+        'yokai': {'001': _yokai('001'), '002': _yokai('002')},
+        'attitudes': {
+            4: {'id': 4, 'name': 'Rough', 'boost_hp': 0, 'boost_str': 26, 'boost_spr': 0,
+                'boost_def': 0, 'boost_spd': 0},
+        },
+        'equipment': {
+            1: {'id': 1, 'name': 'Worn Bangle', 'str_bonus': '+10', 'spr_bonus': '',
+                'def_bonus': '', 'spd_bonus': '-5'},
+            2: {'id': 2, 'name': 'Odd Charm', 'str_bonus': '5-15', 'spr_bonus': None,
+                'def_bonus': '+8', 'spd_bonus': ''},
+        },
+    })
+
+
+class TestHydrateTeam:
+
+    def test_rows_are_shared_catalog_rows(self, catalog):
+        (row, build), = hydrate_team([{'id': '001'}], catalog)
+
+        assert row is catalog.yokai['001']
+        assert build == {}
+
+    def test_team_api_format(self, catalog):
+        entry = {
+            'yokai_id': '002',
+            'attitude_id': 'rough',
+            'ivs': {'hp': 10, 'str': 20, 'spr': 0, 'def': 5, 'spd': 5},
+            'gym_points': {'str': 3, 'spr': 0, 'def': 2, 'spd': 0},
+            'equipment': ['1', 'Odd Charm'],
+        }
+
+        (row, build), = hydrate_team([entry], catalog)
+
+        assert row is catalog.yokai['002']
+        assert build['hp_iv'] == 10
+        assert build['str_gym'] == 3
+        assert build['attitude_str_boost'] == 26
+        assert build['equipment_str_bonus'] == 10  # the ranged bonus counts as 0
+        assert build['equipment_def_bonus'] == 8
+        assert build['equipment_spd_bonus'] == -5
+
+    def test_flat_keys_win(self, catalog):
+        (_, build), = hydrate_team([{'id': '001', 'ivs': {'str': 5}, 'str_iv': 9}], catalog)
+
+        assert build['str_iv'] == 9
+
+    def test_unknown_entries_are_their_own_row(self, catalog):
+        entry = {'name': 'Custom', 'bs_b_hp': 50, 'bs_b_str': 1, 'bs_b_spr': 1,
+                 'bs_b_def': 1, 'bs_b_spd': 1}
+
+        (row, _), = hydrate_team([entry], catalog)
+
+        assert row is entry
+
+    def test_engine_applies_build(self, catalog, monkeypatch):
+        def no_db(*args, **kwargs):
+            raise AssertionError("team hydration must not touch the database")
+
+        monkeypatch.setattr('app.services.catalog.get_db', no_db)
+
+        team = [{
+            'yokai_id': '001',
+            'attitude_id': 4,
+            'ivs': {'hp': 10, 'str': 20},
+            'gym_points': {'spd': 5},
+            'equipment': [1],
+        }]
+        engine = BattleEngine(team, [{'id': '002'}], catalog=catalog, seed=1)
+
+        fighter = engine.state['team1'][0]
+        assert fighter.max_hp == 300 + 10
+        assert fighter.str_stat == 150 + 20 + 26 + 10
+        assert fighter.spd_stat == 110 + 5 - 5
+        assert fighter.attitude_str_boost == 26
+        assert fighter.data is catalog.yokai['001']
+        assert engine.state['team2'][0].str_stat == 150
@@ -0,0 +1,141 @@
+import pytest
+from app.services.catalog import MoveCatalog
+from app.services.threat_matrix import build_threat_matrix, get_yokai_columns
+from damage_calc import get_attack_damage
+
+
+class FixedRoll:
+
+    def __init__(self, value):
+        self.value = value
+
+    def uniform(self, a, b):
+        return self.value
+
+
+def _yokai(idx):
+    return {
+        'id': f'{idx:03d}', 'name': f'Yokai {idx}',
+        'bs_b_hp': 150 + idx * 7, 'bs_b_str': 100 + idx, 'bs_b_spr': 90 + idx,
+        'bs_b_def': 60 + (idx * 13) % 120, 'bs_b_spd': 100,
+        'fire_res': 0.7 + (idx % 4) * 0.2, 'water_res': 1.0, 'electric_res': 0.5 + (idx % 3) * 0.5,
+        'earth_res': 1.0, 'wind_res': 1.0, 'ice_res': 1.2,
+    }
+
+
+def _move(move_id, command, power, element='None', hits=1):
+    # Shaped like the seeded attack/technique/soultimate tables
+    return {'id': move_id, 'command': command, 'lv1_power': power // 2, 'lv10_power': power,
+            'n_hits': hits, 'element': element, 'extra': None}
+
+
+@pytest.fixture
+def catalog():
+    return MoveCatalog({
+        'attacks': {'punch': _move('punch', 'Punch', 60, hits=2)},
+        'techniques': {
+            'blaze': _move('blaze', 'Blaze', 90, 'Fire'),
+            'inferno': _move('inferno', 'Inferno', 180, 'Fire'),
+            'spark': _move('spark', 'Spark', 90, 'Lightning'),
+        },
+        'soultimate': {'nova': {**_move('nova', 'Nova', 150, 'Ice'), 'lv1_soul_charge': 10, 'lv10_soul_charge': 20}},
+        'yokai': {f'{idx:03d}': _yokai(idx) for idx in range(40)},
+    })
+
+
+class TestThreatMatrix:
+
+    @pytest.mark.parametrize('move_type,move_id,attack_type', [
+        ('attack', 'punch', 1),
+        ('technique', 'blaze', 2),
+        ('soultimate', 'nova', 3),
+    ])
+    @pytest.mark.parametrize('is_defending,is_crit', [(False, False), (True, False), (False, True)])
+    def test_matches_get_attack_damage(self, catalog, move_type, move_id, attack_type, is_defending, is_crit):
+        attacker = {'id': '005', 'str_iv': 10, 'spr_iv': 5, 'attitude_str_boost': 8}
+        matrix = build_threat_matrix(catalog, attacker, move_type, move_id,
+                                     is_defending=is_defending, is_crit=is_crit, is_moxie=True)
+
+        move = {'attack': catalog.attacks, 'technique': catalog.techniques,
+                'soultimate': catalog.soultimates}[move_type][move_id]
+        attacker_str = catalog.yokai['005']['bs_b_str'] + 10 + 8
+        attacker_spr = catalog.yokai['005']['bs_b_spr'] + 5
+
+        assert len(matrix['results']) == 40
+        for entry in matrix['results']:
+            defender = catalog.yokai[entry['yokai_id']]
+            expected = [
+                get_attack_damage(
+                    move, attacker_str, attacker_spr, defender, defender['bs_b_def'],
+                    defender['bs_b_hp'], attack_type, is_defending=is_defending,
+                    is_crit=is_crit, is_moxie=True, attitude_str_boost=8,
+                    rng=FixedRoll(roll)
+                )
+                for roll in (0.9, 1.1)
+            ]
+            assert entry['min_damage'] == expected[0]['damage']
+            assert entry['max_damage'] == expected[1]['damage']
+            assert entry['hits_to_ko_min'] == expected[1]['hits_to_ko']
+            assert entry['hits_to_ko_max'] == expected[0]['hits_to_ko']
+
+    def test_power_and_element_from_seeded_columns(self, catalog):
+        def damage(move_id):
+            matrix = build_threat_matrix(catalog, {'id': '000'}, 'technique', move_id)
+            return {entry['yokai_id']: entry['max_damage'] for entry in matrix['results']}
+
+        blaze, inferno, spark = damage('blaze'), damage('inferno'), damage('spark')
+        assert all(inferno[yokai_id] > blaze[yokai_id] for yokai_id in blaze)
+        # Same power: Fire follows fire_res, Lightning follows electric_res
+        assert spark['000'] < blaze['000']  # 0.5 vs 0.7
+        assert spark['002'] > blaze['002']  # 1.5 vs 1.1
+
+        punch = get_attack_damage(catalog.attacks['punch'], 100, 90, _yokai(0), 60, 150, 1)
+        assert punch['stats_used']['hit_amount'] == 2 and punch['stats_used']['power'] == 60
+
+    def test_results_sorted_by_damage(self, catalog):
+        matrix = build_threat_matrix(catalog, {'id': '000'}, 'technique', 'blaze')
+
+        damage = [entry['max_damage'] for entry in matrix['results']]
+        assert damage == sorted(damage, reverse=True)
+
+    def test_unknown_move_and_yokai(self, catalog):
+        with pytest.raises(KeyError):
+            build_threat_matrix(catalog, {'id': '000'}, 'attack', 'missing')
+        with pytest.raises(KeyError):
+            build_threat_matrix(catalog, {'id': 'missing'}, 'attack', 'punch')
+        with pytest.raises(ValueError):
+            build_threat_matrix(catalog, {'id': '000'}, 'kick', 'punch')
+
+    def test_columns_cached_per_catalog(self, catalog):
+        assert get_yokai_columns(catalog) is get_yokai_columns(catalog)
+
+        other = MoveCatalog({'yokai': {'000': _yokai(0)}})
+        assert len(get_yokai_columns(other)) == 1
+
+
+class TestThreatMatrixEndpoint:
+
+    def test_threat_matrix_against_catalog(self, client):
+        response = client.post('/api/damage/threat-matrix', json={
+            'yokai_id': 'test_001',
+            'move_type': 'technique',
+            'move_id': 'tech_001',
+            'ivs': {'spr': 10}
+        })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['move_name'] == 'Test Blaze'
+        assert {entry['yokai_id'] for entry in data['results']} >= {'test_001', 'test_002'}
+
+    def test_unknown_move(self, client):
+        response = client.post('/api/damage/threat-matrix', json={
+            'yokai_id': 'test_001', 'move_type': 'attack', 'move_id': 'missing'
+        })
+        assert response.status_code == 404
+
+    def test_invalid_move_type(self, client):
+        response = client.post('/api/damage/threat-matrix', json={
+            'yokai_id': 'test_001', 'move_type': 'kick', 'move_id': 'attack_001'
+        })
+        assert response.status_code == 400
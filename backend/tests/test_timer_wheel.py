@@ -0,0 +1,162 @@
+import asyncio
+import random
+import pytest
+from app.services.battle_store import MemoryBattleStore
+from app.services.timer_wheel import TimerWheel
+from app.sockets import battle_socket
+from app.sockets.battle_router import BattleRouter
+from app.sockets.session_registry import SessionRegistry
+from app.sockets.spectator_feed import SpectatorBroadcaster
+
+ATTACK = {'type': 'attack', 'yokai_index': 0, 'target_index': 0, 'move_id': 'attack_001'}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestTimerWheel:
+    def test_expires_on_its_tick(self, clock):
+        wheel = TimerWheel(tick=1.0, slots=8, levels=2, clock=clock)
+        wheel.schedule('a', 3)
+        wheel.schedule('b', 2.5)  # Rounded up to the next tick
+
+        assert wheel.advance(clock.now + 2) == []
+        assert sorted(wheel.advance(clock.now + 3)) == ['a', 'b']
+        assert len(wheel) == 0
+
+    def test_cascades_and_overflow(self, clock):
+        # Level 0 covers 8 ticks, level 1 64: 40 cascades once, 500 waits in overflow
+        wheel = TimerWheel(tick=1.0, slots=8, levels=2, clock=clock)
+        for delay in (5, 40, 500):
+            wheel.schedule(delay, delay)
+
+        fired = {}
+        for tick in range(1, 600):
+            for key in wheel.advance(clock.now + tick):
+                fired[key] = tick
+        assert fired == {5: 5, 40: 40, 500: 500}
+
+    def test_reschedule_and_cancel(self, clock):
+        wheel = TimerWheel(tick=1.0, slots=8, levels=2, clock=clock)
+        wheel.schedule('a', 5)
+        wheel.schedule('b', 5)
+        wheel.schedule('a', 20)  # Replaces the first deadline
+        assert wheel.cancel('b') and not wheel.cancel('b')
+
+        assert wheel.advance(clock.now + 10) == []
+        assert 'a' in wheel and 'b' not in wheel
+        assert wheel.advance(clock.now + 20) == ['a']
+
+    def test_catches_up_and_schedules_from_now(self, clock):
+        wheel = TimerWheel(tick=0.5, slots=4, levels=2, clock=clock)
+        wheel.advance(clock.now + 100)  # Idle wheel: jumps straight there
+        clock.now += 100
+        wheel.schedule('a', 1)
+        assert wheel.advance(clock.now + 0.5) == []
+        assert wheel.advance(clock.now + 7) == ['a']
+
+    def test_matches_sorted_deadlines(self, clock):
+        rng = random.Random(3)
+        wheel = TimerWheel(tick=1.0, slots=4, levels=3, clock=clock)
+        deadlines = {}
+        for tick in range(1, 400):
+            for _ in range(rng.randrange(4)):
+                key = rng.randrange(50)
+                if rng.random() < 0.2:
+                    wheel.cancel(key)
+                    deadlines.pop(key, None)
+                else:
+                    delay = rng.randrange(1, 150)
+                    clock.now = 1000.0 + tick - 1
+                    wheel.schedule(key, delay)
+                    deadlines[key] = tick - 1 + delay
+            for key in wheel.advance(1000.0 + tick):
+                assert deadlines.pop(key) == tick
+        assert all(deadline >= 400 for deadline in deadlines.values())
+
+
+@pytest.mark.asyncio
+class TestTurnTimers:
+    @pytest.fixture
+    def handlers(self, fake_sio, clock, monkeypatch):
+        monkeypatch.setattr(battle_socket, 'battle_router', BattleRouter(MemoryBattleStore()))
+        monkeypatch.setattr(battle_socket, 'active_battles', {})
+        monkeypatch.setattr(battle_socket, 'sessions', SessionRegistry())
+        monkeypatch.setattr(battle_socket, 'spectator_broadcaster', SpectatorBroadcaster(interval=0.5))
+        monkeypatch.setattr(battle_socket, 'turn_timers', TimerWheel(tick=1.0, clock=clock))
+        battle_socket.register_events(fake_sio)
+        return fake_sio.handlers
+
+    async def _expire(self, fake_sio, clock, seconds):
+        clock.now += seconds
+        for battle_id in battle_socket.turn_timers.advance():
+            await battle_socket.turn_expired(fake_sio, battle_id)
+
+    async def _start(self, handlers, team):
+        await handlers['join_battle']('sid1', {'battle_id': 9, 'user_id': 1, 'team': team})
+        await handlers['join_battle']('sid2', {'battle_id': 9, 'user_id': 2, 'team': team})
+
+    async def test_idle_player_gets_default_action(self, handlers, fake_sio, clock, test_db, sample_team):
+        await self._start(handlers, sample_team)
+        await handlers['battle_action']('sid1', {'battle_id': 9, 'action': ATTACK})
+
+        await self._expire(fake_sio, clock, 59)
+        assert 'turn_timeout' not in fake_sio.events()
+        await self._expire(fake_sio, clock, 1)
+
+        assert fake_sio.events('sid1')[-3:] == ['turn_timeout', 'action_result', 'state_delta']
+        assert battle_socket.active_battles['9']['engine'].turn == 1
+        assert battle_socket.active_battles['9']['missed'] == {1: 0, 2: 1}
+        # The next turn has its own deadline
+        assert '9' in battle_socket.turn_timers
+
+    async def test_idle_players_forfeit(self, handlers, fake_sio, clock, monkeypatch, test_db, sample_team):
+        monkeypatch.setattr(battle_socket.settings, 'TURN_TIMEOUT_FORFEIT_AFTER', 1)
+        await self._start(handlers, sample_team)
+
+        await self._expire(fake_sio, clock, 60)  # Both played for
+        assert battle_socket.active_battles['9']['missed'] == {1: 1, 2: 1}
+        await handlers['battle_action']('sid1', {'battle_id': 9, 'action': ATTACK})
+        await self._expire(fake_sio, clock, 60)  # Player 2 again: out
+
+        assert ('battle_end', {'winner': 1, 'forfeit': [2]}, 'battle:9') in fake_sio.emitted
+        assert '9' not in battle_socket.active_battles
+        assert len(battle_socket.turn_timers) == 0
+
+    async def test_abandoned_battle_is_reaped(self, handlers, fake_sio, clock, monkeypatch, test_db, sample_team):
+        monkeypatch.setattr(battle_socket.settings, 'TURN_TIMEOUT_FORFEIT_AFTER', 0)
+        await self._start(handlers, sample_team)
+        await self._expire(fake_sio, clock, 60)
+
+        assert ('battle_end', {'winner': 0, 'forfeit': [1, 2]}, 'battle:9') in fake_sio.emitted
+        assert battle_socket.active_battles == {}
+
+    async def test_waiting_battle_expires(self, handlers, fake_sio, clock, test_db, sample_team):
+        await handlers['join_battle']('sid1', {'battle_id': 9, 'user_id': 1, 'team': sample_team})
+        await self._expire(fake_sio, clock, battle_socket.settings.BATTLE_IDLE_TIMEOUT)
+
+        assert fake_sio.events('sid1')[-1] == 'battle_expired'
+        assert await battle_socket.battle_router.store.get('9') is None
+
+    async def test_run_fires_callbacks(self):
+        wheel = TimerWheel(tick=0.01)
+        fired = asyncio.Event()
+
+        async def on_expire(key):
+            assert key == 'a'
+            fired.set()
+
+        wheel.schedule('a', 0.02)
+        runner = asyncio.create_task(wheel.run(on_expire))
+        await asyncio.wait_for(fired.wait(), timeout=2)
+        runner.cancel()